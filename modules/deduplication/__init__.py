@@ -7,10 +7,14 @@ from .stem_database import StemDatabase
 from .simhash_detector import SimHashDetector  
 from .angle_changer import AngleChanger
 from .keyword_deduplicator import KeywordDeduplicator
+from .connection_pool import SQLiteConnectionPool, get_connection_pool, close_connection_pools
 
 __all__ = [
     'StemDatabase',
     'SimHashDetector', 
     'AngleChanger',
-    'KeywordDeduplicator'
+    'KeywordDeduplicator',
+    'SQLiteConnectionPool',
+    'get_connection_pool',
+    'close_connection_pools'
 ]
\ No newline at end of file
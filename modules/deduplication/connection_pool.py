@@ -0,0 +1,210 @@
+"""
+Pooled persistent SQLite connections for the deduplication databases.
+
+Connections are opened once per database and reused, so every call keeps its
+compiled statements (sqlite3's per-connection statement cache) and no longer
+pays for connect, schema parsing and an fsync per commit. Databases run in
+WAL mode with synchronous=NORMAL: readers never block the writer and commits
+only append to the write-ahead log.
+
+Callers that issue many writes in a row (keyword pipelines) wrap them in
+``transaction()``: every ``connection()`` on the same thread joins the open
+transaction, which commits once at the end. Each joined unit runs in its own
+savepoint, so a failed unit leaves no partial writes behind.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# Pragmas applied to every new connection
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -16000  # KiB (negative = size instead of pages)
+}
+
+_pools: Dict[str, 'SQLiteConnectionPool'] = {}
+_pools_lock = threading.Lock()
+
+
+class SQLiteConnectionPool:
+    """
+    Thread-safe pool of persistent connections to one SQLite database.
+
+    At most ``max_connections`` connections exist; callers block until one is
+    returned when all are in use.
+    """
+
+    def __init__(self, db_path: str, max_connections: int = 4, timeout: float = 30.0,
+                 cached_statements: int = 256, pragmas: Dict = None):
+        """
+        Initialize the pool (connections are opened on demand).
+
+        Args:
+            db_path: SQLite database path
+            max_connections: Upper bound of open connections
+            timeout: Seconds to wait for a database lock (and for a free connection)
+            cached_statements: Compiled statements kept per connection
+            pragmas: Pragmas for new connections (defaults to DEFAULT_PRAGMAS)
+        """
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take a connection from the pool (opening one while below the limit)."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.max_connections
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"No free connection to {self.db_path} "
+                                           f"after {self.timeout}s")
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool (rolling back anything left open)."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for one unit of work.
+
+        Commits on success and rolls back on error, like ``with
+        sqlite3.connect(...)``. Inside ``transaction()`` on the same thread
+        the open transaction's connection is returned and the unit runs in a
+        savepoint: an error rolls back only this unit's writes, and the batch
+        commits the rest.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            depth = getattr(self._local, 'depth', 0)
+            savepoint = f"unit_{depth}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+            self._local.depth = depth + 1
+            try:
+                yield conn
+            except BaseException:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                raise
+            finally:
+                self._local.depth = depth
+                conn.execute(f"RELEASE {savepoint}")
+            return
+
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a batch of calls in one write transaction (BEGIN IMMEDIATE).
+
+        Every ``connection()`` on this thread joins it until the block ends;
+        it commits once on success and rolls back on error. Nested calls join
+        the outer transaction.
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            yield self._local.conn
+            return
+
+        conn = self.acquire()
+        try:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute('BEGIN IMMEDIATE')
+            self._local.conn = conn
+            try:
+                yield conn
+            finally:
+                self._local.conn = None
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close the idle connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+def get_connection_pool(db_path: str, **kwargs) -> SQLiteConnectionPool:
+    """
+    Shared pool of a database (one per absolute path per process).
+
+    Args:
+        db_path: SQLite database path
+        **kwargs: SQLiteConnectionPool options, used when the pool is created
+
+    Returns:
+        SQLiteConnectionPool instance
+    """
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SQLiteConnectionPool(db_path, **kwargs)
+        return pool
+
+
+def close_connection_pools():
+    """Close the idle connections of every shared pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
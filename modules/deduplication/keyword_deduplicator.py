@@ -272,6 +272,10 @@ class KeywordDeduplicator:
         """
         Process multiple keywords in batch.
         
+        All keywords share one transaction per database. A failed database
+        call only undoes its own writes (savepoint), but an exception that
+        escapes process_keyword rolls back every earlier keyword of the batch.
+        
         Args:
             keywords: List of keyword dictionaries with keys: 'keyword', 'category', 'source', 'score'
             
@@ -280,15 +284,17 @@ class KeywordDeduplicator:
         """
         results = []
         
-        for kw_data in keywords:
-            keyword = kw_data.get('keyword', '')
-            category = kw_data.get('category', 'smart_home')
-            source = kw_data.get('source', 'generated')
-            score = kw_data.get('monetization_score', 0.5)
-            
-            if keyword.strip():
-                result = self.process_keyword(keyword, category, source, score)
-                results.append(result)
+        # One transaction per database for the whole batch instead of a commit per call
+        with self.stem_db.batch(), self.simhash_detector.batch():
+            for kw_data in keywords:
+                keyword = kw_data.get('keyword', '')
+                category = kw_data.get('category', 'smart_home')
+                source = kw_data.get('source', 'generated')
+                score = kw_data.get('monetization_score', 0.5)
+                
+                if keyword.strip():
+                    result = self.process_keyword(keyword, category, source, score)
+                    results.append(result)
         
         return results
     
@@ -1,6 +1,14 @@
 """
 SimHash-based similarity detection for content deduplication.
-Implements LSH (Locality-Sensitive Hashing) for efficient similarity search.
+Implements LSH (Locality-Sensitive Hashing) for efficient similarity search:
+every record is stored under its bucket key in each table of a multi-block
+Hamming index (indexed SQLite columns), so a lookup only reads records that
+share a bucket with the query.
+
+The bucket layout depends on the similarity threshold, and detectors with
+different thresholds may share a database. Every layout in use is registered
+in ``simhash_layouts`` and bucket rows are keyed by layout; new records are
+indexed under all registered layouts.
 """
 
 import os
@@ -11,7 +19,11 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 import re
 import logging
-from simhash import Simhash, SimhashIndex
+
+from .connection_pool import get_connection_pool
+from ..fingerprint import (
+    SimHashIndex, fingerprint_array, hamming_distances, signed64, text_simhash, unsigned64
+)
 
 @dataclass
 class ContentRecord:
@@ -45,16 +57,27 @@ class SimHashDetector:
         # Create data directory
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
+        # Persistent WAL connections shared by all users of this database
+        self.pool = get_connection_pool(db_path)
+        
         # Initialize database
         self._init_database()
         
+        # Multi-block bucket layout answering distances up to the threshold
+        self.index_layout = SimHashIndex(max_distance=similarity_threshold)
+        self.layout_id: Optional[int] = None
+        self._layouts: Dict[Tuple[int, int], SimHashIndex] = {}
+        
         # Initialize SimHash index for fast similarity search
-        self.simhash_index = None
         self._rebuild_index()
     
+    def batch(self):
+        """Group many calls into one transaction (committed once at the end)."""
+        return self.pool.transaction()
+    
     def _init_database(self):
         """Initialize SQLite database for SimHash storage"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.pool.connection() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS content_simhash (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -76,6 +99,38 @@ class SimHashDetector:
                 CREATE INDEX IF NOT EXISTS idx_timestamp 
                 ON content_simhash(timestamp)
             """)
+            
+            # Bucket layouts in use (one per distinct threshold)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS simhash_layouts (
+                    layout_id INTEGER PRIMARY KEY,
+                    max_distance INTEGER NOT NULL,
+                    num_blocks INTEGER NOT NULL,
+                    UNIQUE (max_distance, num_blocks)
+                )
+            """)
+            
+            # Single-layout buckets of older databases are rebuilt per layout
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(simhash_buckets)")]
+            if columns and 'layout_id' not in columns:
+                conn.execute("DROP TABLE simhash_buckets")
+            conn.execute("DROP TABLE IF EXISTS simhash_index_meta")
+            
+            # Bucket keys of every record, one row per layout and index table
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS simhash_buckets (
+                    layout_id INTEGER NOT NULL,
+                    table_id INTEGER NOT NULL,
+                    bucket_key INTEGER NOT NULL,
+                    record_id INTEGER NOT NULL,
+                    PRIMARY KEY (layout_id, table_id, bucket_key, record_id)
+                ) WITHOUT ROWID
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_buckets_record 
+                ON simhash_buckets(record_id, layout_id)
+            """)
     
     def _preprocess_text(self, text: str) -> str:
         """
@@ -116,8 +171,8 @@ class SimHashDetector:
         if not preprocessed:
             return 0
         
-        # Use 64-bit SimHash with word-level features
-        return Simhash(preprocessed).value
+        # Same fingerprint as simhash.Simhash(preprocessed).value, computed with NumPy
+        return text_simhash(preprocessed)
     
     def add_content_record(self, title: str, category: str = "smart_home", 
                           angle: str = "general", source: str = "generated") -> bool:
@@ -137,15 +192,16 @@ class SimHashDetector:
             simhash_value = self.calculate_simhash(title)
             timestamp = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+            with self.pool.connection() as conn:
+                # SQLite INTEGER is signed 64-bit
+                cursor = conn.execute("""
                     INSERT INTO content_simhash 
                     (title, simhash_value, timestamp, category, angle, source)
                     VALUES (?, ?, ?, ?, ?, ?)
-                """, (title, simhash_value, timestamp, category, angle, source))
-            
-            # Rebuild index to include new record
-            self._rebuild_index()
+                """, (title, signed64(simhash_value), timestamp, category, angle, source))
+                
+                # Add the record to every layout's buckets in the same transaction
+                self._index_records(conn, [(cursor.lastrowid, simhash_value)])
             
             self.logger.info(f"Added content record: {title[:50]}... "
                            f"(SimHash: {simhash_value})")
@@ -172,29 +228,44 @@ class SimHashDetector:
             
             similar_content = []
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
-                    SELECT title, simhash_value, timestamp, category, angle, source
-                    FROM content_simhash
-                    WHERE timestamp >= ?
-                """, (cutoff_date,))
+            with self.pool.connection() as conn:
+                if self.layout_id is None:
+                    # No selective layout for this threshold: scan the time window
+                    cursor = conn.execute("""
+                        SELECT title, simhash_value, timestamp, category, angle, source
+                        FROM content_simhash
+                        WHERE timestamp >= ?
+                    """, (cutoff_date,))
+                else:
+                    # Only records sharing a bucket with the target can be within the threshold
+                    bucket_keys = self.index_layout.bucket_keys(target_simhash)
+                    bucket_query = ' UNION ALL '.join(
+                        ['SELECT record_id FROM simhash_buckets '
+                         'WHERE layout_id = ? AND table_id = ? AND bucket_key = ?'] * len(bucket_keys))
+                    params = [value for table_id, key in bucket_keys
+                              for value in (self.layout_id, table_id, signed64(key))]
+                    cursor = conn.execute(f"""
+                        SELECT title, simhash_value, timestamp, category, angle, source
+                        FROM content_simhash
+                        WHERE id IN ({bucket_query}) AND timestamp >= ?
+                    """, params + [cutoff_date])
                 
-                for row in cursor.fetchall():
-                    title_db, simhash_db, timestamp, category, angle, source = row
-                    
-                    # Calculate Hamming distance
-                    hamming_distance = bin(target_simhash ^ simhash_db).count('1')
-                    
-                    if hamming_distance <= self.similarity_threshold:
-                        record = ContentRecord(
-                            title=title_db,
-                            simhash_value=simhash_db,
-                            timestamp=datetime.fromisoformat(timestamp),
-                            category=category,
-                            angle=angle,
-                            source=source
-                        )
-                        similar_content.append((record, hamming_distance))
+                rows = cursor.fetchall()
+            
+            # Verify the candidates' Hamming distances in one XOR + popcount
+            distances = hamming_distances(target_simhash, fingerprint_array(row[1] for row in rows))
+            
+            for i in (distances <= self.similarity_threshold).nonzero()[0]:
+                title_db, simhash_db, timestamp, category, angle, source = rows[i]
+                record = ContentRecord(
+                    title=title_db,
+                    simhash_value=unsigned64(simhash_db),
+                    timestamp=datetime.fromisoformat(timestamp),
+                    category=category,
+                    angle=angle,
+                    source=source
+                )
+                similar_content.append((record, int(distances[i])))
             
             # Sort by similarity (lower hamming distance = more similar)
             similar_content.sort(key=lambda x: x[1])
@@ -238,30 +309,74 @@ class SimHashDetector:
         
         return is_too_similar, similarity_ratio, most_similar_record.title
     
+    def _layout(self, max_distance: int, num_blocks: int) -> SimHashIndex:
+        """Bucket layout with the given parameters (cached)."""
+        key = (max_distance, num_blocks)
+        if key not in self._layouts:
+            self._layouts[key] = SimHashIndex(max_distance=max_distance, num_blocks=num_blocks)
+        return self._layouts[key]
+    
+    def _index_records(self, conn: sqlite3.Connection, records: List[Tuple[int, int]],
+                       layout_id: Optional[int] = None):
+        """
+        Store the bucket keys of records.
+        
+        Args:
+            conn: Open database connection (caller commits)
+            records: (record id, SimHash value) pairs
+            layout_id: Only this layout (default: every registered layout)
+        """
+        if not records:
+            return
+        
+        layouts = conn.execute(
+            "SELECT layout_id, max_distance, num_blocks FROM simhash_layouts"
+            + ("" if layout_id is None else " WHERE layout_id = ?"),
+            () if layout_id is None else (layout_id,)).fetchall()
+        for layout_id, max_distance, num_blocks in layouts:
+            layout = self._layout(max_distance, num_blocks)
+            conn.executemany("""
+                INSERT OR REPLACE INTO simhash_buckets (layout_id, table_id, bucket_key, record_id)
+                VALUES (?, ?, ?, ?)
+            """, ((layout_id, table_id, signed64(key), record_id)
+                  for record_id, simhash_value in records
+                  for table_id, key in layout.bucket_keys(unsigned64(simhash_value))))
+    
     def _rebuild_index(self):
-        """Rebuild SimHash index for fast similarity search"""
+        """Register this detector's bucket layout and index the records it lacks"""
         try:
-            # Get all current SimHash values
-            simhash_data = []
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT id, simhash_value FROM content_simhash")
-                simhash_data = [(row[0], row[1]) for row in cursor.fetchall()]
-            
-            if simhash_data:
-                # Create new SimHash index
-                objects = [(str(id_val), Simhash(simhash_val, hashfunc=lambda x: int(x))) 
-                          for id_val, simhash_val in simhash_data]
+            with self.pool.connection() as conn:
+                conn.execute("""
+                    DELETE FROM simhash_buckets
+                    WHERE record_id NOT IN (SELECT id FROM content_simhash)
+                """)
                 
-                self.simhash_index = SimhashIndex(objects, k=self.similarity_threshold)
+                if not self.index_layout.table_blocks:
+                    # Thresholds without a selective layout scan instead
+                    self.layout_id = None
+                    return
                 
-                self.logger.debug(f"Rebuilt SimHash index with {len(objects)} records")
-            else:
-                self.simhash_index = None
+                conn.execute("INSERT OR IGNORE INTO simhash_layouts (max_distance, num_blocks) "
+                             "VALUES (?, ?)", (self.index_layout.max_distance, self.index_layout.num_blocks))
+                self.layout_id = conn.execute(
+                    "SELECT layout_id FROM simhash_layouts WHERE max_distance = ? AND num_blocks = ?",
+                    (self.index_layout.max_distance, self.index_layout.num_blocks)).fetchone()[0]
+                self._layouts[(self.index_layout.max_distance, self.index_layout.num_blocks)] = self.index_layout
+                
+                # Records written before this layout was registered (or by older versions)
+                missing = conn.execute("""
+                    SELECT id, simhash_value FROM content_simhash c
+                    WHERE NOT EXISTS (SELECT 1 FROM simhash_buckets b
+                                      WHERE b.record_id = c.id AND b.layout_id = ?)
+                """, (self.layout_id,)).fetchall()
+                self._index_records(conn, missing, self.layout_id)
+            
+            if missing:
+                self.logger.debug(f"Indexed {len(missing)} SimHash records")
                 
         except Exception as e:
-            self.logger.warning(f"Failed to rebuild SimHash index: {e}")
-            self.simhash_index = None
+            self.layout_id = None
+            self.logger.error(f"Failed to rebuild SimHash index: {e}")
     
     def get_recent_records(self, days: int = 7, limit: int = 100) -> List[ContentRecord]:
         """
@@ -279,7 +394,7 @@ class SimHashDetector:
         records = []
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT title, simhash_value, timestamp, category, angle, source
                     FROM content_simhash
@@ -293,7 +408,7 @@ class SimHashDetector:
                     
                     records.append(ContentRecord(
                         title=title,
-                        simhash_value=simhash_value,
+                        simhash_value=unsigned64(simhash_value),
                         timestamp=datetime.fromisoformat(timestamp),
                         category=category,
                         angle=angle,
@@ -315,7 +430,13 @@ class SimHashDetector:
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
+                # Drop the expired records' buckets in the same transaction
+                conn.execute("""
+                    DELETE FROM simhash_buckets WHERE record_id IN
+                        (SELECT id FROM content_simhash WHERE timestamp < ?)
+                """, (cutoff_date,))
+                
                 cursor = conn.execute("""
                     DELETE FROM content_simhash WHERE timestamp < ?
                 """, (cutoff_date,))
@@ -324,8 +445,6 @@ class SimHashDetector:
             
             if deleted_count > 0:
                 self.logger.info(f"Cleaned up {deleted_count} old SimHash records")
-                # Rebuild index after cleanup
-                self._rebuild_index()
                 
         except Exception as e:
             self.logger.error(f"Failed to cleanup old SimHash records: {e}")
@@ -341,7 +460,7 @@ class SimHashDetector:
         }
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 # Total records
                 cursor = conn.execute("SELECT COUNT(*) FROM content_simhash")
                 stats['total_records'] = cursor.fetchone()[0]
@@ -359,9 +478,12 @@ class SimHashDetector:
                 """, (cutoff_30d,))
                 stats['last_30_days'] = cursor.fetchone()[0]
                 
-                # Index information
-                if self.simhash_index:
-                    stats['index_size'] = len(self.simhash_index.bucket)
+                # Index information (non-empty buckets over this layout's tables)
+                cursor = conn.execute("""
+                    SELECT COUNT(*) FROM (SELECT DISTINCT table_id, bucket_key FROM simhash_buckets
+                                          WHERE layout_id = ?)
+                """, (self.layout_id,))
+                stats['index_size'] = cursor.fetchone()[0]
                     
         except Exception as e:
             self.logger.error(f"Failed to get SimHash statistics: {e}")
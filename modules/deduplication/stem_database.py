@@ -5,7 +5,6 @@ Maintains a rolling window of keyword stems to prevent repetitive content genera
 
 import os
 import json
-import sqlite3
 from datetime import datetime, timedelta
 from typing import List, Dict, Set
 from dataclasses import dataclass
@@ -13,6 +12,8 @@ import nltk
 from nltk.stem import PorterStemmer
 import logging
 
+from .connection_pool import get_connection_pool
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
@@ -43,12 +44,26 @@ class StemDatabase:
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
+        # Persistent WAL connections shared by all users of this database
+        self.pool = get_connection_pool(db_path)
+        
         # Initialize database
         self._init_database()
+    
+    def batch(self):
+        """
+        Group many calls into one transaction (committed once at the end).
+        
+        Usage:
+            with stem_db.batch():
+                for keyword in keywords:
+                    stem_db.add_keyword_record(keyword)
+        """
+        return self.pool.transaction()
         
     def _init_database(self):
         """Initialize SQLite database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.pool.connection() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS keyword_stems (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -121,7 +136,7 @@ class StemDatabase:
             stems = self.extract_stems(keyword)
             timestamp = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 conn.execute("""
                     INSERT INTO keyword_stems 
                     (keyword, stems_json, angle, timestamp, category, source)
@@ -157,7 +172,7 @@ class StemDatabase:
         all_stems = set()
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 cursor = conn.execute("""
                     SELECT stems_json FROM keyword_stems 
                     WHERE timestamp >= ?
@@ -221,7 +236,7 @@ class StemDatabase:
         records = []
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 if category:
                     cursor = conn.execute("""
                         SELECT keyword, stems_json, angle, timestamp, category, source
@@ -265,7 +280,7 @@ class StemDatabase:
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 cursor = conn.execute("""
                     DELETE FROM keyword_stems WHERE timestamp < ?
                 """, (cutoff_date,))
@@ -294,7 +309,7 @@ class StemDatabase:
         }
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.connection() as conn:
                 # Total records
                 cursor = conn.execute("SELECT COUNT(*) FROM keyword_stems")
                 stats['total_records'] = cursor.fetchone()[0]
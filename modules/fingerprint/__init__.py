@@ -0,0 +1,31 @@
+"""
+Fingerprint utilities shared by the similarity detection tools.
+Provides a vectorized SimHash kernel with XOR/popcount search, SimHash
+indexing for fast near-duplicate lookups, a SQLite per-file fingerprint
+store, winnowing passage fingerprints for section-level overlap checks and
+a persistent TF-IDF pool model for document-level checks.
+"""
+
+from .simhash_kernel import (
+    fingerprint_array, hamming_distances, popcount64, signed64, simhash64, text_simhash,
+    unsigned64
+)
+from .simhash_index import SimHashIndex
+from .fingerprint_store import FingerprintStore
+from .passage_index import PassageIndex, passage_fingerprints
+from .tfidf_pool import TfidfPoolModel
+
+__all__ = [
+    'simhash64',
+    'text_simhash',
+    'fingerprint_array',
+    'popcount64',
+    'hamming_distances',
+    'signed64',
+    'unsigned64',
+    'SimHashIndex',
+    'FingerprintStore',
+    'PassageIndex',
+    'passage_fingerprints',
+    'TfidfPoolModel'
+]
@@ -0,0 +1,160 @@
+"""
+SQLite store for per-file SimHash fingerprints.
+
+Replaces the JSON list that was read and rewritten in full on every run.
+Rows are keyed by path and indexed by ctime, so a run reads only the
+fingerprints inside its lookback window, writes only the rows that changed and
+expires old rows with one indexed delete.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from .simhash_kernel import signed64, unsigned64
+
+
+class FingerprintStore:
+    """
+    Fingerprints of files with the size, mtime and ctime they were computed at.
+
+    Records are dicts with keys path, simhash (unsigned 64-bit int), size,
+    mtime_ns (0 = unknown), ctime (epoch seconds) and version.
+    """
+
+    VERSION = 1
+
+    def __init__(self, db_path: str = ':memory:'):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path: SQLite database path (':memory:' for a throwaway store)
+        """
+        self.db_path = db_path
+
+        directory = os.path.dirname(db_path) if db_path != ':memory:' else ''
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                path TEXT PRIMARY KEY,
+                simhash INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                ctime REAL NOT NULL,
+                version INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_fingerprints_ctime ON fingerprints(ctime);
+        ''')
+
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(self.VERSION):
+            self.conn.execute('DELETE FROM fingerprints')
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                              (str(self.VERSION),))
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0]
+
+    @staticmethod
+    def _record(row) -> Dict:
+        path, simhash, size, mtime_ns, ctime, version = row
+        return {'path': path, 'simhash': unsigned64(simhash), 'size': size,
+                'mtime_ns': mtime_ns, 'ctime': ctime, 'version': version}
+
+    def get(self, path: str) -> Optional[Dict]:
+        """Record of a path (None if not stored)."""
+        row = self.conn.execute(
+            'SELECT path, simhash, size, mtime_ns, ctime, version FROM fingerprints WHERE path = ?',
+            (path,)).fetchone()
+        return self._record(row) if row else None
+
+    def range(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Records with since <= ctime < until (either bound may be omitted).
+
+        Returns:
+            Path -> record
+        """
+        rows = self.conn.execute('''
+            SELECT path, simhash, size, mtime_ns, ctime, version FROM fingerprints
+            WHERE ctime >= ? AND ctime < ?
+        ''', (float('-inf') if since is None else since, float('inf') if until is None else until))
+        return {row[0]: self._record(row) for row in rows}
+
+    def upsert(self, records: Iterable[Dict]) -> int:
+        """
+        Insert or replace records (keyed by path).
+
+        Returns:
+            Number of records written
+        """
+        rows = [(record['path'], signed64(record['simhash']), record.get('size', 0),
+                 record.get('mtime_ns', 0), record['ctime'], record.get('version', 0))
+                for record in records]
+        self.conn.executemany('''
+            INSERT OR REPLACE INTO fingerprints (path, simhash, size, mtime_ns, ctime, version)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        return len(rows)
+
+    def expire(self, before: float) -> int:
+        """
+        Delete records with ctime < before.
+
+        Returns:
+            Number of deleted records
+        """
+        return self.conn.execute('DELETE FROM fingerprints WHERE ctime < ?', (before,)).rowcount
+
+    def import_json(self, json_path: str) -> int:
+        """
+        Import a legacy ``{"version": .., "items": [..]}`` JSON fingerprint cache.
+
+        Items carry a hex simhash and an ISO ctime; unreadable files and items
+        are skipped. Imported records have an unknown mtime (0).
+
+        Returns:
+            Number of imported records
+        """
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            return 0
+        if not isinstance(data, dict) or not isinstance(data.get('items'), list):
+            return 0
+
+        records = []
+        for item in data['items']:
+            try:
+                records.append({
+                    'path': item['path'],
+                    'simhash': int(item['simhash'], 16),
+                    'size': int(item.get('size', 0)),
+                    'mtime_ns': 0,
+                    'ctime': datetime.fromisoformat(item['ctime']).timestamp(),
+                    'version': int(item.get('version', 0))
+                })
+            except Exception:
+                continue
+        return self.upsert(records)
+
+    def commit(self):
+        """Write pending changes to disk."""
+        self.conn.commit()
+
+    def close(self):
+        """Commit and close the database."""
+        self.conn.commit()
+        self.conn.close()
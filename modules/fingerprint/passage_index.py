@@ -0,0 +1,259 @@
+"""
+Winnowing passage index for section-level overlap checks.
+Implements document fingerprinting by winnowing (Schleimer et al., SIGMOD 2003).
+
+Every passage (article section) is reduced to the minimum hashes of its
+overlapping word k-grams within each window of ``window`` k-grams. Any copied
+run of at least ``window + kgram - 1`` words therefore shares a fingerprint
+with its source. Fingerprints are stored in SQLite clustered by hash, so a
+lookup only touches the passages that share fingerprints with the query,
+independent of how many articles are indexed.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+# Word tokens (same definition as the uniqueness guard's word counts)
+WORD_PATTERN = re.compile(r"[A-Za-z0-9']+")
+
+# Fingerprints per SQL lookup (below SQLite's bound parameter limit)
+LOOKUP_CHUNK = 500
+
+
+def kgram_hashes(words: Sequence[str], kgram: int) -> List[int]:
+    """
+    Hash every run of ``kgram`` consecutive words.
+
+    Texts shorter than one k-gram hash as a single gram.
+
+    Returns:
+        Signed 64-bit hashes (storable as SQLite INTEGER), in text order
+    """
+    if not words:
+        return []
+    grams = [' '.join(words[i:i + kgram]) for i in range(max(len(words) - kgram + 1, 1))]
+    return [int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(),
+                           'big', signed=True)
+            for gram in grams]
+
+
+def winnow(hashes: Sequence[int], window: int) -> Set[int]:
+    """
+    Select the winnowing fingerprints of a hash sequence.
+
+    The minimum of every window of ``window`` consecutive hashes is selected
+    (rightmost on ties); sequences shorter than one window keep their minimum.
+
+    Returns:
+        Distinct selected hashes
+    """
+    if not hashes:
+        return set()
+
+    selected = set()
+    candidates = deque()
+    for position, value in enumerate(hashes):
+        # Keep positions with strictly increasing hashes; the front is the window minimum
+        while candidates and hashes[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(position)
+        if candidates[0] <= position - window:
+            candidates.popleft()
+        if position >= window - 1:
+            selected.add(hashes[candidates[0]])
+
+    if len(hashes) < window:
+        selected.add(min(hashes))
+    return selected
+
+
+def passage_fingerprints(text: str, kgram: int = 5, window: int = 4) -> Set[int]:
+    """Winnowing fingerprints of a passage (lowercased word k-grams)."""
+    return winnow(kgram_hashes(WORD_PATTERN.findall(text.lower()), kgram), window)
+
+
+class PassageIndex:
+    """
+    Persistent fingerprint index over the sections of a pool of articles.
+
+    Documents are registered by path together with their file size and
+    modification time, so callers only re-fingerprint changed files.
+    """
+
+    VERSION = 1
+
+    def __init__(self, db_path: str = ':memory:', kgram: int = 5, window: int = 4,
+                 config_hash: str = ''):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: SQLite database path (':memory:' for a throwaway index)
+            kgram: Words per k-gram
+            window: Winnowing window in k-grams
+            config_hash: Caller settings that change passages (e.g. excluded
+                headings); the index is cleared when any setting changes
+        """
+        self.db_path = db_path
+        self.kgram = kgram
+        self.window = window
+
+        directory = os.path.dirname(db_path) if db_path != ':memory:' else ''
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS passages (
+                passage_id INTEGER PRIMARY KEY,
+                doc_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                fingerprint_count INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_passages_doc ON passages(doc_id);
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                hash INTEGER NOT NULL,
+                passage_id INTEGER NOT NULL,
+                PRIMARY KEY (hash, passage_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_fingerprints_passage ON fingerprints(passage_id);
+        ''')
+
+        settings = {'version': str(self.VERSION), 'kgram': str(kgram),
+                    'window': str(window), 'config_hash': config_hash}
+        stored = dict(self.conn.execute('SELECT key, value FROM meta'))
+        if stored != settings:
+            self.conn.executescript('''
+                DELETE FROM fingerprints;
+                DELETE FROM passages;
+                DELETE FROM documents;
+                DELETE FROM meta;
+            ''')
+            self.conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', settings.items())
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+    def documents(self) -> Dict[str, Tuple[int, int]]:
+        """Indexed paths with the (size, mtime_ns) they were fingerprinted at."""
+        return {path: (size, mtime_ns) for path, size, mtime_ns in
+                self.conn.execute('SELECT path, size, mtime_ns FROM documents')}
+
+    def add_document(self, path: str, sections: Iterable[Tuple[str, str]],
+                     size: int = 0, mtime_ns: int = 0):
+        """
+        Fingerprint and store the sections of a document (replacing older ones).
+
+        Args:
+            path: Document path
+            sections: (section title, section text) pairs
+            size: File size the sections were read at
+            mtime_ns: File modification time the sections were read at
+        """
+        self.remove_document(path)
+        cursor = self.conn.execute(
+            'INSERT INTO documents (path, size, mtime_ns) VALUES (?, ?, ?)', (path, size, mtime_ns))
+        doc_id = cursor.lastrowid
+
+        for title, text in sections:
+            fingerprints = passage_fingerprints(text, self.kgram, self.window)
+            if not fingerprints:
+                continue
+            passage_id = self.conn.execute(
+                'INSERT INTO passages (doc_id, title, fingerprint_count) VALUES (?, ?, ?)',
+                (doc_id, title, len(fingerprints))).lastrowid
+            self.conn.executemany('INSERT INTO fingerprints (hash, passage_id) VALUES (?, ?)',
+                                  ((value, passage_id) for value in fingerprints))
+
+    def remove_document(self, path: str) -> bool:
+        """
+        Delete a document and its passages.
+
+        Returns:
+            True if the document was indexed
+        """
+        row = self.conn.execute('SELECT doc_id FROM documents WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            return False
+
+        self.conn.execute('''
+            DELETE FROM fingerprints WHERE passage_id IN
+                (SELECT passage_id FROM passages WHERE doc_id = ?)
+        ''', row)
+        self.conn.execute('DELETE FROM passages WHERE doc_id = ?', row)
+        self.conn.execute('DELETE FROM documents WHERE doc_id = ?', row)
+        return True
+
+    def query(self, text: str, exclude_paths: Iterable[str] = ()) -> List[Dict]:
+        """
+        Find the indexed documents sharing fingerprints with a passage.
+
+        Args:
+            text: Passage to look up
+            exclude_paths: Documents to ignore (e.g. the passage's own article)
+
+        Returns:
+            One dict per matching document, highest overlap first, with keys
+            source (path), source_section (section holding most shared
+            fingerprints), shared and overlap (shared / passage fingerprints)
+        """
+        fingerprints = list(passage_fingerprints(text, self.kgram, self.window))
+        if not fingerprints:
+            return []
+        excluded = set(exclude_paths)
+
+        shared_by_doc: Dict[str, Set[int]] = {}
+        shared_by_section: Dict[Tuple[str, int, str], int] = {}
+        for start in range(0, len(fingerprints), LOOKUP_CHUNK):
+            chunk = fingerprints[start:start + LOOKUP_CHUNK]
+            rows = self.conn.execute(f'''
+                SELECT f.hash, d.path, p.passage_id, p.title
+                FROM fingerprints f
+                JOIN passages p ON p.passage_id = f.passage_id
+                JOIN documents d ON d.doc_id = p.doc_id
+                WHERE f.hash IN ({",".join("?" * len(chunk))})
+            ''', chunk)
+            for value, path, passage_id, title in rows:
+                if path in excluded:
+                    continue
+                shared_by_doc.setdefault(path, set()).add(value)
+                section = (path, passage_id, title)
+                shared_by_section[section] = shared_by_section.get(section, 0) + 1
+
+        best_sections: Dict[str, Tuple[int, str]] = {}
+        for (path, passage_id, title), count in shared_by_section.items():
+            if count > best_sections.get(path, (0, ''))[0]:
+                best_sections[path] = (count, title)
+
+        matches = [{
+            'source': path,
+            'source_section': best_sections[path][1],
+            'shared': len(values),
+            'overlap': len(values) / len(fingerprints)
+        } for path, values in shared_by_doc.items()]
+        matches.sort(key=lambda match: (-match['overlap'], match['source']))
+        return matches
+
+    def commit(self):
+        """Write pending changes to disk."""
+        self.conn.commit()
+
+    def close(self):
+        """Commit and close the database."""
+        self.conn.commit()
+        self.conn.close()
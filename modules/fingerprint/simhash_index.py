@@ -0,0 +1,296 @@
+"""
+Multi-table SimHash index for Hamming-distance queries.
+Implements the k-block permuted-table scheme from Manku et al. (WWW 2007).
+
+The tables only pay off while their keys are selective. A 64-bit fingerprint
+split for distance k needs about 4k/3 blocks for keys of 16 bits, and the
+number of tables, C(blocks, k), explodes beyond k = 6 (120 tables at k = 7,
+1820 at k = 12). For larger distances the index keeps no tables and answers
+queries with a vectorized XOR/popcount scan, which at those distances is
+cheaper than probing the tables: short keys would select a large share of the
+corpus anyway.
+"""
+
+import json
+import os
+from itertools import combinations
+from math import comb
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .simhash_kernel import fingerprint_array, hamming_distances
+
+# Smallest table key (in bits) the default layout accepts
+MIN_KEY_BITS = 16
+
+# Most tables the default layout builds; beyond that queries scan
+MAX_TABLES = 64
+
+
+def default_num_blocks(max_distance: int, hash_bits: int = 64) -> int:
+    """
+    Block count of the default layout for a distance.
+
+    Returns the fewest blocks whose tables have keys of at least
+    MIN_KEY_BITS bits, or 0 (no tables, queries scan) if that layout would
+    need more than MAX_TABLES tables.
+    """
+    for num_blocks in range(max_distance + 1, hash_bits + 1):
+        if (num_blocks - max_distance) * (hash_bits // num_blocks) >= MIN_KEY_BITS:
+            return num_blocks if comb(num_blocks, max_distance) <= MAX_TABLES else 0
+    return 0
+
+
+class SimHashIndex:
+    """
+    Index answering "all fingerprints within Hamming distance k".
+
+    The fingerprint is split into ``num_blocks`` contiguous blocks. If two
+    fingerprints differ in at most k bits, at least ``num_blocks - k`` blocks
+    are identical, so every combination of ``num_blocks - k`` blocks becomes
+    the key of one hash table. A query only inspects the buckets it shares
+    with the target and verifies the real distance of those candidates.
+
+    More blocks mean shorter blocks but keys made of more of them: keys get
+    longer (smaller buckets) while the table count C(num_blocks, k) grows.
+    The default layout (``default_num_blocks``) picks keys of at least 16
+    bits; ``num_blocks=0`` keeps no tables and scans every fingerprint.
+    """
+
+    VERSION = 2
+
+    def __init__(self, max_distance: int = 3, num_blocks: Optional[int] = None,
+                 hash_bits: int = 64):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_distance: Largest Hamming distance answered from the tables (k)
+            num_blocks: Number of fingerprint blocks (must exceed max_distance;
+                0 = no tables; default: ``default_num_blocks``)
+            hash_bits: Fingerprint size in bits
+        """
+        if num_blocks is None:
+            num_blocks = default_num_blocks(max_distance, hash_bits)
+        if num_blocks and (num_blocks <= max_distance or num_blocks > hash_bits):
+            raise ValueError(f"num_blocks must be 0 or in ({max_distance}, {hash_bits}], got {num_blocks}")
+
+        self.max_distance = max_distance
+        self.num_blocks = num_blocks
+        self.hash_bits = hash_bits
+
+        # (shift, mask) per block, lowest bits first
+        self.blocks: List[Tuple[int, int]] = []
+        if num_blocks:
+            base, extra = divmod(hash_bits, num_blocks)
+            shift = 0
+            for block in range(num_blocks):
+                width = base + (1 if block < extra else 0)
+                self.blocks.append((shift, (1 << width) - 1))
+                shift += width
+
+        self.table_blocks = list(combinations(range(num_blocks), num_blocks - max_distance)) if num_blocks else []
+        self.tables: List[Dict[int, Set[Hashable]]] = [{} for _ in self.table_blocks]
+        self.fingerprints: Dict[Hashable, int] = {}
+
+        # Keys, uint64 fingerprints and live flags for scans (rebuilt after an
+        # add; a remove only clears the flag)
+        self._scan_keys: Optional[List[Hashable]] = None
+        self._scan_array: Optional[np.ndarray] = None
+        self._scan_live: Optional[np.ndarray] = None
+        self._scan_slots: Dict[Hashable, int] = {}
+
+    @property
+    def uses_tables(self) -> bool:
+        """Whether queries probe tables (False = every query scans)."""
+        return bool(self.table_blocks)
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.fingerprints
+
+    def _table_keys(self, fingerprint: int) -> List[int]:
+        """Compute the bucket key of a fingerprint in every table."""
+        block_values = [(fingerprint >> shift) & mask for shift, mask in self.blocks]
+        keys = []
+        for chosen in self.table_blocks:
+            key = 0
+            for block in chosen:
+                shift, mask = self.blocks[block]
+                key = (key << (mask.bit_length())) | block_values[block]
+            keys.append(key)
+        return keys
+
+    def bucket_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        """
+        (table number, bucket key) pairs of a fingerprint.
+
+        Lets callers keep the tables outside of memory (e.g. in an indexed
+        SQLite table) and look up candidates with the same layout.
+        """
+        return list(enumerate(self._table_keys(fingerprint)))
+
+    def add(self, key: Hashable, fingerprint: int):
+        """
+        Insert or replace a fingerprint.
+
+        Args:
+            key: Unique identifier (e.g. file path)
+            fingerprint: SimHash value
+        """
+        if key in self.fingerprints:
+            self.remove(key)
+
+        self.fingerprints[key] = fingerprint
+        self._scan_keys = None
+        for table, bucket_key in zip(self.tables, self._table_keys(fingerprint)):
+            table.setdefault(bucket_key, set()).add(key)
+
+    def remove(self, key: Hashable) -> bool:
+        """
+        Delete a fingerprint.
+
+        Args:
+            key: Identifier used on insert
+
+        Returns:
+            True if the key was present
+        """
+        fingerprint = self.fingerprints.pop(key, None)
+        if fingerprint is None:
+            return False
+        if self._scan_keys is not None:
+            self._scan_live[self._scan_slots.pop(key)] = False
+
+        for table, bucket_key in zip(self.tables, self._table_keys(fingerprint)):
+            bucket = table.get(bucket_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[bucket_key]
+        return True
+
+    def candidates(self, fingerprint: int) -> Set[Hashable]:
+        """Return keys sharing at least one bucket with the fingerprint (all keys without tables; unverified)."""
+        if not self.uses_tables:
+            return set(self.fingerprints)
+
+        found: Set[Hashable] = set()
+        for table, bucket_key in zip(self.tables, self._table_keys(fingerprint)):
+            bucket = table.get(bucket_key)
+            if bucket:
+                found.update(bucket)
+        return found
+
+    def _scan(self) -> Tuple[List[Hashable], np.ndarray, np.ndarray]:
+        """Keys, fingerprint array and live flags of the whole index."""
+        if self._scan_keys is None:
+            self._scan_keys = list(self.fingerprints)
+            self._scan_array = fingerprint_array(self.fingerprints.values())
+            self._scan_live = np.ones(len(self._scan_keys), dtype=bool)
+            self._scan_slots = {key: slot for slot, key in enumerate(self._scan_keys)}
+        return self._scan_keys, self._scan_array, self._scan_live
+
+    def query(self, fingerprint: int, max_distance: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """
+        Find all fingerprints within a Hamming distance.
+
+        Distances above the index's own ``max_distance``, and every query of
+        an index without tables, are answered with a full scan.
+
+        Args:
+            fingerprint: Query SimHash value
+            max_distance: Distance limit (defaults to the index's max_distance)
+
+        Returns:
+            List of (key, distance) tuples sorted by distance
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+
+        if max_distance > self.max_distance or not self.uses_tables:
+            keys, fingerprints, live = self._scan()
+        else:
+            keys = list(self.candidates(fingerprint))
+            fingerprints = fingerprint_array(self.fingerprints[key] for key in keys)
+            live = True
+
+        distances = hamming_distances(fingerprint, fingerprints)
+        matches = [(keys[i], int(distances[i])) for i in ((distances <= max_distance) & live).nonzero()[0]]
+
+        matches.sort(key=lambda item: (item[1], str(item[0])))
+        return matches
+
+    def save(self, path: str):
+        """
+        Persist the index to a JSON file (written atomically).
+
+        Tables are rebuilt on load, so only the fingerprints are stored, as
+        [key, fingerprint] pairs: str and int keys keep their type.
+
+        Args:
+            path: Target file path
+        """
+        data = {
+            'version': self.VERSION,
+            'max_distance': self.max_distance,
+            'num_blocks': self.num_blocks,
+            'hash_bits': self.hash_bits,
+            'items': [[key, f"{value:016x}"] for key, value in self.fingerprints.items()]
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, max_distance: Optional[int] = None,
+             num_blocks: Optional[int] = None) -> 'SimHashIndex':
+        """
+        Load an index saved with save().
+
+        If the requested layout differs from the stored one, the stored
+        fingerprints are re-indexed with the requested layout. Version 1 files
+        (string keys, old default layout) are re-indexed with the default
+        layout. A missing or unreadable file yields an empty index.
+
+        Args:
+            path: Index file path
+            max_distance: Desired max distance (defaults to the stored value)
+            num_blocks: Desired block count (defaults to the stored value)
+
+        Returns:
+            Loaded index
+        """
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        if data.get('version') not in (1, cls.VERSION):
+            data = {}
+
+        items = data.get('items', [])
+        if isinstance(items, dict):
+            items = list(items.items())
+
+        stored_distance = data.get('max_distance', 3)
+        if max_distance is None:
+            max_distance = stored_distance
+        if num_blocks is None and max_distance == stored_distance and data.get('version') == cls.VERSION:
+            num_blocks = data.get('num_blocks')
+
+        index = cls(max_distance=max_distance, num_blocks=num_blocks,
+                    hash_bits=data.get('hash_bits', 64))
+        for key, value in items:
+            index.add(key, int(value, 16))
+        return index
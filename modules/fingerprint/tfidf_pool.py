@@ -0,0 +1,334 @@
+"""
+Persistent TF-IDF pool model for document-level uniqueness checks.
+
+Stores the raw term counts of every pool article as a sparse matrix on disk,
+keyed by path with the file size and modification time they were counted at.
+A check only tokenizes the target: document frequencies, IDF weights and row
+norms are derived from the stored counts with two sparse matrix-vector
+products. The scores equal those of fitting
+``TfidfVectorizer(max_df=..., smooth_idf=True, norm='l2')`` on the pool plus
+the target (up to floating point rounding), without refitting anything.
+"""
+
+import os
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class TfidfPoolModel:
+    """
+    Raw term count matrix of a pool of documents, updated incrementally.
+
+    Rows are documents, columns are terms. Terms that no longer occur in any
+    document are dropped once they make up half of the vocabulary.
+    """
+
+    VERSION = 1
+
+    def __init__(self, analyzer: Callable[[str], List[str]], max_df: float = 1.0,
+                 config_hash: str = ''):
+        """
+        Initialize an empty model.
+
+        Args:
+            analyzer: Text to tokens (e.g. ``TfidfVectorizer(...).build_analyzer()``)
+            max_df: Ignore terms in more than this share (float) or number (int) of documents
+            config_hash: Caller settings that change the counts (stop words,
+                excluded sections); stored models with another hash are discarded
+        """
+        self.analyzer = analyzer
+        self.max_df = max_df
+        self.config_hash = config_hash
+
+        self.paths: List[str] = []
+        self.stats = np.zeros((0, 2), dtype=np.int64)
+        self.terms: List[str] = []
+        self.counts = sp.csr_matrix((0, 0), dtype=np.float64)
+        self._term_ids: Optional[Dict[str, int]] = None
+        self._squared = None
+        self._df = None
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def term_ids(self) -> Dict[str, int]:
+        """Term to column mapping (built on first use)."""
+        if self._term_ids is None:
+            self._term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+        return self._term_ids
+
+    def documents(self) -> Dict[str, Tuple[int, int]]:
+        """Counted paths with the (size, mtime_ns) they were read at."""
+        return {path: (int(size), int(mtime_ns)) for path, (size, mtime_ns) in zip(self.paths, self.stats)}
+
+    def sync(self, entries: Dict[str, Tuple[int, int]],
+             read_text: Callable[[str], Optional[str]]) -> bool:
+        """
+        Bring the pool in line with a set of files.
+
+        Rows of files that left the pool or changed are dropped; new and
+        changed files are read and counted.
+
+        Args:
+            entries: Path -> (size, mtime_ns) of every pool file
+            read_text: Returns the text of a path (None = skip the file)
+
+        Returns:
+            True if the model changed
+        """
+        current = self.documents()
+        keep_rows = [row for row, path in enumerate(self.paths) if entries.get(path) == current[path]]
+        kept = {self.paths[row] for row in keep_rows}
+        pending = [path for path in entries if path not in kept]
+        if len(keep_rows) == len(self.paths) and not pending:
+            return False
+
+        term_ids = self.term_ids
+        paths = [self.paths[row] for row in keep_rows]
+        stats = [tuple(self.stats[row]) for row in keep_rows]
+        indptr, indices, data = [0], [], []
+        for path in pending:
+            text = read_text(path)
+            if text is None:
+                continue
+            for term, count in Counter(self.analyzer(text)).items():
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(self.terms)
+                    self.terms.append(term)
+                indices.append(term_id)
+                data.append(count)
+            indptr.append(len(indices))
+            paths.append(path)
+            stats.append(entries[path])
+
+        width = len(self.terms)
+        if keep_rows:
+            kept_rows = self.counts[keep_rows]
+            kept_counts = sp.csr_matrix((kept_rows.data, kept_rows.indices, kept_rows.indptr),
+                                        shape=(len(keep_rows), width))
+        else:
+            kept_counts = sp.csr_matrix((0, width))
+        new_counts = sp.csr_matrix((np.asarray(data, dtype=np.float64),
+                                    np.asarray(indices, dtype=np.int64),
+                                    np.asarray(indptr, dtype=np.int64)),
+                                   shape=(len(indptr) - 1, width))
+
+        self.paths = paths
+        self.stats = np.asarray(stats, dtype=np.int64).reshape(-1, 2)
+        self.counts = sp.vstack([kept_counts, new_counts], format='csr')
+        self._squared = None
+        self._df = None
+        self._compact_terms()
+        return True
+
+    def _compact_terms(self):
+        """Drop terms without documents once they are half of the vocabulary."""
+        used = self.document_frequency() > 0
+        if used.sum() * 2 >= len(self.terms):
+            return
+
+        self.counts = sp.csr_matrix(self.counts[:, np.flatnonzero(used)])
+        self.terms = [term for term, keep in zip(self.terms, used) if keep]
+        self._term_ids = None
+        self._squared = None
+        self._df = None
+
+    def document_frequency(self) -> np.ndarray:
+        """Number of documents containing each term."""
+        if self._df is None:
+            self._df = np.bincount(self.counts.indices, minlength=len(self.terms)).astype(np.float64)
+        return self._df
+
+    def similarities(self, text: str) -> np.ndarray:
+        """
+        Cosine similarity of a text to every pool document.
+
+        The text is treated as one more document of the fit, as when
+        TfidfVectorizer is fitted on the pool plus the target.
+
+        Args:
+            text: Target text
+
+        Returns:
+            Similarities aligned with ``paths``
+        """
+        return self.batch_similarities([text])[:, 0]
+
+    def _max_doc_count(self, n_samples: int) -> float:
+        """Largest document frequency a term may have (TfidfVectorizer max_df)."""
+        return self.max_df if isinstance(self.max_df, int) else self.max_df * n_samples
+
+    @staticmethod
+    def _idf(df: np.ndarray, n_samples: int) -> np.ndarray:
+        """Smoothed IDF, computed in the same order as TfidfTransformer."""
+        idf = np.full_like(df, n_samples + 1.0)
+        idf /= df + 1.0
+        np.log(idf, out=idf)
+        idf += 1.0
+        return idf
+
+    def batch_similarities(self, texts: List[str]) -> np.ndarray:
+        """
+        Cosine similarity of several texts to every pool document.
+
+        Every text is scored as in ``similarities`` (its own fit of pool plus
+        that text); all texts share one pair of sparse products.
+
+        Args:
+            texts: Target texts
+
+        Returns:
+            Array of shape (pool documents, texts)
+        """
+        if not self.paths or not texts:
+            return np.zeros((len(self.paths), len(texts)))
+
+        # Weights of the pool alone; a text only changes the weights of its own terms
+        n_samples = len(self.paths) + 1
+        max_doc_count = self._max_doc_count(n_samples)
+        base_df = self.document_frequency()
+        base_weights = np.where((base_df <= max_doc_count) & (base_df > 0),
+                                self._idf(base_df, n_samples), 0.0)
+        unknown_idf = np.log((n_samples + 1.0) / 2.0) + 1.0 if 1 <= max_doc_count else 0.0
+
+        term_ids = self.term_ids
+        rows, columns, weight_deltas, query_values = [], [], [], []
+        target_norms = np.zeros(len(texts))
+        for column, text in enumerate(texts):
+            target_counts = Counter(self.analyzer(text))
+            known = [(term_ids[term], count) for term, count in target_counts.items() if term in term_ids]
+            unknown = np.asarray([count for term, count in target_counts.items() if term not in term_ids],
+                                 dtype=np.float64)
+            known_ids = np.asarray([term_id for term_id, _ in known], dtype=np.int64)
+            known_counts = np.asarray([count for _, count in known], dtype=np.float64)
+
+            df = base_df[known_ids] + 1
+            weights = np.where(df <= max_doc_count, self._idf(df, n_samples), 0.0)
+            target_norms[column] = np.sqrt(np.sum((known_counts * weights) ** 2)
+                                           + np.sum((unknown * unknown_idf) ** 2))
+
+            rows.append(known_ids)
+            columns.append(np.full(len(known_ids), column))
+            weight_deltas.append(weights * weights - base_weights[known_ids] ** 2)
+            query_values.append(known_counts * weights * weights)
+
+        shape = (len(self.terms), len(texts))
+        rows = np.concatenate(rows)
+        columns = np.concatenate(columns)
+        deltas = sp.csc_matrix((np.concatenate(weight_deltas), (rows, columns)), shape=shape)
+        queries = sp.csc_matrix((np.concatenate(query_values), (rows, columns)), shape=shape)
+
+        if self._squared is None:
+            self._squared = self.counts.multiply(self.counts).tocsr()
+        squared_norms = (self._squared @ (base_weights * base_weights))[:, None] + (self._squared @ deltas).toarray()
+        dots = (self.counts @ queries).toarray()
+
+        denominators = np.sqrt(np.maximum(squared_norms, 0.0)) * target_norms[None, :]
+        scores = np.zeros(dots.shape)
+        np.divide(dots, denominators, out=scores, where=denominators > 0)
+        return scores
+
+    def cross_similarities(self, texts: List[str]) -> np.ndarray:
+        """
+        Cosine similarity between texts, fitted on the pool plus all texts.
+
+        Args:
+            texts: Target texts
+
+        Returns:
+            Symmetric array of shape (texts, texts)
+        """
+        if not texts:
+            return np.zeros((0, 0))
+
+        term_ids = dict(self.term_ids)
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            for term, count in Counter(self.analyzer(text)).items():
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(term_ids)
+                indices.append(term_id)
+                data.append(count)
+            indptr.append(len(indices))
+
+        counts = sp.csr_matrix((np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64),
+                                np.asarray(indptr, dtype=np.int64)), shape=(len(texts), len(term_ids)))
+
+        n_samples = len(self.paths) + len(texts)
+        df = np.zeros(len(term_ids))
+        df[:len(self.terms)] = self.document_frequency()
+        df += np.bincount(counts.indices, minlength=len(term_ids))
+        weights = np.where((df <= self._max_doc_count(n_samples)) & (df > 0), self._idf(df, n_samples), 0.0)
+
+        vectors = counts.multiply(weights[None, :]).tocsr()
+        norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+        products = (vectors @ vectors.T).toarray()
+        denominators = norms[:, None] * norms[None, :]
+        scores = np.zeros(products.shape)
+        np.divide(products, denominators, out=scores, where=denominators > 0)
+        return scores
+
+    def save(self, path: str):
+        """
+        Persist the model to an .npz file (written atomically).
+
+        Args:
+            path: Target file path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f,
+                     version=np.array(self.VERSION),
+                     config_hash=np.array(self.config_hash),
+                     paths=np.array(self.paths, dtype=str),
+                     stats=self.stats,
+                     terms=np.array(self.terms, dtype=str),
+                     indptr=self.counts.indptr,
+                     indices=self.counts.indices,
+                     data=self.counts.data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, analyzer: Callable[[str], List[str]], max_df: float = 1.0,
+             config_hash: str = '') -> 'TfidfPoolModel':
+        """
+        Load a model saved with save().
+
+        A missing or unreadable file, another format version or another
+        config hash yields an empty model.
+
+        Args:
+            path: Model file path
+            analyzer: Text to tokens
+            max_df: Document frequency cut-off
+            config_hash: Settings the counts must have been made with
+
+        Returns:
+            Loaded model
+        """
+        model = cls(analyzer, max_df=max_df, config_hash=config_hash)
+        if not os.path.exists(path):
+            return model
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != cls.VERSION or str(data['config_hash']) != config_hash:
+                    return model
+                model.paths = data['paths'].tolist()
+                model.stats = data['stats'].reshape(-1, 2)
+                model.terms = data['terms'].tolist()
+                model.counts = sp.csr_matrix((data['data'], data['indices'], data['indptr']),
+                                             shape=(len(model.paths), len(model.terms)))
+        except Exception:
+            return cls(analyzer, max_df=max_df, config_hash=config_hash)
+        return model
@@ -7,12 +7,33 @@ using a two-stage check:
   1) SimHash fingerprint (fast near-duplicate precheck)
   2) TF‑IDF cosine similarity (precise check)
 
+Per-file fingerprints live in a SQLite store (<cache>.db, indexed by path and
+ctime; a legacy JSON cache is imported once). The SimHash stage reports the
+closest pool fingerprint, so it scans the pool fingerprints with one vectorized
+XOR/popcount pass instead of probing a table index (which at the configured
+distances of 12-16 bits could not narrow the pool anyway). A SimHash hit
+decides the verdict without running the TF‑IDF stage; the output then reports
+max_cosine as 0.0 together with tfidf_skipped: true.
+
+The TF‑IDF stage reads raw term counts of the pool from a persisted sparse
+model (<cache>.tfidf.npz) that is updated only for files entering, leaving or
+changing in the window; a check vectorizes just the target.
+
+Section-level overlap is answered from a winnowing passage index over the pool's
+sections (<cache>.passages.db): each target section is looked up by its k-gram
+fingerprints and reports the matching source article, its section and the share
+of the section's fingerprints found there.
+
 Exits non‑zero if either SimHash indicates near-duplicate (by Hamming distance)
 or TF‑IDF similarity exceeds the configured threshold.
 
 Usage:
   python scripts/content_uniqueness_guard.py --target content/articles/foo.md --threshold 0.30 --days 90 \
-    --cache data/content_fingerprints.json --update-cache
+    --cache data/content_fingerprints.db --update-cache
+
+Batch mode loads the pool once for many drafts and prints one JSON line per target;
+each draft is also compared with the drafts listed before it:
+  git diff --name-only -- content/articles | python scripts/content_uniqueness_guard.py --targets -
 """
 import os
 import re
@@ -20,22 +41,35 @@ import sys
 import json
 import argparse
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List
 
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import hashlib
 import yaml
 
+# Add project root to path for the shared fingerprint modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.fingerprint import (
+    FingerprintStore, PassageIndex, TfidfPoolModel, fingerprint_array,
+    hamming_distances, simhash64
+)
+
 FINGERPRINT_VERSION = 1
 
+# Document-level TF‑IDF settings (TfidfVectorizer(stop_words='english', max_df=0.9))
+TFIDF_STOP_WORDS = 'english'
+TFIDF_MAX_DF = 0.9
 
-def strip_front_matter(text: str) -> str:
-    # Remove YAML front matter and code fences
+
+def strip_markdown_blocks(text: str) -> str:
+    # Remove YAML front matter and code fences (line structure is kept)
     text = re.sub(r"^---[\s\S]*?---\s+", "", text, flags=re.M)
-    text = re.sub(r"```[\s\S]*?```", "", text)
+    return re.sub(r"```[\s\S]*?```", "", text)
+
+
+def strip_front_matter(text: str) -> str:
     # Collapse whitespace
-    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s+", " ", strip_markdown_blocks(text))
     return text.strip()
 
 
@@ -44,66 +78,55 @@ def word_ngrams(text: str, n: int = 5):
     return [" ".join(words[i:i+n]) for i in range(len(words)-n+1)] if len(words) >= n else words
 
 
-def simhash64(tokens) -> int:
-    """Compute a 64-bit SimHash from iterable tokens."""
-    if not tokens:
-        return 0
-    bits = [0] * 64
-    for tok in tokens:
-        h = int(hashlib.md5(tok.encode('utf-8')).hexdigest(), 16) & ((1 << 64) - 1)
-        for i in range(64):
-            bits[i] += 1 if (h >> i) & 1 else -1
-    out = 0
-    for i in range(64):
-        if bits[i] > 0:
-            out |= (1 << i)
-    return out
-
-
-def hamming_distance64(a: int, b: int) -> int:
-    x = a ^ b
-    # Kernighan's algorithm
-    cnt = 0
-    while x:
-        x &= x - 1
-        cnt += 1
-    return cnt
-
-
-def load_cache(cache_path: str):
-    if not cache_path or not os.path.exists(cache_path):
-        return {"version": FINGERPRINT_VERSION, "items": []}
-    try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if not isinstance(data, dict) or 'items' not in data:
-                return {"version": FINGERPRINT_VERSION, "items": []}
-            return data
-    except Exception:
-        return {"version": FINGERPRINT_VERSION, "items": []}
-
-
-def save_cache(cache_path: str, data):
-    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def fingerprint_store_path(cache_path: str) -> str:
+    """Path of the SQLite fingerprint store (a legacy .json cache path maps to the .db next to it)."""
+    return os.path.splitext(cache_path)[0] + '.db'
+
+
+def open_fingerprint_store(cache_path: str) -> FingerprintStore:
+    """Open the fingerprint store, importing a legacy JSON cache into a new store once."""
+    store_path = fingerprint_store_path(cache_path)
+    is_new = not os.path.exists(store_path)
+    store = FingerprintStore(store_path)
+    legacy_path = os.path.splitext(cache_path)[0] + '.json'
+    if is_new and os.path.exists(legacy_path):
+        store.import_json(legacy_path)
+        store.commit()
+    return store
+
+
+def tfidf_model_path(cache_path: str) -> str:
+    """Path of the persisted TF‑IDF pool model stored next to the fingerprint cache."""
+    return os.path.splitext(cache_path)[0] + '.tfidf.npz'
+
+
+def passage_index_path(cache_path: str) -> str:
+    """Path of the persisted passage fingerprint index stored next to the fingerprint cache."""
+    return os.path.splitext(cache_path)[0] + '.passages.db'
+
+
+def scan_pool(dir_path: str, days: int = 30) -> Dict[str, os.stat_result]:
+    """Markdown files of a directory created within the window, with their stat results (one scandir pass)."""
+    pool = {}
+    if not os.path.isdir(dir_path):
+        return pool
+    cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.md'):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if st.st_ctime >= cutoff:
+                pool[entry.path] = st
+    return pool
 
 
 def load_recent_articles(dir_path: str, days: int = 30) -> List[str]:
     docs = []
-    if not os.path.exists(dir_path):
-        return docs
-    cutoff = datetime.now() - timedelta(days=days)
-    for name in os.listdir(dir_path):
-        if not name.endswith('.md'):
-            continue
-        path = os.path.join(dir_path, name)
-        try:
-            ts = datetime.fromtimestamp(os.path.getctime(path))
-        except Exception:
-            continue
-        if ts < cutoff:
-            continue
+    for path in scan_pool(dir_path, days):
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 docs.append(strip_front_matter(f.read()))
@@ -159,166 +182,355 @@ def split_sections(text: str):
     return sections
 
 
+def article_sections(text: str, exclude_headings: List[str] = None):
+    """(heading, whitespace-collapsed content) sections of a raw Markdown article."""
+    text = strip_markdown_blocks(text)
+    if exclude_headings:
+        text = strip_boilerplate_sections(text, exclude_headings)
+    return [(title, re.sub(r"\s+", " ", content).strip()) for title, content in split_sections(text)]
+
+
+def open_tfidf_pool(cache_path: str, pool_stats: Dict[str, os.stat_result], pool_raw: dict,
+                    exclude_headings: List[str] = None) -> TfidfPoolModel:
+    """Load the TF‑IDF pool model and recount pool articles that changed since the last run."""
+    settings = json.dumps({'stop_words': TFIDF_STOP_WORDS,
+                           'exclude_headings': sorted(exclude_headings or [])})
+    config_hash = hashlib.md5(settings.encode('utf-8')).hexdigest()
+    analyzer = TfidfVectorizer(stop_words=TFIDF_STOP_WORDS).build_analyzer()
+    model_path = tfidf_model_path(cache_path) if cache_path else None
+    if model_path:
+        model = TfidfPoolModel.load(model_path, analyzer, max_df=TFIDF_MAX_DF, config_hash=config_hash)
+    else:
+        model = TfidfPoolModel(analyzer, max_df=TFIDF_MAX_DF, config_hash=config_hash)
+
+    entries = {path: (st.st_size, st.st_mtime_ns) for path, st in pool_stats.items()}
+
+    def read_text(path: str):
+        try:
+            if path not in pool_raw:
+                with open(path, 'r', encoding='utf-8') as f:
+                    pool_raw[path] = f.read()
+        except Exception:
+            return None
+        txt = strip_front_matter(pool_raw[path])
+        if exclude_headings:
+            txt = strip_boilerplate_sections(txt, exclude_headings)
+        return txt
+
+    if model.sync(entries, read_text) and model_path:
+        model.save(model_path)
+    return model
+
+
+def open_passage_index(cache_path: str, pool_stats: Dict[str, os.stat_result], pool_raw: dict,
+                       exclude_headings: List[str] = None, kgram: int = 5,
+                       window: int = 4) -> PassageIndex:
+    """Open the passage index and re-fingerprint pool articles that changed since the last run."""
+    settings = json.dumps({'exclude_headings': sorted(exclude_headings or [])})
+    config_hash = hashlib.md5(settings.encode('utf-8')).hexdigest()
+    index = PassageIndex(passage_index_path(cache_path) if cache_path else ':memory:',
+                         kgram=kgram, window=window, config_hash=config_hash)
+
+    indexed = index.documents()
+    for path in indexed:
+        if path not in pool_stats:
+            index.remove_document(path)
+
+    for path, st in pool_stats.items():
+        try:
+            if indexed.get(path) == (st.st_size, st.st_mtime_ns):
+                continue
+            raw = pool_raw.get(path)
+            if raw is None:
+                with open(path, 'r', encoding='utf-8') as f:
+                    raw = f.read()
+        except Exception:
+            continue
+        index.add_document(path, article_sections(raw, exclude_headings), st.st_size, st.st_mtime_ns)
+
+    index.commit()
+    return index
+
+
 def check_uniqueness(target_path: str, pool_dir: str, days: int, threshold: float,
                      cache_path: str = None, simhash_hamm_dist: int = 16,
                      update_cache: bool = False,
                      exclude_headings: List[str] = None,
                      section_threshold: float = None,
-                     section_min_words: int = 200) -> dict:
+                     section_min_words: int = 200,
+                     passage_kgram: int = 5,
+                     passage_window: int = 4) -> dict:
     """
-    Returns dict with keys: max_cosine, max_simhash_sim, simhash_hit(bool).
+    Returns dict with keys: max_cosine, max_simhash_sim, simhash_hit(bool), simhash_match.
     simhash similarity = 1 - hamming_distance/64.
     Duplicate if simhash_hit or max_cosine >= threshold.
+    A SimHash hit already decides the verdict, so the TF‑IDF stages are skipped:
+    tfidf_skipped is True and max_cosine stays 0.0 (not computed).
+    Section overlap = share of a target section's winnowing fingerprints found in one pool article.
     """
-    with open(target_path, 'r', encoding='utf-8') as f:
-        target_text = strip_front_matter(f.read())
-    if exclude_headings:
-        target_text = strip_boilerplate_sections(target_text, exclude_headings)
-
-    cache = load_cache(cache_path) if cache_path else {"version": FINGERPRINT_VERSION, "items": []}
-
-    # Build pool simhashes from cache where possible
-    pool_paths = []
-    if os.path.isdir(pool_dir):
-        for name in os.listdir(pool_dir):
-            if name.endswith('.md'):
-                p = os.path.join(pool_dir, name)
-                try:
-                    ts = datetime.fromtimestamp(os.path.getctime(p))
-                    if ts >= datetime.now() - timedelta(days=days):
-                        pool_paths.append(p)
-                except Exception:
-                    continue
-
-    cache_items = {it.get('path'): it for it in cache.get('items', [])}
+    return check_uniqueness_batch(
+        [target_path], pool_dir, days, threshold,
+        cache_path=cache_path, simhash_hamm_dist=simhash_hamm_dist,
+        update_cache=update_cache, exclude_headings=exclude_headings,
+        section_threshold=section_threshold, section_min_words=section_min_words,
+        passage_kgram=passage_kgram, passage_window=passage_window
+    )[0]
+
+
+def check_uniqueness_batch(target_paths: List[str], pool_dir: str, days: int, threshold: float,
+                           cache_path: str = None, simhash_hamm_dist: int = 16,
+                           update_cache: bool = False,
+                           exclude_headings: List[str] = None,
+                           section_threshold: float = None,
+                           section_min_words: int = 200,
+                           passage_kgram: int = 5,
+                           passage_window: int = 4) -> List[dict]:
+    """
+    Check several targets against the pool, loading the pool once.
+    Returns one dict per target with the keys of check_uniqueness plus
+    max_batch_cosine and batch_match.
+    max_cosine and section overlap equal those of checking the target alone.
+    Each target is also compared with the targets listed before it: the SimHash
+    stage treats them as pool members, and a TF‑IDF score >= threshold against
+    one is reported as batch_match, so of two near-identical drafts only the
+    later one is flagged. Section overlap is checked against the pool only.
+    """
+    targets_raw = []
+    target_texts = []
+    for target_path in target_paths:
+        with open(target_path, 'r', encoding='utf-8') as f:
+            target_raw = f.read()
+        target_text = strip_front_matter(target_raw)
+        if exclude_headings:
+            target_text = strip_boilerplate_sections(target_text, exclude_headings)
+        targets_raw.append(target_raw)
+        target_texts.append(target_text)
+
+    # Pool files in the window (one scandir pass; stat results are reused by every stage)
+    pool_stats = scan_pool(pool_dir, days)
+    pool_paths = list(pool_stats)
+    cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+
+    # Build pool simhashes from the store where possible (only rows inside the window are read)
+    store = open_fingerprint_store(cache_path) if cache_path else None
+    stored = store.range(since=cutoff) if store is not None else {}
+    computed = []
 
     def ensure_simhash(path: str) -> int:
-        it = cache_items.get(path)
-        if it and isinstance(it.get('simhash'), str) and it.get('version') == FINGERPRINT_VERSION:
-            try:
-                return int(it['simhash'], 16)
-            except Exception:
-                pass
+        st = pool_stats[path]
+        it = stored.get(path)
+        if it and it['version'] == FINGERPRINT_VERSION and it['size'] == st.st_size \
+                and it['mtime_ns'] in (0, st.st_mtime_ns):
+            return it['simhash']
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 txt = strip_front_matter(f.read())
             tokens = word_ngrams(txt, n=5)
             sh = simhash64(tokens)
-            cache_items[path] = {
+            computed.append({
                 'path': path,
-                'simhash': f"{sh:016x}",
-                'size': os.path.getsize(path),
-                'ctime': datetime.fromtimestamp(os.path.getctime(path)).isoformat(),
+                'simhash': sh,
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'ctime': st.st_ctime,
                 'version': FINGERPRINT_VERSION
-            }
+            })
             return sh
         except Exception:
             return 0
 
-    # Compute target simhash
-    target_tokens = word_ngrams(target_text, n=5)
-    target_sh = simhash64(target_tokens)
+    # Compute target simhashes
+    target_shs = [simhash64(word_ngrams(text, n=5)) for text in target_texts]
 
-    # Simhash stage: compute max similarity against pool
-    max_simhash_sim = 0.0
-    simhash_hit = False
-    for p in pool_paths:
+    # Simhash stage: one XOR/popcount scan per target over the pool fingerprints
+    # (the closest distance is reported, so every fingerprint is compared anyway)
+    pool_simhashes = {}
+    for p in sorted(pool_paths):
         sh = ensure_simhash(p)
-        if sh == 0 or target_sh == 0:
-            continue
-        dist = hamming_distance64(sh, target_sh)
-        sim = 1.0 - (dist / 64.0)
-        if sim > max_simhash_sim:
-            max_simhash_sim = sim
-        if dist <= simhash_hamm_dist:
-            simhash_hit = True
-
-    # TF‑IDF document-level stage
-    pool_texts = []
-    for p in pool_paths:
-        try:
-            with open(p, 'r', encoding='utf-8') as f:
-                txt = strip_front_matter(f.read())
-                if exclude_headings:
-                    txt = strip_boilerplate_sections(txt, exclude_headings)
-                pool_texts.append(txt)
-        except Exception:
-            continue
+        if sh != 0:
+            pool_simhashes[p] = sh
+    simhash_paths = list(pool_simhashes)
+    pool_fingerprints = fingerprint_array(pool_simhashes.values())
+    batch_fingerprints = fingerprint_array(target_shs)
+    results = []
+    for i, target_sh in enumerate(target_shs):
+        max_simhash_sim = 0.0
+        simhash_hit = False
+        simhash_match = None
+        if target_sh != 0 and simhash_paths:
+            distances = hamming_distances(target_sh, pool_fingerprints)
+            closest = int(distances.argmin())
+            max_simhash_sim = 1.0 - (int(distances[closest]) / 64.0)
+            if distances[closest] <= simhash_hamm_dist:
+                simhash_hit = True
+                simhash_match = {'path': simhash_paths[closest], 'hamming_distance': int(distances[closest])}
+        # Earlier targets of the batch count as pool members
+        earlier = [j for j in range(i) if target_shs[j] != 0]
+        if target_sh != 0 and earlier:
+            distances = hamming_distances(target_sh, batch_fingerprints[earlier])
+            max_simhash_sim = max(max_simhash_sim, 1.0 - (int(distances.min()) / 64.0))
+            if not simhash_hit and distances.min() <= simhash_hamm_dist:
+                closest = int(distances.argmin())
+                simhash_hit = True
+                simhash_match = {'path': target_paths[earlier[closest]], 'hamming_distance': int(distances[closest])}
+        results.append({
+            'max_cosine': 0.0,
+            'max_simhash_sim': round(max_simhash_sim, 4),
+            'simhash_hit': simhash_hit,
+            'simhash_match': simhash_match,
+            'tfidf_skipped': simhash_hit,
+            'max_batch_cosine': 0.0,
+            'batch_match': None,
+            'section_hit': None,
+            'max_section_overlap': 0.0
+        })
 
-    max_cosine = 0.0
-    if pool_texts:
-        corpus = pool_texts + [target_text]
-        vec = TfidfVectorizer(stop_words='english', max_df=0.9)
-        X = vec.fit_transform(corpus)
-        sims = cosine_similarity(X[-1], X[:-1]).flatten()
+    # TF‑IDF document-level stage: stored pool counts, all targets vectorized together
+    pending = [i for i, res in enumerate(results) if not res['simhash_hit']]
+    pool_raw = {}
+    pool_size = 0
+    max_cosines = {i: 0.0 for i in pending}
+    if pending and pool_paths:
+        pool_model = open_tfidf_pool(cache_path, pool_stats, pool_raw, exclude_headings)
+        pool_size = len(pool_model)
+        sims = pool_model.batch_similarities([target_texts[i] for i in pending])
         if sims.size:
-            max_cosine = float(sims.max())
-
-    section_hit = None
-    max_section_sim = 0.0
-    if section_threshold and pool_texts and max_cosine < threshold:
-        # Only run section-level check if doc-level passed
-        sections = split_sections(target_text)
-        for title, content in sections:
-            words = re.findall(r"[A-Za-z0-9']+", content)
-            if len(words) < section_min_words:
+            for column, i in enumerate(pending):
+                max_cosines[i] = float(sims[:, column].max())
+    else:
+        pool_model = None
+
+    batch_cosines = {i: 0.0 for i in pending}
+    if len(target_paths) > 1 and pending:
+        if pool_model is None:
+            analyzer = TfidfVectorizer(stop_words=TFIDF_STOP_WORDS).build_analyzer()
+            pool_model = TfidfPoolModel(analyzer, max_df=TFIDF_MAX_DF)
+        cross = pool_model.cross_similarities(target_texts)
+        for i in pending:
+            if i == 0:
                 continue
-            corpus = pool_texts + [content]
-            vec = TfidfVectorizer(stop_words='english', max_df=0.9)
-            X = vec.fit_transform(corpus)
-            sims = cosine_similarity(X[-1], X[:-1]).flatten()
-            if sims.size:
-                sec_sim = float(sims.max())
-                if sec_sim > max_section_sim:
-                    max_section_sim = sec_sim
-                if sec_sim >= section_threshold:
-                    section_hit = {'title': title, 'similarity': round(sec_sim, 4)}
-                    break
-
-    # After checks, optionally update cache with target
-    if cache_path and update_cache:
-        items = list(cache_items.values())
-        # keep only recent days to bound file size
-        cutoff = datetime.now() - timedelta(days=days)
-        filtered = []
-        for it in items:
-            try:
-                if datetime.fromisoformat(it.get('ctime', '1970-01-01T00:00:00')) >= cutoff:
-                    filtered.append(it)
-            except Exception:
-                continue
-        # add target
-        filtered.append({
-            'path': target_path,
-            'simhash': f"{target_sh:016x}",
-            'size': os.path.getsize(target_path),
-            'ctime': datetime.now().isoformat(),
-            'version': FINGERPRINT_VERSION
-        })
-        save_cache(cache_path, {'version': FINGERPRINT_VERSION, 'items': filtered})
-
-    return {
-        'max_cosine': round(max_cosine, 4),
-        'max_simhash_sim': round(max_simhash_sim, 4),
-        'simhash_hit': simhash_hit,
-        'section_hit': section_hit,
-        'max_section_sim': round(max_section_sim, 4)
-    }
+            j = int(cross[i, :i].argmax())
+            batch_cosines[i] = float(cross[i, j])
+            if batch_cosines[i] >= threshold:
+                results[i]['batch_match'] = {'path': target_paths[j], 'cosine': round(batch_cosines[i], 4)}
+
+    for i in pending:
+        results[i]['max_cosine'] = round(max_cosines[i], 4)
+        results[i]['max_batch_cosine'] = round(batch_cosines[i], 4)
+
+    # Section stage: only for targets that passed the document-level checks
+    section_pending = [i for i in pending
+                       if max_cosines[i] < threshold and batch_cosines[i] < threshold]
+    if section_threshold and pool_size and section_pending:
+        passages = open_passage_index(cache_path, pool_stats, pool_raw, exclude_headings,
+                                      kgram=passage_kgram, window=passage_window)
+        try:
+            for i in section_pending:
+                target_abs = os.path.abspath(target_paths[i])
+                exclude_paths = [p for p in pool_paths if os.path.abspath(p) == target_abs]
+                max_section_overlap = 0.0
+                for title, content in article_sections(targets_raw[i], exclude_headings):
+                    words = re.findall(r"[A-Za-z0-9']+", content)
+                    if len(words) < section_min_words:
+                        continue
+                    matches = passages.query(content, exclude_paths=exclude_paths)
+                    if not matches:
+                        continue
+                    best = matches[0]
+                    if best['overlap'] > max_section_overlap:
+                        max_section_overlap = best['overlap']
+                    if best['overlap'] >= section_threshold:
+                        results[i]['section_hit'] = {
+                            'title': title,
+                            'source': best['source'],
+                            'source_section': best['source_section'],
+                            'overlap': round(best['overlap'], 4)
+                        }
+                        break
+                results[i]['max_section_overlap'] = round(max_section_overlap, 4)
+        finally:
+            passages.close()
+
+    # Newly computed pool fingerprints are always kept; targets only with update_cache
+    # (an empty store is falsy: it defines __len__)
+    if store is not None:
+        store.upsert(computed)
+        if update_cache:
+            now = datetime.now().timestamp()
+            targets = []
+            for target_path, target_sh in zip(target_paths, target_shs):
+                st = os.stat(target_path)
+                targets.append({
+                    'path': target_path,
+                    'simhash': target_sh,
+                    'size': st.st_size,
+                    'mtime_ns': st.st_mtime_ns,
+                    'ctime': now,
+                    'version': FINGERPRINT_VERSION
+                })
+            store.upsert(targets)
+            # keep only recent days to bound the store size
+            store.expire(cutoff)
+        store.close()
+
+    return results
+
+
+def read_target_list(values: List[str]) -> List[str]:
+    """Expand --targets values; '-' reads one path per line from stdin. Duplicates are dropped."""
+    paths = []
+    for value in values:
+        if value == '-':
+            paths.extend(line.strip() for line in sys.stdin if line.strip())
+        else:
+            paths.append(value)
+    return list(dict.fromkeys(paths))
+
+
+def batch_verdict(res: dict, threshold: float, section_threshold) -> str:
+    """Stage that flagged a batch result as duplicate (None = unique)."""
+    if res['simhash_hit']:
+        return 'simhash'
+    if res['max_cosine'] >= threshold:
+        return 'tfidf'
+    if res['batch_match']:
+        return 'batch'
+    if res['section_hit'] and section_threshold is not None:
+        return 'section'
+    return None
+
+
+def section_threshold_from_config(cfg: dict):
+    """Section overlap threshold of a config (None = section stage off).
+
+    The legacy ``section_tfidf_threshold`` was a section TF‑IDF cosine, a
+    different scale from the winnowing overlap share, so it is ignored.
+    """
+    if 'section_overlap_threshold' in cfg:
+        return cfg['section_overlap_threshold']
+    if cfg.get('section_tfidf_threshold') is not None:
+        print("Warning: section_tfidf_threshold is no longer used (it was a section TF‑IDF cosine); "
+              "set section_overlap_threshold to enable the section overlap check", file=sys.stderr)
+    return None
 
 
 def main():
     p = argparse.ArgumentParser(description='Check article uniqueness against recent posts')
-    p.add_argument('--target', required=True, help='Path to target Markdown file')
+    targets = p.add_mutually_exclusive_group(required=True)
+    targets.add_argument('--target', help='Path to target Markdown file')
+    targets.add_argument('--targets', nargs='+', metavar='PATH',
+                         help="Check several targets in one run ('-' reads paths from stdin); prints one JSON line per target")
     p.add_argument('--pool', default='content/articles', help='Directory of existing articles')
     p.add_argument('--days', type=int, default=30, help='Lookback window in days')
     p.add_argument('--threshold', type=float, default=0.85, help='Max allowed cosine similarity (0-1)')
-    p.add_argument('--cache', default='data/content_fingerprints.json', help='Path to fingerprint cache JSON')
+    p.add_argument('--cache', default='data/content_fingerprints.db',
+                   help='Path to the fingerprint store (SQLite; a legacy .json cache next to it is imported once)')
     p.add_argument('--simhash-hamm', type=int, default=16, help='Max allowed Hamming distance (64-bit) for near-duplicate precheck')
     p.add_argument('--update-cache', action='store_true', help='Update cache with the target if not duplicate')
     p.add_argument('--config', default='config/uniqueness.yml', help='Path to YAML config to override defaults')
     args = p.parse_args()
 
-    if not os.path.exists(args.target):
+    if args.target and not os.path.exists(args.target):
         print(f"Target not found: {args.target}")
         return 2
 
@@ -335,23 +547,57 @@ def main():
     days = int(cfg.get('days_window', args.days))
     simhash_hamm = int(cfg.get('simhash_hamm', args.simhash_hamm))
     exclude_headings = cfg.get('exclude_headings', []) or []
-    section_threshold = cfg.get('section_tfidf_threshold')
+    section_threshold = section_threshold_from_config(cfg)
     section_min_words = int(cfg.get('section_min_words', 200))
+    passage_kgram = int(cfg.get('passage_kgram', 5))
+    passage_window = int(cfg.get('passage_window', 4))
+
+    if args.targets:
+        target_paths = read_target_list(args.targets)
+        found = [path for path in target_paths if os.path.exists(path)]
+        results = dict(zip(found, check_uniqueness_batch(
+            found, args.pool, days, threshold,
+            cache_path=args.cache, simhash_hamm_dist=simhash_hamm,
+            update_cache=args.update_cache, exclude_headings=exclude_headings,
+            section_threshold=section_threshold, section_min_words=section_min_words,
+            passage_kgram=passage_kgram, passage_window=passage_window
+        ) if found else []))
+        missing = duplicates = 0
+        for path in target_paths:
+            if path not in results:
+                missing += 1
+                print(json.dumps({'target': path, 'error': 'Target not found'}))
+                continue
+            res = results[path]
+            reason = batch_verdict(res, threshold, section_threshold)
+            duplicates += reason is not None
+            print(json.dumps({'target': path, 'duplicate': reason is not None, 'reason': reason,
+                              'threshold': threshold, **res}))
+        if duplicates:
+            return 3
+        return 2 if missing else 0
 
     res = check_uniqueness(
         args.target, args.pool, days, threshold,
         cache_path=args.cache, simhash_hamm_dist=simhash_hamm,
         update_cache=args.update_cache, exclude_headings=exclude_headings,
-        section_threshold=section_threshold, section_min_words=section_min_words
+        section_threshold=section_threshold, section_min_words=section_min_words,
+        passage_kgram=passage_kgram, passage_window=passage_window
     )
     out = {
         'max_cosine': res['max_cosine'],
         'max_simhash_sim': res['max_simhash_sim'],
         'threshold': threshold,
         'simhash_hit': res['simhash_hit'],
+        'simhash_match': res['simhash_match'],
+        'tfidf_skipped': res['tfidf_skipped'],
         'section_hit': res['section_hit'],
-        'max_section_sim': res['max_section_sim']
+        'max_section_overlap': res['max_section_overlap'],
+        # Pre-overlap key names, kept for existing consumers of this output
+        'max_section_sim': res['max_section_overlap']
     }
+    if res['section_hit']:
+        out['section_hit'] = {**res['section_hit'], 'similarity': res['section_hit']['overlap']}
     print(json.dumps(out))
     if res['simhash_hit']:
         print(f"Too similar (SimHash near-duplicate)")
@@ -360,7 +606,9 @@ def main():
         print(f"Too similar (TF‑IDF): {res['max_cosine']:.3f} >= {threshold:.2f}")
         return 3
     if res['section_hit'] and section_threshold is not None:
-        print(f"Too similar (Section TF‑IDF): {res['section_hit']['similarity']:.3f} >= {float(section_threshold):.2f} in [{res['section_hit']['title']}]")
+        hit = res['section_hit']
+        print(f"Too similar (Section overlap): {hit['overlap']:.3f} >= {float(section_threshold):.2f} "
+              f"in [{hit['title']}] from {hit['source']} [{hit['source_section']}]")
         return 3
     return 0
 
@@ -240,12 +240,10 @@ class SimilarityChecker:
 
         print(f"🔍 开始线性相似度检测 {len(articles)} 篇文章...")
 
-        # 1. 按有效日期排序（最早到最新）
-        articles_sorted = sorted(articles, key=lambda x: self._get_article_effective_date(x))
-
-        # 为文章添加有效日期
-        for article in articles_sorted:
+        # 1. 为文章添加有效日期（每篇只解析一次），按有效日期排序（最早到最新）
+        for article in articles:
             article['effective_date'] = self._get_article_effective_date(article)
+        articles_sorted = sorted(articles, key=lambda x: x['effective_date'])
 
         print(f"📅 文章按日期排序完成，时间范围: {articles_sorted[0]['effective_date'].strftime('%Y-%m-%d')} 到 {articles_sorted[-1]['effective_date'].strftime('%Y-%m-%d')}")
 
@@ -428,15 +426,16 @@ class SimilarityChecker:
 
         print(f"  🔄 计算 {n}×{n} 相似度矩阵...")
 
+        # 每篇文章的有效日期只解析一次，不在每对比较中重复计算
+        dates = [self._get_article_effective_date(article) for article in articles]
+
         for i in range(n):
             # 对角线为1.0 (自己与自己完全相似)
             matrix[i][i] = 1.0
 
             for j in range(i + 1, n):
                 # 检查时间窗口限制
-                date_i = self._get_article_effective_date(articles[i])
-                date_j = self._get_article_effective_date(articles[j])
-                time_diff = abs((date_i - date_j).days)
+                time_diff = abs((dates[i] - dates[j]).days)
 
                 if time_diff > self.comparison_window_days:
                     matrix[i][j] = matrix[j][i] = 0.0
@@ -520,7 +519,8 @@ class SimilarityChecker:
                 if len(component) > 1:
                     # 按日期排序，最早的作为基准文章
                     component_articles = [articles[idx] for idx in component]
-                    component_sorted = sorted(component, key=lambda idx: self._get_article_effective_date(articles[idx]))
+                    component_dates = {idx: self._get_article_effective_date(articles[idx]) for idx in component}
+                    component_sorted = sorted(component, key=component_dates.__getitem__)
                     base_article_idx = component_sorted[0]
 
                     # 构建群组信息
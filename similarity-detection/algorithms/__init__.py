@@ -9,11 +9,17 @@ Collection of algorithms for detecting content similarity.
 from .tfidf_similarity import TFIDFSimilarity
 from .simhash_similarity import SimHashSimilarity
 from .semantic_similarity import SemanticSimilarity
+from .embedding_store import EmbeddingStore
+from .ann_index import IVFFlatIndex
 from .linear_comparison import LinearComparison
+from .graph_clustering import GraphClustering
 
 __all__ = [
     'TFIDFSimilarity',
     'SimHashSimilarity',
     'SemanticSimilarity',
+    'EmbeddingStore',
+    'IVFFlatIndex',
     'LinearComparison',
+    'GraphClustering',
 ]
\ No newline at end of file
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Approximate Nearest Neighbour Index
+
+Pure-NumPy IVF-flat index for cosine similarity search. Vectors are clustered
+with spherical k-means; a query only scans the ``nprobe`` clusters whose
+centroids are closest to it. Vectors are kept as float16 codes, so scores from
+the index are approximate and callers re-rank the shortlist with the exact
+float32 vectors.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class IVFFlatIndex:
+    """
+    Inverted-file index over L2-normalized vectors.
+
+    Until ``min_train_size`` vectors are present the index is untrained and
+    searches scan every vector. Once trained, new vectors are assigned to
+    their nearest centroid; the clustering is retrained when the index has
+    grown by ``retrain_factor`` since the last training.
+    """
+
+    VERSION = 1
+    CODE_DTYPE = np.float16
+
+    def __init__(self, nlist: Optional[int] = None, nprobe: int = 8,
+                 min_train_size: int = 1024, retrain_factor: float = 4.0, seed: int = 0):
+        """
+        Initialize an empty index.
+
+        Args:
+            nlist: Number of clusters (None = about sqrt of the index size)
+            nprobe: Clusters scanned per query (higher = better recall, slower)
+            min_train_size: Vectors required before clustering
+            retrain_factor: Retrain once the index grows by this factor
+            seed: Random seed for k-means initialisation
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_factor = retrain_factor
+        self.seed = seed
+        self.metadata: Dict = {}
+
+        self.dim: Optional[int] = None
+        self.size = 0
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.codes = np.zeros((0, 0), dtype=self.CODE_DTYPE)
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self._lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rows
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows (zero rows stay zero)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _reserve(self, extra: int):
+        """Grow the row arrays (capacity doubling) and make them writable."""
+        needed = self.size + extra
+        capacity = self.codes.shape[0]
+        if needed <= capacity and self.codes.flags.writeable:
+            return
+
+        capacity = max(needed, capacity * 2, 64)
+        codes = np.zeros((capacity, self.dim), dtype=self.CODE_DTYPE)
+        assignments = np.full(capacity, -1, dtype=np.int32)
+        alive = np.zeros(capacity, dtype=bool)
+        codes[:self.size] = self.codes[:self.size]
+        assignments[:self.size] = self.assignments[:self.size]
+        alive[:self.size] = self.alive[:self.size]
+        self.codes, self.assignments, self.alive = codes, assignments, alive
+
+    def add(self, keys: Iterable[str], vectors: np.ndarray):
+        """
+        Insert vectors (an existing key is replaced).
+
+        Args:
+            keys: Unique key per vector
+            vectors: Matrix with one vector per key
+        """
+        keys = list(keys)
+        if not keys:
+            return
+
+        vectors = self._normalize(np.atleast_2d(vectors))
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self.codes = np.zeros((0, self.dim), dtype=self.CODE_DTYPE)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"vector dimension {vectors.shape[1]} != index dimension {self.dim}")
+
+        for key in keys:
+            self.remove(key)
+
+        self._reserve(len(keys))
+        start, end = self.size, self.size + len(keys)
+        self.codes[start:end] = vectors
+        self.alive[start:end] = True
+        self.assignments[start:end] = self._assign(vectors) if self.is_trained else -1
+        for offset, key in enumerate(keys):
+            self.rows[key] = start + offset
+        self.keys.extend(keys)
+        self.size = end
+        self._lists = None
+
+        if not self.is_trained:
+            if len(self) >= self.min_train_size:
+                self.train()
+        elif len(self) > self.trained_size * self.retrain_factor:
+            self.train()
+
+    def remove(self, key: str) -> bool:
+        """
+        Delete a vector.
+
+        Args:
+            key: Key used on insert
+
+        Returns:
+            True if the key was present
+        """
+        row = self.rows.pop(key, None)
+        if row is None:
+            return False
+        self.alive[row] = False
+        self._lists = None
+        return True
+
+    def _assign(self, vectors: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        """Nearest centroid of each vector."""
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk):
+            block = np.asarray(vectors[start:start + chunk], dtype=np.float32)
+            assignments[start:start + chunk] = np.argmax(block @ self.centroids.T, axis=1)
+        return assignments
+
+    def train(self, iterations: int = 10, max_sample: int = 100000):
+        """
+        Cluster the live vectors with spherical k-means and reassign all rows.
+
+        Args:
+            iterations: k-means iterations
+            max_sample: Maximum vectors used to fit the centroids
+        """
+        live_rows = np.flatnonzero(self.alive[:self.size])
+        if len(live_rows) == 0:
+            return
+        self._reserve(0)
+
+        nlist = self.nlist or int(np.sqrt(len(live_rows)))
+        nlist = int(min(max(1, nlist), len(live_rows)))
+
+        rng = np.random.default_rng(self.seed)
+        sample_rows = live_rows if len(live_rows) <= max_sample \
+            else np.sort(rng.choice(live_rows, max_sample, replace=False))
+        sample = self.codes[sample_rows].astype(np.float32)
+
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+        for _ in range(iterations):
+            self.centroids = centroids
+            labels = self._assign(sample)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+
+            # Reseed empty clusters with random sample vectors
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = self._normalize(sums)
+
+        self.centroids = centroids
+        self.assignments[:self.size] = self._assign(self.codes[:self.size])
+        self.assignments[:self.size][~self.alive[:self.size]] = -1
+        self.trained_size = len(live_rows)
+        self._lists = None
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows grouped by cluster: (row order, start offset per cluster)."""
+        if self._lists is None:
+            assignments = np.where(self.alive[:self.size], self.assignments[:self.size], -1)
+            order = np.argsort(assignments, kind='stable')
+            starts = np.searchsorted(assignments[order], np.arange(len(self.centroids) + 1))
+            self._lists = (order, starts)
+        return self._lists
+
+    def search(self, query: np.ndarray, k: int, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Approximate top-k search by cosine similarity.
+
+        Args:
+            query: Query vector
+            k: Number of neighbours
+            nprobe: Clusters to scan (defaults to the index setting)
+
+        Returns:
+            List of (key, approximate similarity), most similar first
+        """
+        if not len(self) or k <= 0:
+            return []
+
+        query = self._normalize(np.asarray(query).ravel())
+        if self.is_trained:
+            nprobe = max(1, min(nprobe or self.nprobe, len(self.centroids)))
+            centroid_scores = self.centroids @ query
+            probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+            order, starts = self._inverted_lists()
+            rows = np.concatenate([order[starts[c]:starts[c + 1]] for c in probe])
+        else:
+            rows = np.flatnonzero(self.alive[:self.size])
+
+        if len(rows) == 0:
+            return []
+
+        scores = self.codes[rows].astype(np.float32) @ query
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        ranking = np.argsort(-scores, kind='stable')
+        return [(self.keys[rows[i]], float(scores[i])) for i in ranking]
+
+    def save(self, directory: str):
+        """
+        Persist the index (arrays as .npy, keys and settings as JSON).
+
+        Deleted rows are dropped. The metadata file is written last and names
+        the array files, so readers never see a half-written index.
+
+        Args:
+            directory: Target directory
+        """
+        os.makedirs(directory, exist_ok=True)
+        live_rows = np.flatnonzero(self.alive[:self.size])
+        generation = int(self.metadata.get('generation', 0)) + 1
+
+        arrays = {
+            'codes': self.codes[live_rows] if self.dim else np.zeros((0, 0), dtype=self.CODE_DTYPE),
+            'assignments': self.assignments[live_rows],
+        }
+        if self.is_trained:
+            arrays['centroids'] = self.centroids
+
+        files = {}
+        for name, array in arrays.items():
+            files[name] = f"{name}.{generation}.npy"
+            np.save(os.path.join(directory, files[name]), array)
+
+        self.metadata.update({
+            'version': self.VERSION,
+            'generation': generation,
+            'files': files,
+            'dim': self.dim,
+            'nlist': self.nlist,
+            'nprobe': self.nprobe,
+            'trained_size': self.trained_size,
+            'keys': [self.keys[row] for row in live_rows],
+        })
+        meta_path = os.path.join(directory, 'index.json')
+        with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(self.metadata, f, ensure_ascii=False)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+        # Remove array files of older generations
+        for name in os.listdir(directory):
+            if name.endswith('.npy') and name not in files.values():
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    @classmethod
+    def load(cls, directory: str, **kwargs) -> Optional['IVFFlatIndex']:
+        """
+        Load an index saved with save(). Arrays are memory-mapped.
+
+        Args:
+            directory: Index directory
+            **kwargs: Settings overriding the stored ones (e.g. nprobe)
+
+        Returns:
+            Loaded index or None if missing or unreadable
+        """
+        meta_path = os.path.join(directory, 'index.json')
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            if metadata.get('version') != cls.VERSION:
+                return None
+
+            files = metadata['files']
+            settings = {'nlist': metadata.get('nlist'), 'nprobe': metadata.get('nprobe', 8)}
+            settings.update(kwargs)
+            index = cls(**settings)
+            index.metadata = metadata
+            index.keys = list(metadata['keys'])
+            index.rows = {key: row for row, key in enumerate(index.keys)}
+            index.size = len(index.keys)
+            index.dim = metadata.get('dim')
+            index.trained_size = metadata.get('trained_size', 0)
+            index.codes = np.load(os.path.join(directory, files['codes']), mmap_mode='r')
+            index.assignments = np.load(os.path.join(directory, files['assignments']), mmap_mode='r')
+            index.alive = np.ones(index.size, dtype=bool)
+            if 'centroids' in files:
+                index.centroids = np.load(os.path.join(directory, files['centroids']))
+            return index
+        except (OSError, ValueError, KeyError):
+            return None
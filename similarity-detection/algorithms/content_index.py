@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inverted Content Index
+
+Posting lists from TF-IDF tokens to (article, term count) pairs. The content
+similarity of a query article to every indexed article comes from one weighted
+``bincount`` over the postings of the query's terms; articles sharing no token
+with the query are never touched. Articles can be added and replaced while
+the index is in use (e.g. by the similarity daemon).
+
+Cosines are accumulated in a different order than
+``TFIDFSimilarity._count_cosine`` and may differ from it in the last bits, so
+callers use them to shortlist candidates and rescore the shortlist exactly.
+"""
+
+from array import array
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class ContentIndex:
+    """
+    Term count index over a changing set of articles.
+
+    Articles are registered by key (e.g. file path). Replaced or removed
+    articles leave dead ids in the posting lists, which are compacted away
+    once they outnumber the live ones.
+    """
+
+    def __init__(self, pipeline):
+        """
+        Initialize an empty index.
+
+        Args:
+            pipeline: TextPipeline providing the articles' term frequencies
+        """
+        self.pipeline = pipeline
+        self.keys: List[Optional[Hashable]] = []
+        self._ids: Dict[Hashable, int] = {}
+        self._magnitudes = array('d')
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        # Articles with content but no tokens (identical token streams score 1.0)
+        self._tokenless: Set[Hashable] = set()
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._ids
+
+    def add(self, key: Hashable, article: Dict) -> int:
+        """
+        Register (or replace) an article's content.
+
+        Args:
+            key: Article key
+            article: Article information dictionary
+
+        Returns:
+            Internal id of the article
+        """
+        self.remove(key)
+
+        counts = self.pipeline.article_term_frequencies(article) if article.get('content') else {}
+        doc_id = len(self.keys)
+        self._ids[key] = doc_id
+        self.keys.append(key)
+        self._magnitudes.append(sum(count * count for count in counts.values()) ** 0.5)
+        if article.get('content') and not counts:
+            self._tokenless.add(key)
+
+        for term, count in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array('q'), array('d'))
+            postings[0].append(doc_id)
+            postings[1].append(count)
+        return doc_id
+
+    def remove(self, key: Hashable) -> bool:
+        """
+        Drop an article from the index.
+
+        Args:
+            key: Article key
+
+        Returns:
+            True if the article was indexed
+        """
+        doc_id = self._ids.pop(key, None)
+        if doc_id is None:
+            return False
+
+        self.keys[doc_id] = None
+        self._tokenless.discard(key)
+        self._removed += 1
+        if self._removed > len(self._ids):
+            self._compact()
+        return True
+
+    def similarities(self, article: Dict) -> Dict[Hashable, float]:
+        """
+        Content similarity of an article to every indexed article it can match.
+
+        Args:
+            article: Article information dictionary (need not be indexed)
+
+        Returns:
+            Mapping of key to content similarity (all other keys score 0.0)
+        """
+        if not article.get('content'):
+            return {}
+        counts = self.pipeline.article_term_frequencies(article)
+        if not counts:
+            return {key: 1.0 for key in self._tokenless}
+
+        doc_parts, weight_parts = [], []
+        for term, count in counts.items():
+            postings = self._postings.get(term)
+            if postings is not None:
+                doc_parts.append(np.frombuffer(postings[0], dtype=np.int64))
+                weight_parts.append(np.frombuffer(postings[1], dtype=np.float64) * count)
+        if not doc_parts:
+            return {}
+
+        dots = np.bincount(np.concatenate(doc_parts), weights=np.concatenate(weight_parts),
+                           minlength=len(self.keys))
+        hits = np.flatnonzero(dots)
+        magnitude = sum(count * count for count in counts.values()) ** 0.5
+        scores = dots[hits] / (np.frombuffer(self._magnitudes, dtype=np.float64)[hits] * magnitude)
+
+        keys = self.keys
+        return {keys[doc_id]: score for doc_id, score in zip(hits.tolist(), scores.tolist())
+                if keys[doc_id] is not None}
+
+    def _compact(self):
+        """Renumber the live articles and drop dead ids from the posting lists."""
+        new_ids = {}
+        keys: List[Optional[Hashable]] = []
+        magnitudes = array('d')
+        for doc_id, key in enumerate(self.keys):
+            if key is not None:
+                new_ids[doc_id] = len(keys)
+                keys.append(key)
+                magnitudes.append(self._magnitudes[doc_id])
+
+        postings = {}
+        for term, (docs, counts) in self._postings.items():
+            live = [(new_ids[doc_id], count) for doc_id, count in zip(docs, counts) if doc_id in new_ids]
+            if live:
+                postings[term] = (array('q', (doc_id for doc_id, _ in live)),
+                                  array('d', (count for _, count in live)))
+
+        self.keys = keys
+        self._ids = {key: doc_id for doc_id, key in enumerate(keys)}
+        self._magnitudes = magnitudes
+        self._postings = postings
+        self._removed = 0
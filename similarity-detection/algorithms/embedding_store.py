@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Embedding Store
+
+Binary, append-only storage for semantic embeddings. Vectors live in a raw
+float32 matrix file (``<base>.f32``) that is memory-mapped for reading; a small
+JSON-lines log (``<base>.idx``) maps (content hash, model) keys to matrix rows.
+New embeddings append one row and one log line, and removals append a
+tombstone, so no write rewrites existing data. Compaction writes a new matrix
+generation (``<base>.<n>.f32``) and then atomically swaps in an index naming
+it, so an interrupted compaction leaves the previous store intact. Every file
+whose content maps to a stored embedding is recorded with it, so identical
+copies stay distinguishable.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+class EmbeddingStore:
+    """
+    Memory-mapped float32 embedding matrix with a (content hash, model) index.
+
+    Intended for a single writing process. Vectors returned by get() are
+    read-only views into the memory map (no copy).
+    """
+
+    VERSION = 1
+    DTYPE = np.float32
+
+    def __init__(self, base_path: str, compact_ratio: float = 0.5):
+        """
+        Open (or create) an embedding store.
+
+        Args:
+            base_path: Path prefix of the store files (without extension)
+            compact_ratio: Compact when dead rows exceed this share of all rows
+        """
+        self.base_path = base_path
+        self.index_path = f"{base_path}.idx"
+        self.compact_ratio = compact_ratio
+
+        self.generation = 0
+        self.matrix_path = self._matrix_file(0)
+        self.dim: Optional[int] = None
+        self.rows = 0
+        self.entries: Dict[Tuple[str, str], Dict] = {}
+        self._matrix: Optional[np.memmap] = None
+
+        # Incremented on every change so readers can detect updates cheaply
+        self.revision = 0
+
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self.entries
+
+    @property
+    def dead_rows(self) -> int:
+        """Rows no longer referenced by any key."""
+        return self.rows - len(self.entries)
+
+    def _matrix_file(self, generation: int) -> str:
+        """Matrix file path of a compaction generation."""
+        return f"{self.base_path}.f32" if generation == 0 else f"{self.base_path}.{generation}.f32"
+
+    def _header(self) -> Dict:
+        """Index header record."""
+        return {'version': self.VERSION, 'dim': self.dim, 'generation': self.generation}
+
+    def _load_index(self):
+        """Replay the index log, ignoring rows missing from the matrix file."""
+        if not os.path.exists(self.index_path):
+            return
+
+        with open(self.index_path, 'rb') as f:
+            data = f.read()
+        if data and not data.endswith(b'\n'):
+            # Drop a torn final line so the next record starts on its own line
+            data = data[:data.rfind(b'\n') + 1]
+            with open(self.index_path, 'r+b') as f:
+                f.truncate(len(data))
+
+        for line in data.decode('utf-8', errors='replace').splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Corrupt line after an interrupted write
+
+            if 'dim' in record:
+                self.dim = record['dim']
+                self.generation = record.get('generation', 0)
+                self.matrix_path = self._matrix_file(self.generation)
+                continue
+
+            key = (record['hash'], record['model'])
+            if record.get('deleted'):
+                self.entries.pop(key, None)
+            elif record.get('link'):
+                entry = self.entries.get(key)
+                if entry is not None and record['file_path'] not in entry['file_paths']:
+                    entry['file_paths'].append(record['file_path'])
+            else:
+                # Records written before file_paths existed hold a single file_path
+                record.setdefault('file_paths', [record['file_path']] if record.get('file_path') else [])
+                self.entries[key] = record
+
+        if self.dim:
+            row_bytes = self.dim * np.dtype(self.DTYPE).itemsize
+            matrix_size = os.path.getsize(self.matrix_path) if os.path.exists(self.matrix_path) else 0
+            self.rows = matrix_size // row_bytes
+            if matrix_size % row_bytes:
+                # Drop a partially written trailing row so appends stay aligned
+                with open(self.matrix_path, 'r+b') as f:
+                    f.truncate(self.rows * row_bytes)
+            self.entries = {key: record for key, record in self.entries.items()
+                            if record['row'] < self.rows}
+
+    def _append_index(self, record: Dict):
+        """Append one record to the index log."""
+        directory = os.path.dirname(self.index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def _map(self) -> Optional[np.memmap]:
+        """Return the memory map of the matrix file, remapping after appends."""
+        if self.rows == 0:
+            return None
+        if self._matrix is None or self._matrix.shape[0] != self.rows:
+            self._matrix = np.memmap(self.matrix_path, dtype=self.DTYPE, mode='r',
+                                     shape=(self.rows, self.dim))
+        return self._matrix
+
+    def get(self, content_hash: str, model: str) -> Optional[np.ndarray]:
+        """
+        Look up an embedding.
+
+        Args:
+            content_hash: Hash of the embedded content
+            model: Embedding model name
+
+        Returns:
+            Read-only float32 vector or None if not stored
+        """
+        record = self.entries.get((content_hash, model))
+        if record is None:
+            return None
+        return self._map()[record['row']]
+
+    def add(self, content_hash: str, model: str, embedding: np.ndarray, file_path: str = '',
+            timestamp: Optional[str] = None):
+        """
+        Append an embedding (replaces the vector of an existing key and keeps
+        its file paths).
+
+        Args:
+            content_hash: Hash of the embedded content
+            model: Embedding model name
+            embedding: Embedding vector
+            file_path: Source file, kept for reference
+            timestamp: ISO creation time (defaults to now)
+        """
+        vector = np.asarray(embedding, dtype=self.DTYPE).ravel()
+        if self.dim is None:
+            self.dim = int(vector.size)
+            self._append_index(self._header())
+        elif vector.size != self.dim:
+            raise ValueError(f"embedding dimension {vector.size} != store dimension {self.dim}")
+
+        # Vector first, then the index line that makes it visible
+        with open(self.matrix_path, 'ab') as f:
+            f.write(vector.tobytes())
+
+        previous = self.entries.get((content_hash, model))
+        file_paths = list(previous['file_paths']) if previous else []
+        if file_path and file_path not in file_paths:
+            file_paths.append(file_path)
+
+        record = {
+            'hash': content_hash,
+            'model': model,
+            'row': self.rows,
+            'timestamp': timestamp or datetime.now().isoformat(),
+            'file_path': file_paths[0] if file_paths else '',
+            'file_paths': file_paths
+        }
+        self._append_index(record)
+        self.entries[(content_hash, model)] = record
+        self.rows += 1
+        self.revision += 1
+
+    def add_file_path(self, content_hash: str, model: str, file_path: str) -> bool:
+        """
+        Record another file with the content of a stored embedding.
+
+        Args:
+            content_hash: Hash of the embedded content
+            model: Embedding model name
+            file_path: File with identical content
+
+        Returns:
+            True if the path was added (False for unknown keys or known paths)
+        """
+        entry = self.entries.get((content_hash, model))
+        if entry is None or not file_path or file_path in entry['file_paths']:
+            return False
+        self._append_index({'hash': content_hash, 'model': model, 'file_path': file_path, 'link': True})
+        entry['file_paths'].append(file_path)
+        if not entry['file_path']:
+            entry['file_path'] = file_path
+        return True
+
+    def remove(self, content_hash: str, model: str) -> bool:
+        """
+        Remove an embedding by appending a tombstone.
+
+        Args:
+            content_hash: Hash of the embedded content
+            model: Embedding model name
+
+        Returns:
+            True if the key was present
+        """
+        if self.entries.pop((content_hash, model), None) is None:
+            return False
+        self._append_index({'hash': content_hash, 'model': model, 'deleted': True})
+        self.revision += 1
+        return True
+
+    def items(self) -> Iterator[Tuple[Tuple[str, str], Dict]]:
+        """Iterate over ((content_hash, model), record) pairs."""
+        return iter(list(self.entries.items()))
+
+    def as_matrix(self) -> Tuple[list, Optional[np.ndarray]]:
+        """
+        Return all live keys and their embedding matrix.
+
+        Without dead rows this is the memory map itself; otherwise the live
+        rows are gathered into a new array.
+
+        Returns:
+            (keys, matrix) where matrix row i belongs to keys[i]
+        """
+        keys = sorted(self.entries, key=lambda key: self.entries[key]['row'])
+        if not keys:
+            return keys, None
+        if self.dead_rows == 0:
+            return keys, self._map()
+        rows = np.fromiter((self.entries[key]['row'] for key in keys), dtype=np.int64, count=len(keys))
+        return keys, self._map()[rows]
+
+    def needs_compaction(self) -> bool:
+        """Check whether dead rows exceed the compaction ratio."""
+        return self.rows > 0 and self.dead_rows > self.rows * self.compact_ratio
+
+    def compact(self) -> int:
+        """
+        Rewrite both files with live rows only (atomic replace).
+
+        Returns:
+            Number of dropped rows
+        """
+        dropped = self.dead_rows
+        if dropped == 0 or self.dim is None:
+            return 0
+
+        matrix = self._map()
+        old_matrix_path = self.matrix_path
+        self.generation += 1
+        new_matrix_path = self._matrix_file(self.generation)
+        tmp_index = f"{self.index_path}.tmp"
+
+        new_entries = {}
+        with open(new_matrix_path, 'wb') as matrix_file, open(tmp_index, 'w', encoding='utf-8') as index_file:
+            if self.dim:
+                index_file.write(json.dumps(self._header()) + '\n')
+            for new_row, (key, record) in enumerate(sorted(self.entries.items(),
+                                                           key=lambda item: item[1]['row'])):
+                matrix_file.write(np.asarray(matrix[record['row']], dtype=self.DTYPE).tobytes())
+                record = dict(record, row=new_row)
+                index_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+                new_entries[key] = record
+
+        # The index swap commits the new generation
+        os.replace(tmp_index, self.index_path)
+
+        # Release the old mapping before deleting its file
+        self._matrix = None
+        del matrix
+        if os.path.exists(old_matrix_path):
+            os.remove(old_matrix_path)
+
+        self.matrix_path = new_matrix_path
+        self.entries = new_entries
+        self.rows = len(new_entries)
+        return dropped
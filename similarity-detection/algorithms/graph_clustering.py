@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Graph Clustering Algorithm
+
+Implements duplicate group detection over a similarity graph. Only edges that
+reach the similarity threshold are kept (sparse edge list), and duplicate
+groups are the connected components found with a union-find structure.
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class UnionFind:
+    """
+    Disjoint-set forest with path halving and union by size.
+
+    Iterative implementation, so component size is not limited by Python's
+    recursion depth.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialize disjoint sets.
+
+        Args:
+            size: Number of elements
+        """
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, element: int) -> int:
+        """Return the representative of the set containing element."""
+        parent = self.parent
+        while parent[element] != element:
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
+
+    def union(self, first: int, second: int) -> bool:
+        """
+        Merge the sets containing first and second.
+
+        Returns:
+            True if two different sets were merged
+        """
+        root1 = self.find(first)
+        root2 = self.find(second)
+        if root1 == root2:
+            return False
+
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        return True
+
+    def components(self) -> Dict[int, List[int]]:
+        """Group all elements by their representative."""
+        groups: Dict[int, List[int]] = {}
+        for element in range(len(self.parent)):
+            groups.setdefault(self.find(element), []).append(element)
+        return groups
+
+
+class GraphClustering:
+    """
+    Graph-based duplicate group detection.
+
+    Articles are nodes; an edge connects two articles inside the comparison
+    window whose similarity reaches the (topic-aware) threshold. Every connected
+    component with more than one article is a duplicate group whose earliest
+    article is the base.
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Initialize graph clustering algorithm.
+
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        self.similarity_threshold = config.get('similarity_threshold', 0.7)
+        self.comparison_window_days = config.get('comparison_window_days', 90)
+        self.min_content_length = config.get('min_content_length', 1000)
+        self.cross_topic_threshold = config.get('cross_topic_threshold', 0.85)
+        self.debug_mode = False
+
+        # Score window pairs in a process pool when more than one worker is set
+        self.workers = config.get('comparison_workers', 1) or (os.cpu_count() or 1)
+
+        try:
+            from .tfidf_similarity import TFIDFSimilarity
+            from .time_window import TimeWindowIndex
+        except ImportError:
+            from tfidf_similarity import TFIDFSimilarity
+            from time_window import TimeWindowIndex
+        self.tfidf_calculator = TFIDFSimilarity(config)
+        self.window_index_class = TimeWindowIndex
+
+        try:
+            from ..utils.topic_classifier import TopicClassifier
+            from ..utils.date_helper import DateHelper
+        except ImportError:
+            from utils.topic_classifier import TopicClassifier
+            from utils.date_helper import DateHelper
+        self.topic_classifier = TopicClassifier.from_config(config)
+        self.date_helper = DateHelper()
+
+    def detect_duplicate_groups(self, articles: List[Dict]) -> Dict[str, Any]:
+        """
+        Detect all duplicate groups among the articles.
+
+        Args:
+            articles: List of articles to analyze
+
+        Returns:
+            Detection results with duplicate groups and the sparse edge list
+        """
+        if len(articles) < 2:
+            print("📊 文章数量不足，无法进行相似度比较")
+            return self._empty_result(articles)
+
+        print(f"🔍 开始全连接图相似度检测 {len(articles)} 篇文章...")
+        print("📊 算法说明: 计算时间窗口内文章对相似度，使用并查集识别重复群组")
+
+        # Filter out articles with insufficient content
+        valid_articles = []
+        for article in articles:
+            if article['word_count'] >= self.min_content_length:
+                valid_articles.append(article)
+            elif self.debug_mode:
+                print(f"📝 跳过字数不足的文章: {article['file_name']} "
+                      f"({article['word_count']} < {self.min_content_length})")
+
+        if len(valid_articles) < 2:
+            print("📊 有效文章数量不足，无法进行相似度比较")
+            return self._empty_result(articles)
+
+        print(f"✅ 有效文章: {len(valid_articles)} 篇")
+
+        corpus_dates = self.date_helper.resolve_corpus(valid_articles, self._get_article_effective_date)
+
+        # Stage 1: thresholded sparse edge list
+        print("\n🔧 第一阶段: 构建稀疏相似度边表...")
+        edges, total_comparisons = self._build_similarity_edges(valid_articles, corpus_dates)
+
+        # Stage 2: connected components
+        print("\n🔧 第二阶段: 查找重复文章群组...")
+        duplicate_groups = self._find_duplicate_groups(valid_articles, edges)
+
+        # Stage 3: unique articles
+        print("\n🔧 第三阶段: 生成分析报告...")
+        grouped_files = {article['file_name']
+                         for group in duplicate_groups for article in group['articles']}
+        unique_articles = [article for article in valid_articles
+                           if article['file_name'] not in grouped_files]
+        print(f"  ✅ 识别出 {len(unique_articles)} 篇独立文章")
+
+        result = {
+            'duplicate_groups': duplicate_groups,
+            'unique_articles': unique_articles,
+            'similarity_edges': [
+                (valid_articles[i]['file_name'], valid_articles[j]['file_name'], similarity)
+                for (i, j), similarity in sorted(edges.items())
+            ],
+            'total_comparisons': total_comparisons,
+            'algorithm': 'graph_clustering'
+        }
+
+        total_duplicates = sum(len(group['articles']) for group in duplicate_groups)
+        print(f"\n✅ 全连接图检测完成:")
+        print(f"  📊 总比较次数: {total_comparisons}")
+        print(f"  🔗 相似边数量: {len(edges)}")
+        print(f"  📦 发现重复群组: {len(duplicate_groups)} 个")
+        print(f"  🔸 重复文章总数: {total_duplicates} 篇")
+        print(f"  ✅ 独立文章: {len(unique_articles)} 篇")
+
+        return result
+
+    def _build_similarity_edges(self, articles: List[Dict], corpus_dates=None
+                                ) -> Tuple[Dict[Tuple[int, int], float], int]:
+        """
+        Score all article pairs inside the time window and keep edges above threshold.
+
+        Args:
+            articles: Valid articles
+            corpus_dates: Resolved dates of the articles (resolved here if omitted)
+
+        Returns:
+            (edges mapping (i, j) with i < j to similarity, number of comparisons)
+        """
+        self.tfidf_calculator.fit_corpus(articles)
+
+        if corpus_dates is None:
+            corpus_dates = self.date_helper.resolve_corpus(articles, self._get_article_effective_date)
+        order = corpus_dates.order.tolist()
+
+        if self.workers > 1:
+            self.tfidf_calculator.similarity_join = None
+            return self._build_similarity_edges_sharded(articles, order, corpus_dates.sorted_timestamps)
+
+        self.tfidf_calculator.prepare_pruning(articles)
+        window_index = self.window_index_class.from_keys(
+            corpus_dates.sorted_timestamps, self.comparison_window_days)
+
+        edges: Dict[Tuple[int, int], float] = {}
+        total_comparisons = 0
+
+        for position, base_idx in enumerate(order):
+            candidate_ids = [order[candidate] for candidate in window_index.candidates(position)]
+            if not candidate_ids:
+                continue
+
+            total_comparisons += len(candidate_ids)
+            base_article = articles[base_idx]
+            thresholds = [self._pair_threshold(base_article, articles[idx]) for idx in candidate_ids]
+            results = self.tfidf_calculator.calculate_similarities(
+                base_article, [articles[idx] for idx in candidate_ids], thresholds)
+
+            for other_idx, similarity_result, threshold in zip(candidate_ids, results, thresholds):
+                # Pruned pairs (None) provably stay below their threshold
+                if similarity_result is None:
+                    continue
+                similarity = similarity_result['overall_similarity']
+                if similarity < threshold:
+                    continue
+
+                edges[(min(base_idx, other_idx), max(base_idx, other_idx))] = similarity
+                if self.debug_mode:
+                    print(f"    🔗 连接: {base_article['file_name']} ↔ "
+                          f"{articles[other_idx]['file_name']} "
+                          f"(相似度: {similarity:.3f}, 阈值: {threshold:.3f})")
+
+        print(f"  ✅ 边表构建完成，共计算 {total_comparisons} 对文章，保留 {len(edges)} 条边")
+        similarity_join = self.tfidf_calculator.similarity_join
+        if similarity_join is not None and similarity_join.checked:
+            print(f"  ✂️ 阈值剪枝: 跳过 {similarity_join.pruned}/{similarity_join.checked} 对 "
+                  f"(相似度上界低于阈值)")
+        return edges, total_comparisons
+
+    def _build_similarity_edges_sharded(self, articles: List[Dict], order: List[int],
+                                        keys) -> Tuple[Dict[Tuple[int, int], float], int]:
+        """
+        Score the window pairs in a process pool (same edges as the sequential scan).
+
+        Args:
+            articles: Valid articles
+            order: Article indices in chronological order
+            keys: Sorted date keys aligned with order
+
+        Returns:
+            (edges mapping (i, j) with i < j to similarity, number of comparisons)
+        """
+        try:
+            from .sharded_comparison import ShardedComparison
+        except ImportError:
+            from sharded_comparison import ShardedComparison
+
+        sorted_articles = [articles[idx] for idx in order]
+        topic_labels = None
+        if self.config.get('topic_classification', {}).get('enabled', False):
+            topic_labels = [self._classify_article_topic(article) for article in sorted_articles]
+
+        scorer = ShardedComparison(self.tfidf_calculator, self.workers)
+        scored = scorer.score_pairs(
+            sorted_articles, keys, self.comparison_window_days,
+            similarity_threshold=self.similarity_threshold,
+            cross_topic_threshold=self.cross_topic_threshold,
+            topic_labels=topic_labels)
+
+        edges: Dict[Tuple[int, int], float] = {}
+        for position in sorted(scored):
+            base_idx = order[position]
+            for candidate, similarity_result in sorted(scored[position].items()):
+                other_idx = order[candidate]
+                similarity = similarity_result['overall_similarity']
+                edges[(min(base_idx, other_idx), max(base_idx, other_idx))] = similarity
+                if self.debug_mode:
+                    print(f"    🔗 连接: {articles[base_idx]['file_name']} ↔ "
+                          f"{articles[other_idx]['file_name']} (相似度: {similarity:.3f})")
+
+        # Every later article inside the window is one comparison
+        window_index = self.window_index_class.from_keys(keys, self.comparison_window_days)
+        total_comparisons = sum(window_index.window_end(position) - position - 1
+                                for position in range(len(order)))
+
+        print(f"  ✅ 边表构建完成，共计算 {total_comparisons} 对文章，保留 {len(edges)} 条边")
+        return edges, total_comparisons
+
+    def _find_duplicate_groups(self, articles: List[Dict],
+                               edges: Dict[Tuple[int, int], float]) -> List[Dict]:
+        """
+        Collect connected components with union-find and build group records.
+
+        Args:
+            articles: Valid articles
+            edges: Sparse edge list
+
+        Returns:
+            Duplicate group list (components with at least two articles)
+        """
+        union_find = UnionFind(len(articles))
+        for i, j in edges:
+            union_find.union(i, j)
+
+        components = [members for members in union_find.components().values() if len(members) > 1]
+        components.sort(key=min)
+
+        duplicate_groups = []
+        for component in components:
+            # Earliest article is the base of the group
+            component_sorted = sorted(component, key=lambda idx: (articles[idx]['effective_date'], idx))
+            base_idx = component_sorted[0]
+            base_article = articles[base_idx]
+
+            group_info = {
+                'base_article': base_article,
+                'articles': [],
+                'group_id': len(duplicate_groups) + 1,
+                'topic': self._classify_article_topic(base_article) or 'Unknown'
+            }
+
+            for idx in component_sorted:
+                group_info['articles'].append({
+                    **articles[idx],
+                    'similarity_to_base': self._similarity_to_base(articles, edges, base_idx, idx),
+                    'is_base': idx == base_idx
+                })
+
+            duplicate_groups.append(group_info)
+
+            if self.debug_mode:
+                print(f"    📦 发现群组 {len(duplicate_groups)}: {len(component)} 篇文章")
+                for article in group_info['articles']:
+                    marker = "🔹" if article['is_base'] else "🔸"
+                    print(f"      {marker} {article['file_name']} "
+                          f"(相似度: {article['similarity_to_base']:.3f})")
+
+        print(f"  ✅ 连通分量分析完成，发现 {len(duplicate_groups)} 个重复群组")
+        return duplicate_groups
+
+    def _similarity_to_base(self, articles: List[Dict], edges: Dict[Tuple[int, int], float],
+                            base_idx: int, idx: int) -> float:
+        """
+        Similarity of a group member to the group base.
+
+        Members connected only transitively have no stored edge; they are
+        scored on demand (0.0 when outside the comparison window).
+        """
+        if idx == base_idx:
+            return 1.0
+
+        key = (min(base_idx, idx), max(base_idx, idx))
+        if key in edges:
+            return edges[key]
+
+        to_key = self.window_index_class.to_key
+        time_diff = abs(to_key(articles[idx]['effective_date']) - to_key(articles[base_idx]['effective_date']))
+        if time_diff > self.window_index_class.window_span(self.comparison_window_days):
+            return 0.0
+
+        return self.tfidf_calculator.calculate_similarity(
+            articles[base_idx], articles[idx])['overall_similarity']
+
+    def _pair_threshold(self, article1: Dict, article2: Dict) -> float:
+        """Effective threshold for a pair (higher for cross-topic pairs)."""
+        if self._are_cross_topic_articles(article1, article2):
+            return self.cross_topic_threshold
+        return self.similarity_threshold
+
+    def _empty_result(self, articles: List[Dict]) -> Dict[str, Any]:
+        """Result dictionary when there is nothing to compare."""
+        return {
+            'duplicate_groups': [],
+            'unique_articles': articles,
+            'similarity_edges': [],
+            'total_comparisons': 0,
+            'algorithm': 'graph_clustering'
+        }
+
+    def _get_article_effective_date(self, article: Dict) -> datetime:
+        """
+        Get effective date for article.
+
+        Priority: filename date > created_time > modified_time
+        """
+        # Precomputed by ArticleAnalyzer
+        if article.get('effective_date'):
+            return article['effective_date']
+
+        filename_date = self.date_helper.extract_date_from_filename(article['file_name'])
+        if filename_date:
+            return filename_date
+
+        if 'created_time' in article:
+            return article['created_time']
+
+        return article['modified_time']
+
+    def _are_cross_topic_articles(self, article1: Dict, article2: Dict) -> bool:
+        """Check if two classified articles belong to different topics."""
+        topic_config = self.config.get('topic_classification', {})
+        if not topic_config.get('enabled', False):
+            return False
+
+        topic1 = self._classify_article_topic(article1)
+        topic2 = self._classify_article_topic(article2)
+        if topic1 is None or topic2 is None:
+            return False
+
+        return topic1 != topic2
+
+    def _classify_article_topic(self, article: Dict) -> Optional[str]:
+        """
+        Classify article topic based on content.
+
+        Uses the topic scores stored by ArticleAnalyzer; articles without
+        current scores are classified with the keyword automaton once.
+
+        Args:
+            article: Article information
+
+        Returns:
+            Topic category name or None if cannot classify
+        """
+        if self.topic_classifier is None:
+            return None
+        return self.topic_classifier.classify(article)
+
+    def set_debug_mode(self, enabled: bool):
+        """Enable or disable debug mode."""
+        self.debug_mode = enabled
+
+    def get_algorithm_info(self) -> Dict[str, Any]:
+        """Get information about this algorithm."""
+        return {
+            'name': 'Graph Clustering',
+            'description': 'Thresholded sparse similarity graph with union-find components',
+            'complexity': 'O(n·w) comparisons plus near-linear union-find',
+            'suitable_for': 'Finding every duplicate group without moving files',
+            'features': [
+                'Sparse edge list instead of dense matrix',
+                'Iterative union-find (no recursion limit)',
+                'Cross-topic thresholds',
+                'Earliest article as group base'
+            ]
+        }
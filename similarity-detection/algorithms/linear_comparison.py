@@ -7,6 +7,8 @@ Implements linear similarity detection algorithm that compares articles
 sequentially in chronological order for efficient duplicate detection.
 """
 
+import os
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
@@ -28,16 +30,37 @@ class LinearComparison:
         """
         self.config = config
         self.similarity_threshold = config.get('similarity_threshold', 0.7)
+        self.cross_topic_threshold = config.get('cross_topic_threshold', 0.85)
         self.comparison_window_days = config.get('comparison_window_days', 90)
         self.min_content_length = config.get('min_content_length', 1000)
         self.debug_mode = False
 
+        # Optional SimHash candidate filter in front of TF-IDF scoring
+        self.simhash_prefilter = config.get('simhash_prefilter', False)
+        self.simhash_prefilter_distance = config.get(
+            'simhash_prefilter_distance', config.get('simhash_hamm_threshold', 16))
+
+        # Score window pairs in a process pool when more than one worker is set
+        self.workers = config.get('comparison_workers', 1) or (os.cpu_count() or 1)
+
         # Import TF-IDF algorithm for similarity calculation
         try:
             from .tfidf_similarity import TFIDFSimilarity
+            from .time_window import TimeWindowIndex
         except ImportError:
             from tfidf_similarity import TFIDFSimilarity
+            from time_window import TimeWindowIndex
         self.tfidf_calculator = TFIDFSimilarity(config)
+        self.window_index_class = TimeWindowIndex
+
+        try:
+            from ..utils.topic_classifier import TopicClassifier
+            from ..utils.date_helper import DateHelper
+        except ImportError:
+            from utils.topic_classifier import TopicClassifier
+            from utils.date_helper import DateHelper
+        self.topic_classifier = TopicClassifier.from_config(config)
+        self.date_helper = DateHelper()
 
     def detect_similarities(self, articles: List[Dict]) -> Dict[str, Any]:
         """
@@ -62,65 +85,114 @@ class LinearComparison:
 
         print(f"🔍 开始线性相似度检测 {len(articles)} 篇文章...")
 
-        # Sort articles by effective date (earliest to newest)
-        articles_sorted = sorted(articles, key=lambda x: self._get_article_effective_date(x))
-
-        # Add effective date to articles
-        for article in articles_sorted:
-            article['effective_date'] = self._get_article_effective_date(article)
+        # Resolve effective dates once and sort articles (earliest to newest)
+        corpus_dates = self.date_helper.resolve_corpus(articles, self._get_article_effective_date)
+        articles_sorted = [articles[idx] for idx in corpus_dates.order]
 
         print(f"📅 文章按日期排序完成，时间范围: "
               f"{articles_sorted[0]['effective_date'].strftime('%Y-%m-%d')} 到 "
               f"{articles_sorted[-1]['effective_date'].strftime('%Y-%m-%d')}")
 
+        # Tokenize the whole corpus once when the corpus TF-IDF engine is enabled
+        if self.tfidf_calculator.fit_corpus(articles_sorted):
+            print(f"🧮 语料库TF-IDF矩阵构建完成: {len(articles_sorted)} 篇文章, "
+                  f"{len(self.tfidf_calculator.corpus_engine.vocabulary)} 个词项")
+
         # Perform linear comparison
         kept_articles = []
         moved_articles = []
         total_comparisons = 0
         processing_date = datetime.now().strftime('%Y-%m-%d')
 
-        remaining_articles = articles_sorted[:]  # Create copy
+        # Sweep over the sorted dates; removed articles are tracked in a bitmap
+        window_index = self.window_index_class.from_keys(
+            corpus_dates.sorted_timestamps, self.comparison_window_days)
 
-        while remaining_articles:
-            # Take earliest article as base
-            base_article = remaining_articles.pop(0)
+        simhash_index, simhashes = self._build_simhash_prefilter(articles_sorted)
+
+        # Sharded mode scores all window pairs up front; the sweep below only
+        # looks results up, so the earliest-kept order is unchanged
+        sharded_edges = None
+        if self.workers > 1:
+            self.tfidf_calculator.similarity_join = None
+            sharded_edges = self._score_sharded(articles_sorted, corpus_dates.sorted_timestamps, simhashes)
+        else:
+            self.tfidf_calculator.prepare_pruning(articles_sorted)
+
+        for base_position, base_article in enumerate(articles_sorted):
+            if window_index.is_removed(base_position):
+                continue
+
+            if simhash_index is not None:
+                # A base is never a candidate again
+                simhash_index.remove(base_position)
+
+            # Earliest remaining article becomes the base
             kept_articles.append(base_article)
 
             print(f"\n📝 处理基准文章: {base_article['file_name']} "
                   f"(日期: {base_article['effective_date'].strftime('%Y-%m-%d')})")
 
-            # Compare with remaining articles
-            to_remove = []
-            for i, other_article in enumerate(remaining_articles):
-                # Check time window
-                time_diff = abs((base_article['effective_date'] -
-                               other_article['effective_date']).days)
-                if time_diff > self.comparison_window_days:
-                    if self.debug_mode:
-                        print(f"    🕐 跳过 {other_article['file_name']} - "
-                              f"时间差 {time_diff} 天 > {self.comparison_window_days} 天窗口")
+            # Skip base articles with insufficient content
+            if base_article['word_count'] < self.min_content_length:
+                if self.debug_mode:
+                    print(f"    📝 跳过比较 - 基准文章字数不足 "
+                          f"({base_article['word_count']} < {self.min_content_length})")
+                continue
+
+            # Collect comparable articles inside the time window
+            near_positions = None
+            if simhash_index is not None:
+                near_positions = {position for position, _ in simhash_index.query(
+                    simhashes[base_position], self.simhash_prefilter_distance)}
+
+            candidates = []
+            for position in window_index.candidates(base_position):
+                other_article = articles_sorted[position]
+
+                if near_positions is not None and position not in near_positions:
                     continue
 
                 # Skip articles with insufficient content
-                if (base_article['word_count'] < self.min_content_length or
-                    other_article['word_count'] < self.min_content_length):
+                if other_article['word_count'] < self.min_content_length:
                     if self.debug_mode:
                         print(f"    📝 跳过 {other_article['file_name']} - 字数不足 "
                               f"(base: {base_article['word_count']}, "
                               f"other: {other_article['word_count']})")
                     continue
 
-                total_comparisons += 1
+                candidates.append((position, other_article))
 
-                # Calculate similarity
-                similarity_result = self.tfidf_calculator.calculate_similarity(
-                    base_article, other_article)
-                similarity_score = similarity_result['overall_similarity']
+            if self.debug_mode:
+                print(f"    🕐 {self.comparison_window_days} 天窗口内候选文章: {len(candidates)} 篇")
+
+            total_comparisons += len(candidates)
+
+            # Check if cross-topic comparison (if enabled)
+            cross_topic_flags = [self._are_cross_topic_articles(base_article, other_article)
+                                 for _, other_article in candidates]
+            thresholds = [self.cross_topic_threshold
+                          if is_cross_topic else self.similarity_threshold
+                          for is_cross_topic in cross_topic_flags]
 
-                # Check if cross-topic comparison (if enabled)
-                is_cross_topic = self._are_cross_topic_articles(base_article, other_article)
-                effective_threshold = (self.config.get('cross_topic_threshold', 0.85)
-                                     if is_cross_topic else self.similarity_threshold)
+            # Score all candidates of this base article in one batch (pairs that
+            # cannot reach their threshold are pruned and come back as None)
+            if sharded_edges is not None:
+                base_edges = sharded_edges.get(base_position, {})
+                similarity_results = [base_edges.get(position) for position, _ in candidates]
+            else:
+                similarity_results = self.tfidf_calculator.calculate_similarities(
+                    base_article, [other_article for _, other_article in candidates], thresholds)
+
+            for (position, other_article), similarity_result, is_cross_topic, effective_threshold in zip(
+                    candidates, similarity_results, cross_topic_flags, thresholds):
+                if similarity_result is None:
+                    if self.debug_mode:
+                        print(f"    ✂️ 跳过 {other_article['file_name']}: 相似度低于阈值 "
+                              f"{effective_threshold:.3f}")
+                    continue
+
+                similarity_score = similarity_result['overall_similarity']
 
                 if self.debug_mode:
                     title_sim = similarity_result['title_similarity']
@@ -141,19 +213,18 @@ class LinearComparison:
                         **other_article,
                         'similarity_to_base': similarity_score,
                         'base_article': base_article['file_name'],
+                        'base_article_path': base_article['file_path'],
                         'is_cross_topic': is_cross_topic,
                         'effective_threshold': effective_threshold,
                         'similarity_details': similarity_result
                     }
                     moved_articles.append(moved_info)
-                    to_remove.append(i)
+                    window_index.remove(position)
+                    if simhash_index is not None:
+                        simhash_index.remove(position)
                 elif self.debug_mode:
                     print(f"    ❌ 不相似 {similarity_score:.3f} < {effective_threshold:.3f}")
 
-            # Remove marked articles
-            for index in reversed(to_remove):
-                remaining_articles.pop(index)
-
         result = {
             'kept_articles': kept_articles,
             'moved_articles': moved_articles,
@@ -164,11 +235,203 @@ class LinearComparison:
 
         print(f"\n✅ 线性检测完成:")
         print(f"  📊 总比较次数: {total_comparisons}")
+        self._print_pruning_summary()
+        print(f"  ✅ 保留文章: {len(kept_articles)} 篇")
+        print(f"  📦 移动文章: {len(moved_articles)} 篇")
+
+        return result
+
+    def detect_similarities_incremental(self, new_articles: List[Dict],
+                                        reference_articles: List[Dict]) -> Dict[str, Any]:
+        """
+        Check new or modified articles against articles kept in earlier runs.
+
+        Reference articles stay kept. Each new article, in chronological order,
+        is compared with every kept article inside its time window (reference
+        articles on both sides, earlier new articles that were kept) and moved
+        if it is similar to any of them; the earliest similar one becomes its
+        base. Without reference articles this gives the same verdicts as
+        detect_similarities().
+
+        Args:
+            new_articles: Articles added or modified since the last run
+            reference_articles: Kept articles from earlier runs near the new articles' dates
+
+        Returns:
+            Detection results dictionary (only new articles are listed)
+        """
+        print(f"🔍 开始增量相似度检测: {len(new_articles)} 篇新文章, "
+              f"{len(reference_articles)} 篇已保留文章作为参照")
+
+        new_dates = self.date_helper.resolve_corpus(new_articles, self._get_article_effective_date)
+        new_sorted = [new_articles[idx] for idx in new_dates.order]
+
+        if self.tfidf_calculator.fit_corpus(reference_articles + new_sorted):
+            print(f"🧮 语料库TF-IDF矩阵构建完成: {len(reference_articles) + len(new_sorted)} 篇文章, "
+                  f"{len(self.tfidf_calculator.corpus_engine.vocabulary)} 个词项")
+        self.tfidf_calculator.prepare_pruning(reference_articles + new_sorted)
+
+        window = self.window_index_class.window_span(self.comparison_window_days)
+
+        # All kept articles (reference and accepted new ones) sorted by date
+        reference_dates = self.date_helper.resolve_corpus(reference_articles,
+                                                          self._get_article_effective_date)
+        kept_pool = [reference_articles[idx] for idx in reference_dates.order]
+        kept_keys = reference_dates.sorted_timestamps.tolist()
+
+        kept_articles = []
+        moved_articles = []
+        total_comparisons = 0
+        processing_date = datetime.now().strftime('%Y-%m-%d')
+
+        for article, key in zip(new_sorted, new_dates.sorted_timestamps.tolist()):
+
+            candidates = []
+            if article['word_count'] >= self.min_content_length:
+                start = bisect_left(kept_keys, key - window)
+                end = bisect_right(kept_keys, key + window)
+                candidates = [other for other in kept_pool[start:end]
+                              if other['word_count'] >= self.min_content_length]
+            elif self.debug_mode:
+                print(f"    📝 跳过比较 - 文章字数不足 "
+                      f"({article['word_count']} < {self.min_content_length})")
+
+            total_comparisons += len(candidates)
+            cross_topic_flags = [self._are_cross_topic_articles(base_article, article)
+                                 for base_article in candidates]
+            thresholds = [self.cross_topic_threshold
+                          if is_cross_topic else self.similarity_threshold
+                          for is_cross_topic in cross_topic_flags]
+            similarity_results = self.tfidf_calculator.calculate_similarities(article, candidates, thresholds)
+
+            match = None
+            for base_article, similarity_result, is_cross_topic, effective_threshold in zip(
+                    candidates, similarity_results, cross_topic_flags, thresholds):
+                if similarity_result is None:
+                    continue
+
+                similarity_score = similarity_result['overall_similarity']
+
+                if self.debug_mode:
+                    print(f"    🔍 比较 {base_article['file_name']}: "
+                          f"综合相似度 {similarity_score:.3f}, 阈值 {effective_threshold:.3f}")
+
+                if similarity_score >= effective_threshold:
+                    match = (base_article, similarity_result, is_cross_topic, effective_threshold)
+                    break
+
+            if match is None:
+                print(f"  ✅ 保留新文章: {article['file_name']} "
+                      f"(日期: {article['effective_date'].strftime('%Y-%m-%d')})")
+                kept_articles.append(article)
+                position = bisect_right(kept_keys, key)
+                kept_keys.insert(position, key)
+                kept_pool.insert(position, article)
+                continue
+
+            base_article, similarity_result, is_cross_topic, effective_threshold = match
+            similarity_score = similarity_result['overall_similarity']
+            print(f"  📦 相似文章 (相似度: {similarity_score:.3f}): "
+                  f"{article['file_name']} ≈ {base_article['file_name']}")
+            moved_articles.append({
+                **article,
+                'similarity_to_base': similarity_score,
+                'base_article': base_article['file_name'],
+                'base_article_path': base_article['file_path'],
+                'is_cross_topic': is_cross_topic,
+                'effective_threshold': effective_threshold,
+                'similarity_details': similarity_result
+            })
+
+        result = {
+            'kept_articles': kept_articles,
+            'moved_articles': moved_articles,
+            'total_comparisons': total_comparisons,
+            'processing_date': processing_date,
+            'algorithm': 'linear',
+            'incremental': True
+        }
+
+        print(f"\n✅ 增量检测完成:")
+        print(f"  📊 总比较次数: {total_comparisons}")
         print(f"  ✅ 保留文章: {len(kept_articles)} 篇")
         print(f"  📦 移动文章: {len(moved_articles)} 篇")
 
         return result
 
+    def _score_sharded(self, articles_sorted: List[Dict], keys, simhashes) -> Dict[int, Dict[int, Dict]]:
+        """
+        Score all window pairs in a process pool.
+
+        Args:
+            articles_sorted: Articles in chronological order
+            keys: Sorted date keys of the articles
+            simhashes: SimHash per article when the prefilter is enabled
+
+        Returns:
+            Mapping of base position to {candidate position: similarity dict}
+            for pairs reaching their effective threshold
+        """
+        try:
+            from .sharded_comparison import ShardedComparison
+        except ImportError:
+            from sharded_comparison import ShardedComparison
+
+        topic_labels = None
+        if self.config.get('topic_classification', {}).get('enabled', False):
+            topic_labels = [self._classify_article_topic(article) for article in articles_sorted]
+
+        scorer = ShardedComparison(self.tfidf_calculator, self.workers)
+        return scorer.score_pairs(
+            articles_sorted, keys, self.comparison_window_days,
+            similarity_threshold=self.similarity_threshold,
+            cross_topic_threshold=self.cross_topic_threshold,
+            topic_labels=topic_labels,
+            min_content_length=self.min_content_length,
+            simhashes=simhashes,
+            max_distance=self.simhash_prefilter_distance)
+
+    def _build_simhash_prefilter(self, articles_sorted: List[Dict]):
+        """
+        Build the optional SimHash candidate filter.
+
+        Only pairs within ``simhash_prefilter_distance`` of each other are sent
+        to TF-IDF scoring. This trades recall for speed, so it is disabled
+        unless ``simhash_prefilter`` is enabled.
+
+        Args:
+            articles_sorted: Articles in chronological order
+
+        Returns:
+            (SimHashIndex keyed by position, fingerprint list) or (None, None)
+        """
+        if not self.simhash_prefilter:
+            return None, None
+
+        try:
+            from .simhash_similarity import SimHashSimilarity
+        except ImportError:
+            from simhash_similarity import SimHashSimilarity
+        from modules.fingerprint import SimHashIndex
+
+        simhash_calculator = SimHashSimilarity(self.config)
+        simhashes = [simhash_calculator.article_simhash(article) for article in articles_sorted]
+
+        index = SimHashIndex(max_distance=self.simhash_prefilter_distance,
+                             num_blocks=self.config.get('simhash_index_blocks'))
+        for position, simhash in enumerate(simhashes):
+            index.add(position, simhash)
+
+        print(f"🧬 SimHash候选过滤已启用: 汉明距离 <= {self.simhash_prefilter_distance}")
+        return index, simhashes
+
+    def _print_pruning_summary(self):
+        """Report how many pairs the threshold pruning skipped."""
+        similarity_join = self.tfidf_calculator.similarity_join
+        if similarity_join is not None and similarity_join.checked:
+            print(f"  ✂️ 阈值剪枝: 跳过 {similarity_join.pruned}/{similarity_join.checked} 对 "
+                  f"(相似度上界低于阈值)")
+
     def _get_article_effective_date(self, article: Dict) -> datetime:
         """
         Get effective date for article (used for sorting).
@@ -181,8 +444,12 @@ class LinearComparison:
         Returns:
             Effective date
         """
+        # Precomputed by ArticleAnalyzer
+        if article.get('effective_date'):
+            return article['effective_date']
+
         # Try to extract date from filename
-        filename_date = self._extract_date_from_filename(article['file_name'])
+        filename_date = self.date_helper.extract_date_from_filename(article['file_name'])
         if filename_date:
             return filename_date
 
@@ -193,40 +460,6 @@ class LinearComparison:
         # Use modified time as fallback
         return article['modified_time']
 
-    def _extract_date_from_filename(self, filename: str) -> Optional[datetime]:
-        """
-        Extract date from filename.
-
-        Supports formats: xxx-20250914.md, xxx-2025-09-14.md etc.
-
-        Args:
-            filename: Filename to parse
-
-        Returns:
-            Extracted datetime or None
-        """
-        import re
-
-        # Match YYYYMMDD format
-        date_pattern1 = re.search(r'(\d{8})', filename)
-        if date_pattern1:
-            try:
-                date_str = date_pattern1.group(1)
-                return datetime.strptime(date_str, '%Y%m%d')
-            except ValueError:
-                pass
-
-        # Match YYYY-MM-DD format
-        date_pattern2 = re.search(r'(\d{4}-\d{2}-\d{2})', filename)
-        if date_pattern2:
-            try:
-                date_str = date_pattern2.group(1)
-                return datetime.strptime(date_str, '%Y-%m-%d')
-            except ValueError:
-                pass
-
-        return None
-
     def _are_cross_topic_articles(self, article1: Dict, article2: Dict) -> bool:
         """
         Check if two articles belong to different topics.
@@ -254,45 +487,18 @@ class LinearComparison:
         """
         Classify article topic based on content.
 
+        Uses the topic scores stored by ArticleAnalyzer; articles without
+        current scores are classified with the keyword automaton once.
+
         Args:
             article: Article information
 
         Returns:
             Topic category name or None if cannot classify
         """
-        topic_config = self.config.get('topic_classification', {})
-        if not topic_config.get('enabled', False):
-            return None
-
-        topics = topic_config.get('topics', {})
-        if not topics:
-            return None
-
-        # Combine title and content for classification
-        text_to_classify = (article['title'] + ' ' + article['content']).lower()
-
-        # Calculate scores for each topic
-        topic_scores = {}
-        for topic_name, topic_settings in topics.items():
-            keywords = topic_settings.get('keywords', [])
-            if not keywords:
-                continue
-
-            score = 0
-            for keyword in keywords:
-                if keyword.lower() in text_to_classify:
-                    score += 1
-
-            if score > 0:
-                # Normalize score (matched keywords / total keywords)
-                topic_scores[topic_name] = score / len(keywords)
-
-        if not topic_scores:
+        if self.topic_classifier is None:
             return None
-
-        # Return topic with highest score
-        best_topic = max(topic_scores.items(), key=lambda x: x[1])
-        return best_topic[0] if best_topic[1] > 0.1 else None  # At least 10% keyword match
+        return self.topic_classifier.classify(article)
 
     def set_debug_mode(self, enabled: bool):
         """Enable or disable debug mode."""
@@ -303,7 +509,7 @@ class LinearComparison:
         return {
             'name': 'Linear Comparison',
             'description': 'Sequential chronological comparison algorithm',
-            'complexity': 'O(n²) worst case, O(n) optimized with time windows',
+            'complexity': 'O(n log n + n·w) where w is the number of articles per time window',
             'suitable_for': 'Large datasets with chronological data',
             'features': [
                 'Time-based optimization',
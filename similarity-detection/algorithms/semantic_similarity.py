@@ -8,12 +8,23 @@ and embedding models for deep content understanding.
 """
 
 import json
-import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 import numpy as np
 
+try:
+    from .embedding_store import EmbeddingStore
+    from .ann_index import IVFFlatIndex
+except ImportError:
+    from embedding_store import EmbeddingStore
+    from ann_index import IVFFlatIndex
+
+try:
+    from ..utils.text_pipeline import content_key, get_text_pipeline, preprocess_for_semantic
+except ImportError:
+    from utils.text_pipeline import content_key, get_text_pipeline, preprocess_for_semantic
+
 
 class SemanticSimilarity:
     """
@@ -36,10 +47,31 @@ class SemanticSimilarity:
         self.embedding_model_name = config.get('embedding_model', 'all-MiniLM-L6-v2')
         self.min_content_length = config.get('min_content_length', 500)
         self.fingerprint_cache_path = config.get('fingerprint_db_path', 'data/content_fingerprints.json')
+        self.embedding_store_path = config.get('embedding_store_path', 'data/semantic_embeddings')
+        self.batch_size = config.get('embedding_batch_size', 32)
+        self.block_size = config.get('similarity_block_size', 1024)
+
+        # Approximate nearest-neighbour index over the stored embeddings (lazy)
+        self.ann_index_path = config.get('ann_index_path', f"{self.embedding_store_path}.ivf")
+        self.ann_nlist = config.get('ann_nlist')
+        self.ann_nprobe = config.get('ann_nprobe', 8)
+        self.ann_rerank_factor = config.get('ann_rerank_factor', 4)
+        self.ann_index = None
+        self._ann_synced_revision = None
+
+        # Preprocessed content is memoized per article across algorithms
+        self.pipeline = get_text_pipeline()
 
         # Initialize model (lazy loading)
         self.model = None
-        self.fingerprint_db = self._load_fingerprint_database()
+        self.embedding_store = EmbeddingStore(
+            self.embedding_store_path,
+            compact_ratio=config.get('embedding_compact_ratio', 0.5)
+        )
+        if not Path(self.embedding_store.index_path).exists():
+            self._import_legacy_embeddings()
+        elif self.embedding_store.needs_compaction():
+            self.embedding_store.compact()
 
     def _load_embedding_model(self):
         """Load the sentence transformer model."""
@@ -68,6 +100,29 @@ class SemanticSimilarity:
             print(f"⚠️ 指纹数据库加载失败: {e}")
             return {'version': '1.0', 'fingerprints': {}}
 
+    def _import_legacy_embeddings(self):
+        """Copy embeddings from the old JSON fingerprint database into the binary store."""
+        fingerprints = self._load_fingerprint_database().get('fingerprints', {})
+        if not isinstance(fingerprints, dict):
+            return
+
+        imported = 0
+        for content_hash, data in fingerprints.items():
+            if not isinstance(data, dict) or 'embedding' not in data:
+                continue
+            try:
+                self.embedding_store.add(content_hash,
+                                         data.get('model', self.embedding_model_name),
+                                         np.asarray(data['embedding'], dtype=np.float32),
+                                         data.get('file_path', ''),
+                                         data.get('timestamp'))
+                imported += 1
+            except Exception:
+                continue
+
+        if imported:
+            print(f"📦 已将 {imported} 个语义嵌入从JSON指纹库迁移到二进制存储")
+
     def calculate_similarity(self, article1: Dict, article2: Dict) -> Dict[str, float]:
         """
         Calculate semantic similarity between two articles.
@@ -81,9 +136,9 @@ class SemanticSimilarity:
         """
         model = self._load_embedding_model()
 
-        # Extract and preprocess content
-        content1 = self._preprocess_content(article1.get('content', ''))
-        content2 = self._preprocess_content(article2.get('content', ''))
+        # Preprocessed content (memoized per article)
+        content1 = self.pipeline.article_semantic_text(article1)
+        content2 = self.pipeline.article_semantic_text(article2)
 
         if not content1 or not content2:
             return {
@@ -103,8 +158,10 @@ class SemanticSimilarity:
             }
 
         # Generate embeddings
-        embedding1 = self._get_content_embedding(content1, article1.get('file_path', ''))
-        embedding2 = self._get_content_embedding(content2, article2.get('file_path', ''))
+        embedding1 = self._get_content_embedding(content1, article1.get('file_path', ''),
+                                                 self._embedding_key(article1))
+        embedding2 = self._get_content_embedding(content2, article2.get('file_path', ''),
+                                                 self._embedding_key(article2))
 
         if embedding1 is None or embedding2 is None:
             return {
@@ -130,28 +187,34 @@ class SemanticSimilarity:
             'threshold_used': self.similarity_threshold
         }
 
-    def _get_content_embedding(self, content: str, file_path: str = '') -> Optional[np.ndarray]:
+    def _embedding_key(self, article: Dict) -> str:
+        """Embedding store key of an article (hash of its preprocessed content, memoized)."""
+        return self.pipeline.cached(
+            'semantic_key', article.get('content', ''), article.get('content_hash'),
+            lambda _: content_key(self.pipeline.article_semantic_text(article)))
+
+    def _get_content_embedding(self, content: str, file_path: str = '',
+                               content_hash: Optional[str] = None) -> Optional[np.ndarray]:
         """
         Get or generate content embedding with caching.
 
         Args:
-            content: Content to embed
+            content: Preprocessed content to embed
             file_path: File path for caching
+            content_hash: Hash of the content (computed if None)
 
         Returns:
             Content embedding or None if failed
         """
         # Generate content hash for caching
-        content_hash = hashlib.md5(content.encode('utf-8')).hexdigest()
+        if content_hash is None:
+            content_hash = content_key(content)
 
         # Check cache
-        if content_hash in self.fingerprint_db.get('fingerprints', {}):
-            cached_data = self.fingerprint_db['fingerprints'][content_hash]
-            if 'embedding' in cached_data:
-                try:
-                    return np.array(cached_data['embedding'])
-                except Exception:
-                    pass
+        cached_embedding = self.embedding_store.get(content_hash, self.embedding_model_name)
+        if cached_embedding is not None:
+            self.embedding_store.add_file_path(content_hash, self.embedding_model_name, file_path)
+            return cached_embedding
 
         # Generate new embedding
         try:
@@ -168,25 +231,9 @@ class SemanticSimilarity:
             return None
 
     def _cache_embedding(self, content_hash: str, embedding: np.ndarray, file_path: str = ''):
-        """Cache embedding to fingerprint database."""
+        """Append embedding to the binary embedding store."""
         try:
-            fingerprint_data = {
-                'embedding': embedding.tolist(),
-                'model': self.embedding_model_name,
-                'timestamp': datetime.now().isoformat(),
-                'file_path': file_path
-            }
-
-            if 'fingerprints' not in self.fingerprint_db:
-                self.fingerprint_db['fingerprints'] = {}
-
-            self.fingerprint_db['fingerprints'][content_hash] = fingerprint_data
-
-            # Save to file
-            Path(self.fingerprint_cache_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(self.fingerprint_cache_path, 'w', encoding='utf-8') as f:
-                json.dump(self.fingerprint_db, f, indent=2, ensure_ascii=False)
-
+            self.embedding_store.add(content_hash, self.embedding_model_name, embedding, file_path)
         except Exception as e:
             print(f"⚠️ 缓存嵌入失败: {e}")
 
@@ -200,19 +247,8 @@ class SemanticSimilarity:
         Returns:
             Preprocessed content
         """
-        if not content:
-            return ""
-
-        # Remove excessive whitespace
-        import re
-        content = re.sub(r'\s+', ' ', content)
-
-        # Truncate if too long (models have token limits)
-        max_length = 8000  # Conservative limit for most models
-        if len(content) > max_length:
-            content = content[:max_length] + "..."
-
-        return content.strip()
+        # Collapses whitespace and truncates to the model input limit
+        return preprocess_for_semantic(content)
 
     def _cosine_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
@@ -255,45 +291,320 @@ class SemanticSimilarity:
         if threshold is None:
             threshold = self.similarity_threshold
 
-        target_content = self._preprocess_content(target_article.get('content', ''))
+        target_content = self.pipeline.article_semantic_text(target_article)
         if not target_content:
             return []
 
+        target_hash = self._embedding_key(target_article)
         target_embedding = self._get_content_embedding(
-            target_content, target_article.get('file_path', ''))
+            target_content, target_article.get('file_path', ''), target_hash)
         if target_embedding is None:
             return []
 
-        similar_articles = []
+        # Skip self
+        candidates = [candidate for candidate in candidate_articles
+                      if candidate.get('file_path') != target_article.get('file_path')]
+        if not candidates:
+            return []
 
-        for candidate in candidate_articles:
-            # Skip self
-            if candidate.get('file_path') == target_article.get('file_path'):
-                continue
+        # Embed all candidates in batches, then score them with one matrix-vector product
+        embeddings, valid = self._normalized_embeddings(candidates)
+        target_matrix, target_valid = self._normalize_rows([target_embedding])
+        if not target_valid[0]:
+            return []
 
-            candidate_content = self._preprocess_content(candidate.get('content', ''))
-            if not candidate_content:
-                continue
+        similarities = embeddings @ target_matrix[0]
+        similar_articles = [(candidates[i], float(similarities[i]))
+                            for i in np.flatnonzero(valid & (similarities >= threshold))]
+
+        # Sort by similarity (descending)
+        similar_articles.sort(key=lambda x: x[1], reverse=True)
+
+        return similar_articles
+
+    def get_embeddings(self, articles: List[Dict]) -> List[Optional[np.ndarray]]:
+        """
+        Get embeddings for many articles, encoding uncached ones in batches.
+
+        Args:
+            articles: List of articles
+
+        Returns:
+            Embedding per article (None for empty content or failures)
+        """
+        contents = [self.pipeline.article_semantic_text(article) for article in articles]
+        hashes = [self._embedding_key(article) for article in articles]
 
-            candidate_embedding = self._get_content_embedding(
-                candidate_content, candidate.get('file_path', ''))
-            if candidate_embedding is None:
+        embeddings: List[Optional[np.ndarray]] = [None] * len(articles)
+        missing: Dict[str, Tuple[str, str]] = {}
+        for i, (content, content_hash) in enumerate(zip(contents, hashes)):
+            if not content:
                 continue
+            embeddings[i] = self.embedding_store.get(content_hash, self.embedding_model_name)
+            if embeddings[i] is None and content_hash not in missing:
+                missing[content_hash] = (content, articles[i].get('file_path', ''))
 
-            similarity = self._cosine_similarity(target_embedding, candidate_embedding)
+        if missing:
+            try:
+                model = self._load_embedding_model()
+                pending = list(missing.items())
+                for start in range(0, len(pending), self.batch_size):
+                    batch = pending[start:start + self.batch_size]
+                    vectors = model.encode([content for _, (content, _) in batch],
+                                           batch_size=self.batch_size)
+                    for (content_hash, (_, file_path)), vector in zip(batch, vectors):
+                        self._cache_embedding(content_hash, np.asarray(vector), file_path)
+            except Exception as e:
+                print(f"❌ 生成语义嵌入失败: {e}")
 
-            if similarity >= threshold:
-                similar_articles.append((candidate, similarity))
+            for i, content_hash in enumerate(hashes):
+                if embeddings[i] is None and content_hash in missing:
+                    embeddings[i] = self.embedding_store.get(content_hash, self.embedding_model_name)
 
-        # Sort by similarity (descending)
-        similar_articles.sort(key=lambda x: x[1], reverse=True)
+        # Every file with stored content is recorded, so identical copies can be found
+        for i, content_hash in enumerate(hashes):
+            if embeddings[i] is not None:
+                self.embedding_store.add_file_path(content_hash, self.embedding_model_name,
+                                                   articles[i].get('file_path', ''))
 
-        return similar_articles
+        return embeddings
+
+    def _normalize_rows(self, embeddings: List[Optional[np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stack embeddings into an L2-normalized float32 matrix.
+
+        Args:
+            embeddings: Embedding per row (None rows become zero vectors)
+
+        Returns:
+            (matrix, valid mask)
+        """
+        dim = next((embedding.shape[-1] for embedding in embeddings if embedding is not None), 0)
+        matrix = np.zeros((len(embeddings), dim), dtype=np.float32)
+        for i, embedding in enumerate(embeddings):
+            if embedding is not None:
+                matrix[i] = embedding
+
+        norms = np.linalg.norm(matrix, axis=1)
+        valid = norms > 0
+        matrix[valid] /= norms[valid, None]
+        return matrix, valid
+
+    def _normalized_embeddings(self, articles: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Batched embeddings of articles as an L2-normalized matrix plus valid mask."""
+        return self._normalize_rows(self.get_embeddings(articles))
+
+    def _similarity_blocks(self, embeddings: np.ndarray, valid: np.ndarray,
+                           upper_only: bool) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """
+        Yield cosine similarity tiles of a normalized embedding matrix.
+
+        Each tile is at most block_size x block_size, so memory stays bounded
+        regardless of corpus size. Self-similarities and invalid rows/columns
+        are set to -inf.
+
+        Args:
+            embeddings: L2-normalized matrix
+            valid: Rows with a usable embedding
+            upper_only: Only yield tiles on or above the diagonal
+
+        Yields:
+            (row_start, column_start, tile)
+        """
+        n = embeddings.shape[0]
+        block = max(1, self.block_size)
+        for row_start in range(0, n, block):
+            rows = embeddings[row_start:row_start + block]
+            for col_start in range(row_start if upper_only else 0, n, block):
+                tile = rows @ embeddings[col_start:col_start + block].T
+                tile[~valid[row_start:row_start + block], :] = -np.inf
+                tile[:, ~valid[col_start:col_start + block]] = -np.inf
+                if col_start == row_start:
+                    np.fill_diagonal(tile, -np.inf)
+                yield row_start, col_start, tile
+
+    def find_similar_pairs(self, articles: List[Dict], threshold: Optional[float] = None,
+                           top_k: Optional[int] = None) -> List[Tuple[int, int, float]]:
+        """
+        Find semantically similar article pairs without a dense matrix.
+
+        Similarities are computed as blocked matrix products; only pairs at or
+        above the threshold are kept, optionally limited to each article's
+        top_k most similar neighbours.
+
+        Args:
+            articles: List of articles
+            threshold: Similarity threshold (uses default if None)
+            top_k: Maximum neighbours per article (None = all above threshold)
+
+        Returns:
+            List of (index_i, index_j, similarity) with i < j, most similar first
+        """
+        if threshold is None:
+            threshold = self.similarity_threshold
+
+        embeddings, valid = self._normalized_embeddings(articles)
+        pairs: Dict[Tuple[int, int], float] = {}
+
+        if top_k is None:
+            for row_start, col_start, tile in self._similarity_blocks(embeddings, valid, upper_only=True):
+                rows, cols = np.nonzero(tile >= threshold)
+                for i, j, similarity in zip(rows + row_start, cols + col_start, tile[rows, cols]):
+                    if i < j:
+                        pairs[(int(i), int(j))] = float(similarity)
+        elif top_k > 0:
+            n = embeddings.shape[0]
+            best_scores = np.full((n, top_k), -np.inf, dtype=np.float32)
+            best_columns = np.zeros((n, top_k), dtype=np.int64)
+
+            for row_start, col_start, tile in self._similarity_blocks(embeddings, valid, upper_only=False):
+                row_end = row_start + tile.shape[0]
+                columns = np.arange(col_start, col_start + tile.shape[1])
+                scores = np.concatenate([best_scores[row_start:row_end], tile], axis=1)
+                candidates = np.concatenate(
+                    [best_columns[row_start:row_end], np.broadcast_to(columns, tile.shape)], axis=1)
+                keep = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+                best_scores[row_start:row_end] = np.take_along_axis(scores, keep, axis=1)
+                best_columns[row_start:row_end] = np.take_along_axis(candidates, keep, axis=1)
+
+            rows, ranks = np.nonzero(best_scores >= threshold)
+            for i, j, similarity in zip(rows, best_columns[rows, ranks], best_scores[rows, ranks]):
+                pairs[(int(min(i, j)), int(max(i, j)))] = float(similarity)
+
+        return sorted(((i, j, similarity) for (i, j), similarity in pairs.items()),
+                      key=lambda pair: (-pair[2], pair[0], pair[1]))
+
+    def _get_ann_index(self) -> IVFFlatIndex:
+        """
+        Load the ANN index and sync it with the embedding store.
+
+        Embeddings of the current model that are missing from the index are
+        inserted, and keys no longer in the store are removed. The sync only
+        runs when the store changed since the last call.
+        """
+        if self.ann_index is None:
+            index = IVFFlatIndex.load(self.ann_index_path, nprobe=self.ann_nprobe)
+            if index is None or index.metadata.get('model') != self.embedding_model_name:
+                index = IVFFlatIndex(nlist=self.ann_nlist, nprobe=self.ann_nprobe)
+            index.metadata['model'] = self.embedding_model_name
+            self.ann_index = index
+
+        index = self.ann_index
+        if self._ann_synced_revision == self.embedding_store.revision:
+            return index
+
+        stored = {content_hash for content_hash, model in self.embedding_store.entries
+                  if model == self.embedding_model_name}
+        missing = [content_hash for content_hash in stored if content_hash not in index]
+        stale = [key for key in index.rows if key not in stored]
+
+        for key in stale:
+            index.remove(key)
+        if missing:
+            index.add(missing, np.stack([self.embedding_store.get(content_hash, self.embedding_model_name)
+                                         for content_hash in missing]))
+        self._ann_synced_revision = self.embedding_store.revision
+
+        return index
+
+    def save_ann_index(self):
+        """Persist the ANN index next to the embedding store."""
+        try:
+            self._get_ann_index().save(self.ann_index_path)
+        except Exception as e:
+            print(f"⚠️ 近邻索引保存失败: {e}")
+
+    def index_articles(self, articles: List[Dict]) -> int:
+        """
+        Embed articles (batched, cached) and add them to the ANN index.
+
+        Args:
+            articles: Articles to make searchable
+
+        Returns:
+            Number of indexed embeddings
+        """
+        self.get_embeddings(articles)
+        self.save_ann_index()
+        return len(self.ann_index)
+
+    def query_similar(self, target_article: Dict, top_k: int = 10,
+                      threshold: Optional[float] = None,
+                      nprobe: Optional[int] = None) -> List[Dict]:
+        """
+        Find the nearest indexed articles to a target via the ANN index.
+
+        The index returns a shortlist of ``top_k * ann_rerank_factor``
+        candidates from the ``nprobe`` closest clusters; the shortlist is
+        re-ranked with the exact float32 embeddings. Raising nprobe improves
+        recall at the cost of latency. Every file recorded for a matching
+        embedding is returned, including identical copies of the target; only
+        the target's own file is left out.
+
+        Args:
+            target_article: Article to search for
+            top_k: Maximum number of neighbours
+            threshold: Similarity threshold (uses default if None)
+            nprobe: Clusters to scan (uses ann_nprobe if None)
+
+        Returns:
+            List of dicts with content_hash, file_path and similarity (one per
+            file), most similar first
+        """
+        if threshold is None:
+            threshold = self.similarity_threshold
+
+        target_content = self.pipeline.article_semantic_text(target_article)
+        if not target_content:
+            return []
+
+        target_hash = self._embedding_key(target_article)
+        target_embedding = self._get_content_embedding(
+            target_content, target_article.get('file_path', ''), target_hash)
+        if target_embedding is None:
+            return []
+
+        index = self._get_ann_index()
+        shortlist = [key for key, _ in index.search(
+            target_embedding, top_k * self.ann_rerank_factor + 1, nprobe=nprobe)]
+        if not shortlist:
+            return []
+
+        # Exact re-ranking with the stored float32 embeddings
+        candidates, valid = self._normalize_rows(
+            [self.embedding_store.get(key, self.embedding_model_name) for key in shortlist])
+        query, query_valid = self._normalize_rows([target_embedding])
+        if not query_valid[0]:
+            return []
+        similarities = candidates @ query[0]
+
+        target_path = target_article.get('file_path', '')
+        results = []
+        for i in np.argsort(-similarities, kind='stable'):
+            if not valid[i]:
+                continue
+            if similarities[i] < threshold or len(results) >= top_k:
+                break
+            record = self.embedding_store.entries.get((shortlist[i], self.embedding_model_name), {})
+            for file_path in record.get('file_paths') or ['']:
+                # Skip the target itself (by path, or by hash when it has no path)
+                if file_path == target_path and (file_path or shortlist[i] == target_hash):
+                    continue
+                results.append({
+                    'content_hash': shortlist[i],
+                    'file_path': file_path,
+                    'similarity': float(similarities[i])
+                })
+
+        return results[:top_k]
 
     def batch_similarity_matrix(self, articles: List[Dict]) -> np.ndarray:
         """
         Generate similarity matrix for multiple articles.
 
+        The dense n x n result is only suitable for small sets; use
+        find_similar_pairs for large corpora.
+
         Args:
             articles: List of articles
 
@@ -303,23 +614,15 @@ class SemanticSimilarity:
         n = len(articles)
         similarity_matrix = np.zeros((n, n))
 
-        # Generate all embeddings
-        embeddings = []
-        for article in articles:
-            content = self._preprocess_content(article.get('content', ''))
-            embedding = self._get_content_embedding(content, article.get('file_path', ''))
-            embeddings.append(embedding)
+        # Generate all embeddings in batches
+        embeddings, valid = self._normalized_embeddings(articles)
 
-        # Calculate pairwise similarities
-        for i in range(n):
-            similarity_matrix[i][i] = 1.0  # Self-similarity
-
-            for j in range(i + 1, n):
-                if embeddings[i] is not None and embeddings[j] is not None:
-                    similarity = self._cosine_similarity(embeddings[i], embeddings[j])
-                    similarity_matrix[i][j] = similarity
-                    similarity_matrix[j][i] = similarity
+        # Fill the matrix tile by tile
+        for row_start, col_start, tile in self._similarity_blocks(embeddings, valid, upper_only=False):
+            similarity_matrix[row_start:row_start + tile.shape[0],
+                              col_start:col_start + tile.shape[1]] = np.where(np.isneginf(tile), 0.0, tile)
 
+        np.fill_diagonal(similarity_matrix, 1.0)  # Self-similarity
         return similarity_matrix
 
     def cleanup_cache(self, days_to_keep: int = 30):
@@ -329,30 +632,27 @@ class SemanticSimilarity:
         Args:
             days_to_keep: Number of days to keep cached data
         """
-        if 'fingerprints' not in self.fingerprint_db:
-            return
-
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
         fingerprints_to_remove = []
 
-        for content_hash, data in self.fingerprint_db['fingerprints'].items():
+        for key, record in self.embedding_store.items():
             try:
-                timestamp = datetime.fromisoformat(data.get('timestamp', ''))
+                timestamp = datetime.fromisoformat(record.get('timestamp', ''))
                 if timestamp < cutoff_date:
-                    fingerprints_to_remove.append(content_hash)
+                    fingerprints_to_remove.append(key)
             except Exception:
                 # Remove invalid timestamps
-                fingerprints_to_remove.append(content_hash)
+                fingerprints_to_remove.append(key)
 
         # Remove old fingerprints
-        for content_hash in fingerprints_to_remove:
-            del self.fingerprint_db['fingerprints'][content_hash]
+        for content_hash, model in fingerprints_to_remove:
+            self.embedding_store.remove(content_hash, model)
 
-        # Save updated database
+        # Reclaim space once enough rows are dead
         if fingerprints_to_remove:
             try:
-                with open(self.fingerprint_cache_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.fingerprint_db, f, indent=2, ensure_ascii=False)
+                if self.embedding_store.needs_compaction():
+                    self.embedding_store.compact()
                 print(f"🧹 清理了 {len(fingerprints_to_remove)} 个过期缓存项")
             except Exception as e:
                 print(f"⚠️ 缓存清理失败: {e}")
@@ -367,7 +667,9 @@ class SemanticSimilarity:
             'features': [
                 'Semantic understanding',
                 'Pre-trained language models',
-                'Embedding caching',
+                'Memory-mapped embedding store',
+                'Batched encoding and blocked similarity',
+                'IVF nearest-neighbour index with exact re-ranking',
                 'Configurable models'
             ],
             'parameters': {
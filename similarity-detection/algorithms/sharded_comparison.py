@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sharded Pair Scoring
+
+Scores all article pairs inside the comparison window in a process pool.
+Chronologically sorted articles are cut into blocks of base articles; each
+block is scored against its own articles plus the following ones up to the
+end of the last base's window, so blocks overlap by one window and every pair
+belongs to exactly one block (the block of its earlier article).
+
+Workers never receive article dictionaries. The parent writes read-only
+feature arrays (term counts or TF-IDF rows, title token sets, hashes, word
+counts, topics, dates) as ``.npy`` files and workers memory-map them. Scores
+are computed with the same floating point operations as TFIDFSimilarity, so a
+pair reaches the threshold in sharded mode exactly when it does in a single
+process. Results are returned per block in block order and merged
+deterministically by the caller.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+try:
+    from .time_window import TimeWindowIndex
+except ImportError:
+    from time_window import TimeWindowIndex
+
+# Scored cells (bases x window columns) per block; bounds worker memory
+DEFAULT_BLOCK_CELLS = 1 << 20
+
+# Set bits per byte value (SimHash Hamming distances)
+_BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.int64)
+
+# Feature arrays of one sharded run (loaded by the workers with mmap)
+_worker_features: Optional[Dict[str, np.ndarray]] = None
+
+
+def _hash_key(text: Optional[str]) -> int:
+    """64-bit key of a string (0 for missing values)."""
+    if text is None:
+        return 0
+    return int.from_bytes(hashlib.md5(text.encode('utf-8')).digest()[:8], 'little')
+
+
+def _csr_arrays(rows: Sequence[Dict], vocabulary: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """CSR (data, indices, indptr) of term -> value mappings."""
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+    for row in rows:
+        for term, value in row.items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(value)
+        indptr.append(len(indices))
+    return (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64),
+            np.asarray(indptr, dtype=np.int64))
+
+
+def _init_shard_worker(feature_dir: str):
+    """Memory-map the feature arrays once per worker process."""
+    global _worker_features
+    _worker_features = {
+        name[:-4]: np.load(os.path.join(feature_dir, name), mmap_mode='r')
+        for name in os.listdir(feature_dir) if name.endswith('.npy')
+    }
+
+
+def _rows(features: Dict[str, np.ndarray], prefix: str, width: int) -> sparse.csr_matrix:
+    """Rebuild a CSR matrix from mapped arrays."""
+    indptr = features[prefix + '_indptr']
+    return sparse.csr_matrix((features[prefix + '_data'], features[prefix + '_indices'], indptr),
+                             shape=(len(indptr) - 1, width))
+
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    """Number of set bits per uint64 value."""
+    counts = np.zeros(values.shape, dtype=np.int64)
+    for shift in range(0, 64, 8):
+        counts += _BYTE_POPCOUNT[(values >> np.uint64(shift)) & np.uint64(0xFF)]
+    return counts
+
+
+def _score_block(task: Tuple) -> Tuple[np.ndarray, ...]:
+    """
+    Score the pairs of one block and keep those reaching their threshold.
+
+    Args:
+        task: (start, end, window_end, params) where bases are positions
+              [start, end) and candidates are later positions < window_end
+
+    Returns:
+        (base positions, candidate positions, title, content, overall similarity)
+    """
+    start, end, window_end, params = task
+    features = _worker_features
+    base = slice(start, end)
+    columns = slice(start, window_end)
+    column_ids = np.arange(start, window_end)
+    base_ids = np.arange(start, end)
+
+    # Window and candidate filters
+    keys = features['keys']
+    mask = column_ids[None, :] > base_ids[:, None]
+    mask &= keys[columns][None, :] - keys[base][:, None] <= params['window_span']
+    word_count = features['word_count']
+    min_length = params['min_content_length']
+    mask &= (word_count[base] >= min_length)[:, None] & (word_count[columns] >= min_length)[None, :]
+    if 'simhash' in features:
+        simhash = features['simhash']
+        distance = _popcount64(simhash[base][:, None] ^ simhash[columns][None, :])
+        mask &= distance <= params['max_distance']
+
+    if not mask.any():
+        empty = np.zeros(0)
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), empty, empty, empty
+
+    shape = mask.shape
+
+    # Title similarity (Jaccard of token sets)
+    title = np.zeros(shape)
+    if params['check_title']:
+        titles = _rows(features, 'title', params['title_width'])
+        shared = (titles[columns] @ titles[base].T).toarray().T
+        size_base = features['title_size'][base][:, None]
+        size_other = features['title_size'][columns][None, :]
+        union = size_base + size_other - shared
+        with np.errstate(divide='ignore', invalid='ignore'):
+            title = np.where(union > 0, shared / union, 0.0)
+        title = np.where((size_base == 0) & (size_other == 0), 1.0, title)
+        present = features['title_present']
+        title = np.where(present[base][:, None] & present[columns][None, :], title, 0.0)
+
+    # Content similarity (cosine), candidate rows first as in similarities_to
+    content = np.zeros(shape)
+    if params['check_content']:
+        vectors = _rows(features, 'content', params['content_width'])
+        dots = (vectors[columns] @ vectors[base].T).toarray().T
+        text_keys = features['text_key']
+        identical = text_keys[base][:, None] == text_keys[columns][None, :]
+        if params['content_mode'] == 'corpus':
+            content = np.minimum(dots, 1.0)
+            content[identical & (text_keys[base][:, None] != 0)] = 1.0
+        else:
+            magnitude = features['magnitude']
+            norms = magnitude[base][:, None] * magnitude[columns][None, :]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                content = np.where(norms != 0, dots / norms, 0.0)
+            content[identical] = 1.0
+            has_content = features['has_content']
+            content[~(has_content[base][:, None] & has_content[columns][None, :])] = 0.0
+
+    overall = np.minimum(title * params['title_weight'] + content * params['content_weight'], 1.0)
+
+    # Identical content scores 1.0 in every component
+    content_hash = features['content_hash']
+    same_content = content_hash[base][:, None] == content_hash[columns][None, :]
+    title[same_content] = 1.0
+    content[same_content] = 1.0
+    overall[same_content] = 1.0
+
+    # Effective threshold per pair (higher for cross-topic pairs)
+    threshold = np.full(shape, params['similarity_threshold'])
+    if params['topics_enabled']:
+        topic = features['topic']
+        cross = ((topic[base][:, None] >= 0) & (topic[columns][None, :] >= 0)
+                 & (topic[base][:, None] != topic[columns][None, :]))
+        threshold[cross] = params['cross_topic_threshold']
+
+    rows, cols = np.nonzero(mask & (overall >= threshold))
+    return (rows + start, cols + start, title[rows, cols], content[rows, cols], overall[rows, cols])
+
+
+class ShardedComparison:
+    """
+    Process-pool scorer for the pairs inside the comparison window.
+
+    Used by LinearComparison and GraphClustering when more than one worker
+    is configured.
+    """
+
+    def __init__(self, tfidf_calculator, workers: int, block_cells: int = DEFAULT_BLOCK_CELLS):
+        """
+        Initialize the scorer.
+
+        Args:
+            tfidf_calculator: Fitted TFIDFSimilarity (weights, engine, pipeline)
+            workers: Number of worker processes
+            block_cells: Maximum bases x window columns scored per task
+        """
+        self.tfidf_calculator = tfidf_calculator
+        self.workers = max(1, workers)
+        self.block_cells = max(1, block_cells)
+
+    def score_pairs(self, articles: List[Dict], keys: Sequence[int], window_days: int,
+                    similarity_threshold: float, cross_topic_threshold: float,
+                    topic_labels: Optional[Sequence[Optional[str]]] = None,
+                    min_content_length: int = 0,
+                    simhashes: Optional[Sequence[int]] = None,
+                    max_distance: int = 0) -> Dict[int, Dict[int, Dict[str, float]]]:
+        """
+        Find all window pairs whose similarity reaches their threshold.
+
+        Args:
+            articles: Articles in chronological order
+            keys: Sorted date keys of the articles (TimeWindowIndex keys)
+            window_days: Comparison window in days
+            similarity_threshold: Threshold for same-topic pairs
+            cross_topic_threshold: Threshold for cross-topic pairs
+            topic_labels: Topic label per article (None = topics disabled)
+            min_content_length: Minimum word count of both articles of a pair
+            simhashes: Optional SimHash per article (candidate filter)
+            max_distance: Maximum Hamming distance when simhashes are given
+
+        Returns:
+            Mapping of base position to {candidate position: similarity dict}
+            (pairs below their threshold are absent)
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        span = TimeWindowIndex.window_span(window_days)
+        window_ends = np.searchsorted(keys, keys + span, side='right')
+        tasks = self._plan_blocks(window_ends)
+
+        feature_dir = tempfile.mkdtemp(prefix='similarity-shards-')
+        try:
+            params = self._write_features(feature_dir, articles, keys, topic_labels, simhashes)
+            params.update({
+                'window_span': span,
+                'min_content_length': min_content_length,
+                'max_distance': max_distance,
+                'similarity_threshold': similarity_threshold,
+                'cross_topic_threshold': cross_topic_threshold,
+                'topics_enabled': topic_labels is not None,
+            })
+
+            print(f"⚙️ 分片并行比较: {self.workers} 个进程, {len(tasks)} 个时间窗口分块")
+
+            edges: Dict[int, Dict[int, Dict[str, float]]] = {}
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_shard_worker,
+                                     initargs=(feature_dir,)) as executor:
+                block_tasks = [(start, end, window_end, params) for start, end, window_end in tasks]
+                for bases, candidates, title, content, overall in executor.map(_score_block, block_tasks):
+                    for base, candidate, title_sim, content_sim, overall_sim in zip(
+                            bases.tolist(), candidates.tolist(), title.tolist(),
+                            content.tolist(), overall.tolist()):
+                        edges.setdefault(base, {})[candidate] = {
+                            'title_similarity': title_sim,
+                            'content_similarity': content_sim,
+                            'overall_similarity': overall_sim
+                        }
+            return edges
+        finally:
+            shutil.rmtree(feature_dir, ignore_errors=True)
+
+    def _plan_blocks(self, window_ends: np.ndarray) -> List[Tuple[int, int, int]]:
+        """
+        Cut base positions into blocks of at most block_cells scored cells.
+
+        Args:
+            window_ends: Exclusive window end per position
+
+        Returns:
+            (start, end, window_end) per block
+        """
+        blocks = []
+        total = len(window_ends)
+        start = 0
+        while start < total:
+            end = start + 1
+            while end < total and (end + 1 - start) * (int(window_ends[end]) - start) <= self.block_cells:
+                end += 1
+            blocks.append((start, end, int(window_ends[end - 1])))
+            start = end
+        return blocks
+
+    def _write_features(self, feature_dir: str, articles: List[Dict], keys: np.ndarray,
+                        topic_labels: Optional[Sequence[Optional[str]]],
+                        simhashes: Optional[Sequence[int]]) -> Dict:
+        """
+        Write the read-only feature arrays for the workers.
+
+        Returns:
+            Parameters describing the arrays (modes, matrix widths, weights)
+        """
+        calculator = self.tfidf_calculator
+        pipeline = calculator.pipeline
+        arrays = {
+            'keys': keys,
+            'word_count': np.asarray([article.get('word_count', 0) for article in articles], dtype=np.int64),
+            'content_hash': np.asarray([_hash_key(article.get('content_hash')) for article in articles],
+                                       dtype=np.uint64),
+        }
+        params = {
+            'check_title': calculator.check_title_similarity,
+            'check_content': calculator.check_content_similarity,
+            'title_weight': calculator.title_weight,
+            'content_weight': calculator.content_weight,
+            'content_mode': 'pairwise',
+            'title_width': 0,
+            'content_width': 0,
+        }
+
+        # Title token sets
+        title_vocabulary: Dict[str, int] = {}
+        title_words = [pipeline.article_title_words(article) if article.get('title') else frozenset()
+                       for article in articles]
+        (arrays['title_data'], arrays['title_indices'],
+         arrays['title_indptr']) = _csr_arrays([dict.fromkeys(words, 1.0) for words in title_words],
+                                               title_vocabulary)
+        arrays['title_size'] = np.asarray([len(words) for words in title_words], dtype=np.int64)
+        arrays['title_present'] = np.asarray([bool(article.get('title')) for article in articles])
+        params['title_width'] = len(title_vocabulary)
+
+        # Content vectors: TF-IDF rows of the corpus engine, or raw term counts
+        engine = calculator.corpus_engine
+        rows = [engine.row_of(article.get('file_path')) for article in articles] if engine is not None else []
+        if engine is not None and all(row is not None for row in rows):
+            matrix = engine.matrix[rows]
+            arrays['content_data'] = matrix.data
+            arrays['content_indices'] = matrix.indices.astype(np.int64)
+            arrays['content_indptr'] = matrix.indptr.astype(np.int64)
+            arrays['text_key'] = engine._text_keys[rows]
+            params['content_mode'] = 'corpus'
+            params['content_width'] = matrix.shape[1]
+        else:
+            content_vocabulary: Dict[str, int] = {}
+            counts = [pipeline.article_term_frequencies(article) if article.get('content') else {}
+                      for article in articles]
+            (arrays['content_data'], arrays['content_indices'],
+             arrays['content_indptr']) = _csr_arrays(counts, content_vocabulary)
+            # Same expression as TFIDFSimilarity._count_cosine
+            arrays['magnitude'] = np.asarray([sum(a * a for a in row.values()) ** 0.5 for row in counts],
+                                             dtype=np.float64)
+            arrays['text_key'] = np.asarray(
+                [_hash_key(' '.join(pipeline.article_tokens(article))) if article.get('content') else 0
+                 for article in articles], dtype=np.uint64)
+            arrays['has_content'] = np.asarray([bool(article.get('content')) for article in articles])
+            params['content_width'] = len(content_vocabulary)
+
+        if topic_labels is not None:
+            topic_ids: Dict[str, int] = {}
+            arrays['topic'] = np.asarray([-1 if label is None else topic_ids.setdefault(label, len(topic_ids))
+                                          for label in topic_labels], dtype=np.int64)
+        if simhashes is not None:
+            arrays['simhash'] = np.asarray([int(value) & (2 ** 64 - 1) for value in simhashes],
+                                           dtype=np.uint64)
+
+        for name, array in arrays.items():
+            np.save(os.path.join(feature_dir, name + '.npy'), np.ascontiguousarray(array))
+        return params
@@ -7,10 +7,21 @@ Implements SimHash-based similarity detection for efficient near-duplicate
 content detection using Hamming distance calculations.
 """
 
-import hashlib
-import re
+import sys
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+# Add project root to path for the shared fingerprint modules
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from ..utils.text_pipeline import get_text_pipeline, preprocess_for_simhash, simhash_words
+except ImportError:
+    from utils.text_pipeline import get_text_pipeline, preprocess_for_simhash, simhash_words
+
+from modules.fingerprint import SimHashIndex, fingerprint_array, hamming_distances, simhash64
+
 
 class SimHashSimilarity:
     """
@@ -30,6 +41,8 @@ class SimHashSimilarity:
         self.config = config
         self.hamming_threshold = config.get('simhash_hamm_threshold', 16)
         self.ngram_size = config.get('simhash_ngram_size', 5)
+        self.index_blocks = config.get('simhash_index_blocks')
+        self.pipeline = get_text_pipeline()
 
     def calculate_similarity(self, article1: Dict, article2: Dict) -> Dict[str, float]:
         """
@@ -42,20 +55,17 @@ class SimHashSimilarity:
         Returns:
             Dictionary with similarity scores
         """
-        # Extract and preprocess content
-        content1 = self._preprocess_content(article1.get('content', ''))
-        content2 = self._preprocess_content(article2.get('content', ''))
-
-        if not content1 or not content2:
+        # Preprocessed content and fingerprints are memoized per article
+        if not self.pipeline.article_simhash_text(article1) or \
+                not self.pipeline.article_simhash_text(article2):
             return {
                 'simhash_similarity': 0.0,
                 'hamming_distance': 64,
                 'is_near_duplicate': False
             }
 
-        # Generate SimHash fingerprints
-        hash1 = self.generate_simhash(content1)
-        hash2 = self.generate_simhash(content2)
+        hash1 = self.article_simhash(article1)
+        hash2 = self.article_simhash(article2)
 
         # Calculate Hamming distance
         hamming_dist = self.hamming_distance(hash1, hash2)
@@ -74,45 +84,38 @@ class SimHashSimilarity:
             'hash2': f"{hash2:016x}"
         }
 
-    def generate_simhash(self, text: str) -> int:
+    def article_simhash(self, article: Dict) -> int:
         """
-        Generate 64-bit SimHash fingerprint from text.
+        SimHash fingerprint of an article's content.
+
+        Uses the fingerprint precomputed by ArticleAnalyzer when present,
+        otherwise computes it once per content hash.
 
         Args:
-            text: Input text content
+            article: Article information dictionary
 
         Returns:
             64-bit SimHash value
         """
-        # Generate n-grams from text
-        tokens = self._generate_ngrams(text, self.ngram_size)
-
-        if not tokens:
-            return 0
-
-        # Initialize bit accumulator
-        bits = [0] * 64
+        if 'simhash' in article:
+            return article['simhash']
+        return self.pipeline.cached(
+            f'simhash{self.ngram_size}', article.get('content', ''), article.get('content_hash'),
+            lambda content: self.generate_simhash(
+                self.pipeline.simhash_text(content, article.get('content_hash'))))
 
-        # Process each token
-        for token in tokens:
-            # Generate hash for token
-            token_hash = int(hashlib.md5(token.encode('utf-8')).hexdigest(), 16)
-            token_hash &= ((1 << 64) - 1)  # Ensure 64-bit
-
-            # Update bit accumulator
-            for i in range(64):
-                if (token_hash >> i) & 1:
-                    bits[i] += 1
-                else:
-                    bits[i] -= 1
+    def generate_simhash(self, text: str) -> int:
+        """
+        Generate 64-bit SimHash fingerprint from text.
 
-        # Generate final SimHash
-        simhash = 0
-        for i in range(64):
-            if bits[i] > 0:
-                simhash |= (1 << i)
+        Args:
+            text: Input text content
 
-        return simhash
+        Returns:
+            64-bit SimHash value
+        """
+        # Generate n-grams from text; bit weights are accumulated by the shared kernel
+        return simhash64(self._generate_ngrams(text, self.ngram_size))
 
     def hamming_distance(self, hash1: int, hash2: int) -> int:
         """
@@ -145,17 +148,8 @@ class SimHashSimilarity:
         Returns:
             Preprocessed content
         """
-        if not content:
-            return ""
-
-        # Remove YAML front matter and code blocks
-        content = re.sub(r"^---[\s\S]*?---\s+", "", content, flags=re.M)
-        content = re.sub(r"```[\s\S]*?```", "", content)
-
-        # Normalize whitespace
-        content = re.sub(r"\s+", " ", content)
-
-        return content.strip()
+        # Removes YAML front matter and code blocks, normalizes whitespace
+        return preprocess_for_simhash(content)
 
     def _generate_ngrams(self, text: str, n: int = 5) -> List[str]:
         """
@@ -169,7 +163,7 @@ class SimHashSimilarity:
             List of n-gram strings
         """
         # Extract words
-        words = re.findall(r"[A-Za-z0-9']+", text.lower())
+        words = simhash_words(text)
 
         if len(words) < n:
             return words
@@ -192,13 +186,7 @@ class SimHashSimilarity:
         Returns:
             List of SimHash values
         """
-        hashes = []
-        for article in articles:
-            content = self._preprocess_content(article.get('content', ''))
-            simhash = self.generate_simhash(content)
-            hashes.append(simhash)
-
-        return hashes
+        return [self.article_simhash(article) for article in articles]
 
     def find_similar_articles(self, target_hash: int, article_hashes: List[Tuple[int, Dict]],
                             threshold: Optional[int] = None) -> List[Tuple[Dict, int, float]]:
@@ -216,14 +204,14 @@ class SimHashSimilarity:
         if threshold is None:
             threshold = self.hamming_threshold
 
-        similar_articles = []
-
-        for article_hash, article_info in article_hashes:
-            hamming_dist = self.hamming_distance(target_hash, article_hash)
+        # One XOR + popcount over all fingerprints
+        distances = hamming_distances(target_hash, fingerprint_array(h for h, _ in article_hashes))
 
-            if hamming_dist <= threshold:
-                similarity = 1.0 - (hamming_dist / 64.0)
-                similar_articles.append((article_info, hamming_dist, similarity))
+        similar_articles = []
+        for i in (distances <= threshold).nonzero()[0]:
+            hamming_dist = int(distances[i])
+            similarity = 1.0 - (hamming_dist / 64.0)
+            similar_articles.append((article_hashes[i][1], hamming_dist, similarity))
 
         # Sort by similarity (descending)
         similar_articles.sort(key=lambda x: x[2], reverse=True)
@@ -245,8 +233,7 @@ class SimHashSimilarity:
         num_bands = 64 // band_size
 
         for article in articles:
-            content = self._preprocess_content(article.get('content', ''))
-            simhash = self.generate_simhash(content)
+            simhash = self.article_simhash(article)
 
             # Create bands
             for band_idx in range(num_bands):
@@ -267,6 +254,49 @@ class SimHashSimilarity:
 
         return lsh_index
 
+    def create_simhash_index(self, articles: List[Dict], max_distance: Optional[int] = None):
+        """
+        Build a multi-table SimHash index keyed by article file path.
+
+        Unlike create_lsh_index, the returned index answers "all articles within
+        Hamming distance k" without scanning every fingerprint, and supports
+        incremental add/remove and persistence.
+
+        Args:
+            articles: List of articles to index
+            max_distance: Hamming distance the tables answer (defaults to threshold)
+
+        Returns:
+            SimHashIndex instance
+        """
+        index = SimHashIndex(
+            max_distance=self.hamming_threshold if max_distance is None else max_distance,
+            num_blocks=self.index_blocks
+        )
+        for article in articles:
+            index.add(article['file_path'], self.article_simhash(article))
+
+        return index
+
+    def find_similar_in_index(self, target_hash: int, index,
+                              threshold: Optional[int] = None) -> List[Tuple[str, int, float]]:
+        """
+        Find indexed articles similar to target based on SimHash.
+
+        Args:
+            target_hash: Target SimHash value
+            index: SimHashIndex built with create_simhash_index
+            threshold: Hamming distance threshold (uses default if None)
+
+        Returns:
+            List of (file_path, hamming_distance, similarity) tuples
+        """
+        if threshold is None:
+            threshold = self.hamming_threshold
+
+        return [(key, distance, 1.0 - (distance / 64.0))
+                for key, distance in index.query(target_hash, threshold)]
+
     def get_algorithm_info(self) -> Dict[str, any]:
         """Get information about this algorithm."""
         return {
@@ -278,6 +308,7 @@ class SimHashSimilarity:
                 'Fast fingerprint generation',
                 'Efficient similarity search',
                 'LSH indexing support',
+                'Multi-table Hamming index',
                 'Configurable similarity threshold'
             ],
             'parameters': {
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Threshold-Aware Cosine Similarity Join
+
+Upper bounds that decide whether a pair of sparse vectors can still reach a
+cosine threshold before the exact similarity is computed (all-pairs style
+filtering):
+
+- norm filter: ``x . y <= min(max(x) * |y|_1, max(y) * |x|_1)`` for unit vectors
+- prefix filter: with terms ordered rarest first, a pair reaching ``t`` must
+  share a term in the prefix of each vector whose remaining suffix norm is
+  still ``>= t``
+- early termination: the partial dot product plus the norm of the unprocessed
+  suffix bounds the final score
+
+The bounds never reject a pair whose exact score reaches the threshold, so
+callers that only score the surviving pairs get the same results above the
+threshold as brute force.
+"""
+
+from collections import Counter
+from typing import Dict, Hashable, List, Mapping, Optional
+
+# Slack for floating point rounding between bounds and exact scores
+BOUND_TOLERANCE = 1e-9
+
+
+class _UnitVector:
+    """Unit-normalized sparse vector with terms in global (rarest first) order."""
+
+    __slots__ = ('terms', 'weights', 'weight_map', 'suffix_norms', 'max_weight', 'l1_norm')
+
+    def __init__(self, terms: List[Hashable], weights: List[float]):
+        self.terms = terms
+        self.weights = weights
+        self.weight_map = dict(zip(terms, weights))
+        self.max_weight = max(weights, default=0.0)
+        self.l1_norm = sum(weights)
+
+        # suffix_norms[k] = L2 norm of weights[k:], non-increasing in k
+        suffix_norms = [0.0] * (len(weights) + 1)
+        squared = 0.0
+        for k in range(len(weights) - 1, -1, -1):
+            squared += weights[k] * weights[k]
+            suffix_norms[k] = squared ** 0.5
+        self.suffix_norms = suffix_norms
+
+    def prefix_length(self, threshold: float) -> int:
+        """Number of leading terms whose suffix norm is still >= threshold."""
+        # Binary search over the non-increasing suffix norms
+        low, high = 0, len(self.terms)
+        while low < high:
+            middle = (low + high) // 2
+            if self.suffix_norms[middle] >= threshold:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class CosineSimilarityJoin:
+    """
+    Pruning index over the vectors of a corpus.
+
+    Vectors are registered per key (e.g. file path); ``may_reach`` answers
+    whether the cosine similarity of two registered vectors can be at least a
+    threshold.
+    """
+
+    def __init__(self, vectors: Mapping[Hashable, Mapping[Hashable, float]]):
+        """
+        Build the index.
+
+        Args:
+            vectors: Sparse vector per key (term -> weight, any positive scale)
+        """
+        document_frequency = Counter()
+        for vector in vectors.values():
+            document_frequency.update(vector.keys())
+        self.document_frequency = document_frequency
+
+        self._vectors: Dict[Hashable, _UnitVector] = {}
+        for key, vector in vectors.items():
+            self._vectors[key] = self._unit_vector(vector)
+
+        self.checked = 0
+        self.pruned = 0
+
+    def _unit_vector(self, vector: Mapping[Hashable, float]) -> _UnitVector:
+        """Normalize a vector and order its terms rarest first."""
+        items = [(term, weight) for term, weight in vector.items() if weight > 0]
+        norm = sum(weight * weight for _, weight in items) ** 0.5
+        frequency = self.document_frequency
+        items.sort(key=lambda item: (frequency[item[0]], item[0]))
+        if not norm:
+            return _UnitVector([], [])
+        return _UnitVector([term for term, _ in items], [weight / norm for _, weight in items])
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._vectors
+
+    def upper_bound(self, key1: Hashable, key2: Hashable, threshold: float) -> Optional[float]:
+        """
+        Cheap upper bound of the cosine similarity, or None if it may reach the threshold.
+
+        Args:
+            key1: First vector key
+            key2: Second vector key
+            threshold: Cosine similarity the pair would need
+
+        Returns:
+            A bound below the threshold when the pair is proven not to reach it,
+            otherwise None (also for unknown keys)
+        """
+        x = self._vectors.get(key1)
+        y = self._vectors.get(key2)
+        if x is None or y is None:
+            return None
+
+        self.checked += 1
+        bound = self._bound(x, y, threshold - BOUND_TOLERANCE)
+        if bound is not None:
+            self.pruned += 1
+        return bound
+
+    def may_reach(self, key1: Hashable, key2: Hashable, threshold: float) -> bool:
+        """Whether the cosine similarity of two vectors can be >= threshold."""
+        return self.upper_bound(key1, key2, threshold) is None
+
+    @staticmethod
+    def _bound(x: _UnitVector, y: _UnitVector, threshold: float) -> Optional[float]:
+        """Apply norm filter, prefix filter and early termination."""
+        if threshold <= 0 or not (x.terms or y.terms):
+            return None
+
+        # Norm filter
+        norm_bound = min(x.max_weight * y.l1_norm, y.max_weight * x.l1_norm)
+        if norm_bound < threshold:
+            return norm_bound
+
+        # Prefix filter in both directions
+        for a, b in ((x, y), (y, x)):
+            prefix = a.prefix_length(threshold)
+            other_weights = b.weight_map
+            if not any(term in other_weights for term in a.terms[:prefix]):
+                return a.suffix_norms[prefix]
+
+        # Early termination over the shorter vector
+        if len(y.terms) < len(x.terms):
+            x, y = y, x
+        other_weights = y.weight_map
+        suffix_norms = x.suffix_norms
+        partial = 0.0
+        for k, (term, weight) in enumerate(zip(x.terms, x.weights)):
+            other_weight = other_weights.get(term)
+            if other_weight is not None:
+                partial += weight * other_weight
+            if partial + suffix_norms[k + 1] < threshold:
+                return partial + suffix_norms[k + 1]
+
+        return None
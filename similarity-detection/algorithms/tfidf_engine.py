@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Corpus TF-IDF Engine
+
+Builds a single sparse term-document matrix for a whole article corpus so that
+similarities for any set of candidate pairs can be computed with sparse matrix
+products instead of rebuilding vocabularies pair by pair.
+"""
+
+import hashlib
+import math
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+
+class CorpusTFIDFEngine:
+    """
+    Corpus-wide sparse TF-IDF model.
+
+    Each document is tokenized exactly once. Rows of the resulting CSR matrix
+    are L2-normalized, so the cosine similarity of two documents is the dot
+    product of their rows.
+    """
+
+    def __init__(self, tokenizer: Callable[[str], List[str]],
+                 use_idf: bool = True, sublinear_tf: bool = False):
+        """
+        Initialize the engine.
+
+        Args:
+            tokenizer: Callable turning raw text into a list of tokens
+            use_idf: Weight terms by smoothed inverse document frequency
+            sublinear_tf: Replace raw term frequency with 1 + log(tf)
+        """
+        self.tokenizer = tokenizer
+        self.use_idf = use_idf
+        self.sublinear_tf = sublinear_tf
+
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.matrix: Optional[sparse.csr_matrix] = None
+        self.keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._text_keys = np.zeros(0, dtype=np.uint64)
+
+    def fit(self, documents: Sequence[str], keys: Optional[Sequence[str]] = None,
+            token_lists: Optional[Sequence[Optional[List[str]]]] = None) -> 'CorpusTFIDFEngine':
+        """
+        Tokenize documents and build the normalized TF-IDF matrix.
+
+        Args:
+            documents: Document texts (used when no token list is supplied)
+            keys: Optional unique key per document (e.g. file path)
+            token_lists: Optional pre-tokenized documents, aligned with documents
+
+        Returns:
+            The fitted engine
+        """
+        n_docs = len(documents)
+        self.keys = list(keys) if keys is not None else [str(i) for i in range(n_docs)]
+        self._rows = {key: i for i, key in enumerate(self.keys)}
+
+        vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        values: List[float] = []
+        text_keys: List[int] = []
+
+        for i, text in enumerate(documents):
+            tokens = token_lists[i] if token_lists is not None and token_lists[i] is not None \
+                else self.tokenizer(text or '')
+            text_keys.append(self._text_key(tokens))
+
+            for term, count in Counter(tokens).items():
+                column = vocabulary.setdefault(term, len(vocabulary))
+                indices.append(column)
+                values.append(1.0 + math.log(count) if self.sublinear_tf else float(count))
+            indptr.append(len(indices))
+
+        self.vocabulary = vocabulary
+        self._text_keys = np.asarray(text_keys, dtype=np.uint64)
+        matrix = sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float64),
+             np.asarray(indices, dtype=np.int64),
+             np.asarray(indptr, dtype=np.int64)),
+            shape=(n_docs, len(vocabulary))
+        )
+
+        if self.use_idf and n_docs:
+            # Smoothed IDF, same formula as sklearn's TfidfVectorizer
+            document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+            self.idf = np.log((1.0 + n_docs) / (1.0 + document_frequency)) + 1.0
+            matrix = matrix @ sparse.diags(self.idf)
+            matrix = matrix.tocsr()
+        else:
+            self.idf = None
+
+        self.matrix = self._l2_normalize(matrix)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def row_of(self, key: str) -> Optional[int]:
+        """Return the matrix row for a document key, or None if unknown."""
+        return self._rows.get(key)
+
+    def similarities_to(self, row: int, rows: Iterable[int]) -> np.ndarray:
+        """
+        Cosine similarities between one document and a list of documents.
+
+        Args:
+            row: Base document row
+            rows: Candidate document rows
+
+        Returns:
+            Similarity per candidate, aligned with rows
+        """
+        rows = np.asarray(list(rows), dtype=np.int64)
+        if rows.size == 0:
+            return np.zeros(0)
+
+        scores = (self.matrix[rows] @ self.matrix[row].T).toarray().ravel()
+        return self._finalize(scores, np.full(rows.size, row), rows)
+
+    def pair_similarities(self, rows_a: Sequence[int], rows_b: Sequence[int]) -> np.ndarray:
+        """
+        Cosine similarities for aligned lists of document pairs.
+
+        Args:
+            rows_a: First document of each pair
+            rows_b: Second document of each pair
+
+        Returns:
+            Similarity per pair
+        """
+        rows_a = np.asarray(rows_a, dtype=np.int64)
+        rows_b = np.asarray(rows_b, dtype=np.int64)
+        if rows_a.size == 0:
+            return np.zeros(0)
+
+        scores = np.asarray(
+            self.matrix[rows_a].multiply(self.matrix[rows_b]).sum(axis=1)).ravel()
+        return self._finalize(scores, rows_a, rows_b)
+
+    def similarity_matrix(self) -> sparse.csr_matrix:
+        """
+        Sparse cosine similarity matrix for the whole corpus.
+
+        Returns:
+            CSR matrix where entry (i, j) is the cosine similarity of i and j
+        """
+        return (self.matrix @ self.matrix.T).tocsr()
+
+    def _finalize(self, scores: np.ndarray, rows_a: np.ndarray, rows_b: np.ndarray) -> np.ndarray:
+        """Clamp rounding noise and force identical normalized texts to 1.0."""
+        scores = np.minimum(scores, 1.0)
+        keys_a = self._text_keys[rows_a]
+        identical = (keys_a == self._text_keys[rows_b]) & (keys_a != 0)
+        scores[identical] = 1.0
+        return scores
+
+    @staticmethod
+    def _text_key(tokens: List[str]) -> int:
+        """Stable 64-bit key of a normalized token stream (0 for empty text)."""
+        if not tokens:
+            return 0
+        digest = hashlib.md5(' '.join(tokens).encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'little') or 1
+
+    @staticmethod
+    def _l2_normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Scale every row to unit Euclidean length (empty rows stay empty)."""
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return (sparse.diags(1.0 / norms) @ matrix).tocsr()
@@ -7,8 +7,12 @@ Implements TF-IDF based similarity detection using cosine similarity.
 Provides both individual article comparison and text processing utilities.
 """
 
-import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from ..utils.text_pipeline import get_text_pipeline, normalize_for_tfidf
+except ImportError:
+    from utils.text_pipeline import get_text_pipeline, normalize_for_tfidf
 
 
 class TFIDFSimilarity:
@@ -29,6 +33,147 @@ class TFIDFSimilarity:
         self.check_title_similarity = config.get('check_title_similarity', True)
         self.check_content_similarity = config.get('check_content_similarity', True)
 
+        # Corpus-wide sparse engine ('corpus') or per-pair word counts ('pairwise')
+        self.engine_mode = config.get('tfidf_engine', 'pairwise')
+        self.use_idf = config.get('tfidf_use_idf', True)
+        self.corpus_engine = None
+
+        # Normalized text and tokens are memoized per article across algorithms
+        self.pipeline = get_text_pipeline()
+
+        # Skip pairs whose score provably stays below the caller's threshold
+        self.threshold_pruning = config.get('threshold_pruning', True)
+        self.similarity_join = None
+
+        # Inverted index of title tokens (built by fit_corpus)
+        self.title_index = None
+
+    def fit_corpus(self, articles: List[Dict]) -> bool:
+        """
+        Build the corpus-wide TF-IDF engine for a set of articles.
+
+        Every article is tokenized once; afterwards content similarities between
+        any two fitted articles come from the shared sparse matrix. The engine
+        is only built when ``tfidf_engine`` is set to ``'corpus'``; the title
+        index is always rebuilt.
+
+        Args:
+            articles: Articles that will be compared against each other
+
+        Returns:
+            True if the corpus engine is ready to use
+        """
+        self.index_titles(articles)
+
+        self.corpus_engine = None
+        if self.engine_mode != 'corpus' or not articles:
+            return False
+
+        try:
+            try:
+                from .tfidf_engine import CorpusTFIDFEngine
+            except ImportError:
+                from tfidf_engine import CorpusTFIDFEngine
+        except ImportError:
+            print("⚠️ numpy/scipy未安装，回退到逐对TF-IDF计算")
+            return False
+
+        engine = CorpusTFIDFEngine(
+            tokenizer=self.pipeline.tokens,
+            use_idf=self.use_idf,
+            sublinear_tf=self.config.get('tfidf_sublinear_tf', False)
+        )
+        engine.fit(
+            [article.get('content', '') for article in articles],
+            keys=[article['file_path'] for article in articles],
+            token_lists=[self.pipeline.article_tokens(article) for article in articles]
+        )
+        self.corpus_engine = engine
+        return True
+
+    def index_titles(self, articles: List[Dict]):
+        """
+        Build the inverted title index for a set of articles.
+
+        Args:
+            articles: Articles that will be compared against each other
+        """
+        self.title_index = None
+        if not self.check_title_similarity or not articles:
+            return
+
+        try:
+            from .title_index import TitleIndex
+        except ImportError:
+            from title_index import TitleIndex
+        self.title_index = TitleIndex(self.pipeline).add_articles(articles)
+
+    def title_matches(self, article: Dict) -> Dict[str, float]:
+        """
+        Title similarity of an article to every fitted article sharing a title token.
+
+        Args:
+            article: Article to look up (need not be fitted)
+
+        Returns:
+            Mapping of file path to title similarity (absent paths score 0.0)
+        """
+        if self.title_index is None:
+            return {}
+        return self.title_index.query(article)
+
+    def prepare_pruning(self, articles: List[Dict]) -> bool:
+        """
+        Build the threshold pruning index for a set of articles.
+
+        Uses the rows of the fitted corpus engine when available (so the
+        bounds apply to the same vectors that are scored), otherwise the
+        articles' term frequencies. Call after fit_corpus.
+
+        Args:
+            articles: Articles that will be compared against each other
+
+        Returns:
+            True if threshold pruning is active
+        """
+        self.similarity_join = None
+        if not self.threshold_pruning or not self.check_content_similarity \
+                or self.content_weight <= 0 or not articles:
+            return False
+
+        try:
+            from .similarity_join import CosineSimilarityJoin
+        except ImportError:
+            from similarity_join import CosineSimilarityJoin
+
+        vectors = {}
+        if self.corpus_engine is not None:
+            matrix = self.corpus_engine.matrix
+            for article in articles:
+                row = self.corpus_engine.row_of(article.get('file_path'))
+                if row is None:
+                    continue
+                start, end = matrix.indptr[row], matrix.indptr[row + 1]
+                vectors[article['file_path']] = dict(zip(matrix.indices[start:end].tolist(),
+                                                         matrix.data[start:end].tolist()))
+        else:
+            for article in articles:
+                if article.get('content'):
+                    vectors[article['file_path']] = self.pipeline.article_term_frequencies(article)
+
+        self.similarity_join = CosineSimilarityJoin(vectors)
+        return True
+
+    def _engine_rows(self, article1: Dict, article2: Dict) -> Optional[Tuple[int, int]]:
+        """Return corpus engine rows for both articles, or None if not fitted."""
+        if self.corpus_engine is None:
+            return None
+        row1 = self.corpus_engine.row_of(article1.get('file_path'))
+        row2 = self.corpus_engine.row_of(article2.get('file_path'))
+        if row1 is None or row2 is None:
+            return None
+        return row1, row2
+
     def calculate_similarity(self, article1: Dict, article2: Dict) -> Dict[str, float]:
         """
         Calculate overall similarity between two articles.
@@ -51,20 +196,128 @@ class TFIDFSimilarity:
         # Calculate title similarity
         title_sim = 0.0
         if self.check_title_similarity:
-            title_sim = self.calculate_title_similarity(
-                article1.get('title', ''),
-                article2.get('title', '')
-            )
+            title_sim = self._article_title_similarity(article1, article2)
 
         # Calculate content similarity
         content_sim = 0.0
         if self.check_content_similarity:
-            content_sim = self.calculate_content_similarity(
-                article1.get('content', ''),
-                article2.get('content', '')
-            )
+            rows = self._engine_rows(article1, article2)
+            if rows is not None:
+                content_sim = float(self.corpus_engine.pair_similarities([rows[0]], [rows[1]])[0])
+            else:
+                content_sim = self._article_content_similarity(article1, article2)
+
+        return self._combine_scores(title_sim, content_sim)
+
+    def calculate_similarities(self, base_article: Dict, other_articles: List[Dict],
+                               thresholds: Optional[List[float]] = None) -> List[Optional[Dict[str, float]]]:
+        """
+        Calculate similarity between one article and a list of articles.
+
+        When the corpus engine is fitted, all content similarities are computed
+        with a single sparse matrix product.
+
+        With thresholds and a prepared pruning index, candidates whose overall
+        similarity provably stays below their threshold are not scored; their
+        entry is None. All other entries are identical to unpruned scoring.
+
+        Args:
+            base_article: Article to compare against
+            other_articles: Candidate articles
+            thresholds: Optional overall similarity threshold per candidate
+
+        Returns:
+            Similarity dictionaries (or None for pruned pairs) aligned with other_articles
+        """
+        if not other_articles:
+            return []
+
+        title_sims = self._title_similarities(base_article, other_articles)
+
+        positions = list(range(len(other_articles)))
+        if thresholds is not None and self.similarity_join is not None:
+            positions = [position for position in positions
+                         if self._may_reach(base_article, other_articles[position],
+                                            thresholds[position], title_sims[position])]
+
+        results: List[Optional[Dict[str, float]]] = [None] * len(other_articles)
+        content_sims = self._content_similarities(
+            base_article, [other_articles[position] for position in positions])
+
+        for position, content_sim in zip(positions, content_sims):
+            if base_article.get('content_hash') == other_articles[position].get('content_hash'):
+                results[position] = {
+                    'title_similarity': 1.0,
+                    'content_similarity': 1.0,
+                    'overall_similarity': 1.0
+                }
+            else:
+                results[position] = self._combine_scores(title_sims[position], content_sim)
+
+        return results
+
+    def _title_similarities(self, base_article: Dict, other_articles: List[Dict]) -> List[float]:
+        """
+        Title similarity of one article to many, via the title index when fitted.
+
+        Candidates sharing no title token with the base score 0.0 straight
+        from the posting-list merge; unindexed articles are scored pairwise.
+        """
+        if not self.check_title_similarity:
+            return [0.0] * len(other_articles)
 
-        # Calculate weighted overall similarity
+        indexed = [None] * len(other_articles)
+        if self.title_index is not None:
+            indexed = self.title_index.similarities(
+                base_article.get('file_path'), [other.get('file_path') for other in other_articles])
+
+        return [self._article_title_similarity(base_article, other) if title_sim is None else title_sim
+                for other, title_sim in zip(other_articles, indexed)]
+
+    def _content_similarities(self, base_article: Dict, other_articles: List[Dict]) -> List[float]:
+        """
+        Content similarity of one article to many.
+
+        All candidates are scored with one sparse product when the base and
+        every candidate are rows of the fitted corpus engine.
+        """
+        if not self.check_content_similarity or not other_articles:
+            return [0.0] * len(other_articles)
+
+        base_row = None
+        if self.corpus_engine is not None:
+            base_row = self.corpus_engine.row_of(base_article.get('file_path'))
+        other_rows = [self.corpus_engine.row_of(other.get('file_path'))
+                      for other in other_articles] if base_row is not None else []
+
+        if base_row is not None and all(row is not None for row in other_rows):
+            return self.corpus_engine.similarities_to(base_row, other_rows).tolist()
+
+        content_sims = []
+        for other in other_articles:
+            rows = self._engine_rows(base_article, other)
+            if rows is not None:
+                content_sims.append(float(self.corpus_engine.pair_similarities([rows[0]], [rows[1]])[0]))
+            else:
+                content_sims.append(self._article_content_similarity(base_article, other))
+        return content_sims
+
+    def _may_reach(self, base_article: Dict, other: Dict, threshold: float, title_sim: float) -> bool:
+        """
+        Whether a pair can reach an overall similarity threshold.
+
+        Given the exact title similarity, the content cosine still needed to
+        reach the threshold is checked against the pruning index bounds.
+        """
+        if base_article.get('content_hash') == other.get('content_hash'):
+            return True
+
+        required_content = (threshold - title_sim * self.title_weight) / self.content_weight
+        return self.similarity_join.may_reach(base_article.get('file_path'),
+                                              other.get('file_path'), required_content)
+
+    def _combine_scores(self, title_sim: float, content_sim: float) -> Dict[str, float]:
+        """Combine title and content similarity into the weighted result dictionary."""
         overall_sim = title_sim * self.title_weight + content_sim * self.content_weight
 
         return {
@@ -73,6 +326,49 @@ class TFIDFSimilarity:
             'overall_similarity': min(1.0, overall_sim)
         }
 
+    def _article_content_similarity(self, article1: Dict, article2: Dict) -> float:
+        """
+        Content similarity from per-article tokens and term frequencies.
+
+        Tokens precomputed by ArticleAnalyzer are used when available, otherwise
+        they come from the shared pipeline (computed once per content hash).
+        Gives the same result as calculate_content_similarity on the raw content.
+        """
+        if not article1.get('content') or not article2.get('content'):
+            return 0.0
+
+        if self.pipeline.article_tokens(article1) == self.pipeline.article_tokens(article2):
+            return 1.0
+
+        return self._count_cosine(
+            self.pipeline.article_term_frequencies(article1),
+            self.pipeline.article_term_frequencies(article2)
+        )
+
+    def _article_title_similarity(self, article1: Dict, article2: Dict) -> float:
+        """
+        Title similarity using memoized normalized titles.
+
+        Gives the same result as calculate_title_similarity on the raw titles.
+        """
+        if not article1.get('title') or not article2.get('title'):
+            return 0.0
+
+        title1_clean = self.pipeline.article_title(article1)
+        title2_clean = self.pipeline.article_title(article2)
+        if title1_clean == title2_clean:
+            return 1.0
+
+        words1 = self.pipeline.article_title_words(article1)
+        words2 = self.pipeline.article_title_words(article2)
+        if not words1 or not words2:
+            return 0.0
+
+        intersection = len(words1 & words2)
+        union = len(words1 | words2)
+
+        return intersection / union if union > 0 else 0.0
+
     def calculate_title_similarity(self, title1: str, title2: str) -> float:
         """
         Calculate similarity between two titles using Jaccard similarity.
@@ -88,8 +384,8 @@ class TFIDFSimilarity:
             return 0.0
 
         # Normalize titles
-        title1_clean = self.normalize_text(title1)
-        title2_clean = self.normalize_text(title2)
+        title1_clean = self.pipeline.normalized(title1)
+        title2_clean = self.pipeline.normalized(title2)
 
         if title1_clean == title2_clean:
             return 1.0
@@ -121,30 +417,24 @@ class TFIDFSimilarity:
             return 0.0
 
         # Normalize content
-        content1_clean = self.normalize_text(content1)
-        content2_clean = self.normalize_text(content2)
-
-        if content1_clean == content2_clean:
+        if self.pipeline.tokens(content1) == self.pipeline.tokens(content2):
             return 1.0
 
         # Simple word frequency method (simplified TF-IDF)
-        words1 = content1_clean.split()
-        words2 = content2_clean.split()
-
-        # Build vocabulary
-        vocab = set(words1 + words2)
+        return self._count_cosine(self.pipeline.term_frequencies(content1),
+                                  self.pipeline.term_frequencies(content2))
 
-        if not vocab:
+    @staticmethod
+    def _count_cosine(counts1: Dict[str, int], counts2: Dict[str, int]) -> float:
+        """Cosine similarity of two term-frequency mappings."""
+        if not counts1 and not counts2:
             return 0.0
 
-        # Calculate word frequency vectors
-        vec1 = [words1.count(word) for word in vocab]
-        vec2 = [words2.count(word) for word in vocab]
-
-        # Calculate cosine similarity
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = sum(a * a for a in vec1) ** 0.5
-        magnitude2 = sum(b * b for b in vec2) ** 0.5
+        # Calculate cosine similarity over the shared vocabulary
+        dot_product = sum(count * counts2[word] for word, count in counts1.items()
+                          if word in counts2)
+        magnitude1 = sum(a * a for a in counts1.values()) ** 0.5
+        magnitude2 = sum(b * b for b in counts2.values()) ** 0.5
 
         if magnitude1 == 0 or magnitude2 == 0:
             return 0.0
@@ -161,20 +451,8 @@ class TFIDFSimilarity:
         Returns:
             Normalized text
         """
-        # Convert to lowercase
-        text = text.lower()
-
-        # Remove Markdown formatting
-        text = re.sub(r'[#*`\[\]()]', '', text)
-        text = re.sub(r'http[s]?://\S+', '', text)
-
-        # Remove punctuation
-        text = re.sub(r'[^\w\s-]', ' ', text)
-
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
-
-        return text.strip()
+        # Lowercase, strip Markdown markup, URLs and punctuation, collapse whitespace
+        return normalize_for_tfidf(text)
 
     def calculate_advanced_tfidf_similarity(self, content1: str, content2: str) -> float:
         """
@@ -199,8 +477,8 @@ class TFIDFSimilarity:
                 return 0.0
 
             # Normalize content
-            content1_clean = self.normalize_text(content1)
-            content2_clean = self.normalize_text(content2)
+            content1_clean = self.pipeline.normalized(content1)
+            content2_clean = self.pipeline.normalized(content2)
 
             # Create TF-IDF vectors
             vectorizer = TfidfVectorizer(
@@ -238,6 +516,10 @@ class TFIDFSimilarity:
             2D list representing similarity matrix
         """
         n = len(articles)
+
+        if self.fit_corpus(articles):
+            return self._batch_similarity_from_engine(articles)
+
         similarity_matrix = [[0.0 for _ in range(n)] for _ in range(n)]
 
         for i in range(n):
@@ -255,6 +537,33 @@ class TFIDFSimilarity:
 
         return similarity_matrix
 
+    def _batch_similarity_from_engine(self, articles: List[Dict]) -> List[List[float]]:
+        """Build the similarity matrix from one sparse product over the fitted corpus."""
+        n = len(articles)
+        content_matrix = None
+        if self.check_content_similarity:
+            content_matrix = self.corpus_engine.similarity_matrix().toarray()
+
+        similarity_matrix = [[0.0 for _ in range(n)] for _ in range(n)]
+        for i in range(n):
+            similarity_matrix[i][i] = 1.0
+
+            for j in range(i + 1, n):
+                if articles[i].get('content_hash') == articles[j].get('content_hash'):
+                    similarity = 1.0
+                else:
+                    title_sim = 0.0
+                    if self.check_title_similarity:
+                        title_sim = self._article_title_similarity(articles[i], articles[j])
+                    content_sim = min(1.0, float(content_matrix[i][j])) \
+                        if content_matrix is not None else 0.0
+                    similarity = self._combine_scores(title_sim, content_sim)['overall_similarity']
+
+                similarity_matrix[i][j] = similarity
+                similarity_matrix[j][i] = similarity
+
+        return similarity_matrix
+
     def get_similarity_statistics(self, similarity_matrix: List[List[float]]) -> Dict[str, float]:
         """
         Calculate statistics for a similarity matrix.
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Time Window Candidate Generation
+
+Sweep-line helper over chronologically sorted articles. Effective dates are
+stored as an integer array so that the articles inside a comparison window are
+found with a binary search instead of scanning the whole corpus.
+"""
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Sequence
+
+EPOCH = datetime(1970, 1, 1)
+RESOLUTION = timedelta(microseconds=1)
+
+
+class TimeWindowIndex:
+    """
+    Sorted effective-date index with a removal bitmap.
+
+    Positions refer to the chronologically sorted article list the index was
+    built from. Removed positions are skipped by candidate generation without
+    shifting any list elements.
+    """
+
+    def __init__(self, dates: Sequence[datetime], window_days: int):
+        """
+        Initialize the index.
+
+        Args:
+            dates: Effective dates sorted from earliest to newest
+            window_days: Comparison window in days
+        """
+        self.keys = array('q', (self.to_key(date) for date in dates))
+        self.window = self.window_span(window_days)
+        self.removed = bytearray(len(self.keys))
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[int], window_days: int) -> 'TimeWindowIndex':
+        """
+        Build the index from precomputed keys (e.g. ``CorpusDates.sorted_timestamps``).
+
+        Args:
+            keys: Sorted keys (microseconds since epoch)
+            window_days: Comparison window in days
+
+        Returns:
+            TimeWindowIndex over the keys
+        """
+        index = cls([], window_days)
+        index.keys = array('q', (int(key) for key in keys))
+        index.removed = bytearray(len(index.keys))
+        return index
+
+    @staticmethod
+    def to_key(date: datetime) -> int:
+        """Convert a datetime to an integer key (microseconds since epoch)."""
+        if date.tzinfo is not None:
+            date = date.replace(tzinfo=None) - date.utcoffset()
+        return (date - EPOCH) // RESOLUTION
+
+    @staticmethod
+    def window_span(window_days: int) -> int:
+        """
+        Largest key difference that still counts as inside the window.
+
+        For an earlier date a and a later date b, ``abs((a - b).days)`` is the
+        gap rounded up to whole days, so it stays within ``window_days``
+        exactly while the gap is at most ``window_days`` days.
+        """
+        return timedelta(days=window_days) // RESOLUTION
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def window_end(self, position: int) -> int:
+        """
+        Return the first position that lies outside the window of ``position``.
+
+        An article is inside the window when it is at most ``window_days`` later
+        than the base article, which matches ``abs((a - b).days) <= window_days``
+        for chronologically sorted dates.
+
+        Args:
+            position: Base article position
+
+        Returns:
+            Exclusive end position of the window
+        """
+        return bisect_right(self.keys, self.keys[position] + self.window, lo=position + 1)
+
+    def candidates(self, position: int) -> Iterator[int]:
+        """
+        Iterate over later, not yet removed positions inside the window.
+
+        Args:
+            position: Base article position
+
+        Yields:
+            Candidate positions in chronological order
+        """
+        removed = self.removed
+        for candidate in range(position + 1, self.window_end(position)):
+            if not removed[candidate]:
+                yield candidate
+
+    def remove(self, position: int):
+        """Mark a position as removed."""
+        self.removed[position] = 1
+
+    def is_removed(self, position: int) -> bool:
+        """Check whether a position has been removed."""
+        return bool(self.removed[position])
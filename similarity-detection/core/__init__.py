@@ -7,13 +7,19 @@ Contains the main engine and core functionality for similarity detection.
 """
 
 from .similarity_engine import SimilarityEngine
+from .similarity_daemon import SimilarityDaemon
 from .article_analyzer import ArticleAnalyzer
+from .feature_cache import ArticleFeatureCache
+from .incremental_state import IncrementalState
 from .comparison_algorithms import ComparisonAlgorithms
 from .result_processor import ResultProcessor
 
 __all__ = [
     'SimilarityEngine',
+    'SimilarityDaemon',
     'ArticleAnalyzer', 
+    'ArticleFeatureCache',
+    'IncrementalState',
     'ComparisonAlgorithms',
     'ResultProcessor',
 ]
\ No newline at end of file
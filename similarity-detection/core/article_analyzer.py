@@ -12,14 +12,54 @@ import sys
 import re
 import hashlib
 import yaml
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+# Add current package to path
+current_package = Path(__file__).parent.parent
+sys.path.insert(0, str(current_package))
+
+try:
+    from .feature_cache import ArticleFeatureCache
+except ImportError:
+    from feature_cache import ArticleFeatureCache
+
+try:
+    from ..algorithms.tfidf_similarity import TFIDFSimilarity
+    from ..algorithms.simhash_similarity import SimHashSimilarity
+    from ..utils.topic_classifier import TopicClassifier
+    from ..utils.date_helper import DateHelper
+except ImportError:
+    from algorithms.tfidf_similarity import TFIDFSimilarity
+    from algorithms.simhash_similarity import SimHashSimilarity
+    from utils.topic_classifier import TopicClassifier
+    from utils.date_helper import DateHelper
+
+
+# Per-process analyzer used by scan worker processes
+_worker_analyzer = None
+
+
+def _init_scan_worker(config: Dict):
+    """Create the analyzer of a scan worker process (without feature cache)."""
+    global _worker_analyzer
+    worker_config = dict(config)
+    worker_config['feature_cache_enabled'] = False
+    _worker_analyzer = ArticleAnalyzer(worker_config)
+
+
+def _parse_in_worker(path: str, file_stat: os.stat_result) -> Dict:
+    """Parse one article inside a scan worker process."""
+    return _worker_analyzer._parse_article(Path(path), file_stat)
+
 
 class ArticleAnalyzer:
     """
@@ -37,6 +77,27 @@ class ArticleAnalyzer:
         self.debug_mode = False
         self.min_content_length = config.get('min_content_length', 1000)
 
+        # Persistent feature cache (opened lazily)
+        self.feature_cache_enabled = config.get('feature_cache_enabled', True)
+        self.feature_cache_path = config.get('feature_cache_path', 'data/article_features.db')
+        self.feature_cache = None
+
+        # Directory scanning
+        self.scan_workers = config.get('scan_workers', 1) or (os.cpu_count() or 1)
+        self.scan_recursive = config.get('scan_recursive', False)
+        self.scan_ordered = config.get('scan_ordered', True)
+        self.scan_queue_size = config.get('scan_queue_size')
+
+        # Shared normalization and fingerprinting used by the algorithms
+        self.text_normalizer = TFIDFSimilarity(config)
+        self.simhash_calculator = SimHashSimilarity(config)
+
+        # Keyword automaton compiled once from topic_classification.topics
+        self.topic_classifier = TopicClassifier.from_config(config)
+
+        # Filename date patterns shared with the comparison algorithms
+        self.date_helper = DateHelper()
+
     def scan_directory(self, directory: str) -> List[Dict]:
         """
         Scan directory for articles and extract information.
@@ -53,26 +114,204 @@ class ArticleAnalyzer:
             return []
 
         # Find all Markdown files
-        md_files = list(directory_path.glob("*.md"))
+        md_files = self.find_markdown_files(directory_path)
         if not md_files:
             print(f"❌ 目录中没有找到Markdown文件: {directory}")
             return []
 
         print(f"📁 找到 {len(md_files)} 个文章文件")
+        if self.scan_workers > 1:
+            print(f"⚙️ 并行解析: {self.scan_workers} 个进程")
 
-        articles = []
-        for i, file_path in enumerate(md_files, 1):
-            print(f"  [{i}/{len(md_files)}] 正在分析: {file_path.name}")
+        articles = list(self.iter_articles(md_files))
+        self._finish_scan(directory_path, md_files)
 
-            try:
-                article_info = self.extract_article_info(file_path)
+        print(f"✅ 成功分析 {len(articles)} 篇文章")
+        return articles
+
+    def iter_directory(self, directory: str) -> Iterator[Dict]:
+        """
+        Stream article information for a directory.
+
+        Same as scan_directory, but articles are yielded as soon as they are
+        parsed instead of being collected into a list.
+
+        Args:
+            directory: Directory path to scan
+
+        Yields:
+            Article information dictionaries
+        """
+        directory_path = Path(directory)
+        if not directory_path.exists():
+            return
+
+        md_files = self.find_markdown_files(directory_path)
+        yield from self.iter_articles(md_files)
+        self._finish_scan(directory_path, md_files)
+
+    def find_markdown_files(self, directory_path: Path) -> List[Path]:
+        """
+        List Markdown files of a directory (recursively if scan_recursive is set).
+
+        Args:
+            directory_path: Directory to search
+
+        Returns:
+            Markdown file paths
+        """
+        pattern = "**/*.md" if self.scan_recursive else "*.md"
+        return [path for path in directory_path.glob(pattern) if path.is_file()]
+
+    def iter_articles(self, file_paths: List[Path]) -> Iterator[Dict]:
+        """
+        Extract article information for a list of files.
+
+        With ``scan_workers`` > 1, cache misses are parsed in a process pool.
+        At most ``scan_queue_size`` files are in flight at any time. Results
+        follow the order of file_paths unless ``scan_ordered`` is disabled, in
+        which case they are yielded as soon as they are ready.
+
+        Args:
+            file_paths: Article files to analyze
+
+        Yields:
+            Article information dictionaries (failed files are skipped)
+        """
+        # Cache writes of a scan are committed once at the end
+        feature_cache = self._get_feature_cache()
+        with feature_cache.batch() if feature_cache else nullcontext():
+            yield from self._iter_articles(file_paths)
+
+    def _iter_articles(self, file_paths: List[Path]) -> Iterator[Dict]:
+        """Extract article information for a list of files (see iter_articles)."""
+        total = len(file_paths)
+        if self.scan_workers <= 1 or total < 2:
+            for i, file_path in enumerate(file_paths, 1):
+                self._report_progress(i, total, file_path)
+                try:
+                    article_info = self.extract_article_info(file_path)
+                    if article_info:
+                        yield article_info
+                except Exception as e:
+                    print(f"    ⚠️ 文件处理失败: {e}")
+            return
+
+        feature_cache = self._get_feature_cache()
+        queue_size = max(1, self.scan_queue_size or self.scan_workers * 4)
+        pending = deque()
+        done_count = 0
+
+        def release(block: bool) -> Iterator[Dict]:
+            nonlocal done_count
+            for file_path, file_stat, work in self._pop_ready(pending, block):
+                done_count += 1
+                self._report_progress(done_count, total, file_path)
+                article_info = self._resolve_scan_work(file_path, file_stat, work)
                 if article_info:
-                    articles.append(article_info)
+                    yield article_info
+
+        with ProcessPoolExecutor(max_workers=self.scan_workers,
+                                 initializer=_init_scan_worker,
+                                 initargs=(self.config,)) as executor:
+            for file_path in file_paths:
+                try:
+                    file_stat = file_path.stat()
+                except OSError as e:
+                    print(f"    ❌ 无法读取文件 {file_path}: {e}")
+                    continue
+
+                cached_info = feature_cache.get(str(file_path), file_stat) if feature_cache else None
+                if cached_info:
+                    work = self._refresh_cached_features(file_path, cached_info, file_stat)
+                else:
+                    work = executor.submit(_parse_in_worker, str(file_path), file_stat)
+                pending.append((file_path, file_stat, work))
+
+                # Yield what is ready; block once the work queue is full
+                yield from release(block=len(pending) > queue_size)
+
+            while pending:
+                yield from release(block=True)
+
+    def _pop_ready(self, pending: deque, block: bool) -> List[Tuple]:
+        """
+        Remove finished entries from the scan work queue.
+
+        Ordered scans only release entries from the front of the queue.
+
+        Args:
+            pending: Queue of (file_path, file_stat, article_info or future)
+            block: Wait until at least one entry is finished
+
+        Returns:
+            Finished entries
+        """
+        def is_ready(work) -> bool:
+            return isinstance(work, dict) or work.done()
+
+        if self.scan_ordered:
+            ready = []
+            while pending and (block or is_ready(pending[0][2])):
+                ready.append(pending.popleft())
+                block = False
+            return ready
+
+        if block and not any(is_ready(entry[2]) for entry in pending):
+            wait([entry[2] for entry in pending], return_when=FIRST_COMPLETED)
+        ready = [entry for entry in pending if is_ready(entry[2])]
+        for entry in ready:
+            pending.remove(entry)
+        return ready
+
+    def _resolve_scan_work(self, file_path: Path, file_stat: os.stat_result, work) -> Optional[Dict]:
+        """Return the article of a finished queue entry and cache freshly parsed results."""
+        if isinstance(work, dict):
+            return work
+
+        try:
+            article_info = work.result()
+        except Exception as e:
+            print(f"    ❌ 无法读取文件 {file_path}: {e}")
+            return None
+
+        feature_cache = self._get_feature_cache()
+        if feature_cache:
+            feature_cache.put(str(file_path), file_stat, article_info)
+        return article_info
+
+    def _report_progress(self, done: int, total: int, file_path: Path):
+        """Print per-file progress in debug mode, otherwise every 10%."""
+        if self.debug_mode or total <= 20:
+            print(f"  [{done}/{total}] 正在分析: {file_path.name}")
+        elif done == total or done % max(1, total // 10) == 0:
+            print(f"  [{done}/{total}] 已分析")
+
+    def _finish_scan(self, directory_path: Path, md_files: List[Path]):
+        """Prune and commit the feature cache after a complete scan."""
+        feature_cache = self._get_feature_cache()
+        if feature_cache:
+            feature_cache.prune(directory_path, [str(file_path) for file_path in md_files],
+                                recursive=self.scan_recursive)
+            feature_cache.flush()
+            print(f"💾 特征缓存: 命中 {feature_cache.hits} 篇，重新解析 {feature_cache.misses} 篇")
+            if feature_cache.errors:
+                print(f"⚠️ 特征缓存读写失败 {feature_cache.errors} 次 (已按未命中处理)")
+
+    def _get_feature_cache(self) -> Optional[ArticleFeatureCache]:
+        """Open the feature cache on first use (None when disabled or unavailable)."""
+        if not self.feature_cache_enabled:
+            return None
+
+        if self.feature_cache is None:
+            try:
+                self.feature_cache = ArticleFeatureCache(self.feature_cache_path, self.config)
             except Exception as e:
-                print(f"    ⚠️ 文件处理失败: {e}")
+                print(f"⚠️ 特征缓存不可用: {e}")
+                self.feature_cache_enabled = False
+                return None
 
-        print(f"✅ 成功分析 {len(articles)} 篇文章")
-        return articles
+        return self.feature_cache
 
     def extract_article_info(self, file_path: Path) -> Optional[Dict]:
         """
@@ -85,41 +324,138 @@ class ArticleAnalyzer:
             Article information dictionary or None if extraction fails
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Extract Front Matter and main content
-            front_matter, article_content = self._extract_front_matter(content)
-
             # Get file statistics
             file_stat = file_path.stat()
+        except OSError as e:
+            print(f"    ❌ 无法读取文件 {file_path}: {e}")
+            return None
 
-            # Extract title
-            title = self._extract_title(front_matter, article_content, file_path.stem)
-
-            article_info = {
-                'file_path': str(file_path),
-                'file_name': file_path.name,
-                'file_stem': file_path.stem,
-                'title': title,
-                'content': article_content,
-                'full_content': content,
-                'word_count': len(article_content.split()),
-                'char_count': len(article_content),
-                'created_time': datetime.fromtimestamp(file_stat.st_ctime),
-                'modified_time': datetime.fromtimestamp(file_stat.st_mtime),
-                'file_size': file_stat.st_size,
-                'content_hash': hashlib.md5(article_content.encode('utf-8')).hexdigest(),
-                'title_hash': hashlib.md5(title.encode('utf-8')).hexdigest() if title else "",
-                'front_matter': front_matter
-            }
-
-            return article_info
+        # Reuse cached features of unchanged files (cache errors only cost a miss)
+        feature_cache = self._get_feature_cache()
+        if feature_cache:
+            cached_info = feature_cache.get(str(file_path), file_stat)
+            if cached_info:
+                return self._refresh_cached_features(file_path, cached_info, file_stat)
 
+        try:
+            article_info = self._parse_article(file_path, file_stat)
         except Exception as e:
             print(f"    ❌ 无法读取文件 {file_path}: {e}")
             return None
 
+        # Committed at once unless a directory scan batches the writes
+        if feature_cache:
+            feature_cache.put(str(file_path), file_stat, article_info)
+        return article_info
+
+    def _parse_article(self, file_path: Path, file_stat: os.stat_result) -> Dict:
+        """
+        Read and parse an article file (no caching).
+
+        Args:
+            file_path: Path to the article file
+            file_stat: Stat result of the file
+
+        Returns:
+            Article information dictionary
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Extract Front Matter and main content
+        front_matter, article_content = self._extract_front_matter(content)
+
+        # Extract title
+        title = self._extract_title(front_matter, article_content, file_path.stem)
+
+        article_info = {
+            'file_path': str(file_path),
+            'file_name': file_path.name,
+            'file_stem': file_path.stem,
+            'title': title,
+            'content': article_content,
+            'full_content': content,
+            'word_count': len(article_content.split()),
+            'char_count': len(article_content),
+            'created_time': datetime.fromtimestamp(file_stat.st_ctime),
+            'modified_time': datetime.fromtimestamp(file_stat.st_mtime),
+            'file_size': file_stat.st_size,
+            'content_hash': hashlib.md5(article_content.encode('utf-8')).hexdigest(),
+            'title_hash': hashlib.md5(title.encode('utf-8')).hexdigest() if title else "",
+            'front_matter': front_matter
+        }
+
+        self._add_derived_features(article_info)
+        return article_info
+
+    def _add_derived_features(self, article_info: Dict):
+        """
+        Precompute features the similarity algorithms would otherwise derive per run.
+
+        Adds normalized content tokens, their term frequencies, the content
+        SimHash, the effective date and (when enabled) topic scores and label.
+
+        Args:
+            article_info: Article information dictionary (updated in place)
+        """
+        content = article_info['content']
+        tokens = self.text_normalizer.normalize_text(content).split()
+
+        article_info['tokens'] = tokens
+        article_info['term_frequencies'] = dict(Counter(tokens))
+        article_info['simhash'] = self.simhash_calculator.generate_simhash(
+            self.simhash_calculator._preprocess_content(content))
+        article_info['effective_date'] = self.get_effective_date(article_info)
+        if self.topic_classifier is not None:
+            self.topic_classifier.annotate(article_info)
+
+    def _refresh_cached_features(self, file_path: Path, article_info: Dict,
+                                 file_stat: os.stat_result) -> Dict:
+        """
+        Bring a cached article up to date with the current stat result and topics.
+
+        Topic labels are recomputed only when the configured keyword set
+        differs from the one they were computed with; the refreshed entry is
+        written back to the cache.
+
+        Args:
+            file_path: Article file path
+            article_info: Cached article information
+            file_stat: Current stat result
+
+        Returns:
+            Updated article information
+        """
+        article_info = self._refresh_file_times(article_info, file_stat)
+        if self.topic_classifier is not None and \
+                article_info.get('topic_signature') != self.topic_classifier.signature:
+            self.topic_classifier.annotate(article_info)
+            feature_cache = self._get_feature_cache()
+            if feature_cache:
+                feature_cache.put(str(file_path), file_stat, article_info)
+        return article_info
+
+    def _refresh_file_times(self, article_info: Dict, file_stat: os.stat_result) -> Dict:
+        """
+        Update file timestamps of a cached article from the current stat result.
+
+        The creation time may change without touching size or mtime (e.g. after
+        a copy), so the effective date is recomputed when it does.
+
+        Args:
+            article_info: Cached article information
+            file_stat: Current stat result
+
+        Returns:
+            Updated article information
+        """
+        created_time = datetime.fromtimestamp(file_stat.st_ctime)
+        if article_info.get('created_time') != created_time:
+            article_info['created_time'] = created_time
+            article_info['effective_date'] = self.get_effective_date(article_info)
+        article_info['modified_time'] = datetime.fromtimestamp(file_stat.st_mtime)
+        return article_info
+
     def _extract_front_matter(self, content: str) -> Tuple[str, str]:
         """
         Extract Front Matter and main content from article.
@@ -189,7 +525,7 @@ class ArticleAnalyzer:
             Effective date
         """
         # Try to extract date from filename
-        filename_date = self._extract_date_from_filename(article['file_name'])
+        filename_date = self.date_helper.extract_date_from_filename(article['file_name'])
         if filename_date:
             return filename_date
 
@@ -200,81 +536,22 @@ class ArticleAnalyzer:
         # Use modified time as fallback
         return article['modified_time']
 
-    def _extract_date_from_filename(self, filename: str) -> Optional[datetime]:
-        """
-        Extract date from filename.
-
-        Supports formats: xxx-20250914.md, xxx-2025-09-14.md etc.
-
-        Args:
-            filename: Filename to parse
-
-        Returns:
-            Extracted datetime or None
-        """
-        # Match YYYYMMDD format
-        date_pattern1 = re.search(r'(\d{8})', filename)
-        if date_pattern1:
-            try:
-                date_str = date_pattern1.group(1)
-                return datetime.strptime(date_str, '%Y%m%d')
-            except ValueError:
-                pass
-
-        # Match YYYY-MM-DD format
-        date_pattern2 = re.search(r'(\d{4}-\d{2}-\d{2})', filename)
-        if date_pattern2:
-            try:
-                date_str = date_pattern2.group(1)
-                return datetime.strptime(date_str, '%Y-%m-%d')
-            except ValueError:
-                pass
-
-        return None
-
     def classify_article_topic(self, article: Dict) -> Optional[str]:
         """
         Classify article topic based on content.
 
+        Uses the scores stored on the article during scanning; articles without
+        current scores are classified with the keyword automaton.
+
         Args:
             article: Article information
 
         Returns:
             Topic category name or None if cannot classify
         """
-        topic_config = self.config.get('topic_classification', {})
-        if not topic_config.get('enabled', False):
-            return None
-
-        topics = topic_config.get('topics', {})
-        if not topics:
+        if self.topic_classifier is None:
             return None
-
-        # Combine title and content for classification
-        text_to_classify = (article['title'] + ' ' + article['content']).lower()
-
-        # Calculate scores for each topic
-        topic_scores = {}
-        for topic_name, topic_config in topics.items():
-            keywords = topic_config.get('keywords', [])
-            if not keywords:
-                continue
-
-            score = 0
-            for keyword in keywords:
-                if keyword.lower() in text_to_classify:
-                    score += 1
-
-            if score > 0:
-                # Normalize score (matched keywords / total keywords)
-                topic_scores[topic_name] = score / len(keywords)
-
-        if not topic_scores:
-            return None
-
-        # Return topic with highest score
-        best_topic = max(topic_scores.items(), key=lambda x: x[1])
-        return best_topic[0] if best_topic[1] > 0.1 else None  # At least 10% keyword match
+        return self.topic_classifier.classify(article)
 
     def are_cross_topic_articles(self, article1: Dict, article2: Dict) -> bool:
         """
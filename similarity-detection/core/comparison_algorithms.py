@@ -18,10 +18,12 @@ sys.path.insert(0, str(parent_dir))
 try:
     from algorithms.tfidf_similarity import TFIDFSimilarity
     from algorithms.linear_comparison import LinearComparison
+    from algorithms.graph_clustering import GraphClustering
 except ImportError:
     # Fallback for relative imports
     from ..algorithms.tfidf_similarity import TFIDFSimilarity
     from ..algorithms.linear_comparison import LinearComparison
+    from ..algorithms.graph_clustering import GraphClustering
 
 
 class ComparisonAlgorithms:
@@ -41,6 +43,7 @@ class ComparisonAlgorithms:
         # Initialize available algorithms
         self.tfidf_similarity = TFIDFSimilarity(config)
         self.linear_comparison = LinearComparison(config)
+        self.graph_clustering = GraphClustering(config)
 
     def calculate_similarity(self, article1: Dict, article2: Dict,
                            algorithm: str = 'tfidf') -> Dict[str, float]:
@@ -81,14 +84,13 @@ class ComparisonAlgorithms:
         if algorithm == 'linear':
             return self.linear_comparison.detect_similarities(articles)
         elif algorithm == 'graph':
-            # Will be implemented when Graph Clustering module is created
-            raise NotImplementedError("Graph clustering algorithm not yet implemented")
+            return self.graph_clustering.detect_duplicate_groups(articles)
         else:
             raise ValueError(f"Unknown detection algorithm: {algorithm}")
 
     def get_available_algorithms(self) -> List[str]:
         """Get list of available algorithms."""
-        return ['tfidf', 'linear']
+        return ['tfidf', 'linear', 'graph']
 
     def get_algorithm_info(self, algorithm: str) -> Dict[str, Any]:
         """Get information about a specific algorithm."""
@@ -104,6 +106,12 @@ class ComparisonAlgorithms:
                 'description': 'Sequential comparison with time-based optimization',
                 'suitable_for': 'Large datasets with time constraints',
                 'performance': 'Medium'
+            },
+            'graph': {
+                'name': 'Graph Clustering',
+                'description': 'Sparse similarity graph with union-find duplicate groups',
+                'suitable_for': 'Complete duplicate group analysis',
+                'performance': 'Medium'
             }
         }
         return info_map.get(algorithm, {'name': 'Unknown', 'description': 'Unknown algorithm'})
\ No newline at end of file
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Feature Cache - Persistent per-article feature storage.
+
+Parsed article information (front matter, normalized tokens, term frequencies,
+SimHash, effective date) is stored in a SQLite database keyed by file path. An
+entry is reused only while the file size, modification time and feature
+configuration hash are unchanged, so reruns over an unchanged corpus skip
+reading and parsing the files.
+
+Writes commit immediately, except inside ``batch()`` (a directory scan), which
+commits once at the end. Database errors (e.g. a cache locked by another
+process) never propagate: a failed read is a miss and a failed write is
+counted in ``errors``.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional
+
+
+class ArticleFeatureCache:
+    """
+    SQLite-backed cache of extracted article features.
+    """
+
+    # Bump when the layout of cached article dictionaries changes
+    FEATURE_VERSION = 1
+
+    # Configuration keys that change extracted features
+    CONFIG_KEYS = ('simhash_ngram_size',)
+
+    def __init__(self, db_path: str, config: Dict):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: SQLite database path
+            config: Configuration dictionary
+        """
+        self.db_path = db_path
+        self.config_hash = self.compute_config_hash(config)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._batch_depth = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Callers serialize access (the similarity daemon answers requests
+        # from worker threads under one lock)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS article_features (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                config_hash TEXT NOT NULL,
+                payload BLOB NOT NULL
+            )
+        ''')
+        self.conn.commit()
+
+    @classmethod
+    def compute_config_hash(cls, config: Dict) -> str:
+        """
+        Hash the configuration values that influence extracted features.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            Hex digest identifying the feature configuration
+        """
+        relevant = {key: config.get(key) for key in cls.CONFIG_KEYS}
+        relevant['feature_version'] = cls.FEATURE_VERSION
+        encoded = json.dumps(relevant, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.md5(encoded).hexdigest()
+
+    def get(self, path: str, file_stat: os.stat_result) -> Optional[Dict]:
+        """
+        Return cached features if the file is unchanged.
+
+        Args:
+            path: Article file path
+            file_stat: Current stat result of the file
+
+        Returns:
+            Cached article information or None on a miss
+        """
+        try:
+            row = self.conn.execute(
+                'SELECT size, mtime_ns, config_hash, payload FROM article_features WHERE path = ?',
+                (path,)
+            ).fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            row = None
+
+        if row and row[0] == file_stat.st_size and row[1] == file_stat.st_mtime_ns \
+                and row[2] == self.config_hash:
+            try:
+                features = pickle.loads(row[3])
+                self.hits += 1
+                return features
+            except Exception:
+                pass
+
+        self.misses += 1
+        return None
+
+    def put(self, path: str, file_stat: os.stat_result, features: Dict) -> bool:
+        """
+        Store features for a file (committed at once outside of batch()).
+
+        Args:
+            path: Article file path
+            file_stat: Stat result the features were extracted from
+            features: Article information dictionary
+
+        Returns:
+            True if the entry was written
+        """
+        try:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO article_features (path, size, mtime_ns, config_hash, payload) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (path, file_stat.st_size, file_stat.st_mtime_ns, self.config_hash,
+                 pickle.dumps(features, protocol=pickle.HIGHEST_PROTOCOL))
+            )
+        except (sqlite3.Error, pickle.PicklingError):
+            self.errors += 1
+            if not self._batch_depth:
+                self._rollback()
+            return False
+
+        if not self._batch_depth:
+            return self.flush()
+        return True
+
+    def prune(self, directory: str, keep_paths: Iterable[str], recursive: bool = False) -> int:
+        """
+        Drop entries of files under a directory that no longer exist there.
+
+        Args:
+            directory: Scanned directory
+            keep_paths: Paths found during the scan
+            recursive: Whether subdirectories were scanned as well
+
+        Returns:
+            Number of removed entries
+        """
+        keep = set(keep_paths)
+        prefix = os.path.join(str(directory), '')
+        try:
+            stale = [(path,) for (path,) in self.conn.execute(
+                'SELECT path FROM article_features WHERE substr(path, 1, ?) = ?',
+                (len(prefix), prefix)
+            ) if path not in keep and (recursive or os.path.dirname(path) == str(directory))]
+            self.conn.executemany('DELETE FROM article_features WHERE path = ?', stale)
+        except sqlite3.Error:
+            self.errors += 1
+            if not self._batch_depth:
+                self._rollback()
+            return 0
+
+        if not self._batch_depth and not self.flush():
+            return 0
+        return len(stale)
+
+    @contextmanager
+    def batch(self) -> Iterator['ArticleFeatureCache']:
+        """
+        Collect the writes of a block (e.g. a directory scan) in one transaction.
+
+        Nested blocks join the outer one; the outermost commits on exit.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
+    def flush(self) -> bool:
+        """
+        Commit pending writes (rolled back if the commit fails).
+
+        Returns:
+            True if the commit succeeded
+        """
+        try:
+            self.conn.commit()
+            return True
+        except sqlite3.Error:
+            self.errors += 1
+            self._rollback()
+            return False
+
+    def _rollback(self):
+        """Discard pending writes."""
+        try:
+            self.conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Commit pending writes and close the database."""
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental State - Persistent verdicts of earlier detection runs.
+
+Every scanned file is recorded with its size, modification time and verdict
+(kept or moved). Kept articles additionally store their extracted features
+(tokens, term frequencies, SimHash, effective date) so that later runs can
+compare new or modified files against them without re-reading the corpus.
+Kept articles are indexed by effective date, so only those inside the time
+window of the new articles are loaded.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    from ..algorithms.time_window import TimeWindowIndex
+except ImportError:
+    from algorithms.time_window import TimeWindowIndex
+
+
+class IncrementalState:
+    """
+    SQLite-backed state of kept and moved articles.
+
+    All changes of one run are applied in a single transaction, so an
+    interrupted run leaves the previous state untouched.
+    """
+
+    # Bump when the stored article layout changes
+    STATE_VERSION = 2
+
+    # Configuration keys that change detection verdicts
+    CONFIG_KEYS = ('similarity_threshold', 'comparison_window_days', 'min_content_length',
+                   'title_weight', 'content_weight', 'cross_topic_threshold',
+                   'topic_classification', 'simhash_ngram_size',
+                   'check_title_similarity', 'check_content_similarity',
+                   'tfidf_engine', 'tfidf_use_idf', 'tfidf_sublinear_tf',
+                   'exact_duplicate_prepass', 'simhash_prefilter',
+                   'simhash_prefilter_distance', 'simhash_hamm_threshold')
+
+    # Article fields not needed for later comparisons
+    DROPPED_FIELDS = ('full_content', 'front_matter')
+
+    def __init__(self, db_path: str, config: Dict):
+        """
+        Open (or create) the state database.
+
+        A state written with a different detection configuration is discarded,
+        because its verdicts would no longer hold.
+
+        Args:
+            db_path: SQLite database path
+            config: Configuration dictionary
+        """
+        self.db_path = db_path
+        self.config_hash = self.compute_config_hash(config)
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS articles (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                effective_ts INTEGER NOT NULL,
+                base_path TEXT,
+                payload BLOB
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_status_date
+                ON articles (status, effective_ts);
+        ''')
+
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'config_hash'").fetchone()
+        self.was_reset = row is not None and row[0] != self.config_hash
+        if row is None or self.was_reset:
+            with self.conn:
+                self.conn.execute('DELETE FROM articles')
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('config_hash', ?)",
+                                  (self.config_hash,))
+
+    @classmethod
+    def compute_config_hash(cls, config: Dict) -> str:
+        """
+        Hash the configuration values that influence detection verdicts.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            Hex digest identifying the detection configuration
+        """
+        relevant = {key: config.get(key) for key in cls.CONFIG_KEYS}
+        relevant['state_version'] = cls.STATE_VERSION
+        encoded = json.dumps(relevant, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.md5(encoded).hexdigest()
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    @staticmethod
+    def resolve_path(path) -> str:
+        """
+        State key of a file or directory path.
+
+        Paths are stored resolved, so the same files match whether a run was
+        started with a relative or an absolute directory.
+
+        Args:
+            path: File or directory path
+
+        Returns:
+            Absolute path with symlinks resolved
+        """
+        return str(Path(path).resolve())
+
+    def file_states(self, directory: str, recursive: bool = False) -> Dict[str, Tuple[int, int]]:
+        """
+        Return the recorded (size, mtime_ns) of all files under a directory.
+
+        Args:
+            directory: Scanned directory
+            recursive: Include files of subdirectories
+
+        Returns:
+            Mapping of resolved file path to (size, mtime_ns)
+        """
+        directory = self.resolve_path(directory)
+        prefix = os.path.join(directory, '')
+        return {path: (size, mtime_ns) for path, size, mtime_ns in self.conn.execute(
+            'SELECT path, size, mtime_ns FROM articles WHERE substr(path, 1, ?) = ?',
+            (len(prefix), prefix)
+        ) if recursive or os.path.dirname(path) == directory}
+
+    def kept_count(self) -> int:
+        """Number of kept articles in the state."""
+        return self.conn.execute("SELECT COUNT(*) FROM articles WHERE status = 'kept'").fetchone()[0]
+
+    def load_kept(self, start: datetime, end: datetime, exclude: Iterable[str] = ()) -> List[Dict]:
+        """
+        Load kept articles whose effective date lies in [start, end].
+
+        Args:
+            start: Earliest effective date
+            end: Latest effective date
+            exclude: Paths to leave out (e.g. files being re-evaluated)
+
+        Returns:
+            Article dictionaries sorted by effective date
+        """
+        excluded = {self.resolve_path(path) for path in exclude}
+        articles = []
+        for path, payload in self.conn.execute(
+                "SELECT path, payload FROM articles WHERE status = 'kept' "
+                "AND effective_ts BETWEEN ? AND ? ORDER BY effective_ts, path",
+                (TimeWindowIndex.to_key(start), TimeWindowIndex.to_key(end))):
+            if path in excluded:
+                continue
+            try:
+                articles.append(pickle.loads(zlib.decompress(payload)))
+            except Exception:
+                continue
+        return articles
+
+    def apply(self, kept: Iterable[Tuple[os.stat_result, Dict]],
+              moved: Iterable[Tuple[os.stat_result, Dict]], removed: Iterable[str] = ()):
+        """
+        Record the verdicts of a run in one transaction.
+
+        Args:
+            kept: (stat result, article) pairs of newly kept articles
+            moved: (stat result, moved article info) pairs of newly moved articles
+            removed: Paths of files that no longer exist
+        """
+        kept_rows = []
+        for file_stat, article in kept:
+            features = {key: value for key, value in article.items() if key not in self.DROPPED_FIELDS}
+            payload = zlib.compress(pickle.dumps(features, protocol=pickle.HIGHEST_PROTOCOL))
+            kept_rows.append((self.resolve_path(article['file_path']), file_stat.st_size, file_stat.st_mtime_ns, 'kept',
+                              TimeWindowIndex.to_key(article['effective_date']), None, payload))
+
+        moved_rows = [(self.resolve_path(article['file_path']), file_stat.st_size, file_stat.st_mtime_ns, 'moved',
+                       TimeWindowIndex.to_key(article['effective_date']),
+                       article.get('base_article_path'), None)
+                      for file_stat, article in moved]
+
+        insert = ('INSERT OR REPLACE INTO articles '
+                  '(path, size, mtime_ns, status, effective_ts, base_path, payload) '
+                  'VALUES (?, ?, ?, ?, ?, ?, ?)')
+        with self.conn:
+            self.conn.executemany('DELETE FROM articles WHERE path = ?',
+                                  [(self.resolve_path(path),) for path in removed])
+            self.conn.executemany(insert, kept_rows)
+            self.conn.executemany(insert, moved_rows)
+
+    def close(self):
+        """Close the database."""
+        self.conn.close()
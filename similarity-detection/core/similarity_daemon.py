@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Similarity Daemon - Long-running query server around SimilarityEngine.
+
+Scans the article directory once and keeps the parsed articles, the title
+and content indexes and (optionally) the semantic model in memory. Queries
+arrive as JSON over a localhost HTTP socket, so publish hooks get duplicate
+checks without cold-starting Python, reloading the configuration or
+rescanning the corpus.
+
+Endpoints:
+    GET  /status               corpus size, uptime and request count
+    POST /compare              {"file1": ..., "file2": ...}
+    POST /nearest-duplicates   {"file": ..., "top_k": 10, "threshold": null,
+                                "window_days": null, "all_dates": false,
+                                "mode": "tfidf" | "semantic"}
+    POST /add-article          {"file": ...}
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Add current package to path
+current_package = Path(__file__).parent.parent
+sys.path.insert(0, str(current_package))
+
+try:
+    from ..algorithms.content_index import ContentIndex
+    from ..algorithms.time_window import TimeWindowIndex
+    from ..algorithms.title_index import TitleIndex
+except ImportError:
+    from algorithms.content_index import ContentIndex
+    from algorithms.time_window import TimeWindowIndex
+    from algorithms.title_index import TitleIndex
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Slack between shortlist scores from the content index and exact scores
+SHORTLIST_TOLERANCE = 1e-9
+
+
+class SimilarityDaemon:
+    """
+    Warm query service over one article directory.
+
+    Scores are identical to ``SimilarityEngine.compare_articles``: the indexes
+    only shortlist candidates, which are then rescored exactly. All requests
+    are serialized with one lock, so the engine's caches are never used from
+    two threads at once.
+    """
+
+    def __init__(self, engine, semantic: bool = False):
+        """
+        Initialize the daemon.
+
+        Args:
+            engine: Configured SimilarityEngine
+            semantic: Load the embedding model and serve semantic queries
+        """
+        self.engine = engine
+        self.config = engine.config
+        self.pipeline = engine.text_pipeline
+        self.tfidf = engine.tfidf_similarity
+        self.cross_topic_threshold = self.config.get('cross_topic_threshold', 0.85)
+
+        self.articles: Dict[str, Dict] = {}
+        self._file_stats: Dict[str, Tuple[int, int]] = {}
+        self._by_content_hash: Dict[str, Set[str]] = {}
+        self.title_index = TitleIndex(self.pipeline)
+        self.content_index = ContentIndex(self.pipeline)
+
+        self.semantic_enabled = semantic
+        self.semantic = None
+
+        self._lock = threading.RLock()
+        self.started_at = time.time()
+        self.request_count = 0
+
+    def load_directory(self, directory: str) -> int:
+        """
+        Scan a directory and index its articles.
+
+        Args:
+            directory: Article directory
+
+        Returns:
+            Number of indexed articles
+        """
+        articles = self.engine.scan_articles(directory)
+        self.engine.date_helper.resolve_corpus(articles)
+
+        with self._lock:
+            for article in articles:
+                self._index_article(self._article_key(article['file_path']), article)
+
+            if self.semantic_enabled:
+                self._load_semantic(articles)
+
+        print(f"🗂️ 已索引 {len(self.articles)} 篇文章")
+        return len(self.articles)
+
+    def _load_semantic(self, articles: List[Dict]):
+        """Load the embedding model once and index the corpus embeddings."""
+        try:
+            from ..algorithms.semantic_similarity import SemanticSimilarity
+        except ImportError:
+            from algorithms.semantic_similarity import SemanticSimilarity
+
+        self.semantic = SemanticSimilarity(self.config)
+        self.semantic._load_embedding_model()
+        self.semantic.index_articles(articles)
+
+    @staticmethod
+    def _article_key(file_path: str) -> str:
+        """Index key of an article path (absolute, so clients may use relative paths)."""
+        return os.path.abspath(file_path)
+
+    def _index_article(self, key: str, article: Dict):
+        """Register an article with all indexes (replacing an older version)."""
+        previous = self.articles.get(key)
+        if previous is not None:
+            self._by_content_hash.get(previous.get('content_hash'), set()).discard(key)
+
+        article['file_path'] = key
+        self.articles[key] = article
+        self._by_content_hash.setdefault(article.get('content_hash'), set()).add(key)
+        self.title_index.add(key, article)
+        self.content_index.add(key, article)
+
+        try:
+            file_stat = os.stat(key)
+            self._file_stats[key] = (file_stat.st_size, file_stat.st_mtime_ns)
+        except OSError:
+            self._file_stats.pop(key, None)
+
+    def _load_article(self, file_path: str) -> Tuple[str, Dict]:
+        """
+        Return an article, reusing the indexed version while the file is unchanged.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file cannot be parsed
+        """
+        key = self._article_key(file_path)
+        file_stat = os.stat(key)
+
+        article = self.articles.get(key)
+        if article is not None and self._file_stats.get(key) == (file_stat.st_size, file_stat.st_mtime_ns):
+            return key, article
+
+        article = self.engine.article_analyzer.extract_article_info(Path(key))
+        if not article:
+            raise ValueError(f"无法解析文章内容: {file_path}")
+        article['file_path'] = key
+        self.engine.date_helper.resolve_corpus([article])
+        return key, article
+
+    def status(self) -> Dict[str, Any]:
+        """Corpus size, uptime and request count."""
+        with self._lock:
+            return {
+                'articles': len(self.articles),
+                'semantic': self.semantic is not None,
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'requests': self.request_count,
+                'similarity_threshold': self.engine.similarity_threshold,
+                'comparison_window_days': self.engine.comparison_window_days
+            }
+
+    def compare(self, file1: str, file2: str) -> Dict[str, Any]:
+        """
+        Compare two articles (same result as ``main.py --compare``).
+
+        Args:
+            file1: First article path
+            file2: Second article path
+
+        Returns:
+            Comparison results
+        """
+        with self._lock:
+            _, article1 = self._load_article(file1)
+            _, article2 = self._load_article(file2)
+            return self.engine.compare_articles(article1, article2)
+
+    def add_article(self, file_path: str) -> Dict[str, Any]:
+        """
+        Index a new or modified article.
+
+        Args:
+            file_path: Article path
+
+        Returns:
+            Key, title and whether the article replaced an indexed version
+        """
+        with self._lock:
+            key, article = self._load_article(file_path)
+            replaced = key in self.articles
+            self._index_article(key, article)
+            if self.semantic is not None:
+                self.semantic.index_articles([article])
+
+            return {
+                'file_path': key,
+                'title': article.get('title', ''),
+                'replaced': replaced,
+                'articles': len(self.articles)
+            }
+
+    def nearest_duplicates(self, file_path: str, top_k: int = 10,
+                           threshold: Optional[float] = None,
+                           window_days: Optional[int] = None,
+                           all_dates: bool = False,
+                           mode: str = 'tfidf') -> Dict[str, Any]:
+        """
+        Find the indexed articles an article duplicates.
+
+        Candidates follow the linear algorithm's rules: same minimum content
+        length, same time window around the effective date and the higher
+        threshold for cross-topic pairs. The article itself is never reported.
+
+        Args:
+            file_path: Article path (need not be indexed)
+            top_k: Maximum number of results
+            threshold: Similarity threshold (uses the engine's if None)
+            window_days: Comparison window (uses the engine's if None)
+            all_dates: Ignore the time window
+            mode: 'tfidf' (exact engine scores) or 'semantic' (ANN index)
+
+        Returns:
+            Query article and its duplicates, most similar first
+        """
+        with self._lock:
+            key, article = self._load_article(file_path)
+
+            if mode == 'semantic':
+                duplicates = self._semantic_duplicates(key, article, top_k, threshold)
+            elif mode == 'tfidf':
+                duplicates = self._tfidf_duplicates(key, article, threshold, window_days, all_dates)
+            else:
+                raise ValueError(f"未知的查询模式: {mode}")
+
+            return {
+                'file_path': key,
+                'title': article.get('title', ''),
+                'mode': mode,
+                'duplicates': duplicates[:top_k]
+            }
+
+    def _tfidf_duplicates(self, key: str, article: Dict, threshold: Optional[float],
+                          window_days: Optional[int], all_dates: bool) -> List[Dict]:
+        """Shortlist candidates from the indexes and rescore them exactly."""
+        min_content_length = self.engine.min_content_length
+        if article['word_count'] < min_content_length:
+            return []
+
+        if threshold is None:
+            threshold = self.engine.similarity_threshold
+        if window_days is None:
+            window_days = self.engine.comparison_window_days
+        window = None if all_dates else TimeWindowIndex.window_span(window_days)
+        article_date = TimeWindowIndex.to_key(article['effective_date'])
+
+        title_sims = self.title_index.query(article) if self.tfidf.check_title_similarity else {}
+        content_sims = self.content_index.similarities(article) if self.tfidf.check_content_similarity else {}
+        identical = self._by_content_hash.get(article.get('content_hash'), set())
+
+        duplicates = []
+        for other_key in set(title_sims) | set(content_sims) | identical:
+            other = self.articles[other_key]
+            if other_key == key or other['word_count'] < min_content_length:
+                continue
+            if window is not None and abs(TimeWindowIndex.to_key(other['effective_date']) - article_date) > window:
+                continue
+
+            is_cross_topic = self.engine.article_analyzer.are_cross_topic_articles(article, other)
+            effective_threshold = self.cross_topic_threshold if is_cross_topic else threshold
+
+            if other_key not in identical:
+                estimate = (title_sims.get(other_key, 0.0) * self.tfidf.title_weight
+                            + content_sims.get(other_key, 0.0) * self.tfidf.content_weight)
+                if estimate < effective_threshold - SHORTLIST_TOLERANCE:
+                    continue
+
+            similarity = self.tfidf.calculate_similarity(article, other)
+            if similarity['overall_similarity'] < effective_threshold:
+                continue
+
+            duplicates.append({
+                'file_path': other_key,
+                'title': other.get('title', ''),
+                'effective_date': other['effective_date'],
+                'similarity_details': similarity,
+                'similarity': similarity['overall_similarity'],
+                'is_cross_topic': is_cross_topic,
+                'effective_threshold': effective_threshold
+            })
+
+        duplicates.sort(key=lambda duplicate: (-duplicate['similarity'], duplicate['file_path']))
+        return duplicates
+
+    def _semantic_duplicates(self, key: str, article: Dict, top_k: int,
+                             threshold: Optional[float]) -> List[Dict]:
+        """Nearest neighbours from the semantic ANN index."""
+        if self.semantic is None:
+            raise ValueError("语义模式未启用 (启动守护进程时使用 --semantic)")
+
+        duplicates = []
+        for match in self.semantic.query_similar(article, top_k + 1, threshold):
+            other_key = self._article_key(match['file_path']) if match['file_path'] else ''
+            if other_key == key:
+                continue
+            other = self.articles.get(other_key, {})
+            duplicates.append({
+                'file_path': other_key,
+                'title': other.get('title', ''),
+                'effective_date': other.get('effective_date'),
+                'content_hash': match['content_hash'],
+                'similarity': match['similarity']
+            })
+        return duplicates[:top_k]
+
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """
+        Answer requests until interrupted.
+
+        Args:
+            host: Interface to bind (keep it on localhost)
+            port: TCP port
+        """
+        server = ThreadingHTTPServer((host, port), _DaemonRequestHandler)
+        server.daemon_threads = True
+        server.similarity_daemon = self
+
+        print(f"🛰️ 相似度守护进程已启动: http://{host}:{server.server_port}")
+        print("   按 Ctrl+C 停止")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 守护进程已停止")
+        finally:
+            server.server_close()
+
+
+def _json_default(value):
+    """Serialize dates in responses."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"不支持JSON序列化的类型: {type(value).__name__}")
+
+
+class _DaemonRequestHandler(BaseHTTPRequestHandler):
+    """JSON request handler bound to the server's SimilarityDaemon."""
+
+    server_version = 'SimilarityDaemon/1.0'
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/status':
+            self._respond(200, self.server.similarity_daemon.status())
+        else:
+            self._respond(404, {'error': f"未知的接口: {self.path}"})
+
+    def do_POST(self):
+        daemon = self.server.similarity_daemon
+        routes = {
+            '/compare': lambda body: daemon.compare(body['file1'], body['file2']),
+            '/nearest-duplicates': lambda body: daemon.nearest_duplicates(
+                body['file'],
+                top_k=int(body.get('top_k', 10)),
+                threshold=body.get('threshold'),
+                window_days=body.get('window_days'),
+                all_dates=bool(body.get('all_dates', False)),
+                mode=body.get('mode', 'tfidf')),
+            '/add-article': lambda body: daemon.add_article(body['file'])
+        }
+
+        route = routes.get(self.path.rstrip('/'))
+        if route is None:
+            self._respond(404, {'error': f"未知的接口: {self.path}"})
+            return
+
+        started = time.perf_counter()
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(body, dict):
+                raise ValueError("请求体必须是JSON对象")
+            result = route(body)
+        except KeyError as e:
+            self._respond(400, {'error': f"缺少参数: {e.args[0]}"})
+            return
+        except (ValueError, OSError) as e:
+            self._respond(400, {'error': str(e)})
+            return
+        except Exception as e:
+            # Unexpected failures still get a JSON answer instead of a dropped connection
+            self._respond(500, {'error': f"内部错误: {type(e).__name__}: {e}"})
+            return
+
+        with daemon._lock:
+            daemon.request_count += 1
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self._respond(200, result)
+
+    def _respond(self, status: int, payload: Dict):
+        try:
+            data = json.dumps(payload, ensure_ascii=False, default=_json_default).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            status = 500
+            data = json.dumps({'error': f"响应无法序列化: {e}"}, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.similarity_daemon.engine.debug_mode:
+            super().log_message(format, *args)
@@ -10,8 +10,9 @@ different similarity algorithms and manages the detection process.
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 # Add project root to path for imports
 project_root = Path(__file__).parent.parent.parent
@@ -23,19 +24,27 @@ sys.path.insert(0, str(current_package))
 
 try:
     from .article_analyzer import ArticleAnalyzer
+    from .incremental_state import IncrementalState
     from .result_processor import ResultProcessor
 except ImportError:
     from article_analyzer import ArticleAnalyzer
+    from incremental_state import IncrementalState
     from result_processor import ResultProcessor
 
 try:
     from ..algorithms.linear_comparison import LinearComparison
+    from ..algorithms.graph_clustering import GraphClustering
     from ..algorithms.tfidf_similarity import TFIDFSimilarity
     from ..utils.file_handler import FileHandler
+    from ..utils.date_helper import DateHelper
+    from ..utils.text_pipeline import get_text_pipeline
 except ImportError:
     from algorithms.linear_comparison import LinearComparison
+    from algorithms.graph_clustering import GraphClustering
     from algorithms.tfidf_similarity import TFIDFSimilarity
     from utils.file_handler import FileHandler
+    from utils.date_helper import DateHelper
+    from utils.text_pipeline import get_text_pipeline
 
 
 class SimilarityEngine:
@@ -61,6 +70,7 @@ class SimilarityEngine:
 
         # Algorithm instances
         self.linear_comparison = LinearComparison(self.config)
+        self.graph_clustering = GraphClustering(self.config)
         self.tfidf_similarity = TFIDFSimilarity(self.config)
 
         # Core configuration
@@ -69,6 +79,14 @@ class SimilarityEngine:
         self.new_articles_folder = self.config.get('new_articles_folder', 'new-articles')
         self.old_articles_folder = self.config.get('old_articles_folder', 'old-articles')
         self.keep_oldest = self.config.get('keep_oldest_article', True)
+        self.incremental_state_path = self.config.get('incremental_state_path',
+                                                      'data/incremental_state.db')
+        self.min_content_length = self.config.get('min_content_length', 1000)
+
+        # Exact duplicate pre-pass (identical content never reaches pairwise scoring)
+        self.exact_duplicate_prepass = self.config.get('exact_duplicate_prepass', True)
+        self.date_helper = DateHelper()
+        self.text_pipeline = get_text_pipeline()
 
         # Topic classification configuration
         self.topic_classification = self.config.get('topic_classification', {})
@@ -143,7 +161,76 @@ class SimilarityEngine:
         if articles is None:
             articles = getattr(self, 'all_articles', [])
 
-        return self.linear_comparison.detect_similarities(articles)
+        return self._detect_linear_with_prepass(articles, self.linear_comparison.detect_similarities)
+
+    def detect_similarities_incremental(self, directory: str) -> Dict[str, Any]:
+        """
+        Perform linear similarity detection on new or modified files only.
+
+        Files whose size and modification time match the persisted state are
+        skipped. Changed files are compared against the kept articles of
+        earlier runs and against each other, then the state is updated in one
+        transaction. Files that disappeared from the directory are dropped from
+        the state.
+
+        Args:
+            directory: Directory path to scan
+
+        Returns:
+            Detection results for the changed files, plus the number of
+            'unchanged_articles'
+        """
+        # The state is keyed by resolved paths, so relative and absolute
+        # spellings of the same directory share it
+        directory_path = Path(directory).resolve()
+        state = IncrementalState(self.incremental_state_path, self.config)
+        if state.was_reset:
+            print("♻️ 检测配置已变更，增量状态已重置")
+
+        try:
+            file_stats = {}
+            for file_path in self.article_analyzer.find_markdown_files(directory_path):
+                try:
+                    file_stats[state.resolve_path(file_path)] = (file_path, file_path.stat())
+                except OSError as e:
+                    print(f"    ❌ 无法读取文件 {file_path}: {e}")
+
+            known = state.file_states(directory_path, recursive=self.article_analyzer.scan_recursive)
+            changed = [file_path for path, (file_path, file_stat) in file_stats.items()
+                       if known.get(path) != (file_stat.st_size, file_stat.st_mtime_ns)]
+            removed = [path for path in known if path not in file_stats]
+
+            print(f"📁 找到 {len(file_stats)} 个文章文件: {len(changed)} 个新增或修改, "
+                  f"{len(file_stats) - len(changed)} 个未变化, {len(removed)} 个已删除")
+
+            new_articles = list(self.article_analyzer.iter_articles(changed))
+            self.article_analyzer._finish_scan(directory_path, [file_path for file_path, _ in file_stats.values()])
+
+            reference_articles = []
+            if new_articles:
+                dates = [self.article_analyzer.get_effective_date(article) for article in new_articles]
+                window = timedelta(days=self.linear_comparison.comparison_window_days)
+                reference_articles = state.load_kept(
+                    min(dates) - window, max(dates) + window,
+                    exclude=changed)
+
+            result = self._detect_linear_with_prepass(
+                new_articles,
+                lambda representatives: self.linear_comparison.detect_similarities_incremental(
+                    representatives, reference_articles),
+                reference_articles)
+
+            kept = [(file_stats[state.resolve_path(article['file_path'])][1], article)
+                    for article in result['kept_articles']]
+            moved = [(file_stats[state.resolve_path(article['file_path'])][1], article)
+                     for article in result['moved_articles']]
+            state.apply(kept=kept, moved=moved, removed=removed)
+            print(f"💾 增量状态已更新: {state.kept_count()} 篇保留文章")
+
+            result['unchanged_articles'] = len(file_stats) - len(changed)
+            return result
+        finally:
+            state.close()
 
     def detect_duplicate_groups(self, articles: Optional[List[Dict]] = None) -> Dict[str, Any]:
         """
@@ -158,10 +245,192 @@ class SimilarityEngine:
         if articles is None:
             articles = getattr(self, 'all_articles', [])
 
-        # This will be implemented when we create the graph algorithm module
-        from ..algorithms.graph_clustering import GraphClustering
-        graph_clustering = GraphClustering(self.config)
-        return graph_clustering.detect_duplicate_groups(articles)
+        representatives, duplicates = self.collapse_exact_duplicates(articles)
+        result = self.graph_clustering.detect_duplicate_groups(representatives)
+        return self._merge_exact_duplicates_graph(result, duplicates)
+
+    def collapse_exact_duplicates(self, articles: List[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, Dict]]]:
+        """
+        Bucket articles by normalized content hash and keep one per bucket.
+
+        Byte- or whitespace-identical copies would score 1.0 against each
+        other anyway; they are removed before pairwise scoring and attached to
+        the earliest article of their bucket that lies within their comparison
+        window. A copy outside the window of that article starts a new
+        representative, just as the detector would keep it. Articles below the
+        minimum content length are never compared and are left untouched.
+
+        Args:
+            articles: Articles to analyze
+
+        Returns:
+            (representative articles in input order, (duplicate, representative) pairs)
+        """
+        if not self.exact_duplicate_prepass or len(articles) < 2:
+            return articles, []
+
+        corpus_dates = self.date_helper.resolve_corpus(articles, self.article_analyzer.get_effective_date)
+        window = self.linear_comparison.window_index_class.window_span(
+            self.linear_comparison.comparison_window_days)
+
+        # Chronological order makes the current representative of each bucket
+        # the earliest copy still inside the window
+        representatives: Dict[str, int] = {}
+        duplicate_of: Dict[int, int] = {}
+        for idx in corpus_dates.order.tolist():
+            article = articles[idx]
+            if article.get('word_count', 0) < self.min_content_length:
+                continue
+            key = self.text_pipeline.article_exact_key(article)
+            representative = representatives.get(key)
+            if (representative is not None and
+                    corpus_dates.timestamps[idx] - corpus_dates.timestamps[representative] <= window):
+                duplicate_of[idx] = representative
+            else:
+                representatives[key] = idx
+
+        if not duplicate_of:
+            return articles, []
+
+        print(f"🧬 精确重复预处理: {len(duplicate_of)} 篇文章与更早的文章内容完全相同，"
+              f"直接合并，不再参与两两比较")
+
+        kept = [article for idx, article in enumerate(articles) if idx not in duplicate_of]
+        duplicates = [(articles[idx], articles[representative])
+                      for idx, representative in sorted(duplicate_of.items(),
+                                                        key=lambda item: (item[1], item[0]))]
+        return kept, duplicates
+
+    def _detect_linear_with_prepass(self, articles: List[Dict], detect: Callable[[List[Dict]], Dict[str, Any]],
+                                    reference_articles: Iterable[Dict] = ()) -> Dict[str, Any]:
+        """
+        Run a linear detection on the exact duplicate representatives only.
+
+        A duplicate follows its representative, so it ends up on the same base
+        when the representative is moved. If that base lies outside the
+        duplicate's own comparison window, the duplicate is put back and the
+        detection is repeated, so that it is scored like any other article.
+
+        Args:
+            articles: Articles to analyze
+            detect: Linear detection over a list of articles
+            reference_articles: Earlier kept articles the detection compares against
+
+        Returns:
+            Detection results including the exact duplicates
+        """
+        representatives, duplicates = self.collapse_exact_duplicates(articles)
+        by_path = {article['file_path']: article for article in chain(reference_articles, articles)}
+        window_index_class = self.linear_comparison.window_index_class
+        window = window_index_class.window_span(self.linear_comparison.comparison_window_days)
+
+        def timestamp(article: Dict) -> int:
+            return window_index_class.to_key(self.article_analyzer.get_effective_date(article))
+
+        while True:
+            result = detect(representatives)
+            moved = {article['file_path']: article for article in result['moved_articles']}
+            displaced = set()
+            for duplicate, representative in duplicates:
+                base = by_path.get(moved.get(representative['file_path'], {}).get('base_article_path'))
+                if base is not None and abs(timestamp(duplicate) - timestamp(base)) > window:
+                    displaced.add(duplicate['file_path'])
+            if not displaced:
+                return self._merge_exact_duplicates_linear(result, duplicates)
+
+            duplicates = [pair for pair in duplicates if pair[0]['file_path'] not in displaced]
+            remaining = {article['file_path'] for article in representatives} | displaced
+            representatives = [article for article in articles if article['file_path'] in remaining]
+
+    def _merge_exact_duplicates_linear(self, result: Dict[str, Any],
+                                       duplicates: List[Tuple[Dict, Dict]]) -> Dict[str, Any]:
+        """
+        Add collapsed exact duplicates to a linear result as moved articles.
+
+        A duplicate of a kept representative is moved to the representative. A
+        duplicate of a moved representative is moved to that representative's
+        base with its scores, so no duplicate points at a moved article.
+
+        Args:
+            result: Linear (or incremental) detection result
+            duplicates: (duplicate, representative) pairs from collapse_exact_duplicates
+
+        Returns:
+            The updated result
+        """
+        result['exact_duplicates'] = len(duplicates)
+        moved = {article['file_path']: article for article in result['moved_articles']}
+        for duplicate, representative in duplicates:
+            moved_representative = moved.get(representative['file_path'])
+            if moved_representative is not None:
+                # Identical content scores like its representative against the base
+                match = {key: moved_representative[key] for key in (
+                    'similarity_to_base', 'base_article', 'base_article_path',
+                    'is_cross_topic', 'effective_threshold', 'similarity_details')}
+            else:
+                match = {
+                    'similarity_to_base': 1.0,
+                    'base_article': representative['file_name'],
+                    'base_article_path': representative['file_path'],
+                    'is_cross_topic': False,
+                    'effective_threshold': self.similarity_threshold,
+                    'similarity_details': {
+                        'title_similarity': 1.0,
+                        'content_similarity': 1.0,
+                        'overall_similarity': 1.0
+                    }
+                }
+            result['moved_articles'].append({**duplicate, **match, 'exact_duplicate': True})
+        if duplicates:
+            print(f"  🧬 精确重复文章: {len(duplicates)} 篇 (已计入移动文章)")
+        return result
+
+    def _merge_exact_duplicates_graph(self, result: Dict[str, Any],
+                                      duplicates: List[Tuple[Dict, Dict]]) -> Dict[str, Any]:
+        """
+        Add collapsed exact duplicates to a graph result.
+
+        A duplicate joins the group of its representative; a representative
+        without a group forms a new group with its duplicates.
+
+        Args:
+            result: Graph clustering result
+            duplicates: (duplicate, representative) pairs from collapse_exact_duplicates
+
+        Returns:
+            The updated result
+        """
+        result['exact_duplicates'] = len(duplicates)
+        if not duplicates:
+            return result
+
+        groups_by_path = {article['file_path']: group
+                          for group in result['duplicate_groups'] for article in group['articles']}
+
+        for duplicate, representative in duplicates:
+            group = groups_by_path.get(representative['file_path'])
+            if group is None:
+                group = {
+                    'base_article': representative,
+                    'articles': [{**representative, 'similarity_to_base': 1.0, 'is_base': True}],
+                    'group_id': len(result['duplicate_groups']) + 1,
+                    'topic': self.graph_clustering._classify_article_topic(representative) or 'Unknown'
+                }
+                result['duplicate_groups'].append(group)
+                groups_by_path[representative['file_path']] = group
+                result['unique_articles'] = [article for article in result['unique_articles']
+                                             if article['file_path'] != representative['file_path']]
+
+            # Identical content scores like its representative against the base
+            similarity_to_base = next(article['similarity_to_base'] for article in group['articles']
+                                      if article['file_path'] == representative['file_path'])
+            group['articles'].append({**duplicate, 'similarity_to_base': similarity_to_base,
+                                      'is_base': False, 'exact_duplicate': True})
+            groups_by_path[duplicate['file_path']] = group
+            result['similarity_edges'].append((representative['file_name'], duplicate['file_name'], 1.0))
+
+        print(f"  🧬 精确重复文章: {len(duplicates)} 篇 (已并入重复群组)")
+        return result
 
     def compare_two_articles(self, file1: str, file2: str) -> Dict[str, Any]:
         """
@@ -182,19 +451,40 @@ class SimilarityEngine:
             print(f"❌ 无法解析文章内容")
             return None
 
+        result = self.compare_articles(article1, article2)
+
+        # Output results
+        print(f"\n📊 相似度分析结果:")
+        print(f"  综合相似度: {result['similarity_scores']['overall_similarity']:.3f}")
+        print(f"  检测阈值: {self.similarity_threshold:.3f}")
+        print(f"  判断结果: {'相似' if result['analysis']['is_similar'] else '不相似'}")
+
+        return result
+
+    def compare_articles(self, article1: Dict, article2: Dict) -> Dict[str, Any]:
+        """
+        Compare two parsed articles.
+
+        Args:
+            article1: First article information
+            article2: Second article information
+
+        Returns:
+            Comparison results
+        """
         # Calculate similarities using TF-IDF algorithm
         similarity_score = self.tfidf_similarity.calculate_similarity(article1, article2)
 
         # Build detailed result
-        result = {
+        return {
             'article1': {
-                'file_path': file1,
+                'file_path': article1['file_path'],
                 'title': article1['title'],
                 'word_count': article1['word_count'],
                 'effective_date': self.article_analyzer.get_effective_date(article1)
             },
             'article2': {
-                'file_path': file2,
+                'file_path': article2['file_path'],
                 'title': article2['title'],
                 'word_count': article2['word_count'],
                 'effective_date': self.article_analyzer.get_effective_date(article2)
@@ -206,14 +496,6 @@ class SimilarityEngine:
             }
         }
 
-        # Output results
-        print(f"\n📊 相似度分析结果:")
-        print(f"  综合相似度: {similarity_score['overall_similarity']:.3f}")
-        print(f"  检测阈值: {self.similarity_threshold:.3f}")
-        print(f"  判断结果: {'相似' if result['analysis']['is_similar'] else '不相似'}")
-
-        return result
-
     def process_articles_by_date(self, detection_result: Dict[str, Any],
                                 move_files: bool = True) -> Dict[str, Any]:
         """
@@ -233,6 +515,7 @@ class SimilarityEngine:
         self.debug_mode = enabled
         self.article_analyzer.debug_mode = enabled
         self.linear_comparison.debug_mode = enabled
+        self.graph_clustering.debug_mode = enabled
         if enabled:
             print("🐛 调试模式已启用")
         else:
@@ -63,6 +63,24 @@ def main():
                        help='配置文件输出目录 (默认: 当前目录)')
     parser.add_argument('--simple', action='store_true',
                        help='简化模式：输出精简的结果摘要，适合快速检查')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='不使用文章特征缓存，重新解析所有文件')
+    parser.add_argument('--scan-workers', type=int,
+                       help='并行解析文章的进程数 (0 = 全部CPU核心)')
+    parser.add_argument('--workers', type=int,
+                       help='并行比较文章的进程数 (0 = 全部CPU核心)')
+    parser.add_argument('--recursive', action='store_true',
+                       help='递归扫描子目录中的文章')
+    parser.add_argument('--incremental', action='store_true',
+                       help='增量模式：只检测新增或修改的文章，并与已保存的保留文章状态比较')
+    parser.add_argument('--state-path',
+                       help='增量状态数据库路径 (默认: data/incremental_state.db)')
+    parser.add_argument('--serve', action='store_true',
+                       help='守护进程模式：常驻内存，通过本地HTTP接口提供对比和查重查询')
+    parser.add_argument('--host', help='守护进程监听地址 (默认: 127.0.0.1)')
+    parser.add_argument('--port', type=int, help='守护进程监听端口 (默认: 8765)')
+    parser.add_argument('--semantic', action='store_true',
+                       help='守护进程预加载语义模型，支持语义近邻查询')
 
     args = parser.parse_args()
 
@@ -123,6 +141,53 @@ def main():
             engine.comparison_window_days = args.window_days
             print(f"⏰ 使用自定义时间窗口: {args.window_days} 天")
 
+        if args.no_cache:
+            engine.article_analyzer.feature_cache_enabled = False
+
+        if args.scan_workers is not None:
+            engine.article_analyzer.scan_workers = args.scan_workers or (os.cpu_count() or 1)
+
+        if args.workers is not None:
+            workers = args.workers or (os.cpu_count() or 1)
+            engine.linear_comparison.workers = workers
+            engine.graph_clustering.workers = workers
+
+        if args.recursive:
+            engine.article_analyzer.scan_recursive = True
+
+        if args.state_path:
+            engine.incremental_state_path = args.state_path
+
+        if args.serve:
+            from core.similarity_daemon import SimilarityDaemon
+            daemon = SimilarityDaemon(engine, semantic=args.semantic)
+            daemon.load_directory(args.directory)
+            daemon.serve(args.host or engine.config.get('daemon_host', '127.0.0.1'),
+                         args.port or engine.config.get('daemon_port', 8765))
+            return 0
+
+        if args.incremental:
+            if args.algorithm == 'graph':
+                print("❌ 增量模式仅支持线性算法 (--algorithm linear)")
+                return 1
+
+            print(f"\n📁 增量扫描目录: {args.directory}")
+            detection_result = engine.detect_similarities_incremental(args.directory)
+            new_count = len(detection_result['kept_articles']) + len(detection_result['moved_articles'])
+
+            if args.auto_process and detection_result.get('moved_articles'):
+                print(f"\n🔄 自动处理相似文章...")
+                if args.dry_run:
+                    print("⚠️ 预览模式：只显示操作，不实际移动文件")
+                engine.process_articles_by_date(detection_result, not args.dry_run)
+
+            print(f"\n🎉 增量检测完成！")
+            print(f"📊 新增或修改: {new_count} 篇，未变化: {detection_result['unchanged_articles']} 篇")
+            print(f"📊 总比较次数: {detection_result['total_comparisons']}")
+            print(f"✅ 保留文章: {len(detection_result['kept_articles'])} 篇")
+            print(f"📦 相似文章: {len(detection_result['moved_articles'])} 篇")
+            return 0
+
         # 1. Scan articles
         if args.simple:
             print(f"📁 扫描: {args.directory}")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Similarity Daemon Client
+
+Thin command line client for a running similarity daemon
+(``python main.py DIR --serve``). Uses only the standard library, so publish
+hooks start it without loading the detection modules.
+
+Exit codes: 0 = ok / no duplicates, 1 = error, 2 = duplicates found.
+"""
+
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+DEFAULT_URL = 'http://127.0.0.1:8765'
+
+
+def request(url: str, endpoint: str, payload=None, timeout: float = 30.0):
+    """Send one request to the daemon and return the decoded JSON response."""
+    data = None
+    headers = {}
+    if payload is not None:
+        data = json.dumps(payload).encode('utf-8')
+        headers['Content-Type'] = 'application/json'
+
+    req = urllib.request.Request(url.rstrip('/') + endpoint, data=data, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read().decode('utf-8')).get('error', e.reason)
+        except ValueError:
+            message = e.reason
+        raise RuntimeError(message)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='相似度守护进程客户端')
+    parser.add_argument('--url', default=os.environ.get('SIMILARITY_DAEMON_URL', DEFAULT_URL),
+                        help=f'守护进程地址 (默认: {DEFAULT_URL})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('status', help='查看守护进程状态')
+
+    compare_parser = subparsers.add_parser('compare', help='对比两篇文章的相似度')
+    compare_parser.add_argument('file1')
+    compare_parser.add_argument('file2')
+
+    nearest_parser = subparsers.add_parser('nearest', help='查找文章的重复文章')
+    nearest_parser.add_argument('file')
+    nearest_parser.add_argument('--top-k', type=int, default=10, help='最多返回的文章数')
+    nearest_parser.add_argument('--threshold', type=float, help='相似度阈值')
+    nearest_parser.add_argument('--window-days', type=int, help='检测时间窗口（天数）')
+    nearest_parser.add_argument('--all-dates', action='store_true', help='忽略时间窗口')
+    nearest_parser.add_argument('--semantic', action='store_true', help='使用语义近邻索引')
+
+    add_parser = subparsers.add_parser('add', help='将新文章或修改后的文章加入索引')
+    add_parser.add_argument('file')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'status':
+            result = request(args.url, '/status')
+        elif args.command == 'compare':
+            result = request(args.url, '/compare', {'file1': os.path.abspath(args.file1),
+                                                    'file2': os.path.abspath(args.file2)})
+        elif args.command == 'nearest':
+            result = request(args.url, '/nearest-duplicates', {
+                'file': os.path.abspath(args.file),
+                'top_k': args.top_k,
+                'threshold': args.threshold,
+                'window_days': args.window_days,
+                'all_dates': args.all_dates,
+                'mode': 'semantic' if args.semantic else 'tfidf'
+            })
+        else:
+            result = request(args.url, '/add-article', {'file': os.path.abspath(args.file)})
+    except (RuntimeError, urllib.error.URLError, OSError) as e:
+        print(f"❌ 请求失败: {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    if args.command == 'nearest' and result.get('duplicates'):
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,10 +8,17 @@ Provides common utility functions and helpers.
 
 from .file_handler import FileHandler
 from .text_processor import TextProcessor
-from .date_helper import DateHelper
+from .text_pipeline import TextPipeline, get_text_pipeline
+from .topic_classifier import KeywordAutomaton, TopicClassifier
+from .date_helper import DateHelper, CorpusDates
 
 __all__ = [
     'FileHandler',
     'TextProcessor',
+    'TextPipeline',
+    'get_text_pipeline',
+    'KeywordAutomaton',
+    'TopicClassifier',
     'DateHelper',
+    'CorpusDates',
 ]
\ No newline at end of file
@@ -7,8 +7,60 @@ Provides date and time utilities for similarity detection system.
 """
 
 import re
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional, Dict, List, Sequence
+
+import numpy as np
+import yaml
+
+EPOCH = datetime(1970, 1, 1)
+DAY_MICROSECONDS = 86400 * 1000000
+
+# Filename date patterns in priority order
+FILENAME_DATE_PATTERNS = [
+    (re.compile(r'(\d{8})'), '%Y%m%d'),
+    (re.compile(r'(\d{4}-\d{2}-\d{2})'), '%Y-%m-%d'),
+    (re.compile(r'(\d{4}_\d{2}_\d{2})'), '%Y_%m_%d'),
+    (re.compile(r'(\d{2}\d{2}\d{4})'), '%d%m%Y'),
+]
+
+# Front matter fields holding the publication date, in priority order
+FRONT_MATTER_DATE_FIELDS = ['date', 'created', 'published', 'publish_date']
+
+
+def to_timestamp(value: datetime) -> int:
+    """Convert a datetime to microseconds since the epoch (aware values as UTC)."""
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+class CorpusDates:
+    """
+    Effective dates of a corpus, resolved once and stored as int64 arrays.
+
+    ``timestamps`` holds microseconds since the epoch and ``days`` the epoch
+    day of every article, in the order of the resolved article list.
+    ``order`` sorts the corpus chronologically; the sorted timestamps feed
+    ``TimeWindowIndex`` for window queries.
+    """
+
+    def __init__(self, dates: Sequence[datetime]):
+        """
+        Build the arrays.
+
+        Args:
+            dates: Effective date per article
+        """
+        self.dates = list(dates)
+        self.timestamps = np.fromiter((to_timestamp(value) for value in self.dates),
+                                      dtype=np.int64, count=len(self.dates))
+        self.days = self.timestamps // DAY_MICROSECONDS
+        self.order = np.argsort(self.timestamps, kind='stable')
+        self.sorted_timestamps = self.timestamps[self.order]
+
+    def __len__(self) -> int:
+        return len(self.dates)
 
 
 class DateHelper:
@@ -74,43 +126,51 @@ class DateHelper:
         Returns:
             Extracted datetime or None if not found
         """
-        # Pattern 1: YYYYMMDD
-        pattern1 = re.search(r'(\d{8})', filename)
-        if pattern1:
-            try:
-                date_str = pattern1.group(1)
-                return datetime.strptime(date_str, '%Y%m%d')
-            except ValueError:
-                pass
+        # YYYYMMDD, YYYY-MM-DD, YYYY_MM_DD, DDMMYYYY (first valid match wins)
+        for pattern, date_format in FILENAME_DATE_PATTERNS:
+            match = pattern.search(filename)
+            if match:
+                try:
+                    return datetime.strptime(match.group(1), date_format)
+                except ValueError:
+                    pass
 
-        # Pattern 2: YYYY-MM-DD
-        pattern2 = re.search(r'(\d{4}-\d{2}-\d{2})', filename)
-        if pattern2:
-            try:
-                date_str = pattern2.group(1)
-                return datetime.strptime(date_str, '%Y-%m-%d')
-            except ValueError:
-                pass
+        return None
 
-        # Pattern 3: YYYY_MM_DD
-        pattern3 = re.search(r'(\d{4}_\d{2}_\d{2})', filename)
-        if pattern3:
+    @staticmethod
+    def _front_matter_fields(front_matter) -> Dict:
+        """Front matter as a dictionary (raw YAML text is parsed)."""
+        if isinstance(front_matter, dict):
+            return front_matter
+        if isinstance(front_matter, str) and front_matter.strip():
             try:
-                date_str = pattern3.group(1)
-                return datetime.strptime(date_str, '%Y_%m_%d')
-            except ValueError:
-                pass
+                fields = yaml.safe_load(front_matter)
+            except yaml.YAMLError:
+                return {}
+            return fields if isinstance(fields, dict) else {}
+        return {}
+
+    def resolve_corpus(self, articles: List[Dict],
+                       date_getter: Optional[Callable[[Dict], datetime]] = None) -> CorpusDates:
+        """
+        Resolve the effective date of every article once.
 
-        # Pattern 4: DDMMYYYY
-        pattern4 = re.search(r'(\d{2}\d{2}\d{4})', filename)
-        if pattern4:
-            try:
-                date_str = pattern4.group(1)
-                return datetime.strptime(date_str, '%d%m%Y')
-            except ValueError:
-                pass
+        Dates already stored on an article (``effective_date``) are reused;
+        the resolved date is stored back on each article.
 
-        return None
+        Args:
+            articles: Articles of the corpus
+            date_getter: Date rule per article (default: get_effective_date)
+
+        Returns:
+            CorpusDates aligned with articles
+        """
+        pending = [article for article in articles if not article.get('effective_date')]
+        resolve = date_getter or self.get_effective_date
+        for article in pending:
+            article['effective_date'] = resolve(article)
+
+        return CorpusDates([article['effective_date'] for article in articles])
 
     def get_effective_date(self, article_info: Dict) -> datetime:
         """
@@ -132,11 +192,10 @@ class DateHelper:
 
         # Try front matter date
         if 'front_matter' in article_info and article_info['front_matter']:
-            front_matter = article_info['front_matter']
+            front_matter = self._front_matter_fields(article_info['front_matter'])
 
             # Check common date fields in front matter
-            date_fields = ['date', 'created', 'published', 'publish_date']
-            for field in date_fields:
+            for field in FRONT_MATTER_DATE_FIELDS:
                 if field in front_matter:
                     date_value = front_matter[field]
                     if isinstance(date_value, str):
@@ -145,6 +204,8 @@ class DateHelper:
                             return parsed_date
                     elif isinstance(date_value, datetime):
                         return date_value
+                    elif isinstance(date_value, date):
+                        return datetime(date_value.year, date_value.month, date_value.day)
 
         # Try created time
         if 'created_time' in article_info and article_info['created_time']:
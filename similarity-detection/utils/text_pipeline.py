@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Text Pipeline
+
+Shared, precompiled normalization and tokenization for the similarity
+algorithms. Each algorithm keeps its own normalization rules (so scores do not
+change), but all of them run through this module: patterns are compiled once,
+and results are memoized per content hash so that an article is normalized
+once per run instead of once per comparison.
+"""
+
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, FrozenSet, Hashable, List, Optional
+
+# TF-IDF normalization (TFIDFSimilarity.normalize_text)
+_TFIDF_MARKUP = re.compile(r'[#*`\[\]()]')
+_URL = re.compile(r'http[s]?://\S+')
+_PUNCTUATION = re.compile(r'[^\w\s-]')
+_WHITESPACE = re.compile(r'\s+')
+
+# SimHash preprocessing (SimHashSimilarity._preprocess_content / _generate_ngrams)
+_FRONT_MATTER = re.compile(r"^---[\s\S]*?---\s+", re.M)
+_CODE_BLOCK = re.compile(r"```[\s\S]*?```")
+_SIMHASH_WORD = re.compile(r"[A-Za-z0-9']+")
+
+# Markdown removal (TextProcessor.normalize_text)
+_MARKDOWN_RULES = [
+    (re.compile(r'^#{1,6}\s+', re.M), ''),
+    (re.compile(r'\*{1,2}([^*]+)\*{1,2}'), r'\1'),
+    (re.compile(r'_{1,2}([^_]+)_{1,2}'), r'\1'),
+    (re.compile(r'\[([^\]]+)\]\([^)]+\)'), r'\1'),
+    (re.compile(r'!\[([^\]]*)\]\([^)]+\)'), r'\1'),
+    (re.compile(r'```[\s\S]*?```'), ''),
+    (re.compile(r'`([^`]+)`'), r'\1'),
+    (re.compile(r'^>\s+', re.M), ''),
+    (re.compile(r'^\s*[-*+]\s+', re.M), ''),
+    (re.compile(r'^\s*\d+\.\s+', re.M), ''),
+    (re.compile(r'^-{3,}$', re.M), ''),
+    (re.compile(r'\|'), ' '),
+]
+_EMAIL = re.compile(r'\S+@\S+')
+
+# Semantic models have input limits; longer content is truncated
+SEMANTIC_MAX_LENGTH = 8000
+
+
+def content_key(text: str) -> str:
+    """Memo key of a text (same MD5 hex digest ArticleAnalyzer stores as content_hash)."""
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+def exact_content_key(text: str) -> str:
+    """MD5 of the whitespace-normalized text (equal for byte- or whitespace-identical copies)."""
+    return content_key(_WHITESPACE.sub(' ', text).strip())
+
+
+def normalize_for_tfidf(text: str) -> str:
+    """Lowercase, strip Markdown markup, URLs and punctuation, collapse whitespace."""
+    text = _TFIDF_MARKUP.sub('', text.lower())
+    text = _URL.sub('', text)
+    text = _PUNCTUATION.sub(' ', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def preprocess_for_simhash(text: str) -> str:
+    """Drop front matter and code blocks, collapse whitespace."""
+    if not text:
+        return ""
+    text = _FRONT_MATTER.sub("", text)
+    text = _CODE_BLOCK.sub("", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def simhash_words(text: str) -> List[str]:
+    """Lowercase word tokens used for SimHash n-grams."""
+    return _SIMHASH_WORD.findall(text.lower())
+
+
+def preprocess_for_semantic(text: str) -> str:
+    """Collapse whitespace and truncate to the embedding input limit."""
+    if not text:
+        return ""
+    text = _WHITESPACE.sub(' ', text)
+    if len(text) > SEMANTIC_MAX_LENGTH:
+        text = text[:SEMANTIC_MAX_LENGTH] + "..."
+    return text.strip()
+
+
+def strip_markdown(text: str) -> str:
+    """Remove Markdown formatting (headers, emphasis, links, code, lists, tables)."""
+    for pattern, replacement in _MARKDOWN_RULES:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def normalize_plain(text: str) -> str:
+    """Lowercase, strip Markdown, URLs, e-mail addresses and punctuation."""
+    if not text:
+        return ""
+    text = strip_markdown(text.lower())
+    text = _URL.sub('', text)
+    text = _EMAIL.sub('', text)
+    text = _PUNCTUATION.sub(' ', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class TextPipeline:
+    """
+    Memoizing front end for the normalization functions.
+
+    Results are stored per (stage, content key) in a bounded LRU map. Article
+    helpers use the article's ``content_hash`` as key, so no extra hashing is
+    needed for parsed articles; other texts are keyed by their MD5 digest.
+    """
+
+    def __init__(self, max_entries: int = 8192):
+        """
+        Initialize an empty pipeline.
+
+        Args:
+            max_entries: Maximum number of memoized results
+        """
+        self.max_entries = max_entries
+        self._memo: 'OrderedDict[Hashable, object]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, stage: str, text: str, key: Optional[str], compute: Callable):
+        """
+        Return the memoized result of a stage, computing it on a miss.
+
+        Args:
+            stage: Name of the processing stage
+            text: Input text
+            key: Content key of the text (None = MD5 of the text)
+            compute: Function producing the result from the text
+
+        Returns:
+            Stage result (shared, do not modify)
+        """
+        memo_key = (stage, key if key is not None else content_key(text))
+        try:
+            value = self._memo[memo_key]
+        except KeyError:
+            self.misses += 1
+            value = compute(text)
+            self._memo[memo_key] = value
+            if len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+            return value
+
+        self.hits += 1
+        self._memo.move_to_end(memo_key)
+        return value
+
+    def clear(self):
+        """Forget all memoized results."""
+        self._memo.clear()
+
+    # Text level (key defaults to the MD5 of the text)
+
+    def normalized(self, text: str, key: Optional[str] = None) -> str:
+        """TF-IDF normalized text."""
+        return self.cached('tfidf', text or '', key, normalize_for_tfidf)
+
+    def tokens(self, text: str, key: Optional[str] = None) -> List[str]:
+        """TF-IDF token stream (do not modify the returned list)."""
+        key = content_key(text or '') if key is None else key
+        return self.cached('tokens', text or '', key, lambda t: self.normalized(t, key).split())
+
+    def term_frequencies(self, text: str, key: Optional[str] = None) -> Dict[str, int]:
+        """Term counts of the TF-IDF token stream."""
+        key = content_key(text or '') if key is None else key
+        return self.cached('tf', text or '', key, lambda t: dict(Counter(self.tokens(t, key))))
+
+    def simhash_text(self, text: str, key: Optional[str] = None) -> str:
+        """Content prepared for SimHash fingerprinting."""
+        return self.cached('simhash', text or '', key, preprocess_for_simhash)
+
+    def semantic_text(self, text: str, key: Optional[str] = None) -> str:
+        """Content prepared for embedding."""
+        return self.cached('semantic', text or '', key, preprocess_for_semantic)
+
+    def plain_text(self, text: str, key: Optional[str] = None) -> str:
+        """Markdown-free normalized text (TextProcessor)."""
+        return self.cached('plain', text or '', key, normalize_plain)
+
+    # Article level (keyed by content_hash)
+
+    def article_tokens(self, article: Dict) -> List[str]:
+        """TF-IDF tokens of an article (precomputed tokens are used when present)."""
+        tokens = article.get('tokens')
+        if tokens is not None:
+            return tokens
+        return self.tokens(article.get('content', ''), article.get('content_hash'))
+
+    def article_term_frequencies(self, article: Dict) -> Dict[str, int]:
+        """Term counts of an article's TF-IDF tokens."""
+        term_frequencies = article.get('term_frequencies')
+        if term_frequencies is not None:
+            return term_frequencies
+        return self.term_frequencies(article.get('content', ''), article.get('content_hash'))
+
+    def article_title(self, article: Dict) -> str:
+        """TF-IDF normalized title of an article."""
+        title = article.get('title') or ''
+        return self.cached('title', title, article.get('title_hash') or None, normalize_for_tfidf)
+
+    def article_title_words(self, article: Dict) -> FrozenSet[str]:
+        """Distinct words of an article's normalized title."""
+        title = article.get('title') or ''
+        key = article.get('title_hash') or content_key(title)
+        return self.cached('title_words', title, key,
+                           lambda t: frozenset(self.cached('title', t, key, normalize_for_tfidf).split()))
+
+    def article_exact_key(self, article: Dict) -> str:
+        """Duplicate bucket key of an article's content."""
+        return self.cached('exact', article.get('content', ''), article.get('content_hash'),
+                           exact_content_key)
+
+    def article_simhash_text(self, article: Dict) -> str:
+        """SimHash input of an article."""
+        return self.simhash_text(article.get('content', ''), article.get('content_hash'))
+
+    def article_semantic_text(self, article: Dict) -> str:
+        """Embedding input of an article."""
+        return self.semantic_text(article.get('content', ''), article.get('content_hash'))
+
+
+# Process-wide pipeline shared by all algorithm instances
+_shared_pipeline: Optional[TextPipeline] = None
+
+
+def get_text_pipeline() -> TextPipeline:
+    """Return the process-wide TextPipeline (created on first use)."""
+    global _shared_pipeline
+    if _shared_pipeline is None:
+        _shared_pipeline = TextPipeline()
+    return _shared_pipeline
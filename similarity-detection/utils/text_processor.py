@@ -10,6 +10,11 @@ import re
 import yaml
 from typing import Dict, List, Tuple, Optional, Set
 
+try:
+    from .text_pipeline import get_text_pipeline, strip_markdown
+except ImportError:
+    from text_pipeline import get_text_pipeline, strip_markdown
+
 
 class TextProcessor:
     """
@@ -45,23 +50,9 @@ class TextProcessor:
         if not text:
             return ""
 
-        # Convert to lowercase
-        text = text.lower()
-
-        # Remove Markdown formatting
-        text = self.remove_markdown_formatting(text)
-
-        # Remove URLs
-        text = re.sub(r'http[s]?://\S+', '', text)
-
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-
-        # Remove punctuation (except hyphens in words)
-        text = re.sub(r'[^\w\s-]', ' ', text)
-
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Lowercase, remove Markdown, URLs, e-mail addresses and punctuation
+        # (memoized per text by the shared pipeline)
+        text = get_text_pipeline().plain_text(text)
 
         # Remove stop words if requested
         if remove_stop_words:
@@ -79,39 +70,8 @@ class TextProcessor:
         Returns:
             Plain text
         """
-        # Remove headers
-        text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-
-        # Remove emphasis (bold, italic)
-        text = re.sub(r'\*{1,2}([^*]+)\*{1,2}', r'\1', text)
-        text = re.sub(r'_{1,2}([^_]+)_{1,2}', r'\1', text)
-
-        # Remove links
-        text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-
-        # Remove images
-        text = re.sub(r'!\[([^\]]*)\]\([^)]+\)', r'\1', text)
-
-        # Remove code blocks
-        text = re.sub(r'```[\s\S]*?```', '', text)
-
-        # Remove inline code
-        text = re.sub(r'`([^`]+)`', r'\1', text)
-
-        # Remove blockquotes
-        text = re.sub(r'^>\s+', '', text, flags=re.MULTILINE)
-
-        # Remove list markers
-        text = re.sub(r'^\s*[-*+]\s+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^\s*\d+\.\s+', '', text, flags=re.MULTILINE)
-
-        # Remove horizontal rules
-        text = re.sub(r'^-{3,}$', '', text, flags=re.MULTILINE)
-
-        # Remove table formatting
-        text = re.sub(r'\|', ' ', text)
-
-        return text
+        # Headers, emphasis, links, images, code, blockquotes, lists, rules, tables
+        return strip_markdown(text)
 
     def remove_stop_words(self, text: str) -> str:
         """
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Topic Classifier
+
+Keyword-based topic classification with an Aho-Corasick automaton. All
+keywords of all topics are compiled into one automaton, so an article is
+classified in a single pass over its text instead of one substring search per
+keyword. Scores and labels are stored on the article together with a signature
+of the keyword set; they stay valid until the keywords change.
+"""
+
+import hashlib
+import json
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+# A topic needs more than this share of its keywords to become the label
+MIN_TOPIC_SCORE = 0.1
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton reporting which patterns occur in a text.
+
+    Matching is exact substring matching (the same as ``pattern in text``),
+    including overlapping occurrences.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Compile the automaton.
+
+        Args:
+            patterns: Patterns to search for (empty patterns always match)
+        """
+        self.patterns: List[str] = list(patterns)
+        self.always: Set[int] = {i for i, pattern in enumerate(self.patterns) if not pattern}
+
+        # Trie: goto transitions, failure links and pattern ids ending per state
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(pattern_id)
+
+        # Breadth-first construction of failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text: str) -> Set[int]:
+        """
+        Return the ids of all patterns occurring in the text.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Set of pattern indices
+        """
+        found = set(self.always)
+        remaining = len(self.patterns) - len(found)
+        goto, fail, output = self.goto, self.fail, self.output
+
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                before = len(found)
+                found.update(output[state])
+                remaining -= len(found) - before
+                if remaining <= 0:
+                    break
+
+        return found
+
+
+class TopicClassifier:
+    """
+    Classifies articles by the share of each topic's keywords they contain.
+
+    A topic's score is the number of its keywords found in the lowercased
+    title and content divided by its keyword count; the label is the topic
+    with the highest score if that score exceeds 10%.
+    """
+
+    def __init__(self, topics: Dict[str, Dict]):
+        """
+        Compile the classifier.
+
+        Args:
+            topics: ``topic_classification.topics`` configuration
+        """
+        self.topics: Dict[str, List[str]] = {}
+        for topic_name, topic_settings in (topics or {}).items():
+            keywords = (topic_settings or {}).get('keywords', [])
+            if keywords:
+                self.topics[topic_name] = [str(keyword).lower() for keyword in keywords]
+
+        # One pattern per distinct keyword; topics refer to pattern ids
+        pattern_ids: Dict[str, int] = {}
+        self.topic_patterns: Dict[str, List[int]] = {}
+        for topic_name, keywords in self.topics.items():
+            self.topic_patterns[topic_name] = [pattern_ids.setdefault(keyword, len(pattern_ids))
+                                               for keyword in keywords]
+        self.automaton = KeywordAutomaton(pattern_ids)
+        self.signature = self.compute_signature(self.topics)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['TopicClassifier']:
+        """
+        Build a classifier from the configuration.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            Classifier, or None when topic classification is disabled
+        """
+        topic_config = config.get('topic_classification', {}) or {}
+        if not topic_config.get('enabled', False):
+            return None
+        return cls(topic_config.get('topics', {}))
+
+    @staticmethod
+    def compute_signature(topics: Dict[str, List[str]]) -> str:
+        """Hash of the keyword set (other topic settings do not affect labels)."""
+        encoded = json.dumps(topics, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.md5(encoded).hexdigest()
+
+    def score_text(self, text: str) -> Dict[str, float]:
+        """
+        Score a text against every topic.
+
+        Args:
+            text: Lowercased text
+
+        Returns:
+            Mapping of topic name to score for topics with at least one match
+        """
+        if not self.topics:
+            return {}
+
+        found = self.automaton.find(text)
+        scores = {}
+        for topic_name, pattern_ids in self.topic_patterns.items():
+            matched = sum(1 for pattern_id in pattern_ids if pattern_id in found)
+            if matched:
+                scores[topic_name] = matched / len(pattern_ids)
+        return scores
+
+    @staticmethod
+    def label_from_scores(scores: Dict[str, float]) -> Optional[str]:
+        """Best-scoring topic, or None if no topic exceeds the minimum score."""
+        if not scores:
+            return None
+        best_topic, best_score = max(scores.items(), key=lambda item: item[1])
+        return best_topic if best_score > MIN_TOPIC_SCORE else None
+
+    def annotate(self, article: Dict) -> Dict:
+        """
+        Store topic scores and label on an article.
+
+        Args:
+            article: Article information dictionary (updated in place)
+
+        Returns:
+            The article
+        """
+        text = (article.get('title', '') + ' ' + article.get('content', '')).lower()
+        scores = self.score_text(text)
+        article['topic_scores'] = scores
+        article['topic_label'] = self.label_from_scores(scores)
+        article['topic_signature'] = self.signature
+        return article
+
+    def classify(self, article: Dict) -> Optional[str]:
+        """
+        Return the topic label of an article.
+
+        Labels stored with the current keyword signature are reused;
+        otherwise the article is (re)annotated.
+
+        Args:
+            article: Article information dictionary
+
+        Returns:
+            Topic name or None if the article cannot be classified
+        """
+        if article.get('topic_signature') != self.signature:
+            self.annotate(article)
+        return article['topic_label']
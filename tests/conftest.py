@@ -0,0 +1,80 @@
+"""
+Shared pytest setup.
+
+The similarity-detection tool imports its packages (``algorithms``, ``core``,
+``utils``) from its own directory and the shared ``modules`` package from the
+project root, as ``similarity-detection/main.py`` arranges at startup.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SIMILARITY_DETECTION = PROJECT_ROOT / 'similarity-detection'
+
+for path in (SIMILARITY_DETECTION, PROJECT_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+# Vocabulary of random words, so unrelated random texts share few terms
+_vocabulary_rng = random.Random(2024)
+WORDS = sorted({''.join(_vocabulary_rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(7))
+                for _ in range(3000)})
+
+
+def random_text(rng: random.Random, length: int = 120) -> str:
+    """Paragraphs of random vocabulary words."""
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return '\n\n'.join(' '.join(words[start:start + 20]) for start in range(0, length, 20))
+
+
+def near_copy(rng: random.Random, text: str, changes: int = 5) -> str:
+    """Copy of a text with a few words replaced."""
+    words = text.split(' ')
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return ' '.join(words)
+
+
+@pytest.fixture
+def write_corpus(tmp_path):
+    """Write {file name: (title, body)} as Markdown articles and return their directory."""
+    def write(files, directory='articles'):
+        folder = tmp_path / directory
+        folder.mkdir(exist_ok=True)
+        for name, (title, body) in files.items():
+            (folder / name).write_text(f'---\ntitle: "{title}"\n---\n\n{body}\n', encoding='utf-8')
+        return folder
+    return write
+
+
+@pytest.fixture
+def analyze_corpus():
+    """Scan a directory with a cache-less ArticleAnalyzer."""
+    def analyze(folder, **config):
+        from core.article_analyzer import ArticleAnalyzer
+        settings = {'feature_cache_enabled': False, 'min_content_length': 10}
+        settings.update(config)
+        return ArticleAnalyzer(settings).scan_directory(str(folder))
+    return analyze
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    """Build a SimilarityEngine from a similarity_detection config section (run inside tmp_path)."""
+    monkeypatch.chdir(tmp_path)
+
+    def make(**settings):
+        from core.similarity_engine import SimilarityEngine
+        config = tmp_path / 'similarity_config.yml'
+        section = {'min_content_length': 10, 'feature_cache_enabled': False, **settings}
+        config.write_text(yaml.safe_dump({'similarity_detection': section}), encoding='utf-8')
+        engine = SimilarityEngine(str(config))
+        engine.incremental_state_path = str(tmp_path / 'state.db')
+        return engine
+    return make
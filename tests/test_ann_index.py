@@ -0,0 +1,161 @@
+"""The IVF index returns exact results when every cluster is probed, and keeps recall when few are."""
+
+import os
+
+import numpy as np
+import pytest
+
+from algorithms.ann_index import IVFFlatIndex
+from algorithms.semantic_similarity import SemanticSimilarity
+
+
+def clustered_vectors(count=2000, dim=24, clusters=20, seed=1):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    vectors = centers[rng.integers(clusters, size=count)] + rng.standard_normal((count, dim)) * 0.4
+    return [f'key{number}' for number in range(count)], vectors.astype(np.float32)
+
+
+def brute_force(index, vectors, keys, query, k):
+    """Top-k by the same float16 codes the index scores with."""
+    codes = IVFFlatIndex._normalize(vectors).astype(IVFFlatIndex.CODE_DTYPE).astype(np.float32)
+    scores = codes @ IVFFlatIndex._normalize(query)
+    return [keys[i] for i in np.argsort(-scores, kind='stable')[:k]]
+
+
+def build(keys, vectors, **settings):
+    index = IVFFlatIndex(min_train_size=256, **settings)
+    for start in range(0, len(keys), 300):
+        index.add(keys[start:start + 300], vectors[start:start + 300])
+    return index
+
+
+def test_probing_every_cluster_is_exact():
+    keys, vectors = clustered_vectors()
+    index = build(keys, vectors, nlist=16)
+    assert index.is_trained
+    queries = np.random.default_rng(2).standard_normal((30, vectors.shape[1]))
+    for query in queries:
+        found = index.search(query, 10, nprobe=16)
+        assert [key for key, _ in found] == brute_force(index, vectors, keys, query, 10)
+
+
+def test_untrained_index_scans_everything():
+    keys, vectors = clustered_vectors(count=200)
+    index = build(keys, vectors)
+    assert not index.is_trained
+    query = vectors[7] + 0.1
+    assert [key for key, _ in index.search(query, 5)] == brute_force(index, vectors, keys, query, 5)
+
+
+def test_few_probes_keep_recall():
+    keys, vectors = clustered_vectors()
+    index = build(keys, vectors, nlist=32, nprobe=4)
+    rng = np.random.default_rng(3)
+    hits = total = 0
+    for row in rng.choice(len(keys), 50, replace=False):
+        query = vectors[row] + rng.standard_normal(vectors.shape[1]) * 0.1
+        exact = set(brute_force(index, vectors, keys, query, 10))
+        hits += len(exact & {key for key, _ in index.search(query, 10)})
+        total += len(exact)
+    assert hits / total >= 0.9
+
+
+def test_removed_and_replaced_keys():
+    keys, vectors = clustered_vectors(count=600)
+    index = build(keys, vectors, nlist=8)
+    index.remove('key5')
+    index.add(['key6'], -vectors[6:7])
+    assert 'key5' not in index and len(index) == 599
+
+    found = dict(index.search(vectors[5], 600, nprobe=8))
+    assert 'key5' not in found
+    assert found['key6'] < 0
+    top = index.search(-vectors[6], 1, nprobe=8)
+    assert top[0][0] == 'key6' and top[0][1] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_index_grows_and_retrains():
+    keys, vectors = clustered_vectors(count=1200)
+    index = IVFFlatIndex(min_train_size=100, retrain_factor=4.0)
+    index.add(keys[:100], vectors[:100])
+    assert index.trained_size == 100 and len(index.centroids) == 10
+    index.add(keys[100:400], vectors[100:400])
+    assert index.trained_size == 100
+    index.add(keys[400:], vectors[400:])
+    assert index.trained_size == 1200
+    with pytest.raises(ValueError):
+        index.add(['bad'], np.ones((1, 3)))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    keys, vectors = clustered_vectors(count=800)
+    index = build(keys, vectors, nlist=12)
+    index.remove('key0')
+    directory = str(tmp_path / 'index.ivf')
+    index.save(directory)
+    index.save(directory)
+    assert sorted(os.listdir(directory)) == ['assignments.2.npy', 'centroids.2.npy', 'codes.2.npy', 'index.json']
+
+    loaded = IVFFlatIndex.load(directory, nprobe=12)
+    assert len(loaded) == 799 and 'key0' not in loaded
+    queries = np.random.default_rng(5).standard_normal((10, vectors.shape[1]))
+    for query in queries:
+        assert loaded.search(query, 8) == index.search(query, 8, nprobe=12)
+
+    # Loaded (memory-mapped) indexes stay writable
+    loaded.add(['extra'], vectors[:1] * -1)
+    loaded.remove('key1')
+    assert loaded.search(-vectors[0], 1)[0][0] == 'extra'
+    assert IVFFlatIndex.load(str(tmp_path / 'missing')) is None
+
+
+class TableModel:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def encode(self, texts, batch_size=32):
+        return np.stack([self.vectors[text] for text in texts])
+
+
+def test_query_similar_matches_exact_ranking(tmp_path):
+    _, vectors = clustered_vectors(count=300, dim=16)
+    table = {f'article {number}': vector for number, vector in enumerate(vectors)}
+    articles = [{'file_path': f'/posts/{number}.md', 'content': text} for number, text in enumerate(table)]
+    semantic = SemanticSimilarity({'embedding_store_path': str(tmp_path / 'embeddings'),
+                                   'fingerprint_db_path': str(tmp_path / 'fingerprints.json'),
+                                   'min_content_length': 1})
+    semantic.model = TableModel(table)
+    assert semantic.index_articles(articles) == 300
+
+    target = articles[42]
+    results = semantic.query_similar(target, top_k=5, threshold=0.5)
+    exact = sorted(((semantic._cosine_similarity(vectors[42], vectors[number]), article['file_path'])
+                    for number, article in enumerate(articles) if number != 42), reverse=True)
+    expected = [(path, score) for score, path in exact[:5] if score >= 0.5]
+    assert expected
+    assert [(result['file_path'], pytest.approx(result['similarity'], abs=1e-6)) for result in results] == expected
+
+
+def test_query_similar_returns_identical_copies(tmp_path):
+    _, vectors = clustered_vectors(count=50, dim=16)
+    table = {f'article {number}': vector for number, vector in enumerate(vectors)}
+    articles = [{'file_path': f'/posts/{number}.md', 'content': text} for number, text in enumerate(table)]
+    copies = [{'file_path': f'/copies/{number}.md', 'content': 'article 7'} for number in range(2)]
+    config = {'embedding_store_path': str(tmp_path / 'embeddings'),
+              'fingerprint_db_path': str(tmp_path / 'fingerprints.json'), 'min_content_length': 1}
+    semantic = SemanticSimilarity(config)
+    semantic.model = TableModel(table)
+    semantic.index_articles(articles + copies)
+
+    results = semantic.query_similar(articles[7], top_k=3, threshold=0.5)
+    assert [result['file_path'] for result in results[:2]] == ['/copies/0.md', '/copies/1.md']
+    assert all(result['similarity'] == pytest.approx(1.0, abs=1e-6) for result in results[:2])
+    assert '/posts/7.md' not in [result['file_path'] for result in results]
+    assert len(results) == 3
+
+    # Copies are still known after reopening the store
+    reopened = SemanticSimilarity(config)
+    reopened.model = TableModel(table)
+    found = [result['file_path'] for result in reopened.query_similar(copies[0], top_k=2, threshold=0.5)]
+    assert found == ['/posts/7.md', '/copies/1.md']
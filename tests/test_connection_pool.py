@@ -0,0 +1,100 @@
+"""Units joined to a pooled batch transaction stay atomic on their own."""
+
+import importlib.util
+import sqlite3
+import threading
+
+import pytest
+
+from conftest import PROJECT_ROOT
+
+
+@pytest.fixture(scope='module')
+def connection_pool():
+    # Loaded by path: the deduplication package itself imports nltk
+    spec = importlib.util.spec_from_file_location(
+        'connection_pool', PROJECT_ROOT / 'modules' / 'deduplication' / 'connection_pool.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def pool(connection_pool, tmp_path):
+    pool = connection_pool.SQLiteConnectionPool(str(tmp_path / 'dedup.db'))
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE records (name TEXT PRIMARY KEY, detail TEXT)")
+    yield pool
+    pool.close()
+
+
+def names(pool):
+    with pool.connection() as conn:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM records"))
+
+
+def add_record(pool, name, fail=False):
+    """Two-statement unit that swallows its error, like add_content_record."""
+    try:
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO records (name) VALUES (?)", (name,))
+            if fail:
+                raise sqlite3.IntegrityError('second statement failed')
+            conn.execute("UPDATE records SET detail = 'ok' WHERE name = ?", (name,))
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def test_failed_unit_in_batch_leaves_no_partial_writes(pool):
+    with pool.transaction():
+        assert add_record(pool, 'first')
+        assert not add_record(pool, 'broken', fail=True)
+        assert add_record(pool, 'last')
+    assert names(pool) == ['first', 'last']
+
+
+def test_failed_unit_outside_batch_rolls_back(pool):
+    assert not add_record(pool, 'broken', fail=True)
+    assert names(pool) == []
+
+
+def test_uncaught_error_rolls_back_whole_batch(pool):
+    with pytest.raises(RuntimeError):
+        with pool.transaction():
+            add_record(pool, 'first')
+            raise RuntimeError('pipeline failed')
+    assert names(pool) == []
+
+
+def test_nested_units_roll_back_independently(pool):
+    with pool.transaction():
+        with pool.connection() as outer:
+            outer.execute("INSERT INTO records (name) VALUES ('outer')")
+            assert not add_record(pool, 'inner', fail=True)
+    assert names(pool) == ['outer']
+
+
+def test_connections_use_wal(pool):
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+
+def test_batches_on_other_threads_do_not_join(pool):
+    errors = []
+
+    def worker(number):
+        try:
+            with pool.transaction():
+                for item in range(20):
+                    add_record(pool, f'{number}-{item}')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(names(pool)) == 80
@@ -0,0 +1,189 @@
+"""Uniqueness guard: persistent fingerprints, single and batch checks, and CLI output."""
+
+import importlib.util
+import json
+import random
+
+import pytest
+
+from conftest import PROJECT_ROOT, near_copy, random_text
+
+from modules.fingerprint import FingerprintStore
+
+
+@pytest.fixture(scope='module')
+def guard():
+    spec = importlib.util.spec_from_file_location(
+        'content_uniqueness_guard', PROJECT_ROOT / 'scripts' / 'content_uniqueness_guard.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def pool(tmp_path):
+    rng = random.Random(11)
+    folder = tmp_path / 'pool'
+    folder.mkdir()
+    texts = [random_text(rng, 300) for _ in range(6)]
+    for number, text in enumerate(texts):
+        (folder / f'post-{number}.md').write_text(f'---\ntitle: Post {number}\n---\n\n{text}\n', encoding='utf-8')
+    return folder, texts, rng
+
+
+def write_target(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(f'---\ntitle: Draft\n---\n\n{text}\n', encoding='utf-8')
+    return str(path)
+
+
+def test_second_run_reads_fingerprints_back(guard, pool, tmp_path, monkeypatch):
+    folder, texts, rng = pool
+    cache = str(tmp_path / 'data' / 'fp.db')
+    target = write_target(tmp_path, 'draft.md', random_text(rng, 300))
+
+    first = guard.check_uniqueness(target, str(folder), 30, 0.85, cache_path=cache, update_cache=True)
+    assert not first['simhash_hit']
+
+    store = FingerprintStore(guard.fingerprint_store_path(cache))
+    stored = store.range()
+    store.close()
+    assert len(stored) == len(texts) + 1
+    assert target in stored
+
+    # Only the target is fingerprinted again; pool rows come from the store
+    calls = []
+    simhash64 = guard.simhash64
+    monkeypatch.setattr(guard, 'simhash64', lambda tokens: calls.append(1) or simhash64(tokens))
+    second = guard.check_uniqueness(target, str(folder), 30, 0.85, cache_path=cache)
+    assert len(calls) == 1
+    assert second['max_cosine'] == first['max_cosine']
+
+
+def test_pool_fingerprints_are_stored_without_update_cache(guard, pool, tmp_path):
+    folder, texts, rng = pool
+    cache = str(tmp_path / 'fp.db')
+    target = write_target(tmp_path, 'draft.md', random_text(rng, 300))
+
+    guard.check_uniqueness(target, str(folder), 30, 0.85, cache_path=cache)
+    store = FingerprintStore(guard.fingerprint_store_path(cache))
+    assert len(store) == len(texts)
+    assert store.get(target) is None
+    store.close()
+
+
+def test_near_copy_is_a_simhash_hit(guard, pool, tmp_path):
+    folder, texts, rng = pool
+    cache = str(tmp_path / 'fp.db')
+    target = write_target(tmp_path, 'copy.md', near_copy(rng, texts[2], changes=2))
+
+    result = guard.check_uniqueness(target, str(folder), 30, 0.85, cache_path=cache)
+    assert result['simhash_hit']
+    assert result['simhash_match']['path'].endswith('post-2.md')
+
+
+def test_legacy_json_cache_is_imported(guard, pool, tmp_path):
+    folder, texts, rng = pool
+    legacy = tmp_path / 'fp.json'
+    legacy.write_text(json.dumps({'version': 1, 'items': [
+        {'path': 'gone.md', 'simhash': f'{12345:016x}', 'ctime': '2099-01-01T00:00:00', 'size': 1}
+    ]}), encoding='utf-8')
+
+    store = guard.open_fingerprint_store(str(legacy))
+    assert store.get('gone.md')['simhash'] == 12345
+    store.close()
+
+
+def run_main(guard, monkeypatch, capsys, argv):
+    monkeypatch.setattr('sys.argv', ['content_uniqueness_guard.py', *argv])
+    code = guard.main()
+    captured = capsys.readouterr()
+    return code, json.loads(captured.out.splitlines()[0]), captured.err
+
+
+def test_legacy_section_key_is_ignored_with_a_warning(guard, monkeypatch, capsys, tmp_path):
+    assert guard.section_threshold_from_config({'section_overlap_threshold': 0.3}) == 0.3
+    assert guard.section_threshold_from_config({'section_overlap_threshold': 0.3,
+                                                'section_tfidf_threshold': 0.45}) == 0.3
+    assert capsys.readouterr().err == ''
+
+    assert guard.section_threshold_from_config({'section_tfidf_threshold': 0.45}) is None
+    assert 'section_tfidf_threshold' in capsys.readouterr().err
+
+
+def test_single_target_output_keeps_legacy_section_keys(guard, pool, tmp_path, monkeypatch, capsys):
+    folder, texts, rng = pool
+    copied = ' '.join(texts[0].split()[:250])
+    fresh = random_text(rng, 600)
+    target = tmp_path / 'draft.md'
+    target.write_text(f'---\ntitle: Draft\n---\n\n## Copied\n\n{copied}\n\n## Fresh\n\n{fresh}\n', encoding='utf-8')
+    config = tmp_path / 'uniqueness.yml'
+    config.write_text('section_overlap_threshold: 0.45\nsection_min_words: 200\n', encoding='utf-8')
+
+    code, out, err = run_main(guard, monkeypatch, capsys, [
+        '--target', str(target), '--pool', str(folder), '--config', str(config),
+        '--cache', str(tmp_path / 'fp.db')])
+    assert code == 3
+    assert out['section_hit']['source'].endswith('post-0.md')
+    assert out['section_hit']['similarity'] == out['section_hit']['overlap']
+    assert out['max_section_sim'] == out['max_section_overlap']
+
+
+def test_simhash_hit_output_keeps_a_numeric_cosine(guard, pool, tmp_path, monkeypatch, capsys):
+    folder, texts, rng = pool
+    target = write_target(tmp_path, 'copy.md', near_copy(rng, texts[2], changes=2))
+
+    code, out, err = run_main(guard, monkeypatch, capsys, [
+        '--target', target, '--pool', str(folder), '--cache', str(tmp_path / 'fp.db')])
+    assert code == 3
+    assert out['simhash_hit'] and out['tfidf_skipped']
+    assert out['max_cosine'] == 0.0
+
+
+def test_batch_results_equal_single_checks(guard, pool, tmp_path):
+    folder, texts, rng = pool
+    cache = str(tmp_path / 'fp.db')
+    sections = f"## Copied\n\n{' '.join(texts[1].split()[:250])}\n\n## Fresh\n\n{random_text(rng, 600)}"
+    drafts = [write_target(tmp_path, 'fresh.md', random_text(rng, 300)),
+              write_target(tmp_path, 'sections.md', sections),
+              write_target(tmp_path, 'copy.md', near_copy(rng, texts[4], changes=2)),
+              write_target(tmp_path, 'other.md', random_text(rng, 300))]
+    options = {'cache_path': cache, 'section_threshold': 0.45, 'section_min_words': 200}
+
+    batch = guard.check_uniqueness_batch(drafts, str(folder), 30, 0.85, **options)
+    for draft, result in zip(drafts, batch):
+        single = guard.check_uniqueness(draft, str(folder), 30, 0.85, **options)
+        for key in ('max_cosine', 'simhash_hit', 'section_hit', 'max_section_overlap'):
+            assert result[key] == single[key], (draft, key)
+    assert batch[1]['section_hit']['source'].endswith('post-1.md')
+    assert batch[2]['simhash_hit']
+
+
+def test_later_of_two_similar_drafts_is_flagged(guard, pool, tmp_path):
+    folder, texts, rng = pool
+    text = random_text(rng, 300)
+    first = write_target(tmp_path, 'first.md', text)
+    # Far enough apart for SimHash, close enough for TF-IDF
+    second = write_target(tmp_path, 'second.md', near_copy(rng, text, changes=40))
+
+    results = guard.check_uniqueness_batch([first, second], str(folder), 30, 0.7,
+                                           cache_path=str(tmp_path / 'fp.db'), simhash_hamm_dist=0)
+    assert results[0]['batch_match'] is None
+    assert results[1]['batch_match']['path'] == first
+    assert guard.batch_verdict(results[0], 0.7, None) is None
+    assert guard.batch_verdict(results[1], 0.7, None) == 'batch'
+
+
+def test_targets_mode_prints_one_line_per_target(guard, pool, tmp_path, monkeypatch, capsys):
+    folder, texts, rng = pool
+    unique = write_target(tmp_path, 'unique.md', random_text(rng, 300))
+    copy = write_target(tmp_path, 'copy.md', near_copy(rng, texts[0], changes=2))
+    monkeypatch.setattr('sys.argv', ['content_uniqueness_guard.py', '--targets', unique, copy,
+                                     str(tmp_path / 'missing.md'), '--pool', str(folder),
+                                     '--cache', str(tmp_path / 'fp.db'), '--config', ''])
+    assert guard.main() == 3
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line['target'] for line in lines] == [unique, copy, str(tmp_path / 'missing.md')]
+    assert [line.get('reason') for line in lines] == [None, 'simhash', None]
+    assert lines[2]['error'] == 'Target not found'
@@ -0,0 +1,40 @@
+"""Filename dates are parsed by one shared set of patterns."""
+
+from datetime import datetime
+
+from utils.date_helper import CorpusDates, DateHelper
+
+
+def test_filename_patterns():
+    helper = DateHelper()
+    assert helper.extract_date_from_filename('guide-20250914.md') == datetime(2025, 9, 14)
+    assert helper.extract_date_from_filename('guide-2025-09-14.md') == datetime(2025, 9, 14)
+    assert helper.extract_date_from_filename('guide_2025_09_14.md') == datetime(2025, 9, 14)
+    assert helper.extract_date_from_filename('guide.md') is None
+
+
+def test_ddmmyyyy_is_tried_after_yyyymmdd():
+    helper = DateHelper()
+    assert helper.extract_date_from_filename('post-15032025.md') == datetime(2025, 3, 15)
+    # Valid as YYYYMMDD, so the first pattern wins
+    assert helper.extract_date_from_filename('post-20250315.md') == datetime(2025, 3, 15)
+    assert helper.extract_date_from_filename('post-99999999.md') is None
+
+
+def test_algorithms_share_the_filename_rule():
+    from algorithms.linear_comparison import LinearComparison
+    from core.article_analyzer import ArticleAnalyzer
+
+    article = {'file_name': 'guide_2025_09_14.md', 'created_time': datetime(2024, 1, 1),
+               'modified_time': datetime(2024, 1, 2)}
+    analyzer = ArticleAnalyzer({'feature_cache_enabled': False})
+    linear = LinearComparison({})
+    assert analyzer.get_effective_date(article) == datetime(2025, 9, 14)
+    assert linear._get_article_effective_date(dict(article)) == datetime(2025, 9, 14)
+
+
+def test_corpus_dates_order():
+    dates = [datetime(2025, 3, 1), datetime(2025, 1, 1), datetime(2025, 2, 1)]
+    corpus = CorpusDates(dates)
+    assert corpus.order.tolist() == [1, 2, 0]
+    assert corpus.sorted_timestamps.tolist() == sorted(corpus.timestamps.tolist())
@@ -0,0 +1,208 @@
+"""The memory-mapped embedding store returns exactly what was stored, across reopens and compactions."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from algorithms.embedding_store import EmbeddingStore
+from algorithms.semantic_similarity import SemanticSimilarity
+
+
+def random_vectors(count, dim=8, seed=0):
+    return np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+
+
+def fill(store, vectors, model='m1'):
+    for number, vector in enumerate(vectors):
+        store.add(f'hash{number}', model, vector, file_path=f'/posts/{number}.md')
+
+
+def test_round_trip_through_reopen(tmp_path):
+    base = str(tmp_path / 'store' / 'embeddings')
+    vectors = random_vectors(20)
+    store = EmbeddingStore(base)
+    fill(store, vectors)
+    store.add('hash0', 'm2', vectors[5])
+
+    reopened = EmbeddingStore(base)
+    assert len(reopened) == 21
+    for number, vector in enumerate(vectors):
+        assert np.array_equal(reopened.get(f'hash{number}', 'm1'), vector)
+    # Keys include the model
+    assert np.array_equal(reopened.get('hash0', 'm2'), vectors[5])
+    assert reopened.get('hash0', 'm3') is None
+    assert reopened.entries[('hash3', 'm1')]['file_path'] == '/posts/3.md'
+
+
+def test_replace_and_remove_are_logged(tmp_path):
+    base = str(tmp_path / 'embeddings')
+    vectors = random_vectors(4)
+    store = EmbeddingStore(base)
+    fill(store, vectors[:3])
+    store.add('hash1', 'm1', vectors[3])
+    assert store.remove('hash2', 'm1')
+    assert not store.remove('hash2', 'm1')
+
+    reopened = EmbeddingStore(base)
+    assert np.array_equal(reopened.get('hash1', 'm1'), vectors[3])
+    assert reopened.get('hash2', 'm1') is None
+    assert reopened.dead_rows == 2
+
+    keys, matrix = reopened.as_matrix()
+    assert keys == [('hash0', 'm1'), ('hash1', 'm1')]
+    assert np.array_equal(matrix, vectors[[0, 3]])
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    store = EmbeddingStore(str(tmp_path / 'embeddings'))
+    store.add('a', 'm1', np.ones(4))
+    with pytest.raises(ValueError):
+        store.add('b', 'm1', np.ones(5))
+
+
+def test_torn_writes_are_dropped(tmp_path):
+    base = str(tmp_path / 'embeddings')
+    vectors = random_vectors(3)
+    store = EmbeddingStore(base)
+    fill(store, vectors)
+
+    # Half a row appended without its index line, plus a torn index line
+    with open(store.matrix_path, 'ab') as f:
+        f.write(vectors[0].tobytes()[:10])
+    with open(store.index_path, 'a', encoding='utf-8') as f:
+        f.write('{"hash": "hash9", "mod')
+
+    reopened = EmbeddingStore(base)
+    assert reopened.rows == 3 and len(reopened) == 3
+    assert os.path.getsize(reopened.matrix_path) == 3 * vectors[0].nbytes
+    reopened.add('hash3', 'm1', vectors[1])
+    assert np.array_equal(EmbeddingStore(base).get('hash3', 'm1'), vectors[1])
+
+
+def test_compaction_keeps_live_vectors(tmp_path):
+    base = str(tmp_path / 'embeddings')
+    vectors = random_vectors(10)
+    store = EmbeddingStore(base, compact_ratio=0.5)
+    fill(store, vectors)
+    for number in range(0, 10, 3):
+        store.remove(f'hash{number}', 'm1')
+    store.remove('hash1', 'm1')
+    store.remove('hash2', 'm1')
+    assert store.needs_compaction()
+
+    old_matrix = store.matrix_path
+    assert store.compact() == 6
+    assert not os.path.exists(old_matrix)
+    assert store.rows == len(store) == 4 and store.dead_rows == 0
+    store.add('new', 'm1', vectors[0])
+
+    reopened = EmbeddingStore(base)
+    live = [4, 5, 7, 8]
+    for number in live:
+        assert np.array_equal(reopened.get(f'hash{number}', 'm1'), vectors[number])
+    assert np.array_equal(reopened.get('new', 'm1'), vectors[0])
+    keys, matrix = reopened.as_matrix()
+    assert np.array_equal(matrix, vectors[live + [0]])
+
+
+def test_interrupted_compaction_leaves_store_usable(tmp_path):
+    base = str(tmp_path / 'embeddings')
+    vectors = random_vectors(4)
+    store = EmbeddingStore(base)
+    fill(store, vectors)
+    store.remove('hash0', 'm1')
+
+    # Next generation written, index swap never happened
+    with open(f'{base}.1.f32', 'wb') as f:
+        f.write(vectors[1:].tobytes()[:7])
+    with open(f'{base}.idx.tmp', 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'version': 1, 'dim': 8, 'generation': 1}) + '\n')
+
+    reopened = EmbeddingStore(base)
+    assert reopened.generation == 0 and len(reopened) == 3
+    for number in range(1, 4):
+        assert np.array_equal(reopened.get(f'hash{number}', 'm1'), vectors[number])
+    reopened.compact()
+    assert np.array_equal(EmbeddingStore(base).get('hash3', 'm1'), vectors[3])
+
+
+class CountingModel:
+    """Deterministic stand-in for a sentence transformer."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, batch_size=32):
+        self.encoded.extend(texts)
+        return np.stack([np.frombuffer(text.encode('utf-8')[:8].ljust(8, b' '), dtype=np.uint8)
+                         .astype(np.float32) for text in texts])
+
+
+def test_semantic_similarity_reuses_stored_embeddings(tmp_path):
+    config = {'embedding_store_path': str(tmp_path / 'embeddings'), 'min_content_length': 1,
+              'fingerprint_db_path': str(tmp_path / 'fingerprints.json')}
+    articles = [{'file_path': f'/posts/{number}.md', 'content': f'article number {number} body'}
+                for number in range(5)]
+
+    semantic = SemanticSimilarity(config)
+    semantic.model = CountingModel()
+    first = semantic.get_embeddings(articles)
+    assert len(semantic.model.encoded) == 5
+
+    reopened = SemanticSimilarity(config)
+    reopened.model = CountingModel()
+    second = reopened.get_embeddings(articles)
+    assert reopened.model.encoded == []
+    for before, after in zip(first, second):
+        assert np.array_equal(before, after)
+
+    # Another model does not see these vectors
+    other = SemanticSimilarity({**config, 'embedding_model': 'other-model'})
+    other.model = CountingModel()
+    other.get_embeddings(articles[:2])
+    assert len(other.model.encoded) == 2
+
+
+def test_legacy_json_embeddings_are_imported(tmp_path):
+    legacy = {'version': '1.0', 'fingerprints': {
+        'abc': {'embedding': [1.0, 2.0, 3.0], 'model': 'all-MiniLM-L6-v2',
+                'timestamp': '2025-01-01T00:00:00', 'file_path': '/posts/a.md'},
+        'bad': {'no_embedding': True}}}
+    (tmp_path / 'fingerprints.json').write_text(json.dumps(legacy), encoding='utf-8')
+    semantic = SemanticSimilarity({'embedding_store_path': str(tmp_path / 'embeddings'),
+                                   'fingerprint_db_path': str(tmp_path / 'fingerprints.json')})
+    store = semantic.embedding_store
+    assert len(store) == 1
+    assert np.array_equal(store.get('abc', 'all-MiniLM-L6-v2'), [1.0, 2.0, 3.0])
+    assert store.entries[('abc', 'all-MiniLM-L6-v2')]['timestamp'] == '2025-01-01T00:00:00'
+
+
+def test_every_file_path_is_kept_per_embedding(tmp_path):
+    base = str(tmp_path / 'embeddings')
+    vectors = random_vectors(2)
+    store = EmbeddingStore(base)
+    store.add('same', 'm1', vectors[0], file_path='/posts/a.md')
+    assert store.add_file_path('same', 'm1', '/posts/b.md')
+    assert not store.add_file_path('same', 'm1', '/posts/b.md')
+    assert not store.add_file_path('missing', 'm1', '/posts/c.md')
+    store.add('same', 'm1', vectors[1], file_path='/posts/c.md')
+    store.add('other', 'm1', vectors[0], file_path='/posts/d.md')
+    store.remove('other', 'm1')
+
+    reopened = EmbeddingStore(base)
+    assert reopened.entries[('same', 'm1')]['file_paths'] == ['/posts/a.md', '/posts/b.md', '/posts/c.md']
+    reopened.compact()
+    assert EmbeddingStore(base).entries[('same', 'm1')]['file_paths'] == ['/posts/a.md', '/posts/b.md', '/posts/c.md']
+
+
+def test_records_without_file_paths_are_read(tmp_path):
+    base = str(tmp_path / 'embeddings')
+    store = EmbeddingStore(base)
+    store.add('a', 'm1', np.ones(4), file_path='/posts/a.md')
+    # Index line as written before file_paths were recorded
+    with open(store.index_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'hash': 'a', 'model': 'm1', 'row': 0, 'timestamp': '2025-01-01T00:00:00',
+                            'file_path': '/posts/old.md'}) + '\n')
+    assert EmbeddingStore(base).entries[('a', 'm1')]['file_paths'] == ['/posts/old.md']
@@ -0,0 +1,161 @@
+"""Exact duplicates are collapsed onto their earliest copy in the window before pairwise scoring."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import near_copy, random_text
+
+from algorithms.linear_comparison import LinearComparison
+
+CONFIG = {'tfidf_threshold': 0.7, 'comparison_window_days': 30}
+
+
+def build_corpus(write_corpus, seed=5, count=30):
+    rng = random.Random(seed)
+    start = datetime(2025, 4, 1)
+    files, originals = {}, []
+    for number in range(count):
+        date = (start + timedelta(days=rng.randint(0, 50))).strftime('%Y%m%d')
+        roll = rng.random()
+        if originals and roll < 0.25:
+            # Byte- or whitespace-identical copy under another title
+            title, body = rng.choice(originals)
+            body = body.replace('\n\n', '\n \n') if rng.random() < 0.5 else body
+            title = f'{title} (copy)'
+        elif originals and roll < 0.45:
+            title, body = rng.choice(originals)
+            body = near_copy(rng, body)
+        else:
+            title, body = f'Article {number}', random_text(rng)
+            originals.append((title, body))
+        files[f'article-{number:02d}-{date}.md'] = (title, body)
+    return write_corpus(files)
+
+
+def test_collapse_keeps_the_earliest_copy(make_engine, write_corpus):
+    folder = build_corpus(write_corpus)
+    engine = make_engine(**CONFIG)
+    articles = engine.scan_articles(str(folder))
+
+    representatives, duplicates = engine.collapse_exact_duplicates(articles)
+    assert duplicates
+    assert len(representatives) + len(duplicates) == len(articles)
+    for duplicate, representative in duplicates:
+        assert representative in representatives
+        assert timedelta(0) <= duplicate['effective_date'] - representative['effective_date'] <= timedelta(days=30)
+        assert ' '.join(duplicate['content'].split()) == ' '.join(representative['content'].split())
+
+    # Representatives of the same content lie outside each other's window
+    by_key = {}
+    for article in representatives:
+        by_key.setdefault(engine.text_pipeline.article_exact_key(article), []).append(article['effective_date'])
+    for dates in by_key.values():
+        dates.sort()
+        assert all(later - earlier > timedelta(days=30) for earlier, later in zip(dates, dates[1:]))
+
+
+@pytest.mark.parametrize('seed, displaced', [(5, 0), (6, 1)])
+def test_linear_scores_only_representatives(make_engine, write_corpus, seed, displaced):
+    folder = build_corpus(write_corpus, seed=seed, count=40)
+    engine = make_engine(**CONFIG)
+    articles = engine.scan_articles(str(folder))
+
+    result = engine.detect_similarities_linear(articles)
+    kept = {article['file_name']: article for article in result['kept_articles']}
+    exact = [article for article in result['moved_articles'] if article.get('exact_duplicate')]
+    assert exact and result['exact_duplicates'] == len(exact)
+    assert len(kept) + len(result['moved_articles']) == len(articles)
+    for moved in result['moved_articles']:
+        # Every base is a kept article inside the moved article's window
+        base = kept[moved['base_article']]
+        assert abs(moved['effective_date'] - base['effective_date']) <= timedelta(days=30)
+
+    # Everything else is exactly the scored run over the articles that were not collapsed
+    exact_names = {article['file_name'] for article in exact}
+    expected = LinearComparison(engine.config).detect_similarities(
+        [article for article in articles if article['file_name'] not in exact_names])
+    assert set(kept) == {a['file_name'] for a in expected['kept_articles']}
+    assert ({(a['file_name'], a['base_article']) for a in result['moved_articles'] if not a.get('exact_duplicate')}
+            == {(a['file_name'], a['base_article']) for a in expected['moved_articles']})
+
+    # Duplicates whose representative moved to a base outside their window are scored instead
+    assert len(engine.collapse_exact_duplicates(articles)[1]) - len(exact) == displaced
+
+
+def chain_corpus(write_corpus, copy_day):
+    """A, then R (near copy of A) 15 days later, then D (exact copy of R) on copy_day."""
+    rng = random.Random(9)
+    body = random_text(rng, 200)
+    near = near_copy(rng, body, changes=3)
+    return write_corpus({'a-20250101.md': ('Guide', body),
+                         'r-20250116.md': ('Guide', near),
+                         f'd-202501{copy_day:02d}.md' if copy_day <= 31 else f'd-202502{copy_day - 31:02d}.md':
+                             ('Guide', near)})
+
+
+def linear_verdicts(engine, folder):
+    result = engine.detect_similarities_linear(engine.scan_articles(str(folder)))
+    return ({article['file_name'] for article in result['kept_articles']},
+            {article['file_name']: article['base_article'] for article in result['moved_articles']})
+
+
+def test_duplicate_of_a_moved_article_follows_its_base(make_engine, write_corpus):
+    folder = chain_corpus(write_corpus, copy_day=20)
+    kept, moved = linear_verdicts(make_engine(**CONFIG), folder)
+    assert kept == {'a-20250101.md'}
+    assert moved == {'r-20250116.md': 'a-20250101.md', 'd-20250120.md': 'a-20250101.md'}
+    assert linear_verdicts(make_engine(**CONFIG, exact_duplicate_prepass=False), folder) == (kept, moved)
+
+
+def test_duplicate_outside_the_base_window_is_scored(make_engine, write_corpus):
+    # D is 28 days after R but 43 days after A
+    folder = chain_corpus(write_corpus, copy_day=44)
+    kept, moved = linear_verdicts(make_engine(**CONFIG), folder)
+    assert kept == {'a-20250101.md', 'd-20250213.md'}
+    assert moved == {'r-20250116.md': 'a-20250101.md'}
+    assert linear_verdicts(make_engine(**CONFIG, exact_duplicate_prepass=False), folder) == (kept, moved)
+
+
+def test_identical_articles_outside_the_window_are_kept(make_engine, write_corpus):
+    body = random_text(random.Random(3), 200)
+    folder = write_corpus({'x-20250101.md': ('Same', body), 'y-20250301.md': ('Same', body),
+                           'z-20250310.md': ('Same', body)})
+    engine = make_engine(**CONFIG)
+    representatives, duplicates = engine.collapse_exact_duplicates(engine.scan_articles(str(folder)))
+    assert [(d['file_name'], r['file_name']) for d, r in duplicates] == [('z-20250310.md', 'y-20250301.md')]
+
+    expected = ({'x-20250101.md', 'y-20250301.md'}, {'z-20250310.md': 'y-20250301.md'})
+    assert linear_verdicts(engine, folder) == expected
+    assert linear_verdicts(make_engine(**CONFIG, exact_duplicate_prepass=False), folder) == expected
+
+
+def test_graph_merges_duplicates_into_representative_groups(make_engine, write_corpus):
+    folder = build_corpus(write_corpus)
+    engine = make_engine(**CONFIG)
+    articles = engine.scan_articles(str(folder))
+    _, duplicates = engine.collapse_exact_duplicates(articles)
+
+    result = engine.detect_duplicate_groups(articles)
+    group_of = {article['file_name']: group['group_id']
+                for group in result['duplicate_groups'] for article in group['articles']}
+    assert result['exact_duplicates'] == len(duplicates)
+    for duplicate, representative in duplicates:
+        assert group_of[duplicate['file_name']] == group_of[representative['file_name']]
+    assert not {article['file_name'] for article in result['unique_articles']} & set(group_of)
+
+
+def test_prepass_can_be_disabled(make_engine, write_corpus):
+    folder = build_corpus(write_corpus)
+    engine = make_engine(**CONFIG, exact_duplicate_prepass=False)
+    articles = engine.scan_articles(str(folder))
+    assert engine.collapse_exact_duplicates(articles) == (articles, [])
+
+
+def test_short_articles_are_never_collapsed(make_engine, write_corpus):
+    folder = write_corpus({'a-20250101.md': ('A', 'too short'), 'b-20250102.md': ('B', 'too short')})
+    engine = make_engine(**CONFIG, min_content_length=50)
+    articles = engine.scan_articles(str(folder))
+    assert len(articles) == 2
+    assert engine.collapse_exact_duplicates(articles)[1] == []
@@ -0,0 +1,105 @@
+"""Feature cache writes are committed promptly and cache failures never drop articles."""
+
+import random
+import sqlite3
+
+from conftest import random_text
+
+from core.article_analyzer import ArticleAnalyzer
+from core.feature_cache import ArticleFeatureCache
+
+
+class LockedConnection:
+    """Connection whose every statement fails as if another process held the lock."""
+
+    def execute(self, *args):
+        raise sqlite3.OperationalError('database is locked')
+
+    executemany = execute
+
+    def commit(self):
+        raise sqlite3.OperationalError('database is locked')
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_analyzer(cache_path):
+    return ArticleAnalyzer({'feature_cache_path': str(cache_path), 'min_content_length': 10})
+
+
+def write_articles(folder, count=4):
+    rng = random.Random(9)
+    folder.mkdir()
+    for number in range(count):
+        (folder / f'post-{number}.md').write_text(f'# Post {number}\n\n{random_text(rng)}\n', encoding='utf-8')
+    return sorted(folder.glob('*.md'))
+
+
+def test_single_extraction_is_committed(tmp_path):
+    paths = write_articles(tmp_path / 'articles')
+    cache_path = tmp_path / 'features.db'
+
+    daemon_like = make_analyzer(cache_path)
+    assert daemon_like.extract_article_info(paths[0])
+    assert not daemon_like.feature_cache.conn.in_transaction
+
+    other = ArticleFeatureCache(str(cache_path), {})
+    assert other.get(str(paths[0]), paths[0].stat()) is not None
+    other.close()
+
+
+def test_scan_next_to_a_long_lived_reader(tmp_path):
+    folder = tmp_path / 'articles'
+    paths = write_articles(folder)
+    cache_path = tmp_path / 'features.db'
+
+    # A daemon keeps its analyzer (and cache connection) open between requests
+    daemon_like = make_analyzer(cache_path)
+    daemon_like.extract_article_info(paths[0])
+
+    articles = make_analyzer(cache_path).scan_directory(str(folder))
+    assert len(articles) == len(paths)
+
+
+def test_scan_writes_once_and_reuses_entries(tmp_path):
+    folder = tmp_path / 'articles'
+    paths = write_articles(folder)
+    cache_path = tmp_path / 'features.db'
+
+    first = make_analyzer(cache_path)
+    first.scan_directory(str(folder))
+    assert first.feature_cache.misses == len(paths)
+    assert not first.feature_cache.conn.in_transaction
+
+    second = make_analyzer(cache_path)
+    second.scan_directory(str(folder))
+    assert second.feature_cache.hits == len(paths)
+
+
+def test_locked_cache_only_costs_a_miss(tmp_path):
+    folder = tmp_path / 'articles'
+    paths = write_articles(folder)
+    analyzer = make_analyzer(tmp_path / 'features.db')
+    cache = analyzer._get_feature_cache()
+    cache.conn.close()
+    cache.conn = LockedConnection()
+
+    assert analyzer.extract_article_info(paths[0])['file_path'] == str(paths[0])
+    assert len(analyzer.scan_directory(str(folder))) == len(paths)
+    assert cache.errors > 0
+
+
+def test_batch_commits_once(tmp_path):
+    cache = ArticleFeatureCache(str(tmp_path / 'features.db'), {})
+    file_stat = (tmp_path / 'features.db').stat()
+    with cache.batch():
+        assert cache.put('a.md', file_stat, {'title': 'a'})
+        with cache.batch():
+            cache.put('b.md', file_stat, {'title': 'b'})
+        assert cache.conn.in_transaction
+    assert not cache.conn.in_transaction
+    assert cache.get('b.md', file_stat) == {'title': 'b'}
@@ -0,0 +1,91 @@
+"""Graph clustering finds the connected components of the thresholded window graph."""
+
+import random
+from datetime import datetime, timedelta
+
+from conftest import near_copy, random_text
+
+from algorithms.graph_clustering import GraphClustering, UnionFind
+from algorithms.linear_comparison import LinearComparison
+
+CONFIG = {'min_content_length': 10, 'similarity_threshold': 0.7, 'comparison_window_days': 30}
+
+
+def build_corpus(write_corpus, analyze_corpus, seed=3, count=40):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    files, originals = {}, []
+    for number in range(count):
+        date = (start + timedelta(days=rng.randint(0, 120))).strftime('%Y%m%d')
+        if originals and rng.random() < 0.4:
+            title, body = rng.choice(originals)
+            body = near_copy(rng, body)
+        else:
+            title, body = f'Guide {number}', random_text(rng)
+            originals.append((title, body))
+        files[f'article-{number:02d}-{date}.md'] = (title, body)
+    return analyze_corpus(write_corpus(files), **CONFIG)
+
+
+def brute_force_groups(clustering, articles):
+    """Components of the graph of all window pairs scored one by one."""
+    clustering.tfidf_calculator.fit_corpus(articles)
+    window = timedelta(days=clustering.comparison_window_days)
+    union_find = UnionFind(len(articles))
+    for i in range(len(articles)):
+        for j in range(i + 1, len(articles)):
+            if abs(articles[i]['effective_date'] - articles[j]['effective_date']) > window:
+                continue
+            similarity = clustering.tfidf_calculator.calculate_similarity(articles[i], articles[j])
+            if similarity['overall_similarity'] >= clustering._pair_threshold(articles[i], articles[j]):
+                union_find.union(i, j)
+    return {frozenset(articles[idx]['file_name'] for idx in members)
+            for members in union_find.components().values() if len(members) > 1}
+
+
+def test_groups_match_brute_force(write_corpus, analyze_corpus):
+    articles = build_corpus(write_corpus, analyze_corpus)
+    clustering = GraphClustering(CONFIG)
+    result = clustering.detect_duplicate_groups(articles)
+
+    groups = {frozenset(article['file_name'] for article in group['articles'])
+              for group in result['duplicate_groups']}
+    assert groups
+    assert groups == brute_force_groups(GraphClustering(CONFIG), articles)
+
+    for group in result['duplicate_groups']:
+        dates = [article['effective_date'] for article in group['articles']]
+        assert group['base_article']['effective_date'] == min(dates)
+
+
+def test_similarity_to_base_uses_the_window_rule(write_corpus, analyze_corpus):
+    rng = random.Random(5)
+    body = random_text(rng)
+    articles = analyze_corpus(write_corpus({
+        'a-20250101.md': ('Same', body),
+        'b-20250131.md': ('Same', body),
+        'c-20250201.md': ('Same', body),
+    }), **CONFIG)
+    articles.sort(key=lambda article: article['file_name'])
+    clustering = GraphClustering(CONFIG)
+    clustering.tfidf_calculator.fit_corpus(articles)
+
+    # 30 days apart: inside; 31 days apart: outside
+    assert clustering._similarity_to_base(articles, {}, 0, 1) > 0.9
+    assert clustering._similarity_to_base(articles, {}, 0, 2) == 0.0
+
+
+def test_union_find_components():
+    union_find = UnionFind(6)
+    union_find.union(0, 1)
+    union_find.union(2, 3)
+    union_find.union(1, 3)
+    groups = sorted(sorted(members) for members in union_find.components().values())
+    assert groups == [[0, 1, 2, 3], [4], [5]]
+
+
+def test_cross_topic_threshold_key_is_shared():
+    config = {'cross_topic_threshold': 0.91,
+              'topic_classification': {'cross_topic_similarity_threshold': 0.5}}
+    assert GraphClustering(config).cross_topic_threshold == 0.91
+    assert LinearComparison(config).cross_topic_threshold == 0.91
@@ -0,0 +1,140 @@
+"""Incremental runs reach the same verdicts as a full run and persist them between runs."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import near_copy, random_text
+
+from core.incremental_state import IncrementalState
+
+SETTINGS = {'tfidf_threshold': 0.7, 'comparison_window_days': 30, 'exact_duplicate_prepass': True}
+
+
+@pytest.fixture
+def make_engine(make_engine):
+    return lambda **overrides: make_engine(**{**SETTINGS, **overrides})
+
+
+def corpus(rng, start, count, originals, prefix):
+    """Articles dated from start on; some are near copies of earlier originals."""
+    files = {}
+    for number in range(count):
+        date = (start + timedelta(days=rng.randint(0, 40))).strftime('%Y%m%d')
+        if originals and rng.random() < 0.4:
+            title, body = rng.choice(originals)
+            body = near_copy(rng, body, changes=rng.randint(1, 8))
+        else:
+            title, body = f'{prefix} {number}', random_text(rng)
+            originals.append((title, body))
+        files[f'{prefix}-{number:02d}-{date}.md'] = (title, body)
+    return files
+
+
+def verdicts(result):
+    kept = {article['file_name'] for article in result['kept_articles']}
+    moved = {article['file_name']: article['base_article'] for article in result['moved_articles']}
+    return kept, moved
+
+
+def test_incremental_runs_match_full_run(make_engine, write_corpus):
+    rng = random.Random(17)
+    originals = []
+    folder = write_corpus(corpus(rng, datetime(2025, 1, 1), 25, originals, 'first'))
+
+    engine = make_engine()
+    first = engine.detect_similarities_incremental(str(folder))
+    full = make_engine().detect_similarities_linear(engine.scan_articles(str(folder)))
+    assert verdicts(first) == verdicts(full)
+    assert first['moved_articles']
+
+    # Nothing changed: every file is skipped
+    unchanged = make_engine().detect_similarities_incremental(str(folder))
+    assert unchanged['kept_articles'] == unchanged['moved_articles'] == []
+    assert unchanged['unchanged_articles'] == 25
+
+    # Later articles are judged against the persisted kept articles only
+    write_corpus(corpus(rng, datetime(2025, 2, 5), 15, originals, 'second'))
+    second = make_engine().detect_similarities_incremental(str(folder))
+    assert second['unchanged_articles'] == 25
+    full_kept, full_moved = verdicts(make_engine().detect_similarities_linear(
+        engine.scan_articles(str(folder))))
+    second_kept, second_moved = verdicts(second)
+    assert second_kept == {name for name in full_kept if name.startswith('second')}
+    assert second_moved == {name: base for name, base in full_moved.items() if name.startswith('second')}
+    assert second_moved and second_kept
+
+
+def test_relative_and_absolute_directories_share_the_state(make_engine, write_corpus):
+    folder = write_corpus(corpus(random.Random(4), datetime(2025, 1, 1), 4, [], 'post'))
+
+    first = make_engine().detect_similarities_incremental('articles')
+    assert len(first['kept_articles']) == 4 and first['moved_articles'] == []
+
+    # Same unchanged files, spelled as an absolute path
+    second = make_engine().detect_similarities_incremental(str(folder.resolve()))
+    assert second['kept_articles'] == second['moved_articles'] == []
+    assert second['unchanged_articles'] == 4
+
+    # A modified file is not compared against its own stored copy
+    victim = sorted(folder.glob('*.md'))[0]
+    victim.write_text(victim.read_text(encoding='utf-8') + '\nOne more line.\n', encoding='utf-8')
+    third = make_engine().detect_similarities_incremental('articles')
+    assert [article['file_name'] for article in third['kept_articles']] == [victim.name]
+    assert third['moved_articles'] == []
+
+
+def test_deleted_files_leave_the_state(make_engine, write_corpus, tmp_path):
+    rng = random.Random(2)
+    folder = write_corpus(corpus(rng, datetime(2025, 1, 1), 6, [], 'post'))
+    make_engine().detect_similarities_incremental(str(folder))
+
+    victim = sorted(folder.glob('*.md'))[0]
+    victim.unlink()
+    make_engine().detect_similarities_incremental(str(folder))
+
+    state = IncrementalState(str(tmp_path / 'state.db'), make_engine().config)
+    assert str(victim) not in state.file_states(folder)
+    assert len(state) == 5
+    state.close()
+
+
+def test_kept_articles_load_by_date_window(tmp_path):
+    state = IncrementalState(str(tmp_path / 'state.db'), {})
+    stat = (tmp_path / 'state.db').stat()
+    articles = [{'file_path': f'/a/{day}.md', 'effective_date': datetime(2025, 1, day), 'tokens': ['x']}
+                for day in (1, 10, 20)]
+    state.apply(kept=[(stat, article) for article in articles], moved=[])
+
+    loaded = state.load_kept(datetime(2025, 1, 5), datetime(2025, 1, 20), exclude=['/a/20.md'])
+    assert [article['file_path'] for article in loaded] == ['/a/10.md']
+    assert loaded[0]['tokens'] == ['x']
+    state.close()
+
+
+def test_changed_detection_settings_reset_the_state(tmp_path):
+    path = str(tmp_path / 'state.db')
+    state = IncrementalState(path, {'similarity_threshold': 0.7})
+    stat = (tmp_path / 'state.db').stat()
+    state.apply(kept=[(stat, {'file_path': '/a.md', 'effective_date': datetime(2025, 1, 1)})], moved=[])
+    state.close()
+
+    same = IncrementalState(path, {'similarity_threshold': 0.7})
+    assert not same.was_reset and len(same) == 1
+    same.close()
+
+    changed = IncrementalState(path, {'similarity_threshold': 0.8})
+    assert changed.was_reset and len(changed) == 0
+    changed.close()
+
+
+@pytest.mark.parametrize('key, value', [
+    ('tfidf_engine', 'corpus'), ('tfidf_use_idf', False), ('tfidf_sublinear_tf', True),
+    ('check_title_similarity', False), ('check_content_similarity', False),
+    ('exact_duplicate_prepass', False), ('simhash_prefilter', True), ('simhash_prefilter_distance', 8),
+])
+def test_verdict_settings_are_part_of_the_config_hash(key, value):
+    assert IncrementalState.compute_config_hash({key: value}) != IncrementalState.compute_config_hash({})
+    # I/O-only settings do not reset the state
+    assert IncrementalState.compute_config_hash({'scan_workers': 4}) == IncrementalState.compute_config_hash({})
@@ -0,0 +1,69 @@
+"""Parallel streaming scans parse exactly what a sequential scan parses."""
+
+import random
+
+import pytest
+
+from conftest import random_text
+
+from core.article_analyzer import ArticleAnalyzer
+
+
+def build_corpus(write_corpus, seed=8, count=30):
+    rng = random.Random(seed)
+    files = {f'post-{number:02d}-202503{number % 28 + 1:02d}.md': (f'Post {number}', random_text(rng, rng.randint(5, 150)))
+             for number in range(count)}
+    folder = write_corpus(files)
+    (folder / 'broken.md').write_bytes(b'\xff\xfe not utf-8 \x80')
+    (folder / 'nested').mkdir()
+    (folder / 'nested' / 'deep-20250401.md').write_text('---\ntitle: "Deep"\n---\n\n' + random_text(rng),
+                                                        encoding='utf-8')
+    return folder
+
+
+def scan(folder, **config):
+    settings = {'feature_cache_enabled': False, 'min_content_length': 10, **config}
+    return ArticleAnalyzer(settings).scan_directory(str(folder))
+
+
+@pytest.mark.parametrize('settings', [{}, {'scan_queue_size': 1}, {'scan_recursive': True}])
+def test_ordered_parallel_scan_equals_sequential(write_corpus, settings):
+    folder = build_corpus(write_corpus)
+    sequential = scan(folder, scan_workers=1, **settings)
+    parallel = scan(folder, scan_workers=2, **settings)
+    assert sequential
+    assert parallel == sequential
+    assert any('deep' in article['file_name'] for article in sequential) == bool(settings.get('scan_recursive'))
+
+
+def test_unordered_scan_yields_the_same_articles(write_corpus):
+    folder = build_corpus(write_corpus)
+    sequential = scan(folder, scan_workers=1)
+    unordered = scan(folder, scan_workers=3, scan_ordered=False, scan_queue_size=2)
+    key = lambda article: article['file_path']
+    assert sorted(unordered, key=key) == sorted(sequential, key=key)
+
+
+def test_parallel_scan_fills_and_reuses_the_feature_cache(write_corpus, tmp_path):
+    folder = build_corpus(write_corpus)
+    sequential = scan(folder, scan_workers=1)
+    config = {'feature_cache_enabled': True, 'feature_cache_path': str(tmp_path / 'features.db'),
+              'scan_workers': 2}
+
+    first = ArticleAnalyzer({'min_content_length': 10, **config})
+    assert first.scan_directory(str(folder)) == sequential
+    assert first.feature_cache.hits == 0
+    first.feature_cache.close()
+
+    second = ArticleAnalyzer({'min_content_length': 10, **config})
+    assert second.scan_directory(str(folder)) == sequential
+    assert second.feature_cache.hits == len(list(folder.glob('*.md'))) - 1
+    second.feature_cache.close()
+
+
+def test_iter_directory_streams_scan_results(write_corpus):
+    folder = build_corpus(write_corpus)
+    analyzer = ArticleAnalyzer({'feature_cache_enabled': False, 'min_content_length': 10, 'scan_workers': 2})
+    stream = analyzer.iter_directory(str(folder))
+    first = next(stream)
+    assert [first, *stream] == scan(folder, scan_workers=1)
@@ -0,0 +1,90 @@
+"""Winnowing fingerprints guarantee copied runs are found, and the index reports exact overlaps."""
+
+import random
+
+import pytest
+
+from conftest import random_text
+
+from modules.fingerprint import PassageIndex, passage_fingerprints
+from modules.fingerprint.passage_index import kgram_hashes, winnow
+
+
+def brute_force_winnow(hashes, window):
+    if len(hashes) < window:
+        return {min(hashes)} if hashes else set()
+    return {min(hashes[i:i + window]) for i in range(len(hashes) - window + 1)}
+
+
+def test_winnow_selects_every_window_minimum():
+    rng = random.Random(1)
+    for _ in range(200):
+        hashes = [rng.randint(-20, 20) for _ in range(rng.randint(0, 40))]
+        window = rng.randint(1, 6)
+        assert winnow(hashes, window) == brute_force_winnow(hashes, window)
+
+
+@pytest.mark.parametrize('kgram, window', [(5, 4), (3, 2), (4, 6)])
+def test_copied_run_of_guaranteed_length_shares_a_fingerprint(kgram, window):
+    rng = random.Random(kgram * 10 + window)
+    run = window + kgram - 1
+    for _ in range(100):
+        source = random_text(rng, 200).split()
+        start = rng.randrange(len(source) - run)
+        copied = source[start:start + run]
+        target = random_text(rng, 50).split() + copied + random_text(rng, 50).split()
+        assert passage_fingerprints(' '.join(source), kgram, window) & \
+            passage_fingerprints(' '.join(target), kgram, window)
+
+
+def test_short_texts_hash_as_one_gram():
+    assert len(kgram_hashes(['only', 'three', 'words'], 5)) == 1
+    assert passage_fingerprints('', 5, 4) == set()
+
+
+def test_query_overlap_matches_fingerprint_sets(tmp_path):
+    rng = random.Random(4)
+    sources = {f'/pool/{number}.md': [(f'Section {part}', random_text(rng, 150)) for part in range(3)]
+               for number in range(8)}
+    index = PassageIndex(str(tmp_path / 'passages.db'))
+    for path, sections in sources.items():
+        index.add_document(path, sections, size=1, mtime_ns=1)
+    index.commit()
+
+    # Half of one source section plus new text
+    copied = sources['/pool/3.md'][1][1].split()
+    query = ' '.join(copied[:75] + random_text(rng, 75).split())
+    matches = index.query(query)
+    query_fingerprints = passage_fingerprints(query)
+    expected = {path: len(query_fingerprints & set().union(*(passage_fingerprints(text) for _, text in sections)))
+                for path, sections in sources.items()}
+    assert {match['source']: match['shared'] for match in matches} == \
+        {path: shared for path, shared in expected.items() if shared}
+    assert matches[0]['source'] == '/pool/3.md'
+    assert matches[0]['source_section'] == 'Section 1'
+    assert matches[0]['overlap'] == pytest.approx(expected['/pool/3.md'] / len(query_fingerprints))
+
+    full = index.query(sources['/pool/5.md'][0][1])
+    assert full[0]['source'] == '/pool/5.md' and full[0]['overlap'] == 1.0
+    assert all(match['source'] != '/pool/5.md'
+               for match in index.query(sources['/pool/5.md'][0][1], exclude_paths=['/pool/5.md']))
+    index.close()
+
+
+def test_documents_persist_until_settings_change(tmp_path):
+    path = str(tmp_path / 'passages.db')
+    text = random_text(random.Random(2), 100)
+    index = PassageIndex(path)
+    index.add_document('/a.md', [('Intro', text)], size=10, mtime_ns=20)
+    index.add_document('/b.md', [('Intro', text)])
+    assert index.remove_document('/b.md')
+    index.close()
+
+    reopened = PassageIndex(path)
+    assert reopened.documents() == {'/a.md': (10, 20)}
+    assert [match['source'] for match in reopened.query(text)] == ['/a.md']
+    reopened.close()
+
+    changed = PassageIndex(path, kgram=6)
+    assert len(changed) == 0
+    changed.close()
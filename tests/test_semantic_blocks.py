@@ -0,0 +1,123 @@
+"""Batched encoding and blocked similarity products match per-pair cosine similarity."""
+
+import numpy as np
+import pytest
+
+from algorithms.semantic_similarity import SemanticSimilarity
+
+
+class TableModel:
+    """Sentence-transformer stand-in returning a fixed vector per text."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.batches = []
+
+    def encode(self, texts, batch_size=32):
+        self.batches.append(list(texts))
+        return np.stack([self.vectors[text] for text in texts])
+
+
+def build(tmp_path, count=40, dim=16, seed=4, **config):
+    rng = np.random.default_rng(seed)
+    base = rng.standard_normal((count // 2, dim))
+    vectors, articles = {}, []
+    for number in range(count):
+        if number < count // 2:
+            vector = base[number]
+        else:
+            # Noisy copy of an earlier article
+            vector = base[rng.integers(count // 2)] + rng.standard_normal(dim) * rng.uniform(0.05, 1.0)
+        text = f'article {number}'
+        vectors[text] = vector.astype(np.float32)
+        articles.append({'file_path': f'/posts/{number}.md', 'content': text})
+    vectors['zero vector'] = np.zeros(dim, dtype=np.float32)
+    articles.append({'file_path': '/posts/zero.md', 'content': 'zero vector'})
+    articles.append({'file_path': '/posts/empty.md', 'content': ''})
+    # Same text under another path shares one encoding
+    articles.append({'file_path': '/posts/again.md', 'content': 'article 3'})
+
+    semantic = SemanticSimilarity({'embedding_store_path': str(tmp_path / 'embeddings'),
+                                   'fingerprint_db_path': str(tmp_path / 'fingerprints.json'),
+                                   'min_content_length': 1, **config})
+    semantic.model = TableModel(vectors)
+    return semantic, articles, vectors
+
+
+def naive_matrix(semantic, articles, vectors):
+    n = len(articles)
+    matrix = np.eye(n)
+    for i in range(n):
+        for j in range(n):
+            if i != j and articles[i]['content'] and articles[j]['content']:
+                matrix[i, j] = semantic._cosine_similarity(vectors[articles[i]['content']],
+                                                           vectors[articles[j]['content']])
+    return matrix
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 1024])
+def test_dense_matrix_matches_pairwise_cosine(tmp_path, block_size):
+    semantic, articles, vectors = build(tmp_path, similarity_block_size=block_size)
+    assert np.allclose(semantic.batch_similarity_matrix(articles), naive_matrix(semantic, articles, vectors),
+                       atol=1e-6)
+
+
+def test_encoding_is_batched_and_deduplicated(tmp_path):
+    semantic, articles, _ = build(tmp_path, embedding_batch_size=8)
+    semantic.get_embeddings(articles)
+    batches = semantic.model.batches
+    encoded = [text for batch in batches for text in batch]
+    assert all(len(batch) <= 8 for batch in batches)
+    assert sorted(encoded) == sorted({article['content'] for article in articles if article['content']})
+
+    semantic.get_embeddings(articles)
+    assert semantic.model.batches == batches
+
+
+@pytest.mark.parametrize('block_size', [1, 5, 1024])
+@pytest.mark.parametrize('threshold', [0.2, 0.8])
+def test_threshold_pairs_match_brute_force(tmp_path, block_size, threshold):
+    semantic, articles, vectors = build(tmp_path, similarity_block_size=block_size)
+    expected = naive_matrix(semantic, articles, vectors)
+    pairs = semantic.find_similar_pairs(articles, threshold=threshold)
+
+    n = len(articles)
+    found = {(i, j) for i, j, _ in pairs}
+    assert found == {(i, j) for i in range(n) for j in range(i + 1, n) if expected[i, j] >= threshold}
+    for i, j, similarity in pairs:
+        assert similarity == pytest.approx(expected[i, j], abs=1e-6)
+    assert [similarity for _, _, similarity in pairs] == sorted((s for _, _, s in pairs), reverse=True)
+
+
+@pytest.mark.parametrize('block_size', [3, 1024])
+def test_top_k_pairs_match_brute_force(tmp_path, block_size):
+    semantic, articles, vectors = build(tmp_path, similarity_block_size=block_size)
+    expected = naive_matrix(semantic, articles, vectors)
+    np.fill_diagonal(expected, -np.inf)
+    valid = [bool(article['content']) and article['content'] != 'zero vector' for article in articles]
+    for i, is_valid in enumerate(valid):
+        if not is_valid:
+            expected[i, :] = expected[:, i] = -np.inf
+
+    top_k, threshold = 3, 0.3
+    brute = set()
+    for i in range(len(articles)):
+        for j in np.argsort(-expected[i])[:top_k]:
+            if expected[i, j] >= threshold:
+                brute.add((min(i, j), max(i, j)))
+    assert {(i, j) for i, j, _ in semantic.find_similar_pairs(articles, threshold, top_k=top_k)} == brute
+
+
+def test_target_search_matches_pairwise_scores(tmp_path):
+    semantic, articles, vectors = build(tmp_path)
+    target = articles[5]
+    results = semantic.find_semantically_similar_articles(target, articles, threshold=0.5)
+
+    expected = {}
+    for article in articles:
+        if article['file_path'] == target['file_path'] or not article['content']:
+            continue
+        score = semantic.calculate_similarity(target, article)['semantic_similarity']
+        if score >= 0.5:
+            expected[article['file_path']] = score
+    assert {article['file_path']: pytest.approx(score, abs=1e-6) for article, score in results} == expected
@@ -0,0 +1,95 @@
+"""Sharded multi-process scoring gives the same results as a single process."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import near_copy, random_text
+
+from algorithms.graph_clustering import GraphClustering
+from algorithms.linear_comparison import LinearComparison
+from algorithms.sharded_comparison import ShardedComparison
+
+TOPICS = {'cross_topic_threshold': 0.75,
+          'topic_classification': {'enabled': True, 'topics': {'energy': {'keywords': ['solar']},
+                                                               'home': {'keywords': ['garden']}}}}
+
+
+def build_articles(write_corpus, analyze_corpus, config, seed=13, count=50):
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 1)
+    files, originals = {}, []
+    for number in range(count):
+        date = (start + timedelta(days=rng.randint(0, 90))).strftime('%Y%m%d')
+        if originals and rng.random() < 0.5:
+            title, body = rng.choice(originals)
+            body = near_copy(rng, body, changes=rng.randint(1, 40))
+            if rng.random() < 0.3:
+                # Same text under the other topic: a cross-topic pair
+                topic, rest = title.split(' ', 1)
+                title = f"{'garden' if topic == 'solar' else 'solar'} {rest}"
+        else:
+            title, body = f"{rng.choice(['solar', 'garden'])} tips {number}", random_text(rng)
+            originals.append((title, body))
+        files[f'item-{number:02d}-{date}.md'] = (title, body)
+    return analyze_corpus(write_corpus(files), **config)
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Many small blocks, so pairs cross block boundaries
+    monkeypatch.setattr(ShardedComparison.__init__, '__defaults__', (64,))
+
+
+def linear_summary(result):
+    return ([article['file_name'] for article in result['kept_articles']],
+            [(article['file_name'], article['base_article'], article['similarity_to_base'])
+             for article in result['moved_articles']])
+
+
+def graph_summary(result):
+    return sorted(sorted((article['file_name'], article['similarity_to_base']) for article in group['articles'])
+                  for group in result['duplicate_groups'])
+
+
+@pytest.mark.parametrize('settings', [
+    {'tfidf_engine': 'pairwise'},
+    {'tfidf_engine': 'corpus'},
+    {'tfidf_engine': 'corpus', **TOPICS},
+    {'simhash_prefilter': True, 'simhash_prefilter_distance': 20},
+])
+def test_linear_sharded_equals_single_process(write_corpus, analyze_corpus, small_blocks, settings):
+    config = {'min_content_length': 10, 'similarity_threshold': 0.7, 'comparison_window_days': 30, **settings}
+    articles = build_articles(write_corpus, analyze_corpus, config)
+
+    single = LinearComparison({**config, 'comparison_workers': 1}).detect_similarities(
+        [dict(article) for article in articles])
+    sharded = LinearComparison({**config, 'comparison_workers': 2}).detect_similarities(
+        [dict(article) for article in articles])
+    assert single['moved_articles']
+    assert linear_summary(sharded) == linear_summary(single)
+    if 'topic_classification' in settings:
+        assert {article['is_cross_topic'] for article in single['moved_articles']} == {False, True}
+
+
+@pytest.mark.parametrize('settings', [{'tfidf_engine': 'pairwise'}, {'tfidf_engine': 'corpus', **TOPICS}])
+def test_graph_sharded_equals_single_process(write_corpus, analyze_corpus, small_blocks, settings):
+    config = {'min_content_length': 10, 'similarity_threshold': 0.7, 'comparison_window_days': 30, **settings}
+    articles = build_articles(write_corpus, analyze_corpus, config)
+
+    single = GraphClustering({**config, 'comparison_workers': 1}).detect_duplicate_groups(
+        [dict(article) for article in articles])
+    sharded = GraphClustering({**config, 'comparison_workers': 2}).detect_duplicate_groups(
+        [dict(article) for article in articles])
+    assert single['duplicate_groups']
+    assert graph_summary(sharded) == graph_summary(single)
+
+
+def test_blocks_cover_every_base_once():
+    window_ends = [3, 5, 5, 9, 9, 9, 10, 10, 10, 10]
+    blocks = ShardedComparison(None, 2, block_cells=6)._plan_blocks(window_ends)
+    covered = [position for start, end, _ in blocks for position in range(start, end)]
+    assert covered == list(range(len(window_ends)))
+    for start, end, window_end in blocks:
+        assert window_end == window_ends[end - 1]
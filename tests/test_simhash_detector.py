@@ -0,0 +1,76 @@
+"""Bucket lookups of SimHashDetector equal a brute-force Hamming scan."""
+
+import random
+import sqlite3
+
+import pytest
+
+pytest.importorskip('nltk')
+
+from modules.deduplication import close_connection_pools
+from modules.deduplication.simhash_detector import SimHashDetector
+
+WORDS = ['smart', 'plug', 'alexa', 'wifi', 'robot', 'vacuum', 'pet', 'hair', 'guide', 'best',
+         'review', 'setup', 'camera', 'outdoor', 'solar', 'lock', 'door', 'light', 'bulb', 'hub']
+
+
+@pytest.fixture(autouse=True)
+def close_pools():
+    yield
+    close_connection_pools()
+
+
+def titles(seed, count=120):
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(WORDS) for _ in range(6)) for _ in range(count)]
+
+
+def brute_force(detector, stored_titles, title):
+    target = detector.calculate_simhash(title)
+    distances = [(stored, bin(detector.calculate_simhash(stored) ^ target).count('1')) for stored in stored_titles]
+    return sorted((stored, distance) for stored, distance in distances
+                  if distance <= detector.similarity_threshold)
+
+
+@pytest.mark.parametrize('threshold', [3, 5, 12])
+def test_lookup_matches_brute_force(tmp_path, threshold):
+    detector = SimHashDetector(str(tmp_path / 'simhash.db'), similarity_threshold=threshold)
+    stored = titles(threshold)
+    with detector.batch():
+        for title in stored:
+            assert detector.add_content_record(title)
+
+    for title in titles(threshold + 100, 40) + stored[:20]:
+        found = sorted((record.title, distance) for record, distance in detector.find_similar_content(title))
+        assert found == brute_force(detector, stored, title)
+
+
+def test_detectors_with_other_thresholds_share_a_database(tmp_path):
+    db_path = str(tmp_path / 'simhash.db')
+    title = 'Best Robot Vacuum for Pet Hair 2025 Reviews'
+
+    first = SimHashDetector(db_path, similarity_threshold=3)
+    second = SimHashDetector(db_path, similarity_threshold=5)
+    assert first.add_content_record(title)
+    assert second.add_content_record('Smart Plug Alexa WiFi Setup Guide')
+
+    for detector in (first, second, SimHashDetector(db_path, similarity_threshold=3),
+                     SimHashDetector(db_path, similarity_threshold=5),
+                     SimHashDetector(db_path, similarity_threshold=4)):
+        matches = detector.find_similar_content(title)
+        assert [(record.title, distance) for record, distance in matches][:1] == [(title, 0)]
+        assert detector.find_similar_content('Smart Plug Alexa WiFi Setup Guide')
+
+
+def test_single_layout_databases_are_reindexed(tmp_path):
+    db_path = str(tmp_path / 'simhash.db')
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('CREATE TABLE simhash_buckets (table_id INTEGER, bucket_key INTEGER, record_id INTEGER, '
+                     'PRIMARY KEY (table_id, bucket_key, record_id)) WITHOUT ROWID')
+        conn.execute('CREATE TABLE simhash_index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+    conn.close()
+
+    detector = SimHashDetector(db_path)
+    assert detector.add_content_record('Solar Outdoor Camera Guide')
+    close_connection_pools()
+    assert SimHashDetector(db_path).find_similar_content('Solar Outdoor Camera Guide')
@@ -0,0 +1,93 @@
+"""SimHash index queries equal a brute-force Hamming scan."""
+
+import random
+
+import pytest
+
+from modules.fingerprint import SimHashIndex
+from modules.fingerprint.simhash_index import MIN_KEY_BITS, default_num_blocks
+
+
+def brute_force(fingerprints, target, max_distance):
+    matches = [(key, bin(value ^ target).count('1')) for key, value in fingerprints.items()]
+    return sorted(((key, distance) for key, distance in matches if distance <= max_distance),
+                  key=lambda item: (item[1], str(item[0])))
+
+
+def flip_bits(rng, value, count):
+    for bit in rng.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+
+def make_fingerprints(rng, count=400):
+    """Random fingerprints plus near copies at every distance up to 20."""
+    fingerprints = {}
+    for key in range(count):
+        if key % 2 and key > 1:
+            fingerprints[key] = flip_bits(rng, fingerprints[key - 1], rng.randint(0, 20))
+        else:
+            fingerprints[key] = rng.getrandbits(64)
+    return fingerprints
+
+
+@pytest.mark.parametrize('max_distance, num_blocks', [
+    (0, None), (3, None), (4, None), (6, None), (12, None), (16, None), (3, 8), (5, 0),
+])
+def test_query_matches_brute_force(max_distance, num_blocks):
+    rng = random.Random(max_distance)
+    fingerprints = make_fingerprints(rng)
+    index = SimHashIndex(max_distance=max_distance, num_blocks=num_blocks)
+    for key, value in fingerprints.items():
+        index.add(key, value)
+
+    for key in rng.sample(sorted(fingerprints), 40):
+        target = flip_bits(rng, fingerprints[key], rng.randint(0, max_distance))
+        assert index.query(target) == brute_force(fingerprints, target, max_distance)
+        # Larger distances than the tables answer fall back to a scan
+        assert index.query(target, max_distance + 4) == brute_force(fingerprints, target, max_distance + 4)
+
+
+@pytest.mark.parametrize('uses_tables', [True, False])
+def test_removed_keys_are_not_returned(uses_tables):
+    rng = random.Random(1)
+    fingerprints = make_fingerprints(rng, 100)
+    index = SimHashIndex(max_distance=3 if uses_tables else 12)
+    assert index.uses_tables == uses_tables
+    for key, value in fingerprints.items():
+        index.add(key, value)
+
+    index.query(fingerprints[0])
+    for key in range(0, 100, 3):
+        index.remove(key)
+        del fingerprints[key]
+    index.add(200, fingerprints[1])
+    fingerprints[200] = fingerprints[1]
+
+    for key in (1, 2, 4, 200):
+        assert index.query(fingerprints[key]) == brute_force(fingerprints, fingerprints[key], index.max_distance)
+
+
+def test_default_layout_has_selective_keys():
+    for max_distance in range(0, 7):
+        index = SimHashIndex(max_distance=max_distance)
+        assert index.uses_tables
+        key_bits = min(sum(index.blocks[block][1].bit_length() for block in chosen)
+                       for chosen in index.table_blocks)
+        assert key_bits >= MIN_KEY_BITS
+    # Beyond distance 6 a selective layout needs more than MAX_TABLES tables
+    assert default_num_blocks(7) == 0
+    assert not SimHashIndex(max_distance=12).uses_tables
+
+
+def test_save_and_load_keep_key_types(tmp_path):
+    index = SimHashIndex(max_distance=3)
+    index.add('post.md', 0x1234)
+    index.add(7, 0xFFFF_0000_FFFF_0000)
+    path = str(tmp_path / 'index.json')
+    index.save(path)
+
+    loaded = SimHashIndex.load(path)
+    assert loaded.fingerprints == {'post.md': 0x1234, 7: 0xFFFF_0000_FFFF_0000}
+    assert loaded.query(0x1235) == [('post.md', 1)]
+    assert SimHashIndex.load(path, max_distance=12).fingerprints == loaded.fingerprints
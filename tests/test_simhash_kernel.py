@@ -0,0 +1,81 @@
+"""The vectorized SimHash kernel matches the simhash package and the per-bit loops it replaced."""
+
+import hashlib
+import random
+
+import numpy as np
+import pytest
+
+from conftest import random_text
+
+from modules.fingerprint import (
+    fingerprint_array, hamming_distances, popcount64, signed64, simhash64, text_simhash, unsigned64
+)
+
+simhash = pytest.importorskip('simhash')
+
+
+def loop_simhash64(tokens) -> int:
+    """Per-bit loop of the uniqueness guard before vectorization."""
+    if not tokens:
+        return 0
+    bits = [0] * 64
+    for tok in tokens:
+        h = int(hashlib.md5(tok.encode('utf-8')).hexdigest(), 16) & ((1 << 64) - 1)
+        for i in range(64):
+            bits[i] += 1 if (h >> i) & 1 else -1
+    out = 0
+    for i in range(64):
+        if bits[i] > 0:
+            out |= (1 << i)
+    return out
+
+
+TEXTS = [
+    'Best smart plugs for Alexa in 2024',
+    '智能插座推荐：支持Alexa的最佳选择',
+    'Robot vacuum, pet hair & carpets — a buyer\'s guide!',
+    'abc',
+    '',
+]
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_text_simhash_matches_simhash_package(text):
+    assert text_simhash(text) == simhash.Simhash(text).value
+
+
+def test_long_text_simhash_matches_simhash_package():
+    text = random_text(random.Random(4), 400)
+    assert text_simhash(text) == simhash.Simhash(text).value
+
+
+def test_simhash64_matches_baseline_loop():
+    rng = random.Random(6)
+    for _ in range(20):
+        words = random_text(rng, rng.randint(1, 60)).split()
+        # Repeated tokens weigh repeatedly, as in the loop
+        tokens = words + words[:rng.randint(0, len(words))]
+        assert simhash64(tokens) == loop_simhash64(tokens)
+    assert simhash64([]) == loop_simhash64([]) == 0
+
+
+def test_popcount_and_hamming_match_python():
+    rng = random.Random(2)
+    values = [rng.getrandbits(64) for _ in range(500)] + [0, (1 << 64) - 1, 1 << 63]
+    array = fingerprint_array(values)
+    assert popcount64(array).tolist() == [bin(value).count('1') for value in values]
+
+    query = rng.getrandbits(64)
+    expected = [bin(query ^ value).count('1') for value in values]
+    assert hamming_distances(query, array).tolist() == expected
+
+
+def test_signed_storage_round_trips():
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        stored = signed64(value)
+        assert -(1 << 63) <= stored < (1 << 63)
+        assert unsigned64(stored) == value
+    # Signed values read back from SQLite pack to the same unsigned fingerprints
+    assert fingerprint_array([signed64((1 << 64) - 1)]).tolist() == [(1 << 64) - 1]
+    assert fingerprint_array([-1]).dtype == np.uint64
@@ -0,0 +1,81 @@
+"""Daemon requests always get a JSON answer, even for malformed bodies and internal errors."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from core.similarity_daemon import _DaemonRequestHandler
+
+
+class FailingDaemon:
+    """Minimal daemon whose queries raise an unexpected error."""
+
+    def __init__(self):
+        self.engine = SimpleNamespace(debug_mode=False)
+        self._lock = threading.RLock()
+        self.request_count = 0
+
+    def compare(self, file1, file2):
+        raise RuntimeError('index corrupted')
+
+    def add_article(self, file_path):
+        return {'file': file_path, 'added': True}
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _DaemonRequestHandler)
+    httpd.daemon_threads = True
+    httpd.similarity_daemon = FailingDaemon()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(server, path, data: bytes):
+    request = urllib.request.Request(f'http://127.0.0.1:{server.server_port}{path}', data=data,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize('body', [b'[]', b'"x"', b'42', b'null'])
+def test_non_object_body_is_rejected_with_400(server, body):
+    status, payload = post(server, '/compare', body)
+    assert status == 400
+    assert 'error' in payload
+
+
+def test_invalid_json_is_rejected_with_400(server):
+    status, payload = post(server, '/compare', b'{not json')
+    assert status == 400
+    assert 'error' in payload
+
+
+def test_missing_parameter_is_rejected_with_400(server):
+    status, payload = post(server, '/add-article', b'{}')
+    assert status == 400
+    assert 'file' in payload['error']
+
+
+def test_unexpected_error_answers_500(server):
+    status, payload = post(server, '/compare', json.dumps({'file1': 'a.md', 'file2': 'b.md'}).encode())
+    assert status == 500
+    assert 'index corrupted' in payload['error']
+
+
+def test_valid_request_still_succeeds(server):
+    status, payload = post(server, '/add-article', json.dumps({'file': 'a.md'}).encode())
+    assert status == 200
+    assert payload['added'] is True
+    assert server.similarity_daemon.request_count == 1
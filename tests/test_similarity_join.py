@@ -0,0 +1,96 @@
+"""Threshold pruning never rejects a pair whose exact cosine reaches the threshold."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import near_copy, random_text
+
+from algorithms.linear_comparison import LinearComparison
+from algorithms.similarity_join import CosineSimilarityJoin
+
+THRESHOLDS = [0.05, 0.2, 0.4, 0.6, 0.8, 0.95]
+
+
+def cosine(x, y):
+    dot = sum(weight * y.get(term, 0.0) for term, weight in x.items())
+    norms = sum(w * w for w in x.values()) ** 0.5 * sum(w * w for w in y.values()) ** 0.5
+    return dot / norms if norms else 0.0
+
+
+def random_vectors(rng, count=60, vocabulary=80):
+    vectors = {}
+    for number in range(count):
+        if number and rng.random() < 0.3:
+            # Perturbed copies give pairs on both sides of every threshold
+            base = vectors[rng.randrange(number)]
+            vector = {term: weight * rng.uniform(0.5, 1.5) for term, weight in base.items()
+                      if rng.random() < 0.8}
+            vector.update({rng.randrange(vocabulary): rng.uniform(0.1, 3.0) for _ in range(rng.randint(0, 5))})
+        else:
+            vector = {rng.randrange(vocabulary): rng.uniform(0.1, 3.0) for _ in range(rng.randint(1, 25))}
+        vectors[number] = vector
+    return vectors
+
+
+def test_bounds_never_prune_reachable_pairs():
+    vectors = random_vectors(random.Random(12))
+    join = CosineSimilarityJoin(vectors)
+    for i in vectors:
+        for j in vectors:
+            if i == j:
+                continue
+            exact = cosine(vectors[i], vectors[j])
+            for threshold in THRESHOLDS:
+                bound = join.upper_bound(i, j, threshold)
+                if bound is not None:
+                    assert exact < threshold
+                    assert exact <= bound + 1e-9
+    assert 0 < join.pruned < join.checked
+
+
+def test_pair_exactly_at_threshold_is_kept():
+    vectors = {'a': {'x': 1.0, 'y': 1.0}, 'b': {'x': 1.0, 'z': 1.0}}
+    join = CosineSimilarityJoin(vectors)
+    assert join.may_reach('a', 'b', cosine(vectors['a'], vectors['b']))
+
+
+def test_unknown_and_empty_vectors_are_never_pruned():
+    join = CosineSimilarityJoin({'a': {'x': 1.0}, 'empty': {}})
+    assert join.may_reach('a', 'missing', 0.9)
+    assert join.may_reach('empty', 'empty', 0.9)
+
+
+def detection_summary(result):
+    return ([article['file_name'] for article in result['kept_articles']],
+            [(article['file_name'], article['base_article'], article['similarity_to_base'])
+             for article in result['moved_articles']])
+
+
+@pytest.mark.parametrize('engine', ['pairwise', 'corpus'])
+def test_linear_results_equal_unpruned(write_corpus, analyze_corpus, engine):
+    rng = random.Random(21)
+    start = datetime(2025, 3, 1)
+    files, originals = {}, []
+    for number in range(40):
+        date = (start + timedelta(days=rng.randint(0, 60))).strftime('%Y%m%d')
+        if originals and rng.random() < 0.5:
+            title, body = rng.choice(originals)
+            body = near_copy(rng, body, changes=rng.randint(2, 60))
+        else:
+            title, body = f'Review {number}', random_text(rng)
+            originals.append((title, body))
+        files[f'post-{number:02d}-{date}.md'] = (title, body)
+    config = {'min_content_length': 10, 'similarity_threshold': 0.7,
+              'comparison_window_days': 30, 'tfidf_engine': engine}
+    articles = analyze_corpus(write_corpus(files), **config)
+
+    pruned = LinearComparison({**config, 'threshold_pruning': True})
+    result = pruned.detect_similarities([dict(article) for article in articles])
+    unpruned = LinearComparison({**config, 'threshold_pruning': False})
+    expected = unpruned.detect_similarities([dict(article) for article in articles])
+
+    assert detection_summary(result) == detection_summary(expected)
+    assert result['moved_articles']
+    assert pruned.tfidf_calculator.similarity_join.pruned > 0
@@ -0,0 +1,109 @@
+"""The memoized text pipeline returns exactly what the uncached normalization rules produce."""
+
+import random
+import re
+from collections import Counter
+
+import pytest
+
+from conftest import WORDS
+
+from utils.text_pipeline import TextPipeline, content_key
+
+MARKUP = ['# ', '## ', '**', '*', '_', '`', '```\ncode block\n```', '[link](http://example.com/a)',
+          '![img](x.png)', 'https://example.com/page?q=1', 'user@example.com', '> ', '- ', '1. ',
+          '---', '|', '\n', '\n\n', '  ', "it's", 'well-known', 'Ünïcode', '中文', '!?', '(', ')']
+
+
+def baseline_tfidf(text):
+    text = text.lower()
+    text = re.sub(r'[#*`\[\]()]', '', text)
+    text = re.sub(r'http[s]?://\S+', '', text)
+    text = re.sub(r'[^\w\s-]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def baseline_simhash(text):
+    if not text:
+        return ""
+    text = re.sub(r"^---[\s\S]*?---\s+", "", text, flags=re.M)
+    text = re.sub(r"```[\s\S]*?```", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def baseline_plain(text):
+    if not text:
+        return ""
+    text = text.lower()
+    for pattern, replacement, flags in [
+            (r'^#{1,6}\s+', '', re.MULTILINE), (r'\*{1,2}([^*]+)\*{1,2}', r'\1', 0),
+            (r'_{1,2}([^_]+)_{1,2}', r'\1', 0), (r'\[([^\]]+)\]\([^)]+\)', r'\1', 0),
+            (r'!\[([^\]]*)\]\([^)]+\)', r'\1', 0), (r'```[\s\S]*?```', '', 0), (r'`([^`]+)`', r'\1', 0),
+            (r'^>\s+', '', re.MULTILINE), (r'^\s*[-*+]\s+', '', re.MULTILINE),
+            (r'^\s*\d+\.\s+', '', re.MULTILINE), (r'^-{3,}$', '', re.MULTILINE), (r'\|', ' ', 0)]:
+        text = re.sub(pattern, replacement, text, flags=flags)
+    text = re.sub(r'http[s]?://\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'[^\w\s-]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def markdown_texts(seed=6, count=150):
+    rng = random.Random(seed)
+    texts = ['', ' ', '---\ntitle: x\n---\nbody']
+    for _ in range(count):
+        pieces = [rng.choice(MARKUP) if rng.random() < 0.4 else rng.choice(WORDS).title()
+                  for _ in range(rng.randint(1, 40))]
+        texts.append(' '.join(pieces) if rng.random() < 0.5 else ''.join(pieces))
+    return texts
+
+
+def test_stages_equal_uncached_rules():
+    pipeline = TextPipeline()
+    for _ in range(2):  # second pass is served from the memo
+        for text in markdown_texts():
+            assert pipeline.normalized(text) == baseline_tfidf(text)
+            assert pipeline.tokens(text) == baseline_tfidf(text).split()
+            assert pipeline.term_frequencies(text) == dict(Counter(baseline_tfidf(text).split()))
+            assert pipeline.simhash_text(text) == baseline_simhash(text)
+            assert pipeline.plain_text(text) == baseline_plain(text)
+    assert pipeline.hits > pipeline.misses
+
+
+def test_article_helpers_use_content_hash():
+    pipeline = TextPipeline()
+    for text in markdown_texts(seed=9, count=40):
+        article = {'title': text[:30], 'content': text, 'content_hash': content_key(text)}
+        assert pipeline.article_tokens(article) == baseline_tfidf(text).split()
+        assert pipeline.article_title(article) == baseline_tfidf(text[:30])
+        assert pipeline.article_title_words(article) == frozenset(baseline_tfidf(text[:30]).split())
+        assert pipeline.article_exact_key(article) == content_key(' '.join(text.split()))
+        assert pipeline.article_simhash_text(article) == baseline_simhash(text)
+
+    # Precomputed analyzer output takes precedence over the memo
+    assert pipeline.article_tokens({'content': 'a b', 'tokens': ['x']}) == ['x']
+    assert pipeline.article_term_frequencies({'content': 'a b', 'term_frequencies': {'x': 1}}) == {'x': 1}
+
+
+def test_memo_is_bounded_lru():
+    pipeline = TextPipeline(max_entries=3)
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return text.upper()
+
+    for text in ['a', 'b', 'c', 'a', 'd', 'a', 'b']:
+        assert pipeline.cached('stage', text, None, compute) == text.upper()
+    # 'b' was least recently used when 'd' arrived
+    assert calls == ['a', 'b', 'c', 'd', 'b']
+    assert len(pipeline._memo) == 3
+
+
+@pytest.mark.parametrize('text', ['Smart **Plug** guide', ''])
+def test_stages_do_not_share_entries(text):
+    pipeline = TextPipeline()
+    key = content_key(text)
+    assert pipeline.plain_text(text, key) == baseline_plain(text)
+    assert pipeline.normalized(text, key) == baseline_tfidf(text)
+    assert pipeline.simhash_text(text, key) == baseline_simhash(text)
@@ -0,0 +1,101 @@
+"""The corpus TF-IDF engine equals sklearn's TF-IDF, and the pairwise path keeps its baseline scores."""
+
+import random
+import re
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from conftest import WORDS, near_copy, random_text
+
+from algorithms.tfidf_engine import CorpusTFIDFEngine
+from algorithms.tfidf_similarity import TFIDFSimilarity
+
+
+def documents(seed=7, count=30):
+    rng = random.Random(seed)
+    vocabulary = WORDS[:200]
+    docs = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(5, 120))) for _ in range(count)]
+    docs.append(docs[3])
+    return docs
+
+
+@pytest.mark.parametrize('sublinear_tf', [False, True])
+def test_engine_matches_sklearn(sublinear_tf):
+    docs = documents()
+    engine = CorpusTFIDFEngine(str.split, sublinear_tf=sublinear_tf).fit(docs)
+    matrix = TfidfVectorizer(tokenizer=str.split, lowercase=False, token_pattern=None,
+                             sublinear_tf=sublinear_tf).fit_transform(docs)
+    expected = cosine_similarity(matrix)
+
+    np.testing.assert_allclose(engine.similarity_matrix().toarray(), expected, atol=1e-12)
+    rows = list(range(len(docs)))
+    np.testing.assert_allclose(engine.similarities_to(5, rows), np.minimum(expected[5], 1.0), atol=1e-12)
+    np.testing.assert_allclose(engine.pair_similarities(rows, rows[::-1]),
+                               np.minimum(expected[rows, rows[::-1]], 1.0), atol=1e-12)
+    assert engine.pair_similarities([3], [len(docs) - 1])[0] == 1.0
+
+
+def baseline_content_similarity(content1, content2):
+    """Pairwise content similarity before the corpus engine (words.count vectors)."""
+    def normalize(text):
+        text = text.lower()
+        text = re.sub(r'[#*`\[\]()]', '', text)
+        text = re.sub(r'http[s]?://\S+', '', text)
+        text = re.sub(r'[^\w\s-]', ' ', text)
+        return re.sub(r'\s+', ' ', text).strip()
+
+    if not content1 or not content2:
+        return 0.0
+    clean1, clean2 = normalize(content1), normalize(content2)
+    if clean1 == clean2:
+        return 1.0
+    words1, words2 = clean1.split(), clean2.split()
+    vocab = set(words1 + words2)
+    if not vocab:
+        return 0.0
+    vec1 = [words1.count(word) for word in vocab]
+    vec2 = [words2.count(word) for word in vocab]
+    dot = sum(a * b for a, b in zip(vec1, vec2))
+    magnitude1 = sum(a * a for a in vec1) ** 0.5
+    magnitude2 = sum(b * b for b in vec2) ** 0.5
+    if magnitude1 == 0 or magnitude2 == 0:
+        return 0.0
+    return dot / (magnitude1 * magnitude2)
+
+
+def test_pairwise_content_similarity_matches_baseline():
+    rng = random.Random(9)
+    similarity = TFIDFSimilarity({})
+    texts = ['## Setup\n\nSee [the docs](https://example.com/x) for **details**, then *retry*!',
+             'setup: see the docs for details - then retry.',
+             '',
+             '!!! ???']
+    texts += [random_text(rng, 80) for _ in range(3)]
+    texts.append(near_copy(rng, texts[-1], changes=10))
+    for first in texts:
+        for second in texts:
+            assert similarity.calculate_content_similarity(first, second) == pytest.approx(
+                baseline_content_similarity(first, second), abs=1e-12)
+
+
+def test_corpus_engine_without_idf_equals_pairwise(write_corpus, analyze_corpus):
+    rng = random.Random(4)
+    files = {}
+    for number in range(12):
+        body = random_text(rng)
+        files[f'post-{number}.md'] = (f'Guide {number}', body)
+        files[f'copy-{number}.md'] = (f'Guide {number} again', near_copy(rng, body, changes=20))
+    articles = analyze_corpus(write_corpus(files))
+
+    pairwise = TFIDFSimilarity({})
+    corpus = TFIDFSimilarity({'tfidf_engine': 'corpus', 'tfidf_use_idf': False})
+    assert corpus.fit_corpus(articles)
+
+    base = articles[0]
+    expected = [pairwise.calculate_similarity(base, other) for other in articles[1:]]
+    for result, reference in zip(corpus.calculate_similarities(base, articles[1:]), expected):
+        for key, value in reference.items():
+            assert result[key] == pytest.approx(value, abs=1e-12)
@@ -0,0 +1,96 @@
+"""The TF-IDF pool model scores exactly like refitting TfidfVectorizer on the pool plus the target."""
+
+import random
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from conftest import WORDS
+
+from modules.fingerprint import TfidfPoolModel
+
+# Small vocabulary, so document frequencies vary and max_df cuts some terms
+VOCABULARY = WORDS[:150]
+
+
+def document(rng, length=80):
+    # 'commonword' occurs everywhere and is dropped by max_df
+    return ' '.join(['commonword'] + [rng.choice(VOCABULARY) for _ in range(length)])
+
+
+def fresh_scores(pool_texts, targets, max_df):
+    """Baseline: one fit per target on the pool plus that target."""
+    columns = []
+    for target in targets:
+        matrix = TfidfVectorizer(stop_words='english', max_df=max_df).fit_transform(pool_texts + [target])
+        columns.append(cosine_similarity(matrix[-1], matrix[:-1]).ravel())
+    return np.column_stack(columns)
+
+
+def make_model(texts, max_df):
+    analyzer = TfidfVectorizer(stop_words='english').build_analyzer()
+    model = TfidfPoolModel(analyzer, max_df=max_df)
+    model.sync({path: (len(text), 1) for path, text in texts.items()}, texts.get)
+    return model
+
+
+@pytest.mark.parametrize('max_df', [0.9, 1.0, 12])
+def test_batch_similarities_match_fresh_fit(max_df):
+    rng = random.Random(3)
+    texts = {f'post-{number}.md': document(rng) for number in range(20)}
+    # One target shares a pool document, one has unseen terms, one is empty
+    targets = [document(rng), texts['post-4.md'], document(rng) + ' neverseenterm', '']
+
+    model = make_model(texts, max_df)
+    scores = model.batch_similarities(targets)
+    expected = fresh_scores([texts[path] for path in model.paths], targets, max_df)
+    np.testing.assert_allclose(scores, expected, atol=1e-12)
+    np.testing.assert_allclose(model.similarities(targets[0]), expected[:, 0], atol=1e-12)
+
+
+def test_incremental_sync_matches_fresh_fit(tmp_path):
+    rng = random.Random(5)
+    texts = {f'post-{number}.md': document(rng) for number in range(15)}
+    model = make_model(texts, 0.9)
+
+    # Change one file, delete two and add three
+    texts['post-1.md'] = document(rng)
+    del texts['post-2.md'], texts['post-3.md']
+    for number in range(15, 18):
+        texts[f'post-{number}.md'] = document(rng)
+    entries = {path: (len(text), 2 if path == 'post-1.md' else 1) for path, text in texts.items()}
+    assert model.sync(entries, texts.get)
+    assert not model.sync(entries, texts.get)
+    assert sorted(model.paths) == sorted(texts)
+
+    saved = tmp_path / 'pool.npz'
+    model.save(str(saved))
+    loaded = TfidfPoolModel.load(str(saved), model.analyzer, max_df=0.9)
+    assert loaded.paths == model.paths
+
+    targets = [document(rng), document(rng)]
+    expected = fresh_scores([texts[path] for path in loaded.paths], targets, 0.9)
+    np.testing.assert_allclose(loaded.batch_similarities(targets), expected, atol=1e-12)
+
+
+def test_cross_similarities_match_fit_on_pool_and_targets():
+    rng = random.Random(8)
+    texts = {f'post-{number}.md': document(rng) for number in range(10)}
+    targets = [document(rng) for _ in range(4)]
+    model = make_model(texts, 0.9)
+
+    matrix = TfidfVectorizer(stop_words='english', max_df=0.9).fit_transform(
+        [texts[path] for path in model.paths] + targets)
+    expected = cosine_similarity(matrix[-len(targets):])
+    np.testing.assert_allclose(model.cross_similarities(targets), expected, atol=1e-12)
+
+
+def test_stored_model_with_other_settings_is_discarded(tmp_path):
+    rng = random.Random(1)
+    model = make_model({'a.md': document(rng)}, 0.9)
+    model.config_hash = 'old'
+    saved = tmp_path / 'pool.npz'
+    model.save(str(saved))
+    assert len(TfidfPoolModel.load(str(saved), model.analyzer, config_hash='new')) == 0
@@ -0,0 +1,57 @@
+"""Sweep-line window candidates match the baseline per-pair window check."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from algorithms.time_window import TimeWindowIndex
+
+WINDOW_DAYS = 90
+
+
+def baseline_candidates(dates, position, window_days):
+    """Later positions accepted by the original ``abs((base - other).days)`` check."""
+    base = dates[position]
+    return [other for other in range(position + 1, len(dates))
+            if abs((base - dates[other]).days) <= window_days]
+
+
+@pytest.mark.parametrize('gap, inside', [
+    (timedelta(days=WINDOW_DAYS), True),
+    (timedelta(days=WINDOW_DAYS, hours=1), False),
+    (timedelta(days=WINDOW_DAYS + 1), False),
+    (timedelta(days=WINDOW_DAYS) - timedelta(microseconds=1), True),
+])
+def test_window_boundary(gap, inside):
+    start = datetime(2025, 1, 1, 8, 30)
+    dates = [start, start + gap]
+    index = TimeWindowIndex(dates, WINDOW_DAYS)
+    assert list(index.candidates(0)) == ([1] if inside else [])
+    assert baseline_candidates(dates, 0, WINDOW_DAYS) == list(index.candidates(0))
+
+
+def test_random_corpus_matches_baseline():
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1)
+    dates = sorted(start + timedelta(days=rng.randint(0, 400), hours=rng.randint(0, 23),
+                                     minutes=rng.choice([0, 30]))
+                   for _ in range(300))
+    index = TimeWindowIndex(dates, WINDOW_DAYS)
+    for position in range(len(dates)):
+        assert list(index.candidates(position)) == baseline_candidates(dates, position, WINDOW_DAYS)
+
+
+def test_removed_positions_are_skipped():
+    start = datetime(2025, 1, 1)
+    index = TimeWindowIndex([start + timedelta(days=day) for day in range(5)], 2)
+    index.remove(1)
+    assert list(index.candidates(0)) == [2]
+    assert index.is_removed(1)
+
+
+def test_from_keys_matches_dates():
+    start = datetime(2025, 1, 1)
+    dates = [start, start + timedelta(days=WINDOW_DAYS), start + timedelta(days=WINDOW_DAYS, seconds=1)]
+    from_keys = TimeWindowIndex.from_keys([TimeWindowIndex.to_key(date) for date in dates], WINDOW_DAYS)
+    assert list(from_keys.candidates(0)) == list(TimeWindowIndex(dates, WINDOW_DAYS).candidates(0)) == [1]
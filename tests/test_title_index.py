@@ -0,0 +1,58 @@
+"""The inverted title index scores exactly like pairwise title Jaccard similarity."""
+
+import random
+
+import pytest
+
+from conftest import WORDS
+
+from algorithms.tfidf_similarity import TFIDFSimilarity
+from algorithms.title_index import TitleIndex
+
+SPECIAL_TITLES = ['', None, '!!!', '???', 'Smart Plug', 'smart plug', 'plug, smart!',
+                  'Smart smart plug', 'Best **Smart** Plug (2024)']
+
+
+def make_articles(seed=3, count=60):
+    rng = random.Random(seed)
+    vocabulary = WORDS[:25]
+    titles = SPECIAL_TITLES + [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, 6)))
+                               for _ in range(count)]
+    return [{'file_path': f'/posts/{number}.md', 'title': title} for number, title in enumerate(titles)]
+
+
+@pytest.fixture
+def similarity():
+    return TFIDFSimilarity({})
+
+
+def test_similarities_match_pairwise(similarity):
+    articles = make_articles()
+    index = TitleIndex(similarity.pipeline).add_articles(articles)
+    keys = [article['file_path'] for article in articles]
+
+    for base in articles:
+        expected = [similarity.calculate_title_similarity(base['title'], other['title']) for other in articles]
+        assert index.similarities(base['file_path'], keys) == pytest.approx(expected, abs=1e-12)
+        # A short candidate list takes the direct intersection path
+        assert index.similarities(base['file_path'], keys[:2]) == pytest.approx(expected[:2], abs=1e-12)
+
+
+def test_query_matches_pairwise_for_unindexed_articles(similarity):
+    articles = make_articles()
+    index = TitleIndex(similarity.pipeline).add_articles(articles)
+    for query in make_articles(seed=8, count=20):
+        scores = index.query(query)
+        for article in articles:
+            expected = similarity.calculate_title_similarity(query['title'], article['title'])
+            assert scores.get(article['file_path'], 0.0) == pytest.approx(expected, abs=1e-12)
+
+
+def test_readding_a_key_replaces_its_title(similarity):
+    index = TitleIndex(similarity.pipeline)
+    index.add('a', {'title': 'smart plug guide'})
+    index.add('b', {'title': 'robot vacuum'})
+    index.add('a', {'title': 'robot vacuum review'})
+    assert len(index) == 2
+    assert index.query({'title': 'smart plug'}) == {}
+    assert index.similarities('a', ['b', 'missing']) == [pytest.approx(2 / 3), None]
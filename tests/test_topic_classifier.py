@@ -0,0 +1,67 @@
+"""The keyword automaton finds exactly the substrings, and topic labels match the per-keyword scan."""
+
+import random
+
+from utils.topic_classifier import KeywordAutomaton, TopicClassifier
+
+
+def baseline_topic(article, topics):
+    """Topic label as computed before the automaton (one substring search per keyword)."""
+    text = (article['title'] + ' ' + article['content']).lower()
+    scores = {}
+    for topic_name, topic_settings in topics.items():
+        keywords = topic_settings.get('keywords', [])
+        if not keywords:
+            continue
+        score = sum(1 for keyword in keywords if keyword.lower() in text)
+        if score > 0:
+            scores[topic_name] = score / len(keywords)
+    if not scores:
+        return None
+    best_topic = max(scores.items(), key=lambda x: x[1])
+    return best_topic[0] if best_topic[1] > 0.1 else None
+
+
+def random_string(rng, alphabet, low, high):
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(low, high)))
+
+
+def test_find_equals_substring_search():
+    rng = random.Random(7)
+    for _ in range(300):
+        patterns = [random_string(rng, 'abc', 0, 4) for _ in range(rng.randint(1, 12))]
+        text = random_string(rng, 'abcd', 0, 30)
+        expected = {i for i, pattern in enumerate(patterns) if pattern in text}
+        assert KeywordAutomaton(patterns).find(text) == expected
+
+
+def test_overlapping_and_nested_patterns():
+    automaton = KeywordAutomaton(['he', 'she', 'his', 'hers', 'ushers'])
+    assert automaton.find('ushers') == {0, 1, 3, 4}
+    assert automaton.find('ahishers') == {0, 1, 2, 3}
+
+
+def test_labels_match_baseline():
+    rng = random.Random(3)
+    vocabulary = ['solar', 'panel', 'garden', 'soil', 'smart', 'plug', 'robot', 'vacuum', 'pet', 'hair']
+    for _ in range(200):
+        topics = {f'topic{number}': {'keywords': rng.sample(vocabulary, rng.randint(0, 4))
+                                     + [rng.choice(vocabulary).upper()] * rng.randint(0, 1)}
+                  for number in range(rng.randint(1, 4))}
+        article = {'title': ' '.join(rng.sample(vocabulary, 2)).title(),
+                   'content': ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 30)))}
+        classifier = TopicClassifier(topics)
+        assert classifier.classify(dict(article)) == baseline_topic(article, topics)
+
+
+def test_stored_labels_are_reused_until_keywords_change():
+    article = {'title': 'Solar panels', 'content': 'cleaning solar panels'}
+    energy = TopicClassifier({'energy': {'keywords': ['solar']}})
+    assert energy.classify(article) == 'energy'
+
+    article['content'] = 'garden soil'
+    assert energy.classify(article) == 'energy'
+
+    home = TopicClassifier({'home': {'keywords': ['garden']}})
+    assert home.classify(article) == 'home'
+    assert article['topic_signature'] == home.signature